@@ -47,6 +47,11 @@ class ReadMethod(Enum):
     BY_LINE: ReadMethod
     FULL: ReadMethod
 
+class ModificationMode(Enum):
+    REREAD: ModificationMode
+    APPEND: ModificationMode
+    DIFF: ModificationMode
+
 class DebeziumDBType(Enum):
     POSTGRES: DebeziumDBType
     MONGO_DB: DebeziumDBType
@@ -80,6 +85,7 @@ class ConnectorProperties:
     commit_duration_ms: int | None = None
     unsafe_trusted_ids: bool | None = False
     column_properties: list[ColumnProperties] = []
+    parse_threads: int | None = None
 
 class Column:
     """A Column holds data and conceptually is a Dict[Universe elems, dt]
@@ -156,6 +162,19 @@ class Reducer:
     def stateful_many(combine_many: CombineMany[S]) -> Reducer: ...
     EARLIEST: Reducer
     LATEST: Reducer
+    @staticmethod
+    def approx_count_distinct(precision: int) -> Reducer: ...
+    @staticmethod
+    def approx_quantile(quantile: float, relative_accuracy: float) -> Reducer: ...
+    @staticmethod
+    def top_k(k: int) -> Reducer: ...
+    @staticmethod
+    def variance(ddof: int) -> Reducer: ...
+    @staticmethod
+    def stddev(ddof: int) -> Reducer: ...
+    @staticmethod
+    def covariance(ddof: int) -> Reducer: ...
+    CORRELATION: Reducer
 
 class UnaryOperator:
     INV: UnaryOperator
@@ -360,6 +379,16 @@ class Expression:
     def to_string(expr: Expression) -> Expression: ...
     @staticmethod
     def fill_error(expr: Expression, replacement: Expression) -> Expression: ...
+    @staticmethod
+    def sliding_windows(
+        instance: Expression,
+        key: Expression,
+        hop: Value,
+        duration: Value | None,
+        origin: Value,
+        origin_is_explicit: bool,
+        ratio: int | None = None,
+    ) -> Expression: ...
 
 class MonitoringLevel(Enum):
     NONE = 0
@@ -465,6 +494,16 @@ class Scope:
         deterministic: bool,
         properties: TableProperties,
     ) -> Table: ...
+    def batch_apply_table(
+        self,
+        table: Table,
+        column_paths: list[ColumnPath],
+        function: Callable[..., list[Value]],
+        propagate_none: bool,
+        deterministic: bool,
+        properties: TableProperties,
+        max_batch_size: int | None,
+    ) -> Table: ...
     def gradual_broadcast(
         self,
         input_table_storage: Table,
@@ -623,6 +662,63 @@ class Scope:
         instance_column_path: ColumnPath,
         table_properties: TableProperties,
     ) -> Table: ...
+    def session_windows_table(
+        self,
+        table: Table,
+        key_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        max_gap: Value | None,
+        predicate: Callable[[Value, Value], bool] | None,
+        table_properties: TableProperties,
+    ) -> Table: ...
+    def interval_join_table(
+        self,
+        left_table: Table,
+        right_table: Table,
+        left_time_column_path: ColumnPath,
+        right_time_column_path: ColumnPath,
+        left_instance_column_path: ColumnPath,
+        right_instance_column_path: ColumnPath,
+        lower_bound: Value,
+        upper_bound: Value,
+        table_properties: TableProperties,
+    ) -> Table: ...
+    def asof_join_table(
+        self,
+        table: Table,
+        time_column_path: ColumnPath,
+        side_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        direction: AsofJoinDirection,
+        right_first: bool,
+        match_left: bool,
+        match_right: bool,
+        table_properties: TableProperties,
+    ) -> Table: ...
+    def prefix_sum_upperbound_table(
+        self,
+        table: Table,
+        key_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        weight_column_path: ColumnPath,
+        queries_table: Table,
+        query_instance_column_path: ColumnPath,
+        threshold_column_path: ColumnPath,
+        table_properties: TableProperties,
+    ) -> Table: ...
+    def graph_algorithm_table(
+        self,
+        vertices_table: Table,
+        vertex_instance_column_path: ColumnPath,
+        is_source_column_path: ColumnPath,
+        edges_table: Table,
+        source_column_path: ColumnPath,
+        target_column_path: ColumnPath,
+        weight_column_path: ColumnPath,
+        edge_instance_column_path: ColumnPath,
+        algorithm: GraphAlgorithm,
+        table_properties: TableProperties,
+    ) -> Table: ...
     def probe_table(self, table: Table, operator_id: int): ...
     def subscribe_table(
         self,
@@ -762,6 +858,17 @@ class SessionType(Enum):
     NATIVE: SessionType
     UPSERT: SessionType
 
+class AsofJoinDirection(Enum):
+    BACKWARD: AsofJoinDirection
+    FORWARD: AsofJoinDirection
+    NEAREST: AsofJoinDirection
+
+class GraphAlgorithm:
+    @staticmethod
+    def pagerank(damping: float, tolerance: float) -> GraphAlgorithm: ...
+    WEAKLY_CONNECTED_COMPONENTS: GraphAlgorithm
+    SHORTEST_PATHS: GraphAlgorithm
+
 class SnapshotEvent:
     @staticmethod
     def insert(key: Pointer, values: list[Value]) -> SnapshotEvent: ...
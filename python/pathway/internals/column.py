@@ -18,6 +18,7 @@ from pathway.internals.helpers import SetOnceProperty, StableSet
 from pathway.internals.universe import Universe
 
 if TYPE_CHECKING:
+    from pathway.engine import AsofJoinDirection, GraphAlgorithm
     from pathway.internals.expression import InternalColRef
     from pathway.internals.operator import OutputHandle
     from pathway.internals.table import Table
@@ -483,6 +484,127 @@ class ExternalIndexAsOfNowContext(
         )
 
 
+@dataclass(eq=False, frozen=True)
+class PrefixSumUpperboundContext(Context):
+    """Context of table._prefix_sum_upperbound() operation."""
+
+    _index_id_column: IdColumn
+    _query_id_column: IdColumn
+    index_table: pw.Table
+    query_table: pw.Table
+    key_column: ColumnWithExpression
+    instance_column: ColumnWithExpression
+    weight_column: ColumnWithExpression
+    query_instance_column: ColumnWithExpression
+    threshold_column: ColumnWithExpression
+
+    @property
+    def universe(self) -> Universe:
+        return self._query_id_column.universe
+
+    def id_column_type(self) -> dt.DType:
+        return self._query_id_column.dtype
+
+    def _index_columns(self) -> list[Column]:
+        return [self.key_column, self.instance_column, self.weight_column]
+
+    def _query_columns(self) -> list[Column]:
+        return [self.query_instance_column, self.threshold_column]
+
+    def column_dependencies_external(self) -> Iterable[Column]:
+        return [self._index_id_column, self._query_id_column]
+
+    def column_dependencies_internal(self) -> Iterable[Column]:
+        return self._index_columns() + self._query_columns()
+
+    def index_universe(self) -> Universe:
+        return self.index_table._universe
+
+    def query_universe(self) -> Universe:
+        return self.query_table._universe
+
+    def intermediate_tables(self) -> Iterable[Table]:
+        return [
+            _create_internal_table(
+                self._index_columns(), self.index_table._rowwise_context
+            ),
+            _create_internal_table(
+                self._query_columns(), self.query_table._rowwise_context
+            ),
+        ]
+
+    @cached_property
+    def upperbound_column(self) -> Column:
+        return MaterializedColumn(
+            self.universe,
+            cp.ColumnProperties(dtype=dt.Optional(self._index_id_column.dtype)),
+        )
+
+
+@dataclass(eq=False, frozen=True)
+class GraphAlgorithmContext(Context):
+    """Context of table._graph_algorithm() operation."""
+
+    _vertices_id_column: IdColumn
+    _edges_id_column: IdColumn
+    vertices_table: pw.Table
+    edges_table: pw.Table
+    vertex_instance_column: ColumnWithExpression
+    is_source_column: ColumnWithExpression
+    source_column: ColumnWithExpression
+    target_column: ColumnWithExpression
+    weight_column: ColumnWithExpression
+    edge_instance_column: ColumnWithExpression
+    algorithm: GraphAlgorithm
+    res_type: dt.DType
+
+    @property
+    def universe(self) -> Universe:
+        return self._vertices_id_column.universe
+
+    def id_column_type(self) -> dt.DType:
+        return self._vertices_id_column.dtype
+
+    def _vertices_columns(self) -> list[Column]:
+        return [self.vertex_instance_column, self.is_source_column]
+
+    def _edges_columns(self) -> list[Column]:
+        return [
+            self.source_column,
+            self.target_column,
+            self.weight_column,
+            self.edge_instance_column,
+        ]
+
+    def column_dependencies_external(self) -> Iterable[Column]:
+        return [self._vertices_id_column, self._edges_id_column]
+
+    def column_dependencies_internal(self) -> Iterable[Column]:
+        return self._vertices_columns() + self._edges_columns()
+
+    def vertices_universe(self) -> Universe:
+        return self.vertices_table._universe
+
+    def edges_universe(self) -> Universe:
+        return self.edges_table._universe
+
+    def intermediate_tables(self) -> Iterable[Table]:
+        return [
+            _create_internal_table(
+                self._vertices_columns(), self.vertices_table._rowwise_context
+            ),
+            _create_internal_table(
+                self._edges_columns(), self.edges_table._rowwise_context
+            ),
+        ]
+
+    @cached_property
+    def result_column(self) -> Column:
+        return MaterializedColumn(
+            self.universe, cp.ColumnProperties(dtype=self.res_type)
+        )
+
+
 @dataclass(eq=False, frozen=True)
 class TableRestrictedRowwiseContext(RowwiseContext):
     """Restricts expression to specific table."""
@@ -1053,6 +1175,139 @@ class SortingContext(Context):
         return self.original_id_column_dtype
 
 
+@dataclass(eq=False, frozen=True)
+class SessionWindowsContext(Context):
+    """Context of table._session_windows() operation."""
+
+    key_column: ColumnWithExpression
+    instance_column: ColumnWithExpression
+    max_gap: Any | None
+    predicate: Callable[[Any, Any], bool] | None
+    original_id_column_dtype: dt.DType
+
+    def column_dependencies_internal(self) -> Iterable[Column]:
+        return [self.key_column, self.instance_column]
+
+    @cached_property
+    def universe(self) -> Universe:
+        return self.key_column.universe
+
+    @cached_property
+    def window_column(self) -> Column:
+        return MaterializedColumn(
+            self.universe,
+            cp.ColumnProperties(dtype=self.original_id_column_dtype),
+        )
+
+    @cached_property
+    def start_column(self) -> Column:
+        return MaterializedColumn(
+            self.universe, cp.ColumnProperties(dtype=self.key_column.dtype)
+        )
+
+    @cached_property
+    def end_column(self) -> Column:
+        return MaterializedColumn(
+            self.universe, cp.ColumnProperties(dtype=self.key_column.dtype)
+        )
+
+    def id_column_type(self) -> dt.DType:
+        return self.original_id_column_dtype
+
+
+@dataclass(eq=False, frozen=True)
+class AsofJoinContext(Context):
+    """Context of table._asof_join_peers() operation."""
+
+    time_column: ColumnWithExpression
+    side_column: ColumnWithExpression
+    instance_column: ColumnWithExpression
+    direction: AsofJoinDirection
+    right_first: bool
+    match_left: bool
+    match_right: bool
+    original_id_column_dtype: dt.DType
+
+    def column_dependencies_internal(self) -> Iterable[Column]:
+        return [self.time_column, self.side_column, self.instance_column]
+
+    @cached_property
+    def universe(self) -> Universe:
+        return self.time_column.universe
+
+    @cached_property
+    def peer_column(self) -> Column:
+        return MaterializedColumn(
+            self.universe,
+            cp.ColumnProperties(dtype=dt.Optional(self.original_id_column_dtype)),
+        )
+
+    def id_column_type(self) -> dt.DType:
+        return self.original_id_column_dtype
+
+
+@dataclass(eq=False, frozen=True)
+class IntervalJoinContext(Context):
+    """Context of table._interval_join_pairs() operation."""
+
+    left_table: pw.Table
+    right_table: pw.Table
+    left_time_column: ColumnWithExpression
+    right_time_column: ColumnWithExpression
+    left_instance_column: ColumnWithExpression
+    right_instance_column: ColumnWithExpression
+    lower_bound: Any
+    upper_bound: Any
+
+    def column_dependencies_external(self) -> Iterable[Column]:
+        return [self.left_table._id_column, self.right_table._id_column]
+
+    def column_dependencies_internal(self) -> Iterable[Column]:
+        return self._left_columns() + self._right_columns()
+
+    def _left_columns(self) -> list[Column]:
+        return [self.left_time_column, self.left_instance_column]
+
+    def _right_columns(self) -> list[Column]:
+        return [self.right_time_column, self.right_instance_column]
+
+    def intermediate_tables(self) -> Iterable[Table]:
+        return [
+            _create_internal_table(self._left_columns(), self.left_table._context),
+            _create_internal_table(self._right_columns(), self.right_table._context),
+        ]
+
+    def left_universe(self) -> Universe:
+        return self.left_table._universe
+
+    def right_universe(self) -> Universe:
+        return self.right_table._universe
+
+    @cached_property
+    def universe(self) -> Universe:
+        ret = Universe()
+        if self.left_universe().is_empty() or self.right_universe().is_empty():
+            ret.register_as_empty(no_warn=False)
+        return ret
+
+    @cached_property
+    def left_id_column(self) -> Column:
+        return MaterializedColumn(
+            self.universe,
+            cp.ColumnProperties(dtype=self.left_table._id_column.dtype),
+        )
+
+    @cached_property
+    def right_id_column(self) -> Column:
+        return MaterializedColumn(
+            self.universe,
+            cp.ColumnProperties(dtype=self.right_table._id_column.dtype),
+        )
+
+    def id_column_type(self) -> dt.DType:
+        return dt.ANY_POINTER
+
+
 @dataclass(eq=False, frozen=True)
 class RemoveErrorsContext(
     Context, column_properties_evaluator=cp.PreserveDependenciesPropsEvaluator
@@ -1,5 +1,6 @@
 # Copyright © 2024 Pathway
 
+import itertools
 import pickle
 from abc import ABC, abstractmethod
 from collections import Counter
@@ -196,19 +197,29 @@ def udf_reducer(reducer_cls: type[BaseCustomAccumulator]):
     retract_available = _is_overridden(reducer_cls, "retract")
 
     def wrapper(*args: expr.ColumnExpression | api.Value) -> ColumnExpression:
+        # Accumulators are kept alive between calls and only a small handle
+        # (plus the current result) is stored in the engine state. The engine calls
+        # the combine function with the most recent state of a group only, so it is
+        # safe to update the accumulator in place.
+        live_accumulators: dict[int, _LiveAccumulator] = {}
+        tokens = itertools.count()
+
         @stateful_many
         def stateful_wrapper(
-            packed_state: tuple[api.Value, tuple, int] | None,
+            packed_state: tuple[int, api.Value] | None,
             rows: list[tuple[list[api.Value], int]],
-        ) -> tuple[api.Value, tuple, int] | None:
+        ) -> tuple[int, api.Value] | None:
             if packed_state is not None:
-                serialized_state, _positive_updates_tuple, _cnt = packed_state
-                state = reducer_cls.deserialize(serialized_state)
-                _positive_updates = list(_positive_updates_tuple)
+                token, _result = packed_state
+                live = live_accumulators[token]
             else:
-                state = None
+                token = next(tokens)
+                live = _LiveAccumulator(
+                    state=None, positive_updates=None if retract_available else []
+                )
+
             positive_updates: list[tuple[api.Value, ...]] = []
-            negative_updates = []
+            negative_updates: list[tuple[api.Value, ...]] = []
             for row, count in rows:
                 if count > 0:
                     positive_updates.extend([tuple(row)] * count)
@@ -216,70 +227,61 @@ def udf_reducer(reducer_cls: type[BaseCustomAccumulator]):
                     negative_updates.extend([tuple(row)] * (-count))
 
             if not retract_available and len(negative_updates) > 0:
-                if state is not None:
-                    assert _positive_updates is not None
-                    positive_updates.extend(_positive_updates)
-                    _positive_updates = []
-                    state = None
-                acc = Counter(positive_updates)
+                assert live.positive_updates is not None
+                acc = Counter(live.positive_updates)
+                acc.update(positive_updates)
                 acc.subtract(negative_updates)
                 assert all(x >= 0 for x in acc.values())
                 positive_updates = list(acc.elements())
                 negative_updates = []
-
-            if state is None:
+                # the accumulator is rebuilt aside, the stored one stays valid on errors
+                live = _LiveAccumulator(state=None, positive_updates=[])
+
+            # the rows are converted before the accumulator is modified, so that an error
+            # in `from_row` leaves the accumulator of the group unchanged
+            positive_accumulators = [
+                reducer_cls.from_row(list(row)) for row in positive_updates
+            ]
+            negative_accumulators = [
+                reducer_cls.from_row(list(row)) for row in negative_updates
+            ]
+
+            if live.state is None:
                 if neutral_available:
-                    state = reducer_cls.neutral()
-                    _positive_updates = []
-                    _cnt = 0
+                    live.state = reducer_cls.neutral()
                 elif len(positive_updates) == 0:
                     if len(negative_updates) == 0:
+                        live_accumulators.pop(token, None)
                         return None
                     else:
                         raise ValueError(
                             "Unable to process negative update with this custom reducer."
                         )
                 else:
-                    state = reducer_cls.from_row(list(positive_updates[0]))
-                    if not retract_available:
-                        _positive_updates = positive_updates[0:1]
-                        _cnt = 0
-                    else:
-                        _positive_updates = []
-                        _cnt = 1
-                    positive_updates = positive_updates[1:]
+                    live.state = positive_accumulators.pop(0)
+                    live.record(positive_updates.pop(0))
 
-            for row_up in positive_updates:
-                if not retract_available:
-                    _positive_updates.append(row_up)
-                else:
-                    _cnt += 1
-                val = reducer_cls.from_row(list(row_up))
-                state.update(val)
-
-            for row_up in negative_updates:
-                if not retract_available:
-                    raise ValueError(
-                        "Unable to process negative update with this custom reducer."
-                    )
-                else:
-                    _cnt -= 1
-                val = reducer_cls.from_row(list(row_up))
-                state.retract(val)
+            for row_up, acc_up in zip(positive_updates, positive_accumulators):
+                live.record(row_up)
+                live.state.update(acc_up)
+
+            for acc_up in negative_accumulators:
+                live.cnt -= 1
+                live.state.retract(acc_up)
 
-            _positive_updates_tuple = tuple(tuple(x) for x in _positive_updates)
-            if retract_available and _cnt == 0:
+            if retract_available and live.cnt == 0:
                 # this is fine in this setting, where we process values one by one
                 # if this ever becomes accumulated in a tree, we have to handle
                 # (A-B) updates, so we have to distinguish `0` from intermediate states
                 # accumulating weighted count (weighted by hash) should do fine here
+                live_accumulators.pop(token, None)
                 return None
-            return state.serialize(), _positive_updates_tuple, _cnt
+
+            live_accumulators[token] = live
+            return token, live.state.compute_result()
 
         def extractor(packed: tuple):
-            deserialized = reducer_cls.deserialize(packed[0])
-            assert isinstance(deserialized, reducer_cls)
-            return deserialized.compute_result()
+            return packed[1]
 
         return apply_with_type(
             extractor,
@@ -290,6 +292,28 @@ def udf_reducer(reducer_cls: type[BaseCustomAccumulator]):
     return wrapper
 
 
+class _LiveAccumulator:
+    """Per-group state of a ``udf_reducer``.
+
+    ``positive_updates`` keeps the rows seen so far and is only maintained when
+    the accumulator does not implement ``retract``.
+    """
+
+    def __init__(
+        self,
+        state: BaseCustomAccumulator | None,
+        positive_updates: list[tuple[api.Value, ...]] | None,
+    ):
+        self.state = state
+        self.positive_updates = positive_updates
+        self.cnt = 0
+
+    def record(self, row: tuple[api.Value, ...]) -> None:
+        self.cnt += 1
+        if self.positive_updates is not None:
+            self.positive_updates.append(row)
+
+
 def _is_overridden(cls: type[BaseCustomAccumulator], name: str) -> bool:
     assert hasattr(BaseCustomAccumulator, name)
     return not hasattr(getattr(cls, name), "__pw_stub")
@@ -805,6 +805,42 @@ class AsyncApplyExpression(ApplyExpression):
     pass
 
 
+class BatchApplyExpression(ApplyExpression):
+    _max_batch_size: int | None
+
+    def __init__(
+        self,
+        fun: Callable,
+        return_type: Any,
+        propagate_none: bool,
+        deterministic: bool,
+        args: tuple[ColumnExpression | Value, ...],
+        kwargs: Mapping[str, ColumnExpression | Value],
+        max_batch_size: int | None = None,
+    ):
+        super().__init__(
+            fun,
+            return_type,
+            propagate_none=propagate_none,
+            deterministic=deterministic,
+            args=args,
+            kwargs=kwargs,
+        )
+        self._max_batch_size = max_batch_size
+
+    def _to_internal(self) -> InternalColExpr:
+        return InternalColExpr.build(
+            type(self),
+            self._fun,
+            self._return_type,
+            self._propagate_none,
+            self._deterministic,
+            self._max_batch_size,
+            *self._args,
+            **self._kwargs,
+        )
+
+
 class CastExpression(ColumnExpression):
     _return_type: dt.DType
     _expr: ColumnExpression
@@ -72,6 +72,10 @@ class ExpressionFormatter(ExpressionVisitor):
         args = self._eval_args_kwargs(expression._args, expression._kwargs)
         return f"pathway.apply_async({expression._fun.__name__}, {args})"
 
+    def eval_batch_apply(self, expression: expr.BatchApplyExpression):
+        args = self._eval_args_kwargs(expression._args, expression._kwargs)
+        return f"pathway.apply_batch({expression._fun.__name__}, {args})"
+
     def eval_numbaapply(self, expression: expr.NumbaApplyExpression):
         args = self._eval_args_kwargs(expression._args, expression._kwargs)
         return f"pathway.numba_apply({expression._fun.__name__}, {args})"
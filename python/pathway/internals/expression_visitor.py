@@ -32,6 +32,7 @@ class ExpressionVisitor(ABC):
             expr.IfElseExpression: self.eval_ifelse,
             expr.NumbaApplyExpression: self.eval_numbaapply,
             expr.AsyncApplyExpression: self.eval_async_apply,
+            expr.BatchApplyExpression: self.eval_batch_apply,
             expr.MakeTupleExpression: self.eval_make_tuple,
             expr.GetExpression: self.eval_get,
             expr.MethodCallExpression: self.eval_method_call,
@@ -71,6 +72,9 @@ class ExpressionVisitor(ABC):
     @abstractmethod
     def eval_async_apply(self, expression: expr.AsyncApplyExpression): ...
 
+    @abstractmethod
+    def eval_batch_apply(self, expression: expr.BatchApplyExpression): ...
+
     @abstractmethod
     def eval_pointer(self, expression: expr.PointerExpression): ...
 
@@ -222,6 +226,24 @@ class IdentityTransform(ExpressionVisitor):
             kwargs=expr_kwargs,
         )
 
+    def eval_batch_apply(
+        self, expression: expr.BatchApplyExpression, **kwargs
+    ) -> expr.BatchApplyExpression:
+        expr_args = [self.eval_expression(arg, **kwargs) for arg in expression._args]
+        expr_kwargs = {
+            name: self.eval_expression(arg, **kwargs)
+            for name, arg in expression._kwargs.items()
+        }
+        return expr.BatchApplyExpression(
+            expression._fun,
+            expression._return_type,
+            propagate_none=expression._propagate_none,
+            deterministic=expression._deterministic,
+            args=tuple(expr_args),
+            kwargs=expr_kwargs,
+            max_batch_size=expression._max_batch_size,
+        )
+
     def eval_pointer(
         self, expression: expr.PointerExpression, **kwargs
     ) -> expr.PointerExpression:
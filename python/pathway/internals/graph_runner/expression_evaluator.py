@@ -456,6 +456,40 @@ class RowwiseEvaluator(
         eval_state.set_temporary_table(output_storage, engine_table)
         return self.eval_dependency(tmp_column, eval_state=eval_state)
 
+    def eval_batch_apply(
+        self,
+        expression: expr.BatchApplyExpression,
+        eval_state: RowwiseEvalState | None = None,
+    ):
+        fun, args = self._prepare_positional_apply(
+            fun=expression._fun,
+            args=expression._args,
+            kwargs=expression._kwargs,
+        )
+
+        def batch_fun(*columns: list[api.Value]) -> list[api.Value]:
+            return list(fun(*columns))
+
+        columns, input_storage, engine_input_table = self.run_subexpressions(args)
+        tmp_column = clmn.MaterializedColumn(
+            self.context.universe, ColumnProperties(dtype=expression._dtype)
+        )
+        output_storage = Storage.flat(self.context.universe, [tmp_column])
+        paths = [input_storage.get_path(column) for column in columns]
+        engine_table = self.scope.batch_apply_table(
+            engine_input_table,
+            paths,
+            batch_fun,
+            expression._propagate_none,
+            expression._deterministic,
+            self._table_properties(output_storage),
+            expression._max_batch_size,
+        )
+
+        assert eval_state is not None
+        eval_state.set_temporary_table(output_storage, engine_table)
+        return self.eval_dependency(tmp_column, eval_state=eval_state)
+
     def eval_numbaapply(
         self,
         expression: expr.NumbaApplyExpression,
@@ -872,6 +906,50 @@ class ExternalIndexAsOfNowEvaluator(
         )
 
 
+class PrefixSumUpperboundEvaluator(
+    ExpressionEvaluator, context_type=clmn.PrefixSumUpperboundContext
+):
+    context: clmn.PrefixSumUpperboundContext
+
+    def run(self, output_storage: Storage) -> api.Table:
+        index_storage = self.state.get_storage(self.context.index_universe())
+        queries_storage = self.state.get_storage(self.context.query_universe())
+        properties = self._table_properties(output_storage)
+        return self.scope.prefix_sum_upperbound_table(
+            self.state.get_table(self.context.index_universe()),
+            index_storage.get_path(self.context.key_column),
+            index_storage.get_path(self.context.instance_column),
+            index_storage.get_path(self.context.weight_column),
+            self.state.get_table(self.context.query_universe()),
+            queries_storage.get_path(self.context.query_instance_column),
+            queries_storage.get_path(self.context.threshold_column),
+            properties,
+        )
+
+
+class GraphAlgorithmEvaluator(
+    ExpressionEvaluator, context_type=clmn.GraphAlgorithmContext
+):
+    context: clmn.GraphAlgorithmContext
+
+    def run(self, output_storage: Storage) -> api.Table:
+        vertices_storage = self.state.get_storage(self.context.vertices_universe())
+        edges_storage = self.state.get_storage(self.context.edges_universe())
+        properties = self._table_properties(output_storage)
+        return self.scope.graph_algorithm_table(
+            self.state.get_table(self.context.vertices_universe()),
+            vertices_storage.get_path(self.context.vertex_instance_column),
+            vertices_storage.get_path(self.context.is_source_column),
+            self.state.get_table(self.context.edges_universe()),
+            edges_storage.get_path(self.context.source_column),
+            edges_storage.get_path(self.context.target_column),
+            edges_storage.get_path(self.context.weight_column),
+            edges_storage.get_path(self.context.edge_instance_column),
+            self.context.algorithm,
+            properties,
+        )
+
+
 class ForgetImmediatelyEvaluator(
     ExpressionEvaluator, context_type=clmn.ForgetImmediatelyContext
 ):
@@ -1324,6 +1402,65 @@ class SortingEvaluator(ExpressionEvaluator, context_type=clmn.SortingContext):
         )
 
 
+class SessionWindowsEvaluator(
+    ExpressionEvaluator, context_type=clmn.SessionWindowsContext
+):
+    context: clmn.SessionWindowsContext
+
+    def run(self, output_storage: Storage) -> api.Table:
+        input_storage = self.state.get_storage(self.context.universe)
+        key_column_path = input_storage.get_path(self.context.key_column)
+        instance_column_path = input_storage.get_path(self.context.instance_column)
+        properties = self._table_properties(output_storage)
+        return self.scope.session_windows_table(
+            self.state.get_table(input_storage._universe),
+            key_column_path,
+            instance_column_path,
+            self.context.max_gap,
+            self.context.predicate,
+            properties,
+        )
+
+
+class IntervalJoinEvaluator(ExpressionEvaluator, context_type=clmn.IntervalJoinContext):
+    context: clmn.IntervalJoinContext
+
+    def run(self, output_storage: Storage) -> api.Table:
+        left_storage = self.state.get_storage(self.context.left_universe())
+        right_storage = self.state.get_storage(self.context.right_universe())
+        properties = self._table_properties(output_storage)
+        return self.scope.interval_join_table(
+            self.state.get_table(self.context.left_universe()),
+            self.state.get_table(self.context.right_universe()),
+            left_storage.get_path(self.context.left_time_column),
+            right_storage.get_path(self.context.right_time_column),
+            left_storage.get_path(self.context.left_instance_column),
+            right_storage.get_path(self.context.right_instance_column),
+            self.context.lower_bound,
+            self.context.upper_bound,
+            properties,
+        )
+
+
+class AsofJoinEvaluator(ExpressionEvaluator, context_type=clmn.AsofJoinContext):
+    context: clmn.AsofJoinContext
+
+    def run(self, output_storage: Storage) -> api.Table:
+        input_storage = self.state.get_storage(self.context.universe)
+        properties = self._table_properties(output_storage)
+        return self.scope.asof_join_table(
+            self.state.get_table(input_storage._universe),
+            input_storage.get_path(self.context.time_column),
+            input_storage.get_path(self.context.side_column),
+            input_storage.get_path(self.context.instance_column),
+            self.context.direction,
+            self.context.right_first,
+            self.context.match_left,
+            self.context.match_right,
+            properties,
+        )
+
+
 class SetSchemaContextEvaluator(
     ExpressionEvaluator, context_type=clmn.SetSchemaContext
 ):
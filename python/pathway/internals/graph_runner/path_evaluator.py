@@ -93,8 +93,11 @@ class AddNewColumnsPathEvaluator(
         clmn.RowwiseContext,
         clmn.JoinRowwiseContext,
         clmn.SortingContext,
+        clmn.AsofJoinContext,
         clmn.GradualBroadcastContext,
         clmn.ExternalIndexAsOfNowContext,
+        clmn.PrefixSumUpperboundContext,
+        clmn.GraphAlgorithmContext,
     ],
 ):
     def compute_if_all_new_are_references(
@@ -155,6 +158,53 @@ class AddNewColumnsPathEvaluator(
         return Storage(self.context.universe, paths)
 
 
+class SessionWindowsPathEvaluator(
+    PathEvaluator,
+    context_types=[clmn.SessionWindowsContext],
+):
+    context: clmn.SessionWindowsContext
+
+    def compute(
+        self,
+        output_columns: Iterable[clmn.Column],
+        input_storages: dict[Universe, Storage],
+    ) -> Storage:
+        # the engine always returns all three session columns after the input values
+        input_storage = input_storages.get(self.context.universe)
+        new_columns = [
+            self.context.window_column,
+            self.context.start_column,
+            self.context.end_column,
+        ]
+        paths = {}
+        for column in output_columns:
+            if column in new_columns:
+                paths[column] = ColumnPath((new_columns.index(column) + 1,))
+            else:
+                assert input_storage is not None
+                paths[column] = (0,) + input_storage.get_path(column)
+        return Storage(self.context.universe, paths)
+
+
+class IntervalJoinPathEvaluator(
+    PathEvaluator,
+    context_types=[clmn.IntervalJoinContext],
+):
+    context: clmn.IntervalJoinContext
+
+    def compute(
+        self,
+        output_columns: Iterable[clmn.Column],
+        input_storages: dict[Universe, Storage],
+    ) -> Storage:
+        new_columns = [self.context.left_id_column, self.context.right_id_column]
+        paths = {
+            column: ColumnPath((new_columns.index(column),))
+            for column in output_columns
+        }
+        return Storage(self.context.universe, paths)
+
+
 class NoNewColumnsMultipleSourcesPathEvaluator(
     PathEvaluator,
     context_types=[clmn.UpdateRowsContext, clmn.ConcatUnsafeContext],
@@ -192,6 +192,10 @@ class GroupedTable(GroupedJoinable, OperatorInput):
                 expression, eval_state=state
             )
 
+        reduced = self._reduce_split_expressions(state)
+        return reduced.select(**output_expressions)
+
+    def _reduce_split_expressions(self, state: _ReducerExpressionState) -> table.Table:
         prepared = self._joinable_to_group.select(**state.below_reducer_expressions)
         desugaring = ThisDesugaring({thisclass.this: prepared})
         desugared_reducers = {
@@ -201,7 +205,7 @@ class GroupedTable(GroupedJoinable, OperatorInput):
         reduced = self._reduce(**desugared_reducers)
         if self._filter_out_results_of_forgetting:
             reduced = reduced._filter_out_results_of_forgetting()
-        return reduced.select(**output_expressions)
+        return reduced
 
     def _maybe_warn(self, expression: expr.ColumnExpression) -> None:
         if self._is_window and isinstance(expression, expr.ReducerExpression):
@@ -105,6 +105,29 @@ class MonitoringOutput:
             )
         return table
 
+    def get_caches_table(self) -> Table | None:
+        from pathway.internals.udfs.caches import get_cache_stats
+
+        cache_stats = get_cache_stats()
+        if not cache_stats:
+            return None
+        table = Table(box=box.SIMPLE)
+        table.add_column("cache", justify="left")
+        table.add_column("memory hits", justify="right")
+        table.add_column("disk hits", justify="right")
+        table.add_column("misses", justify="right")
+        table.add_column("evictions from memory", justify="right")
+
+        for name, stats in cache_stats.items():
+            table.add_row(
+                name,
+                f"{stats.memory_hits}",
+                f"{stats.disk_hits}",
+                f"{stats.misses}",
+                f"{stats.evictions}",
+            )
+        return table
+
     def get_operators_table(self, max_height) -> Table:
         if len(self.node_names) == 0:
             caption = (
@@ -153,7 +176,14 @@ class MonitoringOutput:
     ) -> RenderResult:
         layout = Layout(name="monitoring_inner")
         layout.split_row(Layout(name="connectors"), Layout(name="operators"))
-        layout["connectors"].update(Align.center(self.get_connectors_table()))
+        caches_table = self.get_caches_table()
+        if caches_table is None:
+            layout["connectors"].update(Align.center(self.get_connectors_table()))
+        else:
+            layout["connectors"].split_column(
+                Layout(Align.center(self.get_connectors_table())),
+                Layout(Align.center(caches_table)),
+            )
         layout["operators"].update(
             Align.center(self.get_operators_table(options.max_height - 2))
         )
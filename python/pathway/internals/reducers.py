@@ -176,6 +176,75 @@ class TupleWrappingReducer(Reducer):
             return ()
 
 
+class ApproxCountDistinctReducer(UnaryReducerWithDefault):
+    def return_type_unary(self, arg_type: dt.DType, id_type: dt.DType) -> dt.DType:
+        return dt.INT
+
+
+class ApproxQuantileReducer(UnaryReducerWithDefault):
+    def return_type_unary(self, arg_type: dt.DType, id_type: dt.DType) -> dt.DType:
+        if not dt.dtype_issubclass(arg_type, dt.Optional(dt.FLOAT)):
+            raise TypeError(
+                f"Pathway does not support using reducer {self}"
+                + f" on column of type {arg_type}.\n"
+            )
+        if isinstance(arg_type, dt.Optional):
+            return dt.Optional(dt.FLOAT)
+        return dt.FLOAT
+
+
+class TopKReducer(UnaryReducerWithDefault):
+    def return_type_unary(self, arg_type: dt.DType, id_type: dt.DType) -> dt.DType:
+        return dt.List(dt.Tuple(arg_type, dt.INT))
+
+
+def _check_numeric_arg_type(reducer: Reducer, arg_type: dt.DType) -> None:
+    if not dt.dtype_issubclass(arg_type, dt.FLOAT):
+        raise TypeError(
+            f"Pathway does not support using reducer {reducer}"
+            + f" on column of type {arg_type}.\n"
+        )
+
+
+class MomentsReducer(Reducer):
+    _ddof: int
+
+    def __init__(self, *, name: str, ddof: int = 0):
+        super().__init__(name=name)
+        self._ddof = ddof
+
+    def return_type(self, arg_types: list[dt.DType], id_type: dt.DType) -> dt.DType:
+        for arg_type in arg_types:
+            _check_numeric_arg_type(self, arg_type)
+        if self._ddof > 0:
+            return dt.Optional(dt.FLOAT)
+        return dt.FLOAT
+
+
+class VarianceReducer(MomentsReducer):
+    def engine_reducer(self, arg_types: list[dt.DType]) -> api.Reducer:
+        return api.Reducer.variance(self._ddof)
+
+
+class StddevReducer(MomentsReducer):
+    def engine_reducer(self, arg_types: list[dt.DType]) -> api.Reducer:
+        return api.Reducer.stddev(self._ddof)
+
+
+class CovarianceReducer(MomentsReducer):
+    def engine_reducer(self, arg_types: list[dt.DType]) -> api.Reducer:
+        return api.Reducer.covariance(self._ddof)
+
+
+class CorrelationReducer(MomentsReducer):
+    def return_type(self, arg_types: list[dt.DType], id_type: dt.DType) -> dt.DType:
+        super().return_type(arg_types, id_type)
+        return dt.Optional(dt.FLOAT)
+
+    def engine_reducer(self, arg_types: list[dt.DType]) -> api.Reducer:
+        return api.Reducer.CORRELATION
+
+
 class StatefulManyReducer(Reducer):
     name = "stateful_many"
     combine_many: api.CombineMany
@@ -223,8 +292,29 @@ _latest = TimeBasedTypePreservingUnaryReducer(
 )
 
 
+_corr = CorrelationReducer(name="corr")
+
+
+def _approx_count_distinct(precision: int):
+    return ApproxCountDistinctReducer(
+        name="approx_count_distinct",
+        engine_reducer=api.Reducer.approx_count_distinct(precision),
+    )
+
+
+def _approx_quantile(quantile: float, relative_accuracy: float):
+    return ApproxQuantileReducer(
+        name="approx_quantile",
+        engine_reducer=api.Reducer.approx_quantile(quantile, relative_accuracy),
+    )
+
+
+def _top_k(k: int):
+    return TopKReducer(name="top_k", engine_reducer=api.Reducer.top_k(k))
+
+
 def _apply_unary_reducer(
-    reducer: UnaryReducer, arg: expr.ColumnExpression, **kwargs
+    reducer: Reducer, arg: expr.ColumnExpression, **kwargs
 ) -> expr.ReducerExpression:
     return expr.ReducerExpression(reducer, arg, **kwargs)
 
@@ -569,6 +659,131 @@ def avg(expression: expr.ColumnExpression) -> expr.ColumnExpression:
     return sum(expression) / count()
 
 
+def var(expression: expr.ColumnExpression, *, ddof: int = 0) -> expr.ColumnExpression:
+    """
+    Returns the variance of the aggregated values. The divisor used in the computation
+    is ``N - ddof``, where ``N`` is the number of aggregated values. If ``ddof`` is
+    positive, the result is ``None`` for groups with at most ``ddof`` values.
+
+    The variance is maintained incrementally with a numerically stable method, also
+    when values are deleted.
+
+    Example:
+
+    >>> import pathway as pw
+    >>> t = pw.debug.table_from_markdown('''
+    ... colA | colB
+    ... valA |  1
+    ... valA |  3
+    ... valB |  4
+    ... valB |  4
+    ... valB |  7
+    ... ''')
+    >>> result = t.groupby(t.colA).reduce(var=pw.reducers.var(t.colB))
+    >>> pw.debug.compute_and_print(result, include_id=False)
+    var
+    1.0
+    2.0
+    """
+    if ddof < 0:
+        raise ValueError("ddof has to be a non-negative integer.")
+    return _apply_unary_reducer(
+        VarianceReducer(name="var", ddof=ddof), expression, ddof=ddof
+    )
+
+
+def stddev(
+    expression: expr.ColumnExpression, *, ddof: int = 0
+) -> expr.ColumnExpression:
+    """
+    Returns the standard deviation of the aggregated values. The divisor used in
+    the computation of the variance is ``N - ddof``, where ``N`` is the number
+    of aggregated values. If ``ddof`` is positive, the result is ``None`` for groups
+    with at most ``ddof`` values.
+
+    Example:
+
+    >>> import pathway as pw
+    >>> t = pw.debug.table_from_markdown('''
+    ... colA | colB
+    ... valA |  1
+    ... valA |  3
+    ... valB |  4
+    ... valB |  4
+    ... valB |  7
+    ... ''')
+    >>> result = t.groupby(t.colA).reduce(stddev=pw.reducers.stddev(t.colB))
+    >>> pw.debug.compute_and_print(result, include_id=False)
+    stddev
+    1.0
+    1.4142135623730951
+    """
+    if ddof < 0:
+        raise ValueError("ddof has to be a non-negative integer.")
+    return _apply_unary_reducer(
+        StddevReducer(name="stddev", ddof=ddof), expression, ddof=ddof
+    )
+
+
+def cov(
+    x: expr.ColumnExpression, y: expr.ColumnExpression, *, ddof: int = 0
+) -> expr.ColumnExpression:
+    """
+    Returns the covariance of two aggregated columns. The divisor used in
+    the computation is ``N - ddof``, where ``N`` is the number of aggregated rows.
+    If ``ddof`` is positive, the result is ``None`` for groups with at most ``ddof`` rows.
+
+    Example:
+
+    >>> import pathway as pw
+    >>> t = pw.debug.table_from_markdown('''
+    ... colA | x | y
+    ... valA | 1 | 1
+    ... valA | 2 | 3
+    ... valA | 3 | 2
+    ... valB | 1 | 2
+    ... valB | 2 | 4
+    ... valB | 3 | 6
+    ... ''')
+    >>> result = t.groupby(t.colA).reduce(cov=pw.reducers.cov(t.x, t.y))
+    >>> pw.debug.compute_and_print(result, include_id=False)
+    cov
+    0.3333333333333333
+    1.3333333333333333
+    """
+    if ddof < 0:
+        raise ValueError("ddof has to be a non-negative integer.")
+    return expr.ReducerExpression(
+        CovarianceReducer(name="cov", ddof=ddof), x, y, ddof=ddof
+    )
+
+
+def corr(x: expr.ColumnExpression, y: expr.ColumnExpression) -> expr.ColumnExpression:
+    """
+    Returns the Pearson correlation coefficient of two aggregated columns.
+    The result is ``None`` if any of the columns is constant within a group.
+
+    Example:
+
+    >>> import pathway as pw
+    >>> t = pw.debug.table_from_markdown('''
+    ... colA | x | y
+    ... valA | 1 | 1
+    ... valA | 2 | 3
+    ... valA | 3 | 2
+    ... valB | 1 | 2
+    ... valB | 2 | 4
+    ... valB | 3 | 6
+    ... ''')
+    >>> result = t.groupby(t.colA).reduce(corr=pw.reducers.corr(t.x, t.y))
+    >>> pw.debug.compute_and_print(result, include_id=False)
+    corr
+    0.5
+    1.0
+    """
+    return expr.ReducerExpression(_corr, x, y)
+
+
 def int_sum(expression: expr.ColumnExpression):
     warn(
         "Reducer pathway.reducers.int_sum is deprecated, use pathway.reducers.sum instead."
@@ -681,3 +896,128 @@ def latest(expression: expr.ColumnExpression) -> expr.ColumnExpression:
     2 | 2
     """
     return _apply_unary_reducer(_latest, expression)
+
+
+def approx_count_distinct(
+    arg: expr.ColumnExpression, *, precision: int = 12
+) -> expr.ReducerExpression:
+    """
+    Returns an estimate of the number of distinct aggregated values, computed with
+    a HyperLogLog sketch. The state kept for each group has a bounded size regardless
+    of the number of aggregated values and handles deletions of values.
+
+    Args:
+        arg: Column expression to aggregate.
+        precision: Number of bits used to select a register of the sketch, between
+            4 and 16. The sketch uses ``2 ** precision`` registers and its relative
+            standard error is about ``1.04 / sqrt(2 ** precision)``. Defaults to 12.
+
+    Example:
+
+    >>> import pathway as pw
+    >>> t = pw.debug.table_from_markdown('''
+    ... colA | colB
+    ... valA | -1
+    ... valA |  1
+    ... valA | -1
+    ... valB |  4
+    ... valB |  4
+    ... valB |  4
+    ... ''')
+    >>> result = t.groupby(t.colA).reduce(
+    ...     t.colA, distinct=pw.reducers.approx_count_distinct(t.colB)
+    ... )
+    >>> pw.debug.compute_and_print(result, include_id=False)
+    colA | distinct
+    valA | 2
+    valB | 1
+    """
+    if not 4 <= precision <= 16:
+        raise ValueError("precision has to be between 4 and 16.")
+    return _apply_unary_reducer(
+        _approx_count_distinct(precision), arg, precision=precision
+    )
+
+
+def approx_quantile(
+    arg: expr.ColumnExpression, q: float, *, relative_accuracy: float = 0.01
+) -> expr.ReducerExpression:
+    """
+    Returns an estimate of the ``q``-quantile of the aggregated numeric values,
+    computed with a DDSketch. The returned value differs from some value of rank close
+    to ``q`` by at most ``relative_accuracy`` of its magnitude. The state kept for each
+    group depends only on the range of the values, not on their number, and handles
+    deletions of values. ``None`` values are skipped.
+
+    Args:
+        arg: Column expression to aggregate. Has to be of type ``int`` or ``float``.
+        q: Quantile to compute, between 0 and 1.
+        relative_accuracy: Relative accuracy of the sketch. Defaults to 0.01.
+
+    Example:
+
+    >>> import pathway as pw
+    >>> t = pw.debug.table_from_markdown('''
+    ... colA | colB
+    ... valA | 10
+    ... valA | 20
+    ... valA | 30
+    ... valB | 1
+    ... valB | 2
+    ... valB | 3
+    ... ''')
+    >>> result = t.groupby(t.colA).reduce(
+    ...     t.colA, median=pw.reducers.approx_quantile(t.colB, 0.5)
+    ... )
+    >>> result = result.select(pw.this.colA, median=pw.apply(round, pw.this.median))
+    >>> pw.debug.compute_and_print(result, include_id=False)
+    colA | median
+    valA | 20
+    valB | 2
+    """
+    if not 0.0 <= q <= 1.0:
+        raise ValueError("q has to be between 0 and 1.")
+    if not 0.0 < relative_accuracy < 1.0:
+        raise ValueError("relative_accuracy has to be between 0 and 1.")
+    return _apply_unary_reducer(
+        _approx_quantile(q, relative_accuracy),
+        arg,
+        q=q,
+        relative_accuracy=relative_accuracy,
+    )
+
+
+def top_k(arg: expr.ColumnExpression, k: int) -> expr.ReducerExpression:
+    """
+    Returns a tuple of at most ``k`` most frequent aggregated values, each paired with
+    its number of occurrences, ordered by decreasing number of occurrences. Ties are
+    broken by the values.
+
+    The result is exact. The counts of all distinct values of a group are kept, so the
+    memory used grows with the number of distinct values, and every update of a group
+    takes time linear in the number of its distinct values.
+
+    Args:
+        arg: Column expression to aggregate.
+        k: Number of values to return.
+
+    Example:
+
+    >>> import pathway as pw
+    >>> t = pw.debug.table_from_markdown('''
+    ... colA | colB
+    ... valA | a
+    ... valA | b
+    ... valA | a
+    ... valA | c
+    ... valA | b
+    ... valA | a
+    ... ''')
+    >>> result = t.groupby(t.colA).reduce(top=pw.reducers.top_k(t.colB, 2))
+    >>> pw.debug.compute_and_print(result, include_id=False)
+    top
+    (('a', 3), ('b', 2))
+    """
+    if k <= 0:
+        raise ValueError("k has to be a positive integer.")
+    return _apply_unary_reducer(_top_k(k), arg, k=k)
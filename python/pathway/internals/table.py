@@ -622,6 +622,82 @@ id_type=<class 'pathway.engine.Pointer'>>
             _columns={"_pw_index_reply": context.index_reply}, _context=context
         )
 
+    @trace_user_frame
+    @desugar
+    @check_arg_types
+    @contextualized_operator
+    def _prefix_sum_upperbound(
+        self,
+        query_table: Table,
+        *,
+        key: expr.ColumnExpression,
+        weight: expr.ColumnExpression,
+        threshold: expr.ColumnExpression,
+        instance: expr.ColumnExpression | None = None,
+        query_instance: expr.ColumnExpression | None = None,
+    ) -> Table:
+        """For every row of ``query_table``, finds the first row of ``self`` with the same
+        instance, in the order of ``key``, such that the sum of float ``weight`` of rows
+        up to and including it exceeds the float ``threshold`` of the query. Returns
+        the ``_pw_upperbound`` column with the id of such row or ``None`` if there is none.
+        """
+        instance = clmn.ColumnExpression._wrap(instance)
+        query_instance = clmn.ColumnExpression._wrap(query_instance)
+        context = clmn.PrefixSumUpperboundContext(
+            _index_id_column=self._id_column,
+            _query_id_column=query_table._id_column,
+            index_table=self,
+            query_table=query_table,
+            key_column=self._eval(key),
+            instance_column=self._eval(instance),
+            weight_column=self._eval(weight),
+            query_instance_column=query_table._eval(query_instance),
+            threshold_column=query_table._eval(threshold),
+        )
+        return Table(
+            _columns={"_pw_upperbound": context.upperbound_column}, _context=context
+        )
+
+    @trace_user_frame
+    @desugar
+    @check_arg_types
+    @contextualized_operator
+    def _graph_algorithm(
+        self,
+        edges: Table,
+        *,
+        algorithm: api.GraphAlgorithm,
+        source: expr.ColumnExpression,
+        target: expr.ColumnExpression,
+        weight: expr.ColumnExpression | float = 0.0,
+        is_source: expr.ColumnExpression | bool = False,
+        instance: expr.ColumnExpression | None = None,
+        edge_instance: expr.ColumnExpression | None = None,
+        res_type: dt.DType = dt.FLOAT,
+    ) -> Table:
+        """Runs an incremental graph ``algorithm`` on the graph with vertices from ``self``
+        and edges from ``source`` to ``target`` with float ``weight`` from ``edges``,
+        separately for every instance. Returns the ``_pw_result`` column with the result
+        of the algorithm for every vertex.
+        """
+        context = clmn.GraphAlgorithmContext(
+            _vertices_id_column=self._id_column,
+            _edges_id_column=edges._id_column,
+            vertices_table=self,
+            edges_table=edges,
+            vertex_instance_column=self._eval(clmn.ColumnExpression._wrap(instance)),
+            is_source_column=self._eval(clmn.ColumnExpression._wrap(is_source)),
+            source_column=edges._eval(source),
+            target_column=edges._eval(target),
+            weight_column=edges._eval(clmn.ColumnExpression._wrap(weight)),
+            edge_instance_column=edges._eval(
+                clmn.ColumnExpression._wrap(edge_instance)
+            ),
+            algorithm=algorithm,
+            res_type=res_type,
+        )
+        return Table(_columns={"_pw_result": context.result_column}, _context=context)
+
     @trace_user_frame
     @desugar
     @check_arg_types
@@ -2175,6 +2251,116 @@ id_type=<class 'pathway.engine.Pointer'>>
             _context=context,
         )
 
+    @trace_user_frame
+    @desugar
+    @contextualized_operator
+    @check_arg_types
+    def _session_windows(
+        self,
+        key: expr.ColumnExpression,
+        instance: expr.ColumnExpression | None = None,
+        *,
+        max_gap: Any | None = None,
+        predicate: Callable[[Any, Any], bool] | None = None,
+    ) -> Table:
+        """Assigns rows to session windows, i.e. maximal runs of rows of the same instance,
+        ordered by ``key``, in which consecutive keys differ by less than ``max_gap``
+        (or satisfy ``predicate``). Returns ``_pw_window`` (id of the last row of a session),
+        ``_pw_window_start`` and ``_pw_window_end`` columns.
+        """
+        instance = clmn.ColumnExpression._wrap(instance)
+        context = clmn.SessionWindowsContext(
+            self._eval(key),
+            self._eval(instance),
+            max_gap,
+            predicate,
+            self._id_column.dtype,
+        )
+        return Table(
+            _columns={
+                "_pw_window": context.window_column,
+                "_pw_window_start": context.start_column,
+                "_pw_window_end": context.end_column,
+            },
+            _context=context,
+        )
+
+    @trace_user_frame
+    @desugar
+    @contextualized_operator
+    @check_arg_types
+    def _interval_join_pairs(
+        self,
+        other: Table,
+        self_time: expr.ColumnExpression,
+        other_time: expr.ColumnExpression,
+        self_instance: expr.ColumnExpression | None,
+        other_instance: expr.ColumnExpression | None,
+        *,
+        lower_bound: Any,
+        upper_bound: Any,
+    ) -> Table:
+        """Finds pairs of rows of ``self`` and ``other`` with equal instances such that
+        ``self_time + lower_bound <= other_time <= self_time + upper_bound``.
+        Returns ``_pw_left_id`` and ``_pw_right_id`` columns with ids of the matched rows.
+        """
+        self_instance = clmn.ColumnExpression._wrap(self_instance)
+        other_instance = clmn.ColumnExpression._wrap(other_instance)
+        context = clmn.IntervalJoinContext(
+            self,
+            other,
+            self._eval(self_time),
+            other._eval(other_time),
+            self._eval(self_instance),
+            other._eval(other_instance),
+            lower_bound,
+            upper_bound,
+        )
+        return Table(
+            _columns={
+                "_pw_left_id": context.left_id_column,
+                "_pw_right_id": context.right_id_column,
+            },
+            _context=context,
+        )
+
+    @trace_user_frame
+    @desugar
+    @contextualized_operator
+    @check_arg_types
+    def _asof_join_peers(
+        self,
+        time: expr.ColumnExpression,
+        side: expr.ColumnExpression,
+        instance: expr.ColumnExpression | None = None,
+        *,
+        direction: api.AsofJoinDirection,
+        right_first: bool,
+        match_left: bool,
+        match_right: bool,
+    ) -> Table:
+        """Matches rows of both sides of an as-of join, merged into one table and told apart
+        by the boolean ``side`` column, with the closest rows of the other side with the same
+        instance. Right rows precede left rows with equal ``time`` if ``right_first`` is set.
+        Returns the ``_pw_peer`` column with the id of the matched row, which is ``None``
+        for rows without a peer and for rows of sides that are not matched.
+        """
+        instance = clmn.ColumnExpression._wrap(instance)
+        context = clmn.AsofJoinContext(
+            self._eval(time),
+            self._eval(side),
+            self._eval(instance),
+            direction,
+            right_first,
+            match_left,
+            match_right,
+            self._id_column.dtype,
+        )
+        return Table(
+            _columns={"_pw_peer": context.peer_column},
+            _context=context,
+        )
+
     def _set_source(self, source: OutputHandle):
         self._source = source
         if not hasattr(self._id_column, "lineage"):
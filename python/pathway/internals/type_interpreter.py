@@ -267,6 +267,15 @@ class TypeInterpreter(IdentityTransform):
         expression = super().eval_async_apply(expression, state=state, **kwargs)
         return _wrap(expression, expression._return_type)
 
+    def eval_batch_apply(
+        self,
+        expression: expr.BatchApplyExpression,
+        state: TypeInterpreterState | None = None,
+        **kwargs,
+    ) -> expr.BatchApplyExpression:
+        expression = super().eval_batch_apply(expression, state=state, **kwargs)
+        return _wrap(expression, expression._return_type)
+
     def eval_call(
         self,
         expression: expr.ColumnCallExpression,
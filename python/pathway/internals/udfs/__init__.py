@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import abc
+import collections.abc
 import functools
+import typing
 from collections.abc import Callable
 from typing import Any, overload
 from warnings import warn
@@ -12,11 +14,13 @@ from pathway.internals import dtype as dt, expression as expr, udfs
 from pathway.internals.helpers import with_optional_kwargs
 from pathway.internals.runtime_type_check import check_arg_types
 from pathway.internals.shadows import inspect
+from pathway.internals.udfs.batching import with_batching
 from pathway.internals.udfs.caches import (
     CacheStrategy,
     DefaultCache,
     DiskCache,
     InMemoryCache,
+    TieredCache,
     with_cache_strategy,
 )
 from pathway.internals.udfs.executors import (
@@ -52,12 +56,14 @@ __all__ = [
     "DefaultCache",
     "DiskCache",
     "InMemoryCache",
+    "TieredCache",
     "AsyncRetryStrategy",
     "ExponentialBackoffRetryStrategy",
     "FixedDelayRetryStrategy",
     "NoRetryStrategy",
     "async_options",
     "coerce_async",
+    "with_batching",
     "with_cache_strategy",
     "with_capacity",
     "with_retry_strategy",
@@ -101,6 +107,19 @@ class UDF(abc.ABC):
     2.83
     41.57
     164.32
+    >>>
+    >>> class BatchedUDF(pw.UDF):
+    ...     def __init__(self) -> None:
+    ...         super().__init__(batch=True)
+    ...     def __wrapped__(self, a: list[int], b: list[int]) -> list[int]:
+    ...         return [x * y for x, y in zip(a, b)]
+    ...
+    >>> res = table.select(result=BatchedUDF()(table.a, table.b))
+    >>> pw.debug.compute_and_print(res, include_id=False)
+    result
+    2
+    12
+    30
     """
 
     __wrapped__: Callable
@@ -110,6 +129,8 @@ class UDF(abc.ABC):
     propagate_none: bool
     executor: Executor
     cache_strategy: CacheStrategy | None
+    batch: bool
+    max_batch_size: int | None
 
     def __init__(
         self,
@@ -119,6 +140,8 @@ class UDF(abc.ABC):
         propagate_none: bool = False,
         executor: Executor = AutoExecutor(),
         cache_strategy: CacheStrategy | None = None,
+        batch: bool = False,
+        max_batch_size: int | None = None,
     ) -> None:
         """
         Args:
@@ -142,12 +165,25 @@ class UDF(abc.ABC):
                 then it is executed asynchronously. Otherwise it is executed synchronously.
             cache_strategy: Defines the caching mechanism.
                 Defaults to None.
+            batch: If True, the function is called once for a whole batch of rows
+                instead of once per row. Each argument is then a list of values (one
+                per row) and the function has to return a list of results of the same
+                length. A batch consists of the rows that the engine processes
+                together, so the rows with the same processing time can be split
+                across several calls.
+                Defaults to False.
+            max_batch_size: Maximum number of rows passed to a single call of
+                a batched function. Only used if ``batch`` is True.
+                Defaults to None, meaning that the batches are not split further.
         """
         self.return_type = return_type
         self.deterministic = deterministic
         self.propagate_none = propagate_none
+        self.batch = batch
+        self.max_batch_size = max_batch_size
         self.executor = self._prepare_executor(executor)
         self.cache_strategy = cache_strategy
+        self._validate_batch_options()
         self.func = self._wrap_function()
 
     def _get_config(self) -> dict[str, Any]:
@@ -157,8 +193,24 @@ class UDF(abc.ABC):
             "propagate_none": self.propagate_none,
             "executor": self.executor,
             "cache_strategy": self.cache_strategy,
+            "batch": self.batch,
+            "max_batch_size": self.max_batch_size,
         }
 
+    def _validate_batch_options(self) -> None:
+        if self.max_batch_size is not None:
+            if not self.batch:
+                raise ValueError("max_batch_size can only be set if batch is True.")
+            if self.max_batch_size <= 0:
+                raise ValueError("max_batch_size has to be a positive integer.")
+        if self.batch:
+            if not isinstance(self.executor, SyncExecutor):
+                raise ValueError(
+                    "Batched UDFs can only be executed with the synchronous executor."
+                )
+            if self.cache_strategy is not None:
+                raise ValueError("Batched UDFs don't support cache strategies.")
+
     def _get_return_type(self) -> Any:
         return_type = self.return_type
         if inspect.isclass(self.__wrapped__):
@@ -168,6 +220,8 @@ class UDF(abc.ABC):
                 sig_return_type = inspect.signature(self.__wrapped__).return_annotation
             except ValueError:
                 sig_return_type = Any
+            if self.batch:
+                sig_return_type = _batch_item_type(sig_return_type)
 
         if return_type is ...:
             return sig_return_type
@@ -201,6 +255,16 @@ class UDF(abc.ABC):
         return executor
 
     def __call__(self, *args, **kwargs) -> expr.ColumnExpression:
+        if self.batch:
+            return expr.BatchApplyExpression(
+                self.func,
+                return_type=self._get_return_type(),
+                propagate_none=self.propagate_none,
+                deterministic=self.deterministic,
+                args=args,
+                kwargs=kwargs,
+                max_batch_size=self.max_batch_size,
+            )
         return self.executor._apply_expression_type(
             self.func,
             return_type=self._get_return_type(),
@@ -211,6 +275,13 @@ class UDF(abc.ABC):
         )
 
 
+def _batch_item_type(return_type: Any) -> Any:
+    if typing.get_origin(return_type) in (list, collections.abc.Sequence):
+        (item_type,) = typing.get_args(return_type) or (Any,)
+        return item_type
+    return Any
+
+
 class UDFSync(UDF):
     """
     Deprecated. Subclass ``UDF`` instead.
@@ -294,6 +365,8 @@ def udf(
     propagate_none: bool = False,
     executor: Executor = AutoExecutor(),
     cache_strategy: CacheStrategy | None = None,
+    batch: bool = False,
+    max_batch_size: int | None = None,
 ) -> Callable[[Callable], UDF]: ...
 
 
@@ -307,6 +380,8 @@ def udf(
     propagate_none: bool = False,
     executor: Executor = AutoExecutor(),
     cache_strategy: CacheStrategy | None = None,
+    batch: bool = False,
+    max_batch_size: int | None = None,
 ) -> UDF: ...
 
 
@@ -321,6 +396,8 @@ def udf(
     propagate_none: bool = False,
     executor: Executor = AutoExecutor(),
     cache_strategy: CacheStrategy | None = None,
+    batch: bool = False,
+    max_batch_size: int | None = None,
 ):
     """Create a Python UDF (user-defined function) out of a callable.
 
@@ -345,6 +422,12 @@ def udf(
             then it is executed asynchronously. Otherwise it is executed synchronously.
         cache_strategy: Defines the caching mechanism.
             Defaults to None.
+        batch: If True, the function is called once for a whole batch of rows
+            instead of once per row. Each argument is then a list of values (one per
+            row) and the function has to return a list of results of the same length.
+            Defaults to False.
+        max_batch_size: Maximum number of rows passed to a single call of a batched
+            function. Defaults to None, meaning no limit.
     Example:
 
     >>> import pathway as pw
@@ -390,6 +473,18 @@ def udf(
     Alice-dog
     Bob-dog
     Bob-dog
+    >>>
+    >>> @pw.udf(batch=True, max_batch_size=2)
+    ... def batched_concat(left: list[str], right: list[str]) -> list[str]:
+    ...     return [lt + "-" + rt for lt, rt in zip(left, right)]
+    ...
+    >>> res3 = table.select(col=batched_concat(table.owner, table.pet))
+    >>> pw.debug.compute_and_print(res3, include_id=False)
+    col
+    Alice-cat
+    Alice-dog
+    Bob-dog
+    Bob-dog
     """
 
     return UDFFunction(
@@ -399,6 +494,8 @@ def udf(
         propagate_none=propagate_none,
         executor=executor,
         cache_strategy=cache_strategy,
+        batch=batch,
+        max_batch_size=max_batch_size,
     )
 
 
@@ -0,0 +1,127 @@
+# Copyright © 2024 Pathway
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from pathway.internals.runtime_type_check import check_arg_types
+from pathway.internals.udfs.utils import coerce_async
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class _PendingBatch:
+    kwargs: dict[str, Any]
+    items: list[Any] = field(default_factory=list)
+    futures: list[asyncio.Future] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+@check_arg_types
+def with_batching(
+    func: Callable[..., Awaitable[list[R]]] | Callable[..., list[R]],
+    max_batch_size: int,
+    max_wait: float = 0.01,
+) -> Callable[..., Awaitable[R]]:
+    """
+    Coalesces concurrent calls of a function processing a single item into calls
+    of ``func`` processing a list of items. Calls are gathered until ``max_batch_size``
+    items are collected or ``max_wait`` seconds pass since the first call in a batch.
+    Each caller then receives the result computed for its item.
+    Regular function will be wrapped to run in async executor.
+
+    Only calls with equal keyword arguments are put in the same batch.
+    If ``func`` raises an exception, it is propagated to all calls in the batch.
+
+    Args:
+        func: Function taking a list of items as the first argument and returning
+            a list of results of the same length.
+        max_batch_size: Maximum number of items passed to a single call of ``func``.
+        max_wait: Maximum time (in seconds) to wait for more items before calling ``func``.
+            Defaults to 0.01.
+    Returns:
+        Coroutine
+
+    Example:
+
+    >>> import asyncio
+    >>> import pathway as pw
+    >>> async def double(items: list[int]) -> list[int]:
+    ...     print(f"called with {items}")
+    ...     return [2 * item for item in items]
+    ...
+    >>> batched_double = pw.udfs.with_batching(double, max_batch_size=2)
+    >>> async def main():
+    ...     return await asyncio.gather(*(batched_double(i) for i in range(3)))
+    ...
+    >>> asyncio.run(main())
+    called with [0, 1]
+    called with [2]
+    [0, 2, 4]
+    """
+
+    if max_batch_size <= 0:
+        raise ValueError("max_batch_size has to be a positive integer.")
+
+    func = coerce_async(func)
+    # the batches are gathered separately in every event loop, as the futures
+    # of their calls can be awaited only in the loop they belong to
+    pending: dict[tuple[asyncio.AbstractEventLoop, Hashable], _PendingBatch] = {}
+    running: set[asyncio.Task] = set()
+
+    async def run_batch(batch: _PendingBatch) -> None:
+        try:
+            results = await func(batch.items, **batch.kwargs)
+            if len(results) != len(batch.items):
+                raise ValueError(
+                    f"batched function returned {len(results)} results"
+                    + f" for a batch of {len(batch.items)} items"
+                )
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
+
+    def flush(loop: asyncio.AbstractEventLoop, key: Hashable) -> None:
+        batch = pending.pop((loop, key), None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = loop.create_task(run_batch(batch))
+        running.add(task)
+        task.add_done_callback(running.discard)
+
+    @functools.wraps(func)
+    async def wrapper(item: Any, /, **kwargs: Any) -> R:
+        key = tuple(sorted(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            [result] = await func([item], **kwargs)
+            return result
+
+        loop = asyncio.get_running_loop()
+        batch = pending.get((loop, key))
+        if batch is None:
+            batch = _PendingBatch(kwargs=kwargs)
+            batch.timer = loop.call_later(max_wait, flush, loop, key)
+            pending[(loop, key)] = batch
+        future = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        if len(batch.items) >= max_batch_size:
+            flush(loop, key)
+        return await future
+
+    return wrapper
@@ -4,11 +4,17 @@ from __future__ import annotations
 
 import abc
 import functools
+import hashlib
 import inspect
 import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from pathlib import Path
-from typing import ClassVar, ParamSpec, TypeVar, overload
+from typing import Any, ClassVar, Literal, ParamSpec, TypeVar, overload
 
 import async_lru
 import diskcache
@@ -19,6 +25,72 @@ from pathway.internals.runtime_type_check import check_arg_types
 T = TypeVar("T")
 P = ParamSpec("P")
 
+EvictionPolicy = Literal[
+    "least-recently-stored", "least-recently-used", "least-frequently-used", "none"
+]
+
+_MISSING = object()
+
+
+class _CanonicalSet(tuple):
+    """Elements of a set, in the order of their pickled form."""
+
+
+class _CanonicalDict(tuple):
+    """Items of a dict, in the order of the pickled form of their keys."""
+
+
+def _pickled(value: Any) -> bytes:
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _canonicalize(value: Any) -> Any:
+    """Replaces the sets and dicts in the value with their sorted contents, so that
+    the pickled form doesn't depend on the iteration order, which for strings varies
+    with ``PYTHONHASHSEED``."""
+    if isinstance(value, (set, frozenset)):
+        return _CanonicalSet(
+            sorted((_canonicalize(element) for element in value), key=_pickled)
+        )
+    if type(value) is dict:
+        items = ((_canonicalize(k), _canonicalize(v)) for k, v in value.items())
+        return _CanonicalDict(sorted(items, key=lambda item: _pickled(item[0])))
+    if type(value) in (list, tuple):
+        return type(value)(_canonicalize(element) for element in value)
+    return value
+
+
+def _compute_key(args: tuple, kwargs: dict[str, Any]) -> str:
+    """Stable binary fingerprint of the arguments of a call."""
+    hasher = hashlib.blake2b(digest_size=16)
+    try:
+        canonical = _canonicalize((args, kwargs))
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        canonical = (args, kwargs)
+    try:
+        payload = _pickled(canonical)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        payload = repr(canonical).encode()
+    hasher.update(payload)
+    return hasher.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Counters of a cache, displayed in the monitoring dashboard."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+_cache_stats: dict[str, CacheStats] = {}
+
+
+def get_cache_stats() -> dict[str, CacheStats]:
+    return dict(_cache_stats)
+
 
 class CacheStrategy(abc.ABC):
     """Base class used to represent caching strategy."""
@@ -33,32 +105,71 @@ class CacheStrategy(abc.ABC):
 
 
 class DiskCache(CacheStrategy):
+    """
+    On disk cache, persisted between runs. The entries are stored in the persistent
+    storage directory (``PATHWAY_PERSISTENT_STORAGE``), keyed by a fingerprint of the
+    function arguments.
+    """
+
     _cache: diskcache.Cache
     _name: str | None
+    size_limit: int | None
+    eviction_policy: EvictionPolicy
+    ttl: float | None
 
     _custom_names: ClassVar[set[str]] = set()
 
     @trace.trace_user_frame
-    def __init__(self, name: str | None = None) -> None:
+    def __init__(
+        self,
+        name: str | None = None,
+        *,
+        size_limit: int | None = None,
+        eviction_policy: EvictionPolicy = "least-recently-stored",
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Args:
+            name: Name of the cache. Defaults to the name of the cached function.
+            size_limit: Maximum size of the cache on disk (in bytes). When it is
+                exceeded, entries are evicted according to ``eviction_policy``.
+                Defaults to None, meaning that the default limit of ``diskcache`` (1GB)
+                is used.
+            eviction_policy: Which entries are evicted first when the cache is full.
+                Can be one of ``"least-recently-stored"``, ``"least-recently-used"``,
+                ``"least-frequently-used"`` and ``"none"`` (entries are never evicted).
+                Defaults to ``"least-recently-stored"``, which does not require updating
+                the cache on reads.
+            ttl: Time (in seconds) after which an entry expires.
+                Defaults to None, meaning that entries do not expire.
+        """
         super().__init__()
         if name is not None:
             if name in self._custom_names:
                 raise ValueError(f"cache name `{name}` used more than once")
             self._custom_names.add(name)
+        if size_limit is not None and size_limit <= 0:
+            raise ValueError("size_limit has to be a positive integer.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl has to be positive.")
         self._name = name
         self._cache = None
+        self.size_limit = size_limit
+        self.eviction_policy = eviction_policy
+        self.ttl = ttl
 
     def wrap_async(self, func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
         @functools.wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
             cache = self._get_cache(func)
-            key = str((args, kwargs))
             if cache is None:
                 return await func(*args, **kwargs)
-            if key not in cache:
+            key = _compute_key(args, kwargs)
+            result = cache.get(key, default=_MISSING)
+            if result is _MISSING:
                 result = await func(*args, **kwargs)
-                cache[key] = result
-            return cache[key]
+                cache.set(key, result, expire=self.ttl)
+            return result
 
         return wrapper
 
@@ -66,28 +177,37 @@ class DiskCache(CacheStrategy):
         @functools.wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
             cache = self._get_cache(func)
-            key = str((args, kwargs))
             if cache is None:
                 return func(*args, **kwargs)
-            if key not in cache:
+            key = _compute_key(args, kwargs)
+            result = cache.get(key, default=_MISSING)
+            if result is _MISSING:
                 result = func(*args, **kwargs)
-                cache[key] = result
-            return cache[key]
+                cache.set(key, result, expire=self.ttl)
+            return result
 
         return wrapper
 
+    def _resolve_name(self, func: Callable) -> str:
+        if self._name is None:
+            func = inspect.unwrap(func)
+            self._name = f"{func.__module__}_{func.__qualname__}"
+        return self._name
+
     def _get_cache(self, func: Callable) -> diskcache.Cache | None:
         if self._cache is None:
-            if self._name is None:
-                func = inspect.unwrap(func)
-                self._name = f"{func.__module__}_{func.__qualname__}"
+            self._resolve_name(func)
+            assert self._name is not None
             storage_root = os.environ.get("PATHWAY_PERSISTENT_STORAGE")
             if storage_root is None:
                 raise RuntimeError(
                     "no persistent storage configured for the disk cache"
                 )
             cache_dir = Path(storage_root) / "runtime_calls"
-            self._cache = diskcache.Cache(cache_dir / self._name)
+            settings: dict[str, Any] = {"eviction_policy": self.eviction_policy}
+            if self.size_limit is not None:
+                settings["size_limit"] = self.size_limit
+            self._cache = diskcache.Cache(cache_dir / self._name, **settings)
         return self._cache
 
 
@@ -123,6 +243,123 @@ class InMemoryCache(CacheStrategy):
         return functools.lru_cache(self.max_size)(func)  # type: ignore[return-value]
 
 
+class TieredCache(DiskCache):
+    """
+    Two-tier cache: an in-memory LRU cache in front of a ``DiskCache``.
+
+    Lookups are first served from memory, then from disk. Results found on disk or
+    computed are put in memory, so that repeated lookups do not touch the disk.
+    If the persistence is not enabled, only the in-memory tier is used.
+
+    The disk tier is safe to share between processes, so all processes started with
+    ``pathway spawn -n`` use a single on-disk cache. Hits, misses and evictions
+    from memory are shown in the monitoring dashboard.
+    """
+
+    max_memory_entries: int
+    stats: CacheStats
+    _memory: OrderedDict[str, tuple[float | None, Any]]
+    _lock: threading.Lock
+
+    @trace.trace_user_frame
+    def __init__(
+        self,
+        name: str | None = None,
+        *,
+        max_memory_entries: int = 1024,
+        size_limit: int | None = None,
+        eviction_policy: EvictionPolicy = "least-recently-stored",
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Args:
+            name: Name of the cache. Defaults to the name of the cached function.
+            max_memory_entries: Maximum number of entries kept in memory.
+                Defaults to 1024.
+            size_limit: Maximum size of the disk tier (in bytes).
+                Defaults to None, meaning the default limit of ``diskcache`` (1GB).
+            eviction_policy: Eviction policy of the disk tier. See ``DiskCache``.
+            ttl: Time (in seconds) after which an entry expires in both tiers.
+                Defaults to None, meaning that entries do not expire.
+        """
+        super().__init__(
+            name, size_limit=size_limit, eviction_policy=eviction_policy, ttl=ttl
+        )
+        if max_memory_entries <= 0:
+            raise ValueError("max_memory_entries has to be a positive integer.")
+        self.max_memory_entries = max_memory_entries
+        self.stats = CacheStats()
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def wrap_async(self, func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            key = _compute_key(args, kwargs)
+            result = self._lookup(func, key)
+            if result is _MISSING:
+                result = await func(*args, **kwargs)
+                self._store(func, key, result)
+            return result
+
+        return wrapper
+
+    def wrap_sync(self, func: Callable[P, T]) -> Callable[P, T]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            key = _compute_key(args, kwargs)
+            result = self._lookup(func, key)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                self._store(func, key, result)
+            return result
+
+        return wrapper
+
+    def _get_cache(self, func: Callable) -> diskcache.Cache | None:
+        name = self._resolve_name(func)
+        # the latest cache of the given name is reported, also after a restart
+        _cache_stats[name] = self.stats
+        if "PATHWAY_PERSISTENT_STORAGE" not in os.environ:
+            return None
+        return super()._get_cache(func)
+
+    def _lookup(self, func: Callable, key: str) -> Any:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expire_time, result = entry
+                if expire_time is None or expire_time > time.time():
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return result
+                del self._memory[key]
+        cache = self._get_cache(func)
+        if cache is not None:
+            result, expire_time = cache.get(key, default=_MISSING, expire_time=True)
+            if result is not _MISSING:
+                self.stats.disk_hits += 1
+                self._put_in_memory(key, result, expire_time)
+                return result
+        self.stats.misses += 1
+        return _MISSING
+
+    def _store(self, func: Callable, key: str, result: Any) -> None:
+        cache = self._get_cache(func)
+        if cache is not None:
+            cache.set(key, result, expire=self.ttl)
+        expire_time = None if self.ttl is None else time.time() + self.ttl
+        self._put_in_memory(key, result, expire_time)
+
+    def _put_in_memory(self, key: str, result: Any, expire_time: float | None) -> None:
+        with self._lock:
+            self._memory[key] = (expire_time, result)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+                self.stats.evictions += 1
+
+
 @overload
 def with_cache_strategy(
     func: Callable[P, T], cache_strategy: CacheStrategy
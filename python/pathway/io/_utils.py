@@ -26,6 +26,8 @@ _INPUT_MODES_MAPPING = {
     SNAPSHOT_MODE_NAME: ConnectorMode.STREAMING,
 }
 
+_MODIFICATION_MODES = ["reread", "append", "diff"]
+
 _DATA_FORMAT_MAPPING = {
     "csv": "dsv",
     "plaintext": "identity",
@@ -105,6 +107,17 @@ def internal_connector_mode(mode: str | api.ConnectorMode) -> api.ConnectorMode:
     return internal_mode
 
 
+def internal_modification_mode(on_modification: str) -> api.ModificationMode:
+    if on_modification not in _MODIFICATION_MODES:
+        raise ValueError(
+            "Unknown on_modification value: {}. Only {} are supported".format(
+                on_modification, ", ".join(_MODIFICATION_MODES)
+            )
+        )
+
+    return getattr(api.ModificationMode, on_modification.upper())
+
+
 def internal_read_method(format: str) -> ReadMethod:
     if format == "binary" or format == "plaintext_by_file":
         return ReadMethod.FULL
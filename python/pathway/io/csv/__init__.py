@@ -24,6 +24,8 @@ def read(
     mode: str = "streaming",
     object_pattern: str = "*",
     with_metadata: bool = False,
+    on_modification: str = "reread",
+    parallel_readers: int | None = None,
     autocommit_duration_ms: int | None = 1500,
     persistent_id: str | None = None,
     debug_data=None,
@@ -67,6 +69,19 @@ UNIX timestamps for the creation and modification time respectively. Additionall
 column will also have an optional field named ``owner`` that will contain the name of \
 the file owner (applicable only for Un). Finally, the column will also contain a field \
 named ``path`` that will show the full path to the file from where a row was filled.
+        on_modification: Denotes how the rows of a file modified after it was read are \
+updated in the "streaming" mode. If set to "reread", the rows of the old version of the \
+file are removed and the new version is read in full. If set to "append", only the lines \
+appended to the file are read, if the first and the last 64 KiB of the previously read \
+content didn't change; otherwise the file is reread. Only these parts are compared, so \
+the lines changed in the middle of a file that also grew keep their previously read rows; \
+use "reread" if files can be edited in place. As a CSV record may span several lines, "diff" works \
+as "append". The default value is "reread".
+        parallel_readers: Number of copies of the reader to work in parallel, each \
+reading a different part of the files. The files are assigned to the readers by their \
+paths. By default, a single reader is used. This number can't be greater \
+than the number of Pathway engine threads, and will be reduced to the number of engine \
+threads, if it exceeds.
         types: Dictionary containing the mapping between the columns and the data
             types (``pw.Type``) of the values of those columns. This parameter is optional, and if not
             provided the default type is ``pw.Type.ANY``. [will be deprecated soon]
@@ -168,6 +183,8 @@ named ``path`` that will show the full path to the file from where a row was fil
         mode=mode,
         object_pattern=object_pattern,
         with_metadata=with_metadata,
+        on_modification=on_modification,
+        parallel_readers=parallel_readers,
         csv_settings=csv_settings,
         autocommit_duration_ms=autocommit_duration_ms,
         json_field_paths=None,
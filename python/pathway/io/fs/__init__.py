@@ -17,6 +17,7 @@ from pathway.io._utils import (
     CsvParserSettings,
     construct_schema_and_data_format,
     internal_connector_mode,
+    internal_modification_mode,
     internal_read_method,
 )
 
@@ -38,6 +39,8 @@ def read(
     json_field_paths: dict[str, str] | None = None,
     object_pattern: str = "*",
     with_metadata: bool = False,
+    on_modification: str = "reread",
+    parallel_readers: int | None = None,
     persistent_id: str | None = None,
     autocommit_duration_ms: int | None = 1500,
     debug_data: Any = None,
@@ -92,6 +95,22 @@ UNIX timestamps for the creation and modification time respectively. Additionall
 column will also have an optional field named ``owner`` that will contain the name of \
 the file owner (applicable only for Un). Finally, the column will also contain a field \
 named ``path`` that will show the full path to the file from where a row was filled.
+        on_modification: Denotes how the rows of a file modified after it was read are \
+updated in the "streaming" mode. If set to "reread", the rows of the old version of the \
+file are removed and the new version is read in full. If set to "append", only the lines \
+appended to the file are read, if the first and the last 64 KiB of the previously read \
+content didn't change; otherwise the file is reread. Only these parts are compared, so \
+the lines changed in the middle of a file that also grew keep their previously read rows; \
+use "reread" if files can be edited in place. "diff" additionally reads only the changed lines of \
+the rewritten files of up to 16 MiB, except for the "csv" format, where it works as \
+"append". The formats reading whole files always reread them. The default value is "reread".
+        parallel_readers: Number of copies of the reader to work in parallel, each \
+reading a different part of the files. The files are assigned to the readers by their \
+paths; in the "static" mode, the files larger than 64 MiB are split into ranges \
+of lines read by all of the readers, unless the format is "csv" or the files are read \
+in full. By default, a single reader is used. This number can't be greater \
+than the number of Pathway engine threads, and will be reduced to the number of engine \
+threads, if it exceeds.
         persistent_id: (unstable) An identifier, under which the state of the table
             will be persisted or ``None``, if there is no need to persist the state of this table.
             When a program restarts, it restores the state for all input tables according to what
@@ -235,6 +254,8 @@ named ``path`` that will show the full path to the file from where a row was fil
             path=path,
             csv_parser_settings=csv_settings.api_settings if csv_settings else None,
             mode=internal_connector_mode(mode),
+            modification_mode=internal_modification_mode(on_modification),
+            parallel_readers=parallel_readers,
             object_pattern=object_pattern,
             persistent_id=persistent_id,
         )
@@ -244,6 +265,8 @@ named ``path`` that will show the full path to the file from where a row was fil
             path=path,
             mode=internal_connector_mode(mode),
             read_method=internal_read_method(format),
+            modification_mode=internal_modification_mode(on_modification),
+            parallel_readers=parallel_readers,
             object_pattern=object_pattern,
             persistent_id=persistent_id,
         )
@@ -23,6 +23,8 @@ def read(
     json_field_paths: dict[str, str] | None = None,
     object_pattern: str = "*",
     with_metadata: bool = False,
+    on_modification: str = "reread",
+    parallel_readers: int | None = None,
     autocommit_duration_ms: int | None = 1500,
     persistent_id: str | None = None,
     debug_data=None,
@@ -65,6 +67,20 @@ UNIX timestamps for the creation and modification time respectively. Additionall
 column will also have an optional field named ``owner`` that will contain the name of \
 the file owner (applicable only for Un). Finally, the column will also contain a field \
 named ``path`` that will show the full path to the file from where a row was filled.
+        on_modification: Denotes how the rows of a file modified after it was read are \
+updated in the "streaming" mode. If set to "reread", the rows of the old version of the \
+file are removed and the new version is read in full. If set to "append", only the lines \
+appended to the file are read, if the first and the last 64 KiB of the previously read \
+content didn't change; otherwise the file is reread. Only these parts are compared, so \
+the lines changed in the middle of a file that also grew keep their previously read rows; \
+use "reread" if files can be edited in place. "diff" additionally reads only the changed lines of \
+the rewritten files of up to 16 MiB. The default value is "reread".
+        parallel_readers: Number of copies of the reader to work in parallel, each \
+reading a different part of the files. The files are assigned to the readers by their \
+paths; in the "static" mode, the files larger than 64 MiB are split into ranges \
+of lines read by all of the readers. By default, a single reader is used. This number can't be greater \
+than the number of Pathway engine threads, and will be reduced to the number of engine \
+threads, if it exceeds.
         autocommit_duration_ms: the maximum time between two commits. Every
           autocommit_duration_ms milliseconds, the updates received by the connector are
           committed and pushed into Pathway's computation graph.
@@ -177,6 +193,8 @@ named ``path`` that will show the full path to the file from where a row was fil
         value_columns=value_columns,
         object_pattern=object_pattern,
         with_metadata=with_metadata,
+        on_modification=on_modification,
+        parallel_readers=parallel_readers,
         primary_key=primary_key,
         types=types,
         default_values=default_values,
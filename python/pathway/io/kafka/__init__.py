@@ -38,6 +38,7 @@ def read(
     autocommit_duration_ms: int | None = 1500,
     json_field_paths: dict[str, str] | None = None,
     parallel_readers: int | None = None,
+    parse_threads: int | None = None,
     persistent_id: str | None = None,
     value_columns: list[str] | None = None,
     primary_key: list[str] | None = None,
@@ -79,6 +80,11 @@ def read(
             will be taken. This number also can't be greater than the number of Pathway
             engine threads, and will be reduced to the number of engine threads, if it
             exceeds.
+        parse_threads: number of threads parsing the messages of each reader. The
+            messages are still added to the table, and committed, in the order they were
+            read. Parsing on several threads helps when the parsing of the messages, for
+            example of large JSON payloads, can't keep up with the topic. If not specified,
+            the messages are parsed on the engine thread of the reader.
         persistent_id: (unstable) An identifier, under which the state of the table will
             be persisted or ``None``, if there is no need to persist the state of this table.
             When a program restarts, it restores the state for all input tables according to what
@@ -267,7 +273,8 @@ def read(
         _stacklevel=5,
     )
     data_source_options = datasource.DataSourceOptions(
-        commit_duration_ms=autocommit_duration_ms
+        commit_duration_ms=autocommit_duration_ms,
+        parse_threads=parse_threads,
     )
     return table_from_datasource(
         datasource.GenericDataSource(
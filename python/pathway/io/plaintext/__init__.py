@@ -18,6 +18,8 @@ def read(
     mode: str = "streaming",
     object_pattern: str = "*",
     with_metadata: bool = False,
+    on_modification: str = "reread",
+    parallel_readers: int | None = None,
     persistent_id: str | None = None,
     autocommit_duration_ms: int | None = 1500,
     debug_data=None,
@@ -52,6 +54,20 @@ UNIX timestamps for the creation and modification time respectively. Additionall
 column will also have an optional field named ``owner`` that will contain the name of \
 the file owner (applicable only for Un). Finally, the column will also contain a field \
 named ``path`` that will show the full path to the file from where a row was filled.
+        on_modification: Denotes how the rows of a file modified after it was read are \
+updated in the "streaming" mode. If set to "reread", the rows of the old version of the \
+file are removed and the new version is read in full. If set to "append", only the lines \
+appended to the file are read, if the first and the last 64 KiB of the previously read \
+content didn't change; otherwise the file is reread. Only these parts are compared, so \
+the lines changed in the middle of a file that also grew keep their previously read rows; \
+use "reread" if files can be edited in place. "diff" additionally reads only the changed lines of \
+the rewritten files of up to 16 MiB. The default value is "reread".
+        parallel_readers: Number of copies of the reader to work in parallel, each \
+reading a different part of the files. The files are assigned to the readers by their \
+paths; in the "static" mode, the files larger than 64 MiB are split into ranges \
+of lines read by all of the readers. By default, a single reader is used. This number can't be greater \
+than the number of Pathway engine threads, and will be reduced to the number of engine \
+threads, if it exceeds.
         persistent_id: (unstable) An identifier, under which the state of the table \
 will be persisted or ``None``, if there is no need to persist the state of this table. \
 When a program restarts, it restores the state for all input tables according to what \
@@ -77,6 +93,8 @@ computations from the moment they were terminated last time.
         mode=mode,
         object_pattern=object_pattern,
         with_metadata=with_metadata,
+        on_modification=on_modification,
+        parallel_readers=parallel_readers,
         persistent_id=persistent_id,
         autocommit_duration_ms=autocommit_duration_ms,
         debug_data=debug_data,
@@ -99,6 +99,14 @@ class Config:
         snapshot_storage: snapshots backend configuration;
         snapshot_interval_ms: the desired duration between snapshot updates in \
 milliseconds;
+        compress_snapshots: whether to store new snapshot data in compressed blocks \
+with a columnar layout. Snapshots written in either format can be read back;
+        snapshot_compaction_interval_ms: the desired duration between compactions of \
+the snapshot in milliseconds, ``0`` disables the compaction. The compaction replaces \
+the history of changes of every key with its current state, so that the time of \
+restart depends on the size of the state, not on the uptime. As the intermediate \
+states are lost, compacted snapshots are not suitable for replaying the history \
+of changes;
     """
 
     _: KW_ONLY
@@ -108,6 +116,8 @@ milliseconds;
     snapshot_access: api.SnapshotAccess
     persistence_mode: api.PersistenceMode
     continue_after_replay: bool
+    compress_snapshots: bool = False
+    snapshot_compaction_interval_ms: int = 0
 
     @classmethod
     def simple_config(
@@ -117,6 +127,8 @@ milliseconds;
         snapshot_access=api.SnapshotAccess.FULL,
         persistence_mode=api.PersistenceMode.PERSISTING,
         continue_after_replay=True,
+        compress_snapshots=False,
+        snapshot_compaction_interval_ms=0,
     ):
         """
         Construct config from a single instance of the \
@@ -128,6 +140,11 @@ snapshot.
             snapshot_interval_ms: the desired freshness of the persisted snapshot in \
 milliseconds. The greater the value is, the more the amount of time that the snapshot \
 may fall behind, and the less computational resources are required.
+            compress_snapshots: whether to store new snapshot data in compressed \
+blocks. It reduces the size of the snapshot, especially if the rows are repetitive.
+            snapshot_compaction_interval_ms: the desired duration between compactions \
+of the snapshot in milliseconds, ``0`` disables the compaction. The compaction keeps \
+the time of restart proportional to the size of the state rather than to the uptime.
 
         Returns:
             Persistence config.
@@ -140,6 +157,8 @@ may fall behind, and the less computational resources are required.
             snapshot_access=snapshot_access,
             persistence_mode=persistence_mode,
             continue_after_replay=continue_after_replay,
+            compress_snapshots=compress_snapshots,
+            snapshot_compaction_interval_ms=snapshot_compaction_interval_ms,
         )
 
     @property
@@ -151,6 +170,8 @@ may fall behind, and the less computational resources are required.
             snapshot_access=self.snapshot_access,
             persistence_mode=self.persistence_mode,
             continue_after_replay=self.continue_after_replay,
+            compress_snapshots=self.compress_snapshots,
+            snapshot_compaction_interval_ms=self.snapshot_compaction_interval_ms,
         )
 
     def on_before_run(self):
@@ -27,10 +27,14 @@ from pathway.internals.custom_reducers import (
 )
 from pathway.internals.reducers import (
     any,
+    approx_count_distinct,
+    approx_quantile,
     argmax,
     argmin,
     avg,
+    corr,
     count,
+    cov,
     earliest,
     int_sum,
     latest,
@@ -39,17 +43,24 @@ from pathway.internals.reducers import (
     ndarray,
     npsum,
     sorted_tuple,
+    stddev,
     sum,
+    top_k,
     tuple,
     unique,
+    var,
 )
 
 __all__ = [
     "any",
+    "approx_count_distinct",
+    "approx_quantile",
     "argmax",
     "argmin",
     "avg",
+    "corr",
     "count",
+    "cov",
     "earliest",
     "int_sum",
     "latest",
@@ -60,8 +71,11 @@ __all__ = [
     "sorted_tuple",
     "stateful_many",
     "stateful_single",
+    "stddev",
     "sum",
+    "top_k",
     "tuple",
     "udf_reducer",
     "unique",
+    "var",
 ]
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from . import bellman_ford, louvain_communities, pagerank
+from . import bellman_ford, connected_components, louvain_communities, pagerank
 from .common import Edge, Vertex
 from .graph import Graph, WeightedGraph
 
 __all__ = [
     "bellman_ford",
+    "connected_components",
     "pagerank",
     "Edge",
     "Graph",
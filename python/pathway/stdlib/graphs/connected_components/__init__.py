@@ -0,0 +1,7 @@
+# Copyright © 2024 Pathway
+
+from __future__ import annotations
+
+from .impl import Component, weakly_connected_components
+
+__all__ = ["Component", "weakly_connected_components"]
@@ -0,0 +1,40 @@
+# Copyright © 2024 Pathway
+
+from __future__ import annotations
+
+from typing import Any
+
+import pathway.internals as pw
+from pathway.internals import api, dtype as dt
+from pathway.internals.runtime_type_check import check_arg_types
+from pathway.internals.trace import trace_user_frame
+
+from ..common import Edge
+
+
+class Component(pw.Schema):
+    component: pw.Pointer[Any]
+
+
+@check_arg_types
+@trace_user_frame
+def weakly_connected_components(
+    edges: pw.Table[Edge], vertices: pw.Table | None = None
+) -> pw.Table[Component]:
+    """Labels every vertex with the smallest vertex of its weakly connected component.
+    Vertices are the endpoints of edges, unless given explicitly in ``vertices``.
+    Components are maintained by an incremental engine operator that, on the removal
+    of an edge, searches only the smaller of the parts it could have separated.
+    """
+    if vertices is None:
+        vertices = pw.Table.update_rows(
+            edges.groupby(id=edges.v).reduce(), edges.groupby(id=edges.u).reduce()
+        )
+    components = vertices._graph_algorithm(
+        edges,
+        source=edges.u,
+        target=edges.v,
+        algorithm=api.GraphAlgorithm.WEAKLY_CONNECTED_COMPONENTS,
+        res_type=dt.ANY_POINTER,
+    )
+    return components.select(component=components._pw_result)
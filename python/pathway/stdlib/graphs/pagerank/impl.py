@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import pathway.internals as pw
+from pathway.internals import api
 from pathway.internals.runtime_type_check import check_arg_types
 from pathway.internals.trace import trace_user_frame
 
@@ -15,12 +16,29 @@ class Result(pw.Schema):
 
 @check_arg_types
 @trace_user_frame
-def pagerank(edges: pw.Table[Edge], steps: int = 5) -> pw.Table[Result]:
+def pagerank(
+    edges: pw.Table[Edge], steps: int = 5, *, tolerance: float | None = None
+) -> pw.Table[Result]:
+    """Ranks scaled so that a vertex with no incoming edges has rank 1000.
+    By default, computed with ``steps`` steps of the power iteration. If ``tolerance`` is set,
+    ``steps`` are ignored and ranks are maintained by an incremental engine operator that,
+    on every change of edges, recomputes ranks of the affected vertices until they change
+    by at most ``tolerance``.
+    """
     in_vertices: pw.Table = edges.groupby(id=edges.v).reduce(degree=0)
     out_vertices: pw.Table = edges.groupby(id=edges.u).reduce(
         degree=pw.reducers.count()
     )
     degrees: pw.Table = pw.Table.update_rows(in_vertices, out_vertices)
+    if tolerance is not None:
+        ranks = degrees._graph_algorithm(
+            edges,
+            source=edges.u,
+            target=edges.v,
+            algorithm=api.GraphAlgorithm.pagerank(5 / 6, tolerance / 6_000),
+        )
+        return ranks.select(rank=pw.cast(int, (ranks._pw_result * 6_000).num.round()))
+
     base: pw.Table = out_vertices.difference(in_vertices).select(rank=1_000)
 
     ranks: pw.Table = degrees.select(rank=6_000)
@@ -143,64 +143,8 @@ def build_sorted_index(nodes: pw.Table[Key | Instance]) -> SortedIndex:
 
 @check_arg_types
 @trace_user_frame
-def sort_from_index(
-    index: pw.Table[LeftRight | Parent], oracle=None
-) -> pw.Table[PrevNext]:
-    return _treesort(index=index).index  # type: ignore
-
-
-@pw.transformer
-class _treesort:
-    class index(pw.ClassArg, input=LeftRight | Parent, output=PrevNext):
-        parent = pw.input_attribute()
-        left = pw.input_attribute()
-        right = pw.input_attribute()
-
-        @pw.attribute
-        def leftmost(self) -> pw.Pointer[Node]:
-            if self.left is None:
-                return self.id
-            else:
-                return self.transformer.index[self.left].leftmost
-
-        @pw.attribute
-        def rightmost(self) -> pw.Pointer[Node]:
-            if self.right is None:
-                return self.id
-            else:
-                return self.transformer.index[self.right].rightmost
-
-        @pw.attribute
-        def inverse_rightmost(self) -> pw.Pointer[Node]:
-            """Lowest ancestor that is not a right son."""
-            if self.parent is None:
-                return self.id
-            elif self.transformer.index[self.parent].right != self.id:
-                return self.id
-            else:
-                return self.transformer.index[self.parent].inverse_rightmost
-
-        @pw.attribute
-        def inverse_leftmost(self) -> pw.Pointer[Node]:
-            """Lowest ancestor that is not a right son."""
-            if self.parent is None:
-                return self.id
-            elif self.transformer.index[self.parent].left != self.id:
-                return self.id
-            else:
-                return self.transformer.index[self.parent].inverse_leftmost
-
-        @pw.output_attribute
-        def next(self) -> pw.Pointer[Node] | None:
-            if self.right is not None:
-                return self.transformer.index[self.right].leftmost
-            return self.transformer.index[self.inverse_rightmost].parent
-
-        @pw.output_attribute
-        def prev(self) -> pw.Pointer[Node] | None:
-            if self.left is not None:
-                return self.transformer.index[self.left].rightmost
-            return self.transformer.index[self.inverse_leftmost].parent
+def sort_from_index(index: pw.Table[Key | Instance], oracle=None) -> pw.Table[PrevNext]:
+    return index.sort(key=index.key, instance=index.instance)  # type: ignore
 
 
 class ComparisonRet(pw.Schema):
@@ -396,7 +340,6 @@ class _binsearch_oracle:
                 return None
 
 
-# This has O(k) complexity. TODO: write version that has O(log n) complexity.
 @check_arg_types
 @trace_user_frame
 def filter_smallest_k(
@@ -405,20 +348,21 @@ def filter_smallest_k(
     ks = ks.with_id_from(ks.instance)
     table = column.table
     colname = column.name
-    sorted_index = build_sorted_index(nodes=table.select(instance=instance, key=column))
-    sorted_index.index += table.select(val=1)
-    oracle = prefix_sum_oracle(**sorted_index)
-    pw.universes.promise_is_subset_of(ks, oracle)
-    oracle_restricted = oracle.restrict(ks)
-    # root is pked with instance, ks also
-    res = ks.select(res=oracle_restricted.prefix_sum_upperbound(ks.k))
-    res = res.select(
-        res=pw.coalesce(table.ix(res.res, optional=True)[colname], math.inf)
+    nodes = table.select(instance=instance, key=column, val=1.0)
+    upperbound = nodes._prefix_sum_upperbound(
+        ks,
+        key=nodes.key,
+        weight=nodes.val,
+        threshold=pw.cast(float, ks.k),
+        instance=nodes.instance,
+        query_instance=ks.instance,
     )
-
-    selector = filter_cmp_helper(filter_val=res.select(val=res.res), **sorted_index)
-    # todo drop agg
-    return table.filter(selector.comparison_ret < 0)
+    res = upperbound.select(
+        res=pw.coalesce(
+            table.ix(upperbound._pw_upperbound, optional=True)[colname], math.inf
+        )
+    )
+    return table.filter(table[colname] < res.ix_ref(instance).res)
 
 
 @pw.transformer
@@ -25,6 +25,7 @@
 from __future__ import annotations
 
 import fnmatch
+import functools
 import logging
 from statistics import mode
 from typing import Literal
@@ -47,16 +48,28 @@ class DataPoint(pw.Schema):
     data: np.ndarray
 
 
+# The distance functions below take either a single query point or one query point
+# per row of the data table.
+
+
 def _euclidean_distance(data_table: np.ndarray, query_table: np.ndarray) -> np.ndarray:
+    # the differences are taken explicitly, expanding the square loses the precision
+    # of the distances between close points
     return np.sum((data_table - query_table) ** 2, axis=1)
 
 
 def compute_cosine_dist(data_table: np.ndarray, query_point: np.ndarray) -> np.ndarray:
-    return 1 - np.dot(data_table, query_point) / (
-        np.linalg.norm(data_table, axis=1) * np.linalg.norm(query_point)
+    dot_products = np.einsum(
+        "ij,ij->i", data_table, np.broadcast_to(query_point, data_table.shape)
+    )
+    return 1 - dot_products / (
+        np.linalg.norm(data_table, axis=1) * np.linalg.norm(query_point, axis=-1)
     )
 
 
+_ALIGNED_DISTANCE_FUNCTIONS = (_euclidean_distance, compute_cosine_dist)
+
+
 class MetaDataSchema:
     metadata: dict
 
@@ -132,6 +145,100 @@ class CustomFunctions(jmespath.functions.Functions):
 _glob_options = jmespath.Options(custom_functions=CustomFunctions())
 
 
+@functools.lru_cache(maxsize=1024)
+def _compile_metadata_filter(
+    metadata_filter: str,
+) -> jmespath.parser.ParsedResult | None:
+    try:
+        return jmespath.compile(metadata_filter)
+    except jmespath.exceptions.JMESPathError:
+        logging.exception("Incorrect JMESPath expression for metadata filter")
+        return None
+
+
+def _matches_metadata_filter(metadata_filter: str | None, metadata) -> bool:
+    if metadata_filter is None:
+        return True
+    compiled_filter = _compile_metadata_filter(metadata_filter)
+    if compiled_filter is None:
+        return False
+    try:
+        return (
+            compiled_filter.search(
+                metadata.value if metadata is not None else None,
+                options=_glob_options,
+            )
+            is True
+        )
+    except jmespath.exceptions.JMESPathError:
+        logging.exception("Incorrect JMESPath expression for metadata filter")
+        return False
+
+
+def _batch_knns(distance_function):
+    """Returns a batched UDF finding the nearest candidates of every query.
+
+    The built-in distance functions get the candidates of all queries of a batch in one
+    matrix, aligned with the matrix of their queries. Other ones are called per query.
+    """
+
+    @pw.udf(batch=True, deterministic=True)
+    def knns(
+        query_data: list[np.ndarray],
+        k: list[int],
+        candidates: list[tuple],
+    ) -> list[list[tuple[pw.Pointer, float]]]:
+        counts = [len(query_candidates) for query_candidates in candidates]
+        candidate_ids = [
+            candidate_id
+            for query_candidates in candidates
+            for candidate_id, _ in query_candidates
+        ]
+        candidate_data = np.stack(
+            [
+                np.asarray(data_point)
+                for query_candidates in candidates
+                for _, data_point in query_candidates
+            ]
+        )
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        if distance_function in _ALIGNED_DISTANCE_FUNCTIONS:
+            query_matrix = np.repeat(
+                np.stack([np.asarray(point) for point in query_data]), counts, axis=0
+            )
+            distances = distance_function(candidate_data, query_matrix)
+        else:
+            distances = np.concatenate(
+                [
+                    distance_function(candidate_data[start:end], np.asarray(point))
+                    for start, end, point in zip(starts, ends, query_data)
+                ]
+            )
+
+        results = []
+        for start, end, query_k in zip(starts, ends, k):
+            neighs = min(query_k, end - start)
+            if neighs <= 0:
+                results.append([])
+                continue
+            query_distances = distances[start:end]
+            # only the k nearest candidates are selected and then sorted
+            knn_ids = start + np.argpartition(query_distances, neighs - 1)[:neighs]
+            results.append(
+                sorted(
+                    (
+                        (candidate_ids[knn_id], float(distances[knn_id]))
+                        for knn_id in knn_ids
+                    ),
+                    key=lambda id_with_dist: (id_with_dist[1], id_with_dist[0]),
+                )
+            )
+        return results
+
+    return knns
+
+
 def knn_lsh_generic_classifier_train(
     data: pw.Table, lsh_projection, distance_function, L: int
 ):
@@ -199,80 +306,36 @@ def knn_lsh_generic_classifier_train(
             metadata_filter=result.metadata_filter,
         ).filter(pw.this.ids != ())
 
-        # step 3: find knns in unioned buckets
-        @pw.transformer
-        class compute_knns_transformer:
-            class training_data(pw.ClassArg):
-                data = pw.input_attribute()
-                metadata = pw.input_attribute()
-
-            class flattened(pw.ClassArg):
-                data = pw.input_attribute()
-                query_id = pw.input_attribute()
-                ids = pw.input_attribute()
-                k = pw.input_attribute()
-                metadata_filter = pw.input_attribute()
-
-                @pw.output_attribute
-                def knns(self) -> list[tuple[pw.Pointer, float]]:
-                    querypoint = self.data
-                    for id_candidate in self.ids:
-                        try:
-                            self.transformer.training_data[id_candidate].data
-                            self.transformer.training_data[id_candidate].metadata
-                        except Exception:
-                            raise
-                        except BaseException:
-                            # Used to prefetch values
-                            pass
-
-                    try:
-                        candidates = [
-                            (
-                                id_candidate,
-                                self.transformer.training_data[id_candidate].data,
-                            )
-                            for id_candidate in self.ids
-                            if self.metadata_filter is None
-                            or jmespath.search(
-                                self.metadata_filter,
-                                self.transformer.training_data[
-                                    id_candidate
-                                ].metadata.value,
-                                options=_glob_options,
-                            )
-                            is True
-                        ]
-                    except jmespath.exceptions.JMESPathError:
-                        logging.exception(
-                            "Incorrect JMESPath expression for metadata filter"
-                        )
-                        candidates = []
-
-                    if len(candidates) == 0:
-                        return []
-                    ids_filtered, data_candidates_filtered = zip(*candidates)
-                    data_candidates = np.array(data_candidates_filtered)
-                    neighs = min(self.k, len(data_candidates))
-                    distances = distance_function(data_candidates, querypoint)
-                    knn_ids = np.argpartition(
-                        distances,
-                        neighs - 1,
-                    )[
-                        :neighs
-                    ]  # neighs - 1 in argpartition, because of 0-based indexing
-                    k_distances = distances[knn_ids]
-                    final_ids = np.array(ids_filtered)[knn_ids]
-                    if len(final_ids) == 0:
-                        return []
-                    sorted_dists, sorted_ids_by_dist = zip(
-                        *sorted(zip(k_distances, final_ids))
-                    )
-                    return list(zip(sorted_ids_by_dist, sorted_dists))
-
-        knn_result: pw.Table = compute_knns_transformer(  # type: ignore
-            training_data=data, flattened=flattened
-        ).flattened.select(flattened.query_id, knns_ids_with_dists=pw.this.knns)
+        # step 3: pair every query with its candidates, keeping the ones passing
+        # the metadata filter
+        candidates = flattened.flatten(pw.this.ids)
+        candidates = candidates.join(data, candidates.ids == data.id).select(
+            candidates.query_id,
+            candidates.k,
+            query_data=candidates.data,
+            candidate=pw.make_tuple(data.id, data.data),
+            is_matching=pw.apply(
+                _matches_metadata_filter, candidates.metadata_filter, data.metadata
+            ),
+        )
+        candidates = candidates.filter(pw.this.is_matching)
+
+        # step 4: find knns among the candidates, for all queries of a batch at once
+        knn_result = (
+            candidates.groupby(pw.this.query_id)
+            .reduce(
+                pw.this.query_id,
+                query_data=pw.reducers.any(pw.this.query_data),
+                k=pw.reducers.any(pw.this.k),
+                candidates=pw.reducers.tuple(pw.this.candidate),
+            )
+            .select(
+                pw.this.query_id,
+                knns_ids_with_dists=_batch_knns(distance_function)(
+                    pw.this.query_data, pw.this.k, pw.this.candidates
+                ),
+            )
+        )
 
         knn_result_with_empty_results = queries.join_left(
             knn_result, queries.id == knn_result.query_id
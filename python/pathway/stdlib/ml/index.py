@@ -1,21 +1,39 @@
 # Copyright © 2024 Pathway
 
+from typing import Literal
+
 import pathway.internals as pw
+from pathway.internals import api, dtype as dt
 from pathway.stdlib.ml.classifiers import DistanceTypes, knn_lsh_classifier_train
 from pathway.stdlib.ml.utils import _predict_asof_now
 from pathway.stdlib.utils.col import unpack_col
 
+KNNIndexBackend = Literal["lsh", "usearch"]
+
+_USEARCH_METRICS = {
+    # both backends return squared euclidean distances
+    "euclidean": api.USearchMetricKind.L2SQ,
+    "cosine": api.USearchMetricKind.COS,
+}
+
 
 class KNNIndex:
     """
-    An approximate K-Nearest Neighbors (KNN) index implementation using the Locality-Sensitive Hashing (LSH)
-    algorithm within Pathway. This index is designed to efficiently find the
+    An approximate K-Nearest Neighbors (KNN) index implementation within Pathway.
+    This index is designed to efficiently find the
     nearest neighbors of a given query embedding within a dataset.
+
+    By default, the index uses the Locality-Sensitive Hashing (LSH) algorithm.
     It is approximate in a sense that it might return less than k records per query or skip some closer points.
     If it returns not enough points too frequently, increase ``bucket_length`` accordingly.
     If it skips points too often, increase ``n_or`` or play with other parameters.
     Note that changing the parameters will influence the time and memory requirements.
 
+    With ``backend="usearch"``, the data is kept in a native HNSW index
+    (`USearch <https://github.com/unum-cloud/usearch>`_) updated incrementally on insertions
+    and deletions, and distances are computed in the engine. This backend supports
+    only as-of-now queries (``get_nearest_items_asof_now``) and ignores the LSH parameters.
+
     Args:
         data_embedding (pw.ColumnExpression): The column expression representing embeddings in the data.
         data (pw.Table): The table containing the data to be indexed.
@@ -25,6 +43,12 @@ class KNNIndex:
         bucket_length (float): bucket length (after projecting on a line)
         distance_type (str): "euclidean" and "cosine" metrics are supported.
         metadata (pw.ColumnExpression): optional column expression representing dict of the metadata.
+        backend (str): "lsh" or "usearch". Defaults to "lsh".
+        reserved_space (int): initial capacity of the USearch index, it grows automatically when needed.
+        connectivity (int): number of neighbors kept per node of the USearch graph, 0 means the USearch default.
+        expansion_add (int): search depth used when adding to the USearch index, 0 means the USearch default.
+        expansion_search (int): search depth used when querying the USearch index,
+            0 means the USearch default.
     """
 
     def __init__(
@@ -37,19 +61,46 @@ class KNNIndex:
         bucket_length: float = 10.0,
         distance_type: DistanceTypes = "euclidean",
         metadata: pw.ColumnExpression | None = None,
+        backend: KNNIndexBackend = "lsh",
+        reserved_space: int = 1000,
+        connectivity: int = 0,
+        expansion_add: int = 0,
+        expansion_search: int = 0,
     ):
         self.data = data
         self.packed_data = data.select(row=pw.make_tuple(*self.data))
+        self.backend = backend
 
         embeddings = data.select(data=data_embedding, metadata=metadata)
-        self._query = knn_lsh_classifier_train(
-            embeddings,
-            L=n_or,
-            d=n_dimensions,
-            M=n_and,
-            A=bucket_length,
-            type=distance_type,
-        )
+        if backend == "lsh":
+            self._query = knn_lsh_classifier_train(
+                embeddings,
+                L=n_or,
+                d=n_dimensions,
+                M=n_and,
+                A=bucket_length,
+                type=distance_type,
+            )
+        elif backend == "usearch":
+            if distance_type not in _USEARCH_METRICS:
+                raise ValueError(
+                    f"distance_type {distance_type!r} is not supported by the usearch backend"
+                )
+            self._embeddings = embeddings
+            self._has_metadata = metadata is not None
+            self._index_factory = api.ExternalIndexFactory.usearch_knn_factory(
+                dimensions=n_dimensions,
+                reserved_space=reserved_space,
+                metric=_USEARCH_METRICS[distance_type],
+                connectivity=connectivity,
+                expansion_add=expansion_add,
+                expansion_search=expansion_search,
+                return_distance=True,
+            )
+        else:
+            raise ValueError(
+                f"backend has to be one of 'lsh', 'usearch', got {backend!r}"
+            )
 
     def get_nearest_items(
         self,
@@ -171,6 +222,11 @@ class KNNIndex:
         (-3, 1) | ((0, 0), (2, 2))  | 10       | -1
         (-3, 1) | ((0, 0), (-3, 3)) | 10       | 1
         """
+        if self.backend == "usearch":
+            raise ValueError(
+                "KNNIndex with the usearch backend supports only as-of-now queries,"
+                + " use get_nearest_items_asof_now instead"
+            )
         queries = query_embedding.table.select(
             data=query_embedding, k=k, metadata_filter=metadata_filter
         )
@@ -247,8 +303,13 @@ class KNNIndex:
         (-3, 1) | ((0, 0), (2, 2)) | 8        | 1
         """
 
+        get_nearest_items = (
+            self._get_nearest_items_usearch
+            if self.backend == "usearch"
+            else self.get_nearest_items
+        )
         return _predict_asof_now(
-            lambda query, k, metadata_filter: self.get_nearest_items(
+            lambda query, k, metadata_filter: get_nearest_items(
                 query,
                 k=k,
                 collapse_rows=collapse_rows,
@@ -263,6 +324,46 @@ class KNNIndex:
             with_queries_universe=collapse_rows,
         )
 
+    def _get_nearest_items_usearch(
+        self,
+        query_embedding: pw.ColumnReference,
+        k: pw.ColumnExpression | int = 3,
+        collapse_rows: bool = True,
+        with_distances: bool = False,
+        metadata_filter: pw.ColumnExpression | None = None,
+    ):
+        queries = query_embedding.table.select(
+            data=query_embedding, k=k, metadata_filter=metadata_filter
+        )
+        replies = self._embeddings._external_index_as_of_now(
+            queries,
+            index_column=self._embeddings.data,
+            query_column=queries.data,
+            index_factory=self._index_factory,
+            res_type=dt.List(dt.Tuple(dt.ANY_POINTER, dt.FLOAT)),
+            query_responses_limit_column=queries.k,
+            index_filter_data_column=(
+                self._embeddings.metadata if self._has_metadata else None
+            ),
+            query_filter_column=queries.metadata_filter,
+        )
+        knns_ids = (
+            replies.select(query_id=pw.this.id, reply=pw.this._pw_index_reply)
+            .flatten(pw.this.reply)
+            .select(
+                pw.this.query_id,
+                knn_id=pw.this.reply[0],
+                knn_dist=pw.this.reply[1],
+            )
+            .update_types(knn_id=pw.Pointer, knn_dist=float)
+        )
+
+        if collapse_rows:
+            return self._extract_data_collapsed_rows(
+                knns_ids, queries, with_distances=with_distances
+            )
+        return self._extract_data_flat(knns_ids, queries, with_distances=with_distances)
+
     def _extract_data_collapsed_rows(self, knns_ids, queries, with_distances=False):
         selected_data = (
             knns_ids.join_inner(self.packed_data, pw.left.knn_id == pw.right.id)
@@ -16,39 +16,16 @@ def _linear_interpolate(t, t_prev, v_prev, t_next, v_next) -> float:
     return v_prev + (t - t_prev) * (v_next - v_prev) / (t_next - t_prev)
 
 
-def _compute_interpolate(table_with_prev_next: Table) -> Table:
-    import pathway.internals as pw
-
-    @pw.transformer
-    class computing_interpolate:
-        class ordered_ts(pw.ClassArg):
-            timestamp = pw.input_attribute()
-            value = pw.input_attribute()
-            prev_value = pw.input_attribute()
-            next_value = pw.input_attribute()
-
-            @pw.output_attribute
-            def interpolated_value(self) -> float | None:
-                if self.value is not None:
-                    return self.value
-                t = self.timestamp
-
-                if self.prev_value is None and self.next_value is None:
-                    return None
-                if self.prev_value is None:
-                    return self.transformer.ordered_ts[self.next_value].value
-                if self.next_value is None:
-                    return self.transformer.ordered_ts[self.prev_value].value
-
-                t_prev = self.transformer.ordered_ts[self.prev_value].timestamp
-                value_prev = self.transformer.ordered_ts[self.prev_value].value
-                t_next = self.transformer.ordered_ts[self.next_value].timestamp
-                value_next = self.transformer.ordered_ts[self.next_value].value
-                return _linear_interpolate(t, t_prev, value_prev, t_next, value_next)
-
-    return computing_interpolate(
-        ordered_ts=table_with_prev_next
-    ).ordered_ts  # type: ignore
+def _interpolate_point(
+    t, value, t_prev, value_prev, t_next, value_next
+) -> float | None:
+    if value is not None:
+        return value
+    if value_prev is None:
+        return value_next
+    if value_next is None:
+        return value_prev
+    return _linear_interpolate(t, t_prev, value_prev, t_next, value_next)
 
 
 class InterpolateMode(Enum):
@@ -104,7 +81,8 @@ def interpolate(
     6         | 6        | 60
     """
 
-    from pathway.stdlib.indexing.sorting import retrieve_prev_next_values
+    import pathway.internals as pw
+    from pathway.internals import api
 
     if mode != InterpolateMode.LINEAR:
         raise ValueError(
@@ -123,8 +101,6 @@ def interpolate(
             "Table.interpolate(): Invalid column reference for the parameter timestamp."
         )
 
-    ordered_table = self.sort(key=timestamp)
-
     table = self
 
     for value in values:
@@ -141,14 +117,36 @@ def interpolate(
             )
         assert timestamp.name != value.name
 
-        sorted_timestamp_value = ordered_table + self.select(
-            timestamp=timestamp, value=value
-        )
-
-        table_with_prev_next = retrieve_prev_next_values(sorted_timestamp_value)
-
-        interpolated_table = _compute_interpolate(
-            table_with_prev_next + sorted_timestamp_value
+        points = self.select(timestamp=timestamp, value=value)
+        # rows without a value are matched with the closest rows having a value,
+        # ordered by timestamps and then by ids
+        order = pw.make_tuple(points.timestamp, points.id)
+        has_value = points.value.is_not_none()
+
+        def peer(direction: api.AsofJoinDirection):
+            return points._asof_join_peers(
+                order,
+                has_value,
+                direction=direction,
+                right_first=False,
+                match_left=True,
+                match_right=False,
+            )._pw_peer
+
+        prev = points.ix(peer(api.AsofJoinDirection.BACKWARD), optional=True)
+        next_ = points.ix(peer(api.AsofJoinDirection.FORWARD), optional=True)
+
+        interpolated_table = points.select(
+            interpolated_value=pw.apply_with_type(
+                _interpolate_point,
+                float | None,
+                points.timestamp,
+                points.value,
+                prev.timestamp,
+                prev.value,
+                next_.timestamp,
+                next_.value,
+            )
         )
 
         table = table.with_columns(
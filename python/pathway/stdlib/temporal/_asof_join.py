@@ -9,7 +9,7 @@ from typing import Any
 
 import pathway.internals as pw
 import pathway.internals.expression as expr
-import pathway.stdlib.indexing
+from pathway.internals import api, dtype as dt
 from pathway.internals.arg_handlers import (
     arg_handler,
     join_kwargs_handler,
@@ -24,6 +24,7 @@ from pathway.internals.desugaring import (
 from pathway.internals.joins import validate_join_condition
 from pathway.internals.runtime_type_check import check_arg_types
 from pathway.internals.trace import trace_user_frame
+from pathway.internals.type_interpreter import eval_type
 from pathway.stdlib.temporal.temporal_behavior import (
     CommonBehavior,
     apply_temporal_behavior,
@@ -38,72 +39,6 @@ class Direction(enum.Enum):
     NEAREST = 2
 
 
-def _build_groups(t: pw.Table, dir_next: bool) -> pw.Table:
-    """
-    Inputs:
-        - t: ordered table
-            - key: tuple where the last element indicate the group
-            - next/prev pointers
-        - dir_next: boolean
-
-    Outputs a table with the same number elements with:
-        - peer: next if dir_next else prev
-        - peer_key: t(peer).key
-        - peer_same: id of next/prev element in the table with the same group
-        - peer_diff: id of next/prev element in the table with a different group
-    """
-
-    def proc(cur_id, cur, peer_id, peer) -> pw.Pointer:
-        if peer is None:
-            return cur_id
-        if cur[1] != peer[1]:  # check if the same side of a join
-            return cur_id
-        return peer_id
-
-    succ_table = t.select(
-        orig_id=t.orig_id,
-        key=t.key,
-        peer=t.next if dir_next else t.prev,
-    )
-
-    succ_table += succ_table.select(
-        peer_key=succ_table.ix(succ_table.peer, optional=True).key,
-    )
-    succ_table += succ_table.select(
-        group_repr=pw.apply(
-            proc,
-            succ_table.id,
-            succ_table.key,
-            succ_table.peer,
-            succ_table.peer_key,
-        )
-    )
-
-    def merge_ccs(data):
-        data = data.with_columns(data.ix(data.group_repr).group_repr)
-        return data
-
-    group_table = pw.iterate(merge_ccs, data=succ_table)
-    # At the end of the iterative merge_ccs, we have:
-    # group_repr = last element of each consecutive group with the same `key`
-    # We want to compute two things:
-    #   - `next_same`: the next element with the same key
-    #   - `next_diff`: the next element with a different key
-    # To do so,
-    # let reprs = elements which are the last elements of each consecutive group
-    # next_diff(x) = group_repr(x).peer
-    # next_same(x) = is_repr ? next_diff(x).peer : x.peer
-    #
-
-    reprs = group_table.filter(group_table.id == group_table.group_repr)
-    group_table += group_table.select(
-        peer_diff=group_table.ix(group_table.group_repr, optional=True).peer
-    )
-    group_table += group_table.select(peer_same=group_table.peer)
-    group_table <<= reprs.select(peer_same=group_table.ix(reprs.id, optional=True).peer)
-    return group_table
-
-
 @dataclasses.dataclass
 class _SelectColumn:
     column: pw.ColumnReference
@@ -259,13 +194,18 @@ class AsofJoinResult(DesugaringContext):
         right_first = (
             self._direction == Direction.BACKWARD and self._mode == pw.JoinMode.LEFT
         ) or (self._direction == Direction.FORWARD and self._mode == pw.JoinMode.RIGHT)
+        time_dtypes = {
+            dt.unoptionalize(eval_type(data.t)) for data in self._side_data.values()
+        }
+        # the engine compares times of both sides directly, so they need a common type
+        cast_time = len(time_dtypes) > 1 and dt.FLOAT in time_dtypes
         orig_data = {
             k: data.table.select(
                 side=data.side,
                 instance=data.make_instance(),
-                orig_id=data.table.id,
                 key=data.make_sort_key(right_first),
                 t=data.t,
+                _pw_order_time=pw.cast(float, data.t) if cast_time else data.t,
                 **{
                     req_col.internal_name: (
                         req_col.column if data.side == req_col.side else req_col.default
@@ -277,57 +217,22 @@ class AsofJoinResult(DesugaringContext):
         }
         target = pw.Table.concat_reindex(*orig_data.values())
 
-        target += pathway.stdlib.indexing.sort_from_index(
-            **pathway.stdlib.indexing.build_sorted_index(target)
-        )
-
-        next_table = _build_groups(target, dir_next=True)
-        prev_table = _build_groups(target, dir_next=False)
-        m = target + target.select(
-            next_same=next_table.peer_same,
-            next_diff=next_table.peer_diff,
-            prev_same=prev_table.peer_same,
-            prev_diff=prev_table.peer_diff,
-        )
-        peer_elem = None
-        if self._direction == Direction.BACKWARD:
-            peer_elem = m.prev_diff
-        elif self._direction == Direction.FORWARD:
-            peer_elem = m.next_diff
-        elif self._direction == Direction.NEAREST:
-
-            def select_nearest(
-                cur_t: expr.ColumnReference,
-                prev_id: expr.ColumnReference,
-                next_id: expr.ColumnReference,
-                prev_t: expr.ColumnReference,
-                next_t: expr.ColumnReference,
-            ):
-                return pw.if_else(
-                    prev_id.is_none(),
-                    next_id,
-                    pw.if_else(
-                        next_id.is_none(),
-                        prev_id,
-                        pw.if_else(
-                            cur_t - pw.unwrap(prev_t) < pw.unwrap(next_t) - cur_t,
-                            prev_id,
-                            next_id,
-                        ),
-                    ),
-                )
-
-            peer_elem = select_nearest(
-                m.t,
-                m.prev_diff,
-                m.next_diff,
-                m.ix(m.prev_diff, optional=True).t,
-                m.ix(m.next_diff, optional=True).t,
-            )
-
-        else:
+        engine_directions = {
+            Direction.BACKWARD: api.AsofJoinDirection.BACKWARD,
+            Direction.FORWARD: api.AsofJoinDirection.FORWARD,
+            Direction.NEAREST: api.AsofJoinDirection.NEAREST,
+        }
+        if self._direction not in engine_directions:
             raise ValueError(f"Unsupported direction: {self._direction}")
-        m += m.select(peer_elem=peer_elem)
+        m = target + target._asof_join_peers(
+            target._pw_order_time,
+            target.side,
+            target.instance,
+            direction=engine_directions[self._direction],
+            right_first=right_first,
+            match_left=self._mode in [pw.JoinMode.LEFT, pw.JoinMode.OUTER],
+            match_right=self._mode in [pw.JoinMode.RIGHT, pw.JoinMode.OUTER],
+        )
 
         def fill_self(m_self: pw.Table, side: bool):
             return {
@@ -341,22 +246,20 @@ class AsofJoinResult(DesugaringContext):
 
             reqs_with_default = [req for req in reqs if req.default is not None]
             reqs_wo_default = [req for req in reqs if req.default is None]
-            m_with_peer = m_self.filter(m_self.peer_elem.is_not_none())
+            m_with_peer = m_self.filter(m_self._pw_peer.is_not_none())
 
             res_default = m_self.select(
                 **{req.output_name: req.default for req in reqs_with_default}
             )
             res_default <<= m_with_peer.select(
                 **{
-                    req.output_name: m.ix(m_with_peer.peer_elem)[req.internal_name]
+                    req.output_name: m.ix(m_with_peer._pw_peer)[req.internal_name]
                     for req in reqs_with_default
                 }
             )
 
             res = {
-                req.output_name: m.ix(m_self.peer_elem, optional=True)[
-                    req.internal_name
-                ]
+                req.output_name: m.ix(m_self._pw_peer, optional=True)[req.internal_name]
                 for req in reqs_wo_default
             }
             res.update(dict(res_default))
@@ -9,6 +9,7 @@ from dataclasses import dataclass
 from typing import Any, Generic, TypeVar, overload
 
 import pathway.internals as pw
+from pathway.internals import dtype as dt
 from pathway.internals.arg_handlers import (
     arg_handler,
     join_kwargs_handler,
@@ -26,7 +27,7 @@ from pathway.internals.trace import trace_user_frame
 from pathway.internals.type_interpreter import eval_type
 
 from .temporal_behavior import CommonBehavior, apply_temporal_behavior
-from .utils import IntervalType, TimeEventType, check_joint_types, get_default_origin
+from .utils import IntervalType, TimeEventType, check_joint_types
 
 T = TypeVar("T")
 
@@ -188,8 +189,8 @@ class IntervalJoinResult(DesugaringContext):
         left_instance: pw.ColumnReference | None = None,
         right_instance: pw.ColumnReference | None = None,
     ) -> IntervalJoinResult:
-        """Creates an IntervalJoinResult. To perform an interval join uses it uses two
-        tumbling windows of size `lower_bound` + `upper_bound` and then filters the result.
+        """Creates an IntervalJoinResult. Intervals of non-zero length are matched
+        by a dedicated engine operator, intervals of zero length by an equi-join on time.
         """
         check_joint_types(
             {
@@ -285,32 +286,32 @@ class IntervalJoinResult(DesugaringContext):
 
 
 class _NonZeroDifferenceIntervalJoinResult(IntervalJoinResult):
-    _left_bucketed: pw.Table
-    _right_bucketed: pw.Table
-    _earlier_part_filtered: pw.JoinResult
-    _later_part_filtered: pw.JoinResult
+    _left_with_time: pw.Table
+    _right_with_time: pw.Table
+    _left_matched: pw.Table
+    _join_result: pw.JoinResult
     _mode: pw.JoinMode
 
     def __init__(
         self,
-        left_bucketed: pw.Table,
-        right_bucketed: pw.Table,
-        earlier_part_filtered: pw.JoinResult,
-        later_part_filtered: pw.JoinResult,
+        left_with_time: pw.Table,
+        right_with_time: pw.Table,
+        left_matched: pw.Table,
+        join_result: pw.JoinResult,
         table_substitution: dict[pw.TableLike, pw.Table],
         mode: pw.JoinMode,
         _filter_out_results_of_forgetting: bool,
     ):
         super().__init__(
-            left_bucketed,
-            right_bucketed,
+            left_matched,
+            right_with_time,
             table_substitution=table_substitution,
             _filter_out_results_of_forgetting=_filter_out_results_of_forgetting,
         )
-        self._left_bucketed = left_bucketed
-        self._right_bucketed = right_bucketed
-        self._earlier_part_filtered = earlier_part_filtered
-        self._later_part_filtered = later_part_filtered
+        self._left_with_time = left_with_time
+        self._right_with_time = right_with_time
+        self._left_matched = left_matched
+        self._join_result = join_result
         self._mode = mode
 
     @staticmethod
@@ -326,6 +327,9 @@ class _NonZeroDifferenceIntervalJoinResult(IntervalJoinResult):
         left_instance: pw.ColumnReference | None = None,
         right_instance: pw.ColumnReference | None = None,
     ) -> IntervalJoinResult:
+        """Matches rows with an engine operator keeping the rows of both sides ordered by
+        time within each instance, so that every row is only compared with the rows of
+        the other side that fall within its interval."""
         if left_instance is not None and right_instance is not None:
             on = (*on, left_instance == right_instance)
         else:
@@ -333,56 +337,71 @@ class _NonZeroDifferenceIntervalJoinResult(IntervalJoinResult):
         assert left != right
         assert interval.lower_bound < interval.upper_bound  # type: ignore[operator]
 
-        shift = get_default_origin(eval_type(left_time_expression))
         left_with_time = left.with_columns(_pw_time=left_time_expression)
         right_with_time = right.with_columns(_pw_time=right_time_expression)
         left_with_time = apply_temporal_behavior(left_with_time, behavior)
         right_with_time = apply_temporal_behavior(right_with_time, behavior)
-        bounds_difference = interval.upper_bound - interval.lower_bound  # type: ignore[operator]
 
-        left_bucketed = left_with_time.with_columns(
-            _pw_bucket=pw.cast(int, (pw.this._pw_time - shift) // bounds_difference)
-        )
-        right_bucketed = right_with_time.with_columns(
-            _pw_bucket=pw.cast(
-                int,
-                (pw.this._pw_time - shift - interval.upper_bound) // bounds_difference,
-            ),
-        )
-
-        right_bucketed = right_bucketed.with_columns(
-            _pw_bucket_plus_one=right_bucketed._pw_bucket + 1
-        )
+        lower_bound: Any = interval.lower_bound
+        upper_bound: Any = interval.upper_bound
+        time_dtypes = {
+            dt.unoptionalize(eval_type(left_time_expression)),
+            dt.unoptionalize(eval_type(right_time_expression)),
+        }
+        if (
+            dt.FLOAT in time_dtypes
+            or isinstance(lower_bound, float)
+            or isinstance(upper_bound, float)
+        ):
+            # the engine compares times of both sides directly, so they need a common type
+            left_with_time = left_with_time.with_columns(
+                _pw_time=pw.cast(float, pw.this._pw_time)
+            )
+            right_with_time = right_with_time.with_columns(
+                _pw_time=pw.cast(float, pw.this._pw_time)
+            )
+            lower_bound = float(lower_bound)
+            upper_bound = float(upper_bound)
 
         from pathway.internals.joins import validate_join_condition
 
+        on_names: list[tuple[str, str]] = []
         for cond in on:
-            cond_left, cond_right, cond = validate_join_condition(cond, left, right)
-            cond._left = left_bucketed[cond_left._name]
-            cond._right = right_bucketed[cond_right._name]
+            cond_left, cond_right, _ = validate_join_condition(cond, left, right)
+            on_names.append((cond_left._name, cond_right._name))
+        left_on = [left_with_time[left_name] for left_name, _ in on_names]
+        right_on = [right_with_time[right_name] for _, right_name in on_names]
 
-        earlier_part = left_bucketed.join(
-            right_bucketed,
-            left_bucketed._pw_bucket == right_bucketed._pw_bucket,
-            *on,
-        )
-        later_part = left_bucketed.join(
-            right_bucketed,
-            left_bucketed._pw_bucket == right_bucketed._pw_bucket_plus_one,
-            *on,
+        pairs = left_with_time._interval_join_pairs(
+            right_with_time,
+            left_with_time._pw_time,
+            right_with_time._pw_time,
+            pw.make_tuple(*left_on) if left_on else None,
+            pw.make_tuple(*right_on) if right_on else None,
+            lower_bound=lower_bound,
+            upper_bound=upper_bound,
         )
-        pw.universes.promise_are_pairwise_disjoint(earlier_part, later_part)
-
-        earlier_part_filtered = earlier_part.filter(
-            pw.right._pw_time <= pw.left._pw_time + interval.upper_bound
+        left_matched = left_with_time.join(
+            pairs, left_with_time.id == pairs._pw_left_id
+        ).select(
+            *pw.left,
+            _pw_left_id=pw.left.id,
+            _pw_right_id=pw.right._pw_right_id,
         )
-        later_part_filtered = later_part.filter(
-            pw.left._pw_time + interval.lower_bound <= pw.right._pw_time
+        # the join conditions are repeated so that the columns used in them
+        # can be referred to with pw.this
+        join_result = left_matched.join(
+            right_with_time,
+            left_matched._pw_right_id == right_with_time.id,
+            *[
+                left_matched[left_name] == right_with_time[right_name]
+                for left_name, right_name in on_names
+            ],
         )
 
         table_substitution: dict[pw.TableLike, pw.Table] = {
-            left: left_bucketed,
-            right: right_bucketed,
+            left: left_matched,
+            right: right_with_time,
         }
 
         filter_out_results_of_forgetting = (
@@ -390,10 +409,10 @@ class _NonZeroDifferenceIntervalJoinResult(IntervalJoinResult):
         )
 
         return _NonZeroDifferenceIntervalJoinResult(
-            left_bucketed,
-            right_bucketed,
-            earlier_part_filtered,
-            later_part_filtered,
+            left_with_time,
+            right_with_time,
+            left_matched,
+            join_result,
             table_substitution,
             mode,
             _filter_out_results_of_forgetting=filter_out_results_of_forgetting,
@@ -403,30 +422,23 @@ class _NonZeroDifferenceIntervalJoinResult(IntervalJoinResult):
     @arg_handler(handler=select_args_handler)
     @trace_user_frame
     def select(self, *args: pw.ColumnReference, **kwargs: Any) -> pw.Table:
-        exclude_columns = {"_pw_time", "_pw_bucket", "_pw_bucket_plus_one"}
+        exclude_columns = {"_pw_time", "_pw_left_id", "_pw_right_id"}
         # remove internal columns that can appear if using *pw.left, *pw.right
         all_args = combine_args_kwargs(args, kwargs, exclude_columns=exclude_columns)
 
-        earlier_part_selected = self._earlier_part_filtered.select(
-            _pw_left_id=pw.left.id,
+        joined = self._join_result.select(
+            _pw_left_id=pw.left._pw_left_id,
             _pw_right_id=pw.right.id,
             **all_args,
         )
 
-        later_part_selected = self._later_part_filtered.select(
-            _pw_left_id=pw.left.id,
-            _pw_right_id=pw.right.id,
-            **all_args,
-        )
-
-        joined = earlier_part_selected.concat(later_part_selected)
-
         to_concat = [joined.without(joined._pw_left_id, joined._pw_right_id)]
         if self._mode in [pw.JoinMode.LEFT, pw.JoinMode.OUTER]:
             unmatched_left = self._get_unmatched_rows(
                 joined,
-                self._left_bucketed,
-                self._right_bucketed,
+                self._left_with_time,
+                self._left_matched,
+                self._right_with_time,
                 all_args,
                 True,
             )
@@ -434,8 +446,9 @@ class _NonZeroDifferenceIntervalJoinResult(IntervalJoinResult):
         if self._mode in [pw.JoinMode.RIGHT, pw.JoinMode.OUTER]:
             unmatched_right = self._get_unmatched_rows(
                 joined,
-                self._right_bucketed,
-                self._left_bucketed,
+                self._right_with_time,
+                self._right_with_time,
+                self._left_matched,
                 all_args,
                 False,
             )
@@ -456,6 +469,7 @@ class _NonZeroDifferenceIntervalJoinResult(IntervalJoinResult):
     def _get_unmatched_rows(
         joined: pw.Table,
         side: pw.Table,
+        side_in_expressions: pw.Table,
         other: pw.Table,
         cols: dict[str, pw.ColumnExpression],
         is_side_left: bool,
@@ -464,7 +478,9 @@ class _NonZeroDifferenceIntervalJoinResult(IntervalJoinResult):
         matched = joined.groupby(id_column).reduce(old_id=id_column)
         unmatched = side.difference(matched.with_id(matched.old_id))
         cols_new = {}
-        expression_replacer_1 = TableSubstitutionDesugaring({side: unmatched})
+        expression_replacer_1 = TableSubstitutionDesugaring(
+            {side_in_expressions: unmatched}
+        )
         expression_replacer_2 = TableReplacementWithNoneDesugaring(other)
         for column_name, expression in cols.items():
             if column_name not in ("_pw_left_id", "_pw_right_id"):
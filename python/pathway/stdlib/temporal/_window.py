@@ -4,19 +4,29 @@ from __future__ import annotations
 
 import dataclasses
 import datetime
+import math
 from abc import ABC, abstractmethod
 from collections.abc import Callable, Sequence
 from typing import Any
 
+import pandas as pd
+
 import pathway.internals as pw
-from pathway.internals import dtype as dt
+from pathway.internals import (
+    api,
+    dtype as dt,
+    expression as expr,
+    reducers,
+    thisclass,
+)
 from pathway.internals.arg_handlers import (
     arg_handler,
     offset_deprecation,
     shard_deprecation,
     windowby_handler,
 )
-from pathway.internals.desugaring import desugar
+from pathway.internals.desugaring import TableSubstitutionDesugaring, desugar
+from pathway.internals.groupbys import _ReducerExpressionState
 from pathway.internals.joins import validate_join_condition
 from pathway.internals.runtime_type_check import check_arg_types
 from pathway.internals.trace import trace_user_frame
@@ -71,46 +81,16 @@ class _SessionWindow(Window):
     predicate: _SessionPredicateType | None
     max_gap: IntervalType | None
 
-    def _merge(
-        self, cur: pw.ColumnExpression, next: pw.ColumnExpression
-    ) -> pw.ColumnExpression:
-        if self.predicate is not None:
-            return pw.apply_with_type(self.predicate, bool, cur, next)
-        else:
-            return next - cur < self.max_gap
-
     def _compute_group_repr(
         self,
         table: pw.Table,
         key: pw.ColumnExpression,
         instance: pw.ColumnExpression | None,
     ) -> pw.Table:
-        target = table.select(key=key, instance=instance)
-        import pathway.stdlib.indexing
-
-        target = target + pathway.stdlib.indexing.sort_from_index(
-            **pathway.stdlib.indexing.build_sorted_index(target)
+        return table._session_windows(
+            key, instance, max_gap=self.max_gap, predicate=self.predicate
         )
 
-        sel_key = target.select(next_key=target.ix(target.next, optional=True).key)
-        target += target.select(
-            _pw_window=pw.if_else(
-                sel_key.next_key.is_not_none(),
-                pw.if_else(
-                    self._merge(target.key, pw.unwrap(sel_key.next_key)),
-                    target.next,
-                    target.id,
-                ),
-                target.id,
-            ),
-        ).update_types(_pw_window=pw.Pointer)
-
-        def merge_ccs(data):
-            data = data.with_columns(_pw_window=data.ix(data._pw_window)._pw_window)
-            return data
-
-        return pw.iterate(merge_ccs, data=target)
-
     @check_arg_types
     def _apply(
         self,
@@ -128,15 +108,10 @@ class _SessionWindow(Window):
             )
 
         target = self._compute_group_repr(table, key, instance)
-        tmp = target.groupby(target._pw_window).reduce(
-            _pw_window_start=pw.reducers.min(key),
-            _pw_window_end=pw.reducers.max(key),
-        )
-
         gb = table.with_columns(
             target._pw_window,
-            tmp.ix_ref(target._pw_window)._pw_window_start,
-            tmp.ix_ref(target._pw_window)._pw_window_end,
+            target._pw_window_start,
+            target._pw_window_end,
             _pw_instance=instance,
         ).groupby(
             pw.this._pw_window,
@@ -207,14 +182,10 @@ class _SessionWindow(Window):
         group_repr = self._compute_group_repr(
             concatenated_events, concatenated_events.key, concatenated_events.instance
         )
-        tmp = group_repr.groupby(group_repr._pw_window).reduce(
-            _pw_window_start=pw.reducers.min(concatenated_events.key),
-            _pw_window_end=pw.reducers.max(concatenated_events.key),
-        )
         session_ids = concatenated_events.with_columns(
             group_repr._pw_window,
-            tmp.ix_ref(group_repr._pw_window)._pw_window_start,
-            tmp.ix_ref(group_repr._pw_window)._pw_window_end,
+            group_repr._pw_window_start,
+            group_repr._pw_window_end,
         )
 
         left_session_ids = (
@@ -259,12 +230,188 @@ class _SessionWindow(Window):
         )
 
 
+def _engine_window_assignment(
+    instance: pw.ColumnExpression | None,
+    key: pw.ColumnExpression,
+    instance_dtype: dt.DType,
+    key_dtype: dt.DType,
+    *,
+    hop: Any,
+    duration: Any,
+    ratio: int | None,
+    origin: TimeEventType,
+    origin_is_explicit: bool,
+) -> pw.ColumnExpression:
+    return expr.MethodCallExpression(
+        (
+            (
+                (instance_dtype, key_dtype),
+                dt.List(dt.Tuple(instance_dtype, key_dtype, key_dtype)),
+                lambda instance, key: api.Expression.sliding_windows(
+                    instance,
+                    key,
+                    hop,
+                    duration,
+                    origin,
+                    origin_is_explicit,
+                    ratio,
+                ),
+            ),
+        ),
+        "sliding_windows",
+        instance,
+        key,
+    )
+
+
+_WINDOW_COLUMNS = ("_pw_window", "_pw_window_start", "_pw_window_end")
+
+# reducers that give the same result when applied to results of themselves
+# computed over disjoint parts of a group
+_PANE_REDUCERS = (
+    reducers._min,
+    reducers._max,
+    reducers._sum,
+    reducers._any,
+    reducers._unique,
+)
+
+
+def _split_into_pane_reducers(
+    state: _ReducerExpressionState,
+) -> tuple[dict[str, pw.ColumnExpression], dict[str, reducers.Reducer | str]] | None:
+    """Splits reducers into reducers computing partial results in panes and reducers
+    combining these partial results into windows. Plain strings among the latter
+    denote window columns that are taken as they are.
+
+    Returns None if some reducer can't be split."""
+    below = state.below_reducer_expressions
+    pane_reducers: dict[str, pw.ColumnExpression] = {}
+    combiners: dict[str, reducers.Reducer | str] = {}
+    for name, reducer in state.reducers.items():
+        args: tuple[pw.ColumnExpression, ...]
+        combiner: reducers.Reducer
+        if isinstance(reducer, expr.CountExpression):
+            pane_reducers[name] = reducer
+            combiners[name] = reducers._sum
+            continue
+        elif (
+            isinstance(reducer, expr.ColumnReference)
+            and reducer._table is thisclass.this
+        ):
+            below_expression = below[reducer._name]
+            if (
+                isinstance(below_expression, expr.ColumnReference)
+                and below_expression._name in _WINDOW_COLUMNS
+            ):
+                combiners[name] = below_expression._name
+                continue
+            args = (reducer,)
+            combiner = reducers._unique
+        elif (
+            isinstance(reducer, expr.ReducerExpression)
+            and reducer._reducer in _PANE_REDUCERS
+        ):
+            args = reducer._args
+            combiner = reducer._reducer
+        else:
+            return None
+        for arg in args:
+            assert isinstance(arg, expr.ColumnReference)
+            if any(
+                dep._name in _WINDOW_COLUMNS for dep in below[arg._name]._dependencies()
+            ):
+                return None
+        pane_reducers[name] = reducer
+        combiners[name] = combiner
+    return pane_reducers, combiners
+
+
+class _PanedWindowGroupedTable(pw.GroupedTable):
+    """Table grouped into sliding windows which are reduced by first reducing
+    non-overlapping panes windows consist of and then combining partial results
+    of panes. Falls back to reducing each window independently if some reducer
+    can't be computed this way."""
+
+    _panes: pw.Table
+    _assign_windows: Callable[
+        [pw.ColumnExpression, pw.ColumnExpression], pw.ColumnExpression
+    ]
+
+    def __init__(
+        self,
+        grouped: pw.GroupedTable,
+        panes: pw.Table,
+        assign_windows: Callable[
+            [pw.ColumnExpression, pw.ColumnExpression], pw.ColumnExpression
+        ],
+    ):
+        super().__init__(
+            _table=grouped._joinable_to_group,
+            _grouping_columns=tuple(grouped._grouping_columns),
+            _last_column_is_instance=grouped._last_column_is_instance,
+            _is_window=True,
+        )
+        self._panes = panes
+        self._assign_windows = assign_windows
+
+    def _reduce_split_expressions(self, state: _ReducerExpressionState) -> pw.Table:
+        split = _split_into_pane_reducers(state)
+        if split is None:
+            return super()._reduce_split_expressions(state)
+        pane_reducers, combiners = split
+
+        # expressions below reducers refer to the table with rows assigned to windows
+        desugaring = TableSubstitutionDesugaring({self._joinable_to_group: self._panes})
+        prepared = self._panes.select(
+            self._panes._pw_pane,
+            self._panes._pw_instance,
+            **{
+                dep._name: desugaring.eval_expression(
+                    state.below_reducer_expressions[dep._name]
+                )
+                for reducer in pane_reducers.values()
+                for dep in reducer._dependencies()
+            },
+        )
+        partials = prepared.groupby(
+            prepared._pw_pane, instance=prepared._pw_instance
+        ).reduce(pw.this._pw_pane, pw.this._pw_instance, **pane_reducers)
+
+        windows = partials.with_columns(
+            _pw_window=self._assign_windows(pw.this._pw_instance, pw.this._pw_pane)
+        )
+        windows = windows.flatten(windows._pw_window)
+        windows = windows.with_columns(
+            _pw_window_start=pw.this._pw_window.get(1),
+            _pw_window_end=pw.this._pw_window.get(2),
+        )
+        grouped = windows.groupby(
+            windows._pw_window,
+            windows._pw_window_start,
+            windows._pw_window_end,
+            instance=windows._pw_instance,
+            _is_window=True,
+        )
+        return grouped._reduce(
+            **{
+                name: (
+                    windows[combiner]
+                    if isinstance(combiner, str)
+                    else expr.ReducerExpression(combiner, windows[name])
+                )
+                for name, combiner in combiners.items()
+            }
+        )
+
+
 @dataclasses.dataclass
 class _SlidingWindow(Window):
     hop: IntervalType
     duration: IntervalType | None
     ratio: int | None
     origin: TimeEventType | None
+    panes: bool
 
     def __init__(
         self,
@@ -272,11 +419,87 @@ class _SlidingWindow(Window):
         duration: IntervalType | None,
         origin: TimeEventType | None,
         ratio: int | None,
+        panes: bool = False,
     ) -> None:
         self.hop = hop
         self.duration = duration
         self.ratio = ratio
         self.origin = origin
+        self.panes = panes
+
+    def _engine_params(
+        self, key_dtype: dt.DType
+    ) -> tuple[Any, Any, TimeEventType] | None:
+        """Returns hop, duration and origin in a form accepted by the engine window
+        assignment or None if the windows have to be assigned in Python."""
+        if key_dtype not in (
+            dt.INT,
+            dt.FLOAT,
+            dt.DATE_TIME_NAIVE,
+            dt.DATE_TIME_UTC,
+        ):
+            return None
+        origin = (
+            self.origin if self.origin is not None else get_default_origin(key_dtype)
+        )
+        params = (self.hop, self.duration, origin)
+        if key_dtype == dt.INT:
+            if not all(param is None or isinstance(param, int) for param in params):
+                return None
+        elif key_dtype == dt.FLOAT:
+            hop, duration, origin = params
+            return (
+                float(hop),  # type: ignore[arg-type]
+                float(duration) if duration is not None else None,  # type: ignore[arg-type]
+                float(origin),  # type: ignore[arg-type]
+            )
+        return params
+
+    def _pane_size(self, key_dtype: dt.DType) -> IntervalType | None:
+        """Returns the length of panes, the non-overlapping intervals windows consist of,
+        or None if aggregating in panes is not possible or would not save any work."""
+        params = self._engine_params(key_dtype)
+        if params is None:
+            return None
+        hop, duration, _ = params
+        if self.ratio is not None:
+            return hop if self.ratio > 1 else None
+        if key_dtype == dt.FLOAT or duration <= hop:
+            return None
+        if key_dtype == dt.INT:
+            return math.gcd(hop, duration)
+        return pd.Timedelta(
+            math.gcd(pd.Timedelta(hop).value, pd.Timedelta(duration).value), unit="ns"
+        )
+
+    def _window_assignment_expression(
+        self,
+        instance: pw.ColumnExpression | None,
+        key: pw.ColumnExpression,
+        instance_dtype: dt.DType,
+        key_dtype: dt.DType,
+    ) -> pw.ColumnExpression:
+        windows_dtype = dt.List(dt.Tuple(instance_dtype, key_dtype, key_dtype))
+        params = self._engine_params(key_dtype)
+        if params is None:
+            return pw.apply_with_type(
+                self._window_assignment_function(key_dtype),
+                windows_dtype,
+                instance,
+                key,
+            )
+        hop, duration, origin = params
+        return _engine_window_assignment(
+            instance,
+            key,
+            instance_dtype,
+            key_dtype,
+            hop=hop,
+            duration=duration,
+            ratio=self.ratio,
+            origin=origin,
+            origin_is_explicit=self.origin is not None,
+        )
 
     def _window_assignment_function(
         self, key_dtype: dt.DType
@@ -348,20 +571,11 @@ class _SlidingWindow(Window):
         )
 
         key_dtype = eval_type(key)
-        assign_windows = self._window_assignment_function(key_dtype)
+        instance_dtype = eval_type(instance)  # type: ignore
 
         target = table.with_columns(
-            _pw_window=pw.apply_with_type(
-                assign_windows,
-                dt.List(
-                    dt.Tuple(
-                        eval_type(instance),  # type: ignore
-                        key_dtype,
-                        key_dtype,
-                    )
-                ),
-                instance,
-                key,
+            _pw_window=self._window_assignment_expression(
+                instance, key, instance_dtype, key_dtype
             ),
             _pw_key=key,
         )
@@ -431,6 +645,36 @@ class _SlidingWindow(Window):
             _is_window=True,
         )
 
+        pane_size = self._pane_size(key_dtype)
+        if self.panes and behavior is None and pane_size is not None:
+            params = self._engine_params(key_dtype)
+            assert params is not None
+            _, _, origin = params
+            panes = table.with_columns(_pw_instance=instance, _pw_key=key)
+            if self.origin is not None:
+                # keys before an explicit origin belong to no window
+                panes = panes.filter(pw.this._pw_key >= origin)
+            panes = panes.with_columns(
+                _pw_pane=_engine_window_assignment(
+                    pw.this._pw_instance,
+                    pw.this._pw_key,
+                    instance_dtype,
+                    key_dtype,
+                    hop=pane_size,
+                    duration=None,
+                    ratio=1,
+                    origin=origin,
+                    origin_is_explicit=self.origin is not None,
+                )[0][1]
+            )
+            return _PanedWindowGroupedTable(
+                target,
+                panes,
+                lambda instance, key: self._window_assignment_expression(
+                    instance, key, instance_dtype, key_dtype
+                ),
+            )
+
         return target
 
     @check_arg_types
@@ -459,19 +703,10 @@ class _SlidingWindow(Window):
         assert time_expression_dtype == eval_type(
             right_time_expression
         )  # checked in check_joint_types
-        _pw_window_dtype = dt.List(
-            dt.Tuple(
-                dt.NONE,
-                time_expression_dtype,
-                time_expression_dtype,
-            )
-        )
-
-        assign_windows = self._window_assignment_function(time_expression_dtype)
 
         left_window = left.with_columns(
-            _pw_window=pw.apply_with_type(
-                assign_windows, _pw_window_dtype, None, left_time_expression
+            _pw_window=self._window_assignment_expression(
+                None, left_time_expression, dt.NONE, time_expression_dtype
             )
         )
         left_window = left_window.flatten(left_window._pw_window)
@@ -482,8 +717,8 @@ class _SlidingWindow(Window):
         )
 
         right_window = right.with_columns(
-            _pw_window=pw.apply_with_type(
-                assign_windows, _pw_window_dtype, None, right_time_expression
+            _pw_window=self._window_assignment_expression(
+                None, right_time_expression, dt.NONE, time_expression_dtype
             )
         )
         right_window = right_window.flatten(right_window._pw_window)
@@ -663,6 +898,7 @@ def sliding(
     duration: int | float | datetime.timedelta | None = None,
     ratio: int | None = None,
     origin: int | float | datetime.datetime | None = None,
+    panes: bool = False,
 ) -> Window:
     """Allows grouping together elements within a window of a given length sliding
     across ordered time-like data column according to a specified interval (hop)
@@ -677,6 +913,14 @@ def sliding(
         duration: length of the window
         ratio: used as an alternative way to specify duration as hop * ratio
         origin: a point in time at which the first window begins
+        panes: if True, rows are first aggregated in non-overlapping panes of length
+            gcd(hop, duration) and the results for windows are assembled from the
+            results for panes, so that each row is not processed once per window
+            it belongs to. It is used only when all reducers are among
+            ``min``, ``max``, ``sum``, ``any``, ``unique`` and ``count``
+            and no behavior is set, otherwise windows are reduced independently.
+            Pane sizes are computed for int and datetime keys, float keys are
+            supported only when ``ratio`` is given. Defaults to False.
 
     Returns:
         Window: object to pass as an argument to `.windowby()`
@@ -729,6 +973,7 @@ def sliding(
         hop=hop,
         ratio=ratio,
         origin=origin,
+        panes=panes,
     )
 
 
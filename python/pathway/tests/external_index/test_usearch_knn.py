@@ -44,6 +44,8 @@ def test_filter():
     1        |0.15,0.1,0.1|4    |globmatch(`"**/foo/**"`,path)
     2        |0.15,0.1,0.1|4    |globmatch(`"**/bar/**"`,path)
     3        |0.15,0.1,0.1|4    |path=='Eyjafjallajoekull'
+    4        |0.15,0.1,0.1|4    |path=='Hvannadalshnukur'
+    5        |0.15,0.1,0.1|4    |globmatch(`"**/bar/**"`,path)&&path=='foo/bar/'
     """,
         schema=QuerySchema,
     ).with_columns(data=pw.apply(make_list, pw.this.data))
@@ -72,6 +74,8 @@ def test_filter():
         1        |2
         2        |2
         3        |1
+        4        |0
+        5        |1
     """,
         schema=ExpectedSchema,
     ).without(pw.this.pk_source)
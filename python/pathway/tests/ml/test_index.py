@@ -4,6 +4,7 @@ from typing import Any
 
 import numpy as np
 import pandas as pd
+import pytest
 
 import pathway as pw
 from pathway.stdlib.ml.index import KNNIndex
@@ -301,3 +302,71 @@ def test_incorrect_metadata_filter():
         ]
     )
     assert_table_equality_wo_index(result, expected)
+
+
+def test_usearch_asof_now_with_variable_k():
+    points, queries = stream_points(with_k=True)
+    index = KNNIndex(points.coords, points, n_dimensions=2, backend="usearch")
+    result = queries.without(pw.this.k) + index.get_nearest_items_asof_now(
+        queries.coords, queries.k
+    ).select(nn=pw.apply(sort_arrays, pw.this.coords))
+    expected = nn_as_table(
+        [
+            ((0, 0), ((2, 2),)),
+            ((2, -2), ((-1, 0), (3, -2))),
+            ((-1, 1), ((-1, 0), (1, 2), (2, 2))),
+            ((-2, -3), ()),
+        ]
+    )
+    assert_table_equality_wo_index(result, expected)
+
+
+def test_usearch_metadata_filter():
+    data = get_points()
+
+    class InputSchema(pw.Schema):
+        coords: tuple[int, int]
+        is_query: bool
+        metadata: pw.Json
+
+    df = pd.DataFrame(
+        {
+            "coords": [point[0] for point in data],
+            "is_query": [point[1] for point in data],
+            "metadata": [{"foo": i} for i, _ in enumerate(data)],
+        }
+    )
+    table = pw.debug.table_from_pandas(df, schema=InputSchema)
+    points = table.filter(~pw.this.is_query).without(pw.this.is_query)
+    queries = table.filter(pw.this.is_query).without(pw.this.is_query, pw.this.metadata)
+    index = KNNIndex(
+        points.coords,
+        points,
+        n_dimensions=2,
+        metadata=points.metadata,
+        backend="usearch",
+    )
+    queries += queries.select(metadata_filter="foo > `4`")
+    result = queries.without(
+        pw.this.metadata_filter
+    ) + index.get_nearest_items_asof_now(
+        queries.coords, k=2, metadata_filter=queries.metadata_filter
+    ).select(
+        nn=pw.apply(sort_arrays, pw.this.coords),
+    )
+    expected = nn_as_table(
+        [
+            ((0, 0), ((-3, 1), (1, 2))),
+            ((2, -2), ((1, -4), (1, 2))),
+            ((-1, 1), ((-3, 1), (1, 2))),
+            ((-2, -3), ((-3, 1), (1, -4))),
+        ]
+    )
+    assert_table_equality_wo_index(result, expected)
+
+
+def test_usearch_requires_asof_now():
+    points, queries = stream_points()
+    index = KNNIndex(points.coords, points, n_dimensions=2, backend="usearch")
+    with pytest.raises(ValueError, match="supports only as-of-now queries"):
+        index.get_nearest_items(queries.coords, k=2)
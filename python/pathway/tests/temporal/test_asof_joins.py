@@ -739,3 +739,43 @@ def test_preserves_column_names():
     )
 
     assert_table_equality_wo_index(res, expected)
+
+
+def test_asof_join_nearest_with_updates():
+    t1 = T(
+        """
+          | a | t | __time__
+        1 | 1 | 2 |    2
+        2 | 2 | 5 |    2
+        3 | 3 | 9 |    4
+        4 | 4 | 0 |    6
+    """
+    )
+    t2 = T(
+        """
+          |  b | t | __time__ | __diff__
+        1 | 10 | 1 |    2     |    1
+        2 | 20 | 7 |    2     |    1
+        3 | 30 | 3 |    4     |    1
+        2 | 20 | 7 |    6     |   -1
+    """
+    )
+
+    res = t1.asof_join(
+        t2,
+        t1.t,
+        t2.t,
+        how=pw.JoinMode.LEFT,
+        direction=pw.temporal._asof_join.Direction.NEAREST,
+    ).select(pw.left.a, pw.right.b)
+
+    expected = T(
+        """
+        a |  b
+        1 | 30
+        2 | 30
+        3 | 30
+        4 | 10
+    """
+    )
+    assert_table_equality_wo_index(res, expected)
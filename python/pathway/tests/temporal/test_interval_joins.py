@@ -826,6 +826,40 @@ def test_interval_join_time_only_automatic(seed: int) -> None:
     assert_table_equality_wo_index(res, expected)
 
 
+def test_interval_join_with_updates() -> None:
+    t1 = T(
+        """
+      | a | t  | __time__ | __diff__
+    0 | 1 | 1  |     2    |     1
+    1 | 1 | 5  |     2    |     1
+    2 | 2 | 3  |     4    |     1
+    0 | 1 | 1  |     6    |    -1
+    3 | 1 | 10 |     6    |     1
+    """
+    )
+    t2 = T(
+        """
+      | b | t  | __time__ | __diff__
+    0 | 1 | 2  |     2    |     1
+    1 | 1 | 6  |     4    |     1
+    2 | 2 | 3  |     4    |     1
+    3 | 1 | 11 |     4    |     1
+    1 | 1 | 6  |     8    |    -1
+    """
+    )
+    expected = T(
+        """
+    left_t | right_t
+    3      | 3
+    10     | 11
+    """
+    )
+    res = t1.interval_join_inner(
+        t2, t1.t, t2.t, pw.temporal.interval(-1, 2), t1.a == t2.b
+    ).select(left_t=t1.t, right_t=t2.t)
+    assert_table_equality_wo_index(res, expected)
+
+
 @pytest.mark.parametrize("seed", [0, 1, 2, 3, 4, 5, 6, 7, 8, 9])
 def test_interval_join_sharded_automatic(seed: int) -> None:
     n = 20
@@ -14,6 +14,7 @@ from pathway.internals import dtype as dt
 from pathway.internals.dtype import DATE_TIME_NAIVE, DATE_TIME_UTC
 from pathway.tests.utils import (
     T,
+    assert_table_equality,
     assert_table_equality_wo_index,
     deprecated_call_here,
     warns_here,
@@ -242,6 +243,35 @@ def test_session_max_gap_mixed():
     assert_table_equality_wo_index(result, res)
 
 
+def test_session_merge_and_split_on_updates():
+    t = T(
+        """
+            | t | __time__ | __diff__
+        1   | 1 |     2    |     1
+        2   | 2 |     2    |     1
+        3   | 4 |     2    |     1
+        4   | 5 |     2    |     1
+        5   | 3 |     4    |     1
+        2   | 2 |     6    |    -1
+    """
+    )
+
+    gb = t.windowby(t.t, window=pw.temporal.session(max_gap=2))
+    result = gb.reduce(
+        pw.this._pw_window_start,
+        pw.this._pw_window_end,
+        count=pw.reducers.count(),
+    )
+    res = T(
+        """
+        _pw_window_start | _pw_window_end | count
+        1                | 1              | 1
+        3                | 5              | 3
+    """
+    )
+    assert_table_equality_wo_index(result, res)
+
+
 def test_session_window_creation():
     with pytest.raises(ValueError):
         pw.temporal.session()
@@ -686,6 +716,108 @@ def test_sliding_floats():
     assert res_pd["count"].sum() == 3 * n
 
 
+@pytest.mark.parametrize(
+    "window_kwargs",
+    [
+        dict(hop=3, duration=10),
+        dict(hop=4, duration=10, origin=11),
+        dict(hop=2, ratio=3),
+        dict(hop=5, duration=3),
+    ],
+)
+def test_sliding_panes(window_kwargs):
+    t = T(
+        """
+            | instance | t  | v
+        1   | 0        | 12 | 1
+        2   | 0        | 13 | 2
+        3   | 0        | 14 | 3
+        4   | 0        | 15 | 4
+        5   | 0        | 16 | 5
+        6   | 0        | 17 | 6
+        7   | 1        | 10 | 7
+        8   | 1        | 11 | 8
+        9   | 1        | 21 | 9
+    """
+    )
+
+    def reduce(panes: bool) -> pw.Table:
+        gb = t.windowby(
+            t.t,
+            window=pw.temporal.sliding(**window_kwargs, panes=panes),
+            instance=t.instance,
+        )
+        return gb.reduce(
+            pw.this._pw_instance,
+            pw.this._pw_window_start,
+            pw.this._pw_window_end,
+            min_t=pw.reducers.min(pw.this.t),
+            max_t=pw.reducers.max(pw.this.t),
+            sum_v=pw.reducers.sum(pw.this.v * 2),
+            count=pw.reducers.count(),
+        )
+
+    assert_table_equality(reduce(panes=True), reduce(panes=False))
+
+
+def test_sliding_panes_datetimes():
+    t = pw.debug.table_from_markdown(
+        """
+      |          t          | a
+    1 | 2023-05-15T10:13:00 | 1
+    2 | 2023-05-15T10:14:00 | 2
+    3 | 2023-05-15T10:14:00 | 3
+    4 | 2023-05-15T10:26:00 | 4
+    5 | 2023-05-15T10:31:23 | 5
+    6 | 2023-05-15T11:00:20 | 6
+    """
+    ).with_columns(t=pw.this.t.dt.strptime("%Y-%m-%dT%H:%M:%S"))
+
+    def reduce(panes: bool) -> pw.Table:
+        gb = t.windowby(
+            t.t,
+            window=pw.temporal.sliding(
+                hop=datetime.timedelta(minutes=10),
+                duration=datetime.timedelta(minutes=25),
+                panes=panes,
+            ),
+        )
+        return gb.reduce(
+            pw.this._pw_window_start,
+            pw.this._pw_window_end,
+            max_t=pw.reducers.max(pw.this.t),
+            sum_a=pw.reducers.sum(pw.this.a),
+        )
+
+    assert_table_equality(reduce(panes=True), reduce(panes=False))
+
+
+def test_sliding_panes_not_decomposable_reducer():
+    t = T(
+        """
+            | t  | v
+        1   | 12 | 1
+        2   | 13 | 2
+        3   | 17 | 3
+    """
+    )
+    gb = t.windowby(t.t, window=pw.temporal.sliding(hop=3, duration=6, panes=True))
+    result = gb.reduce(
+        pw.this._pw_window_start,
+        pw.this._pw_window_end,
+        v=pw.reducers.avg(pw.this.v),
+    )
+    expected = T(
+        """
+        _pw_window_start | _pw_window_end | v
+        9                | 15             | 1.5
+        12               | 18             | 2.0
+        15               | 21             | 3.0
+        """
+    )
+    assert_table_equality_wo_index(result, expected)
+
+
 @pytest.mark.parametrize(
     "w",
     [
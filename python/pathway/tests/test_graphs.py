@@ -14,6 +14,7 @@ import pytest
 import pathway as pw
 from pathway.stdlib.graphs.bellman_ford.impl import bellman_ford
 from pathway.stdlib.graphs.common import Edge, Vertex, Weight
+from pathway.stdlib.graphs.connected_components import weakly_connected_components
 from pathway.stdlib.graphs.graph import (
     Graph,
     WeightedGraph,
@@ -132,6 +133,87 @@ def test_page_rank_one_node_edge_case():
     assert_table_equality(res, pw.Table.empty(rank=int))
 
 
+def test_page_rank_tolerance():
+    vertices = T(
+        """
+          |
+        a |
+        b |
+        c |
+        """
+    ).select()
+    edges = T(
+        """
+        u | v
+        a | b
+        b | a
+        c | a
+        """,
+    ).select(u=vertices.pointer_from(pw.this.u), v=vertices.pointer_from(pw.this.v))
+
+    res = pagerank(edges, tolerance=0.001)
+
+    expected = T(
+        """
+                |   rank
+        a       |   8727
+        b       |   8273
+        c       |   1000
+        """,
+    )
+    assert_table_equality(res, expected)
+
+
+def test_weakly_connected_components():
+    vertices = T(
+        """
+          |
+        a |
+        b |
+        c |
+        d |
+        e |
+        f |
+        """
+    ).select()
+    edges = T(
+        """
+        u | v
+        a | b
+        c | b
+        d | e
+        e | d
+        """,
+    ).select(u=vertices.pointer_from(pw.this.u), v=vertices.pointer_from(pw.this.v))
+
+    res = weakly_connected_components(edges, vertices)
+    sizes = res.groupby(res.component).reduce(size=pw.reducers.count())
+
+    assert_table_equality_wo_index(
+        sizes.select(sizes.size),
+        T(
+            """
+            size
+            3
+            2
+            1
+            """
+        ),
+    )
+    # every component is labelled with one of its vertices
+    assert_table_equality_wo_index(
+        sizes.select(in_component=res.ix(sizes.component).component == sizes.component),
+        T(
+            """
+            in_component
+            True
+            True
+            True
+            """
+        ),
+    )
+
+
 def test_bellman_ford():
     # directed graph
     vertices = T(
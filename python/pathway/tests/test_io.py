@@ -423,6 +423,38 @@ def test_csv_static_read_write(tmp_path: pathlib.Path):
     assert result.equals(expected)
 
 
+def test_csv_static_parallel_readers(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("PATHWAY_THREADS", "2")
+    inputs_path = tmp_path / "inputs"
+    os.mkdir(inputs_path)
+    for file_index in range(10):
+        data = f"""
+            k | v
+            {2 * file_index} | foo
+            {2 * file_index + 1} | bar
+        """
+        write_csv(inputs_path / f"{file_index}.csv", data)
+    output_path = tmp_path / "output.csv"
+
+    class InputSchema(pw.Schema):
+        k: int = pw.column_definition(primary_key=True)
+        v: str
+
+    table = pw.io.csv.read(
+        inputs_path, schema=InputSchema, mode="static", parallel_readers=2
+    )
+
+    pw.io.csv.write(table, output_path)
+
+    run_all()
+
+    result = pd.read_csv(output_path, usecols=["k", "v"]).sort_values("k")
+    assert result["k"].tolist() == list(range(20))
+    assert result["v"].tolist() == ["foo", "bar"] * 10
+
+
 def test_csv_static_exotic_column_name(tmp_path: pathlib.Path):
     data = """
         #key    | @value
@@ -1163,6 +1195,7 @@ def run_replacement_test(
     monkeypatch,
     inputs_path_override=None,
     has_only_file_replacements=False,
+    on_modification="reread",
 ):
     monkeypatch.setenv("PATHWAY_PERSISTENT_STORAGE", str(tmp_path / "PStorage"))
     inputs_path = inputs_path_override or (tmp_path / "inputs")
@@ -1179,6 +1212,7 @@ def run_replacement_test(
         mode="streaming",
         autocommit_duration_ms=1,
         with_metadata=True,
+        on_modification=on_modification,
     )
 
     output_path = tmp_path / "output.csv"
@@ -1374,6 +1408,58 @@ def test_last_file_replacement_csv(tmp_path: pathlib.Path, monkeypatch):
     )
 
 
+@pytest.mark.flaky(reruns=2)
+@needs_multiprocessing_fork
+def test_appended_lines_read_once(tmp_path: pathlib.Path, monkeypatch):
+    def stream_inputs():
+        time.sleep(1)
+        first_line = {"key": 1, "value": "one"}
+        second_line = {"key": 2, "value": "two"}
+        write_lines(tmp_path / "inputs/input.jsonlines", json.dumps(first_line))
+        time.sleep(1)
+        write_lines(
+            tmp_path / "inputs/input.jsonlines",
+            [json.dumps(first_line), json.dumps(second_line)],
+        )
+
+    run_replacement_test(
+        streaming_target=stream_inputs,
+        input_format="json",
+        expected_output_lines=2,
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        on_modification="append",
+    )
+
+
+@pytest.mark.flaky(reruns=2)
+@needs_multiprocessing_fork
+def test_changed_lines_diffed(tmp_path: pathlib.Path, monkeypatch):
+    def stream_inputs():
+        time.sleep(1)
+        first_line = {"key": 1, "value": "one"}
+        second_line = {"key": 2, "value": "two"}
+        third_line = {"key": 3, "value": "three"}
+        write_lines(
+            tmp_path / "inputs/input.jsonlines",
+            [json.dumps(first_line), json.dumps(second_line)],
+        )
+        time.sleep(1)
+        write_lines(
+            tmp_path / "inputs/input.jsonlines",
+            [json.dumps(first_line), json.dumps(third_line)],
+        )
+
+    run_replacement_test(
+        streaming_target=stream_inputs,
+        input_format="json",
+        expected_output_lines=4,
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        on_modification="diff",
+    )
+
+
 @pytest.mark.flaky(reruns=2)
 @needs_multiprocessing_fork
 def test_file_removal_autogenerated_key(tmp_path: pathlib.Path, monkeypatch):
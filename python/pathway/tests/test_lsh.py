@@ -4,10 +4,19 @@ from __future__ import annotations
 
 import numpy as np
 import pandas as pd
+import pytest
 
 from pathway.debug import table_to_pandas
 from pathway.internals import api
-from pathway.stdlib.ml.classifiers import knn_lsh_classifier_train, knn_lsh_classify
+from pathway.stdlib.ml.classifiers import (
+    knn_lsh_classifier_train,
+    knn_lsh_classify,
+    knn_lsh_generic_classifier_train,
+)
+from pathway.stdlib.ml.classifiers._knn_lsh import (
+    _euclidean_distance,
+    compute_cosine_dist,
+)
 from pathway.tests.utils import T, assert_table_equality
 
 
@@ -89,3 +98,107 @@ def test_knn_classifier():
             unsafe_trusted_ids=True,
         ),
     )
+
+
+def _single_bucket(x: np.ndarray) -> np.ndarray:
+    return np.zeros(1, dtype=int)
+
+
+def _knns_with_distances(data_points, query_points, distance_function, k):
+    data = T(
+        pd.DataFrame({"data": data_points}), format="pandas", unsafe_trusted_ids=True
+    )
+    queries = T(
+        pd.DataFrame({"data": query_points}), format="pandas", unsafe_trusted_ids=True
+    )
+    # with a single bucket every data point is a candidate for every query
+    lsh_index = knn_lsh_generic_classifier_train(
+        data, _single_bucket, distance_function, L=1
+    )
+    result = lsh_index(queries, k=k, with_distances=True)
+    result_pd = table_to_pandas(result.with_id(result.query_id))
+    return {
+        query_id: [(int(knn_id), distance) for knn_id, distance in knns]
+        for query_id, knns in result_pd["knns_ids_with_dists"].items()
+    }
+
+
+@pytest.mark.parametrize(
+    "distance_function,baseline",
+    [
+        (
+            _euclidean_distance,
+            lambda x, q: np.sum((x - q) ** 2),
+        ),
+        (
+            compute_cosine_dist,
+            lambda x, q: 1 - np.dot(x, q) / (np.linalg.norm(x) * np.linalg.norm(q)),
+        ),
+    ],
+)
+def test_knns_match_distances_computed_per_point(distance_function, baseline):
+    gen = np.random.default_rng(seed=0)
+    data_points = list(gen.standard_normal((20, 4)))
+    query_points = list(gen.standard_normal((5, 4)))
+
+    result = _knns_with_distances(data_points, query_points, distance_function, k=3)
+
+    for query_index, query_point in enumerate(query_points):
+        expected = sorted(
+            (baseline(data_point, query_point), data_index)
+            for data_index, data_point in enumerate(data_points)
+        )[:3]
+        knns = result[api.unsafe_make_pointer(query_index)]
+        assert [knn_id for knn_id, _ in knns] == [index for _, index in expected]
+        np.testing.assert_allclose(
+            [distance for _, distance in knns], [distance for distance, _ in expected]
+        )
+
+
+def test_knns_near_duplicates():
+    # the points are so far from the origin that expanding the square of the
+    # difference would cancel out their distances
+    offsets = [3e-3, 1e-3, 4e-3, 2e-3]
+    data_points = [np.array([1e8 + offset, 1e8]) for offset in offsets]
+    query_points = [np.array([1e8, 1e8])]
+
+    result = _knns_with_distances(data_points, query_points, _euclidean_distance, k=4)
+
+    knns = result[api.unsafe_make_pointer(0)]
+    assert [knn_id for knn_id, _ in knns] == [1, 3, 0, 2]
+    assert all(distance > 0 for _, distance in knns)
+
+
+def test_knns_ties_ordered_by_id():
+    data_points = [
+        np.array([1.0, 0.0]),
+        np.array([0.0, 1.0]),
+        np.array([-1.0, 0.0]),
+        np.array([5.0, 5.0]),
+    ]
+    query_points = [np.array([0.0, 0.0])]
+
+    result = _knns_with_distances(data_points, query_points, _euclidean_distance, k=3)
+
+    knns = result[api.unsafe_make_pointer(0)]
+    assert [distance for _, distance in knns] == [1.0, 1.0, 1.0]
+    # ties are broken by the ids of the points
+    expected_pointers = sorted(api.unsafe_make_pointer(index) for index in [0, 1, 2])
+    assert [knn_id for knn_id, _ in knns] == [
+        int(pointer) for pointer in expected_pointers
+    ]
+
+
+def test_knns_custom_distance_per_query():
+    def manhattan_distance(data_table: np.ndarray, query_point: np.ndarray):
+        # custom distance functions always get a single query point
+        assert query_point.ndim == 1
+        return np.sum(np.abs(data_table - query_point), axis=1)
+
+    data_points = [np.array([0, 0]), np.array([3, 3]), np.array([5, 5])]
+    query_points = [np.array([1, 1]), np.array([5, 4])]
+
+    result = _knns_with_distances(data_points, query_points, manhattan_distance, k=1)
+
+    assert result[api.unsafe_make_pointer(0)] == [(0, 2)]
+    assert result[api.unsafe_make_pointer(1)] == [(2, 1)]
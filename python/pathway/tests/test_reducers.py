@@ -4,8 +4,19 @@ from __future__ import annotations
 
 import math
 
+import numpy as np
+import pandas as pd
+import pytest
+
 import pathway as pw
-from pathway.tests.utils import T, assert_table_equality, assert_table_equality_wo_types
+from pathway.internals.expression import ReducerExpression
+from pathway.tests.utils import (
+    T,
+    assert_table_equality,
+    assert_table_equality_wo_index,
+    assert_table_equality_wo_index_types,
+    assert_table_equality_wo_types,
+)
 
 
 class CustomCntAccumulator(pw.BaseCustomAccumulator):
@@ -144,6 +155,85 @@ def test_custom_count_retract_null():
     assert_table_equality(left_res, pw.Table.empty(cnt=int))
 
 
+class CustomCntNotSerializableAccumulator(CustomCntWithRetractAccumulator):
+    def serialize(self):
+        raise AssertionError("accumulator state should not be serialized")
+
+
+def test_custom_count_keeps_accumulator_alive():
+    left = T(
+        """
+            pet  |  owner  | age | __time__ | __diff__
+            dog  | Alice   | 10  | 0        | 1
+            dog  | Bob     | 9   | 2        | 1
+            cat  | Alice   | 8   | 2        | 1
+            dog  | Bob     | 7   | 4        | 1
+            dog  | Bob     | 9   | 6        | -1
+        """
+    )
+
+    custom_cnt_not_serializable = pw.reducers.udf_reducer(
+        CustomCntNotSerializableAccumulator
+    )
+    left_res = left.groupby(left.pet).reduce(
+        left.pet, cnt=custom_cnt_not_serializable()
+    )
+
+    assert_table_equality(
+        left_res,
+        T(
+            """
+                pet | cnt
+                dog | 2
+                cat | 1
+            """,
+            id_from=["pet"],
+        ),
+    )
+
+
+class CustomNonNegativeSumAccumulator(pw.BaseCustomAccumulator):
+    def __init__(self, sum):
+        self.sum = sum
+
+    @classmethod
+    def from_row(cls, row):
+        [val] = row
+        if val < 0:
+            raise ValueError("negative value")
+        return cls(val)
+
+    def update(self, other):
+        self.sum += other.sum
+
+    def compute_result(self) -> int:
+        return self.sum
+
+
+class CustomNonNegativeSumWithRetractAccumulator(CustomNonNegativeSumAccumulator):
+    def retract(self, other) -> None:
+        self.sum -= other.sum
+
+
+@pytest.mark.parametrize(
+    "accumulator",
+    [CustomNonNegativeSumAccumulator, CustomNonNegativeSumWithRetractAccumulator],
+)
+def test_custom_reducer_error_keeps_accumulator(accumulator):
+    expression = pw.reducers.udf_reducer(accumulator)(pw.this.val)
+    [reducer_expression] = expression._args
+    assert isinstance(reducer_expression, ReducerExpression)
+    combine = reducer_expression._reducer.combine_many
+
+    state = combine(None, [([1], 1), ([2], 1)])
+    assert state is not None and state[1] == 3
+    with pytest.raises(ValueError):
+        combine(state, [([4], 1), ([-1], 1), ([1], -1)])
+    # the failed update is not applied, the accumulator of the group is still usable
+    state = combine(state, [([4], 1), ([1], -1)])
+    assert state is not None and state[1] == 6
+
+
 class CustomMeanStdevAccumulator(pw.BaseCustomAccumulator):
     def __init__(self, sum, sum2, count):
         self.sum = sum
@@ -394,3 +484,296 @@ def test_stateful_many_binary():
             id_from=["pet"],
         ),
     )
+
+
+def test_approx_count_distinct():
+    left = T(
+        """
+            pet  |  owner  | __time__ | __diff__
+            dog  | Alice   | 0        | 1
+            dog  | Bob     | 0        | 1
+            cat  | Alice   | 0        | 1
+            dog  | Bob     | 0        | 1
+            dog  | Carol   | 2        | 1
+            dog  | Alice   | 4        | -1
+            cat  | Bob     | 4        | 1
+        """
+    )
+
+    left_res = left.groupby(left.pet).reduce(
+        left.pet, owners=pw.reducers.approx_count_distinct(left.owner)
+    )
+
+    assert_table_equality(
+        left_res,
+        T(
+            """
+                pet | owners
+                dog | 2
+                cat | 2
+            """,
+            id_from=["pet"],
+        ),
+    )
+
+
+def test_approx_count_distinct_many_values():
+    t = pw.debug.table_from_rows(
+        pw.schema_from_types(val=int), [(i % 5000,) for i in range(20000)]
+    )
+
+    res = t.reduce(cnt=pw.reducers.approx_count_distinct(t.val))
+    [cnt] = pw.debug.table_to_pandas(res)["cnt"]
+
+    assert abs(cnt - 5000) < 5000 * 0.05
+
+
+def test_approx_quantile():
+    left = T(
+        """
+            pet  | age | __time__ | __diff__
+            dog  | 10  | 0        | 1
+            dog  | 9   | 0        | 1
+            dog  | 1   | 0        | 1
+            cat  | 8   | 0        | 1
+            cat  | -2  | 0        | 1
+            dog  | 1   | 2        | -1
+            dog  | 7   | 2        | 1
+        """
+    )
+
+    left_res = left.groupby(left.pet).reduce(
+        left.pet,
+        low=pw.reducers.approx_quantile(left.age, 0.0),
+        median=pw.reducers.approx_quantile(left.age, 0.5),
+        high=pw.reducers.approx_quantile(left.age, 1.0),
+    )
+    left_res = left_res.select(
+        pw.this.pet,
+        low=pw.apply(round, pw.this.low),
+        median=pw.apply(round, pw.this.median),
+        high=pw.apply(round, pw.this.high),
+    )
+
+    assert_table_equality_wo_types(
+        left_res,
+        T(
+            """
+                pet | low | median | high
+                dog | 7   | 9      | 10
+                cat | -2  | -2     | 8
+            """,
+            id_from=["pet"],
+        ),
+    )
+
+
+def test_approx_quantile_relative_accuracy():
+    t = pw.debug.table_from_rows(
+        pw.schema_from_types(val=float), [(float(i),) for i in range(1, 1001)]
+    )
+
+    res = t.reduce(p99=pw.reducers.approx_quantile(t.val, 0.99))
+    [p99] = pw.debug.table_to_pandas(res)["p99"]
+
+    assert abs(p99 - 990) <= 990 * 0.01 + 1
+
+
+def test_top_k():
+    left = T(
+        """
+            pet  |  owner  | __time__ | __diff__
+            dog  | Alice   | 0        | 1
+            dog  | Bob     | 0        | 1
+            dog  | Bob     | 0        | 1
+            dog  | Carol   | 0        | 1
+            cat  | Alice   | 0        | 1
+            dog  | Carol   | 2        | 1
+            dog  | Carol   | 2        | 1
+            dog  | Bob     | 4        | -1
+        """
+    )
+
+    left_res = left.groupby(left.pet).reduce(
+        left.pet, top=pw.reducers.top_k(left.owner, 2)
+    )
+
+    expected = pw.debug.table_from_rows(
+        pw.schema_from_types(pet=str, top=list[tuple[str, int]]),
+        [("dog", (("Carol", 3), ("Alice", 1))), ("cat", (("Alice", 1),))],
+    ).with_id_from(pw.this.pet)
+
+    assert_table_equality_wo_types(left_res, expected)
+
+
+def test_avg_var_stddev():
+    left = T(
+        """
+            pet  | age | __time__ | __diff__
+            dog  | 10  | 0        | 1
+            dog  | 9   | 0        | 1
+            dog  | 100 | 0        | 1
+            cat  | 8   | 0        | 1
+            cat  | 2   | 0        | 1
+            dog  | 100 | 2        | -1
+            dog  | 11  | 2        | 1
+        """
+    )
+
+    left_res = left.groupby(left.pet).reduce(
+        left.pet,
+        avg=pw.reducers.avg(left.age),
+        var=pw.reducers.var(left.age),
+        sample_var=pw.reducers.var(left.age, ddof=1),
+        stddev=pw.reducers.stddev(left.age),
+    )
+    left_res = left_res.select(
+        pw.this.pet,
+        avg=pw.apply(lambda x: round(x, 9), pw.this.avg),
+        var=pw.apply(lambda x: round(x, 9), pw.this.var),
+        sample_var=pw.apply(lambda x: round(x, 9), pw.this.sample_var),
+        stddev=pw.apply(lambda x: round(x, 9), pw.this.stddev),
+    )
+
+    assert_table_equality_wo_types(
+        left_res,
+        T(
+            """
+                pet | avg  | var         | sample_var | stddev
+                dog | 10.0 | 0.666666667 | 1.0        | 0.816496581
+                cat | 5.0  | 9.0         | 18.0       | 3.0
+            """,
+            id_from=["pet"],
+        ),
+    )
+
+
+def test_avg_exact_after_deletion():
+    t = T(
+        """
+            val               | __time__ | __diff__
+            10000000000000000 | 0        | 1
+            1                 | 0        | 1
+            10000000000000000 | 2        | -1
+        """
+    )
+
+    res = t.reduce(avg=pw.reducers.avg(pw.this.val))
+
+    assert_table_equality_wo_index(
+        res,
+        T(
+            """
+                avg
+                1.0
+            """
+        ),
+    )
+
+
+def test_avg_ndarray():
+    t = pw.debug.table_from_pandas(
+        pd.DataFrame(
+            {
+                "pet": ["dog", "dog", "cat"],
+                "data": [
+                    np.array([1.0, 2.0, 3.0]),
+                    np.array([3.0, 4.0, 8.0]),
+                    np.array([5.0, 6.0, 7.0]),
+                ],
+            }
+        )
+    )
+
+    res = t.groupby(t.pet).reduce(t.pet, avg=pw.reducers.avg(t.data))
+
+    expected = pw.debug.table_from_pandas(
+        pd.DataFrame(
+            {
+                "pet": ["dog", "cat"],
+                "avg": [np.array([2.0, 3.0, 5.5]), np.array([5.0, 6.0, 7.0])],
+            }
+        )
+    )
+    assert_table_equality_wo_index_types(res, expected)
+
+
+def test_var_ddof_too_large():
+    left = T(
+        """
+            pet  | age
+            dog  | 10
+            dog  | 9
+            cat  | 8
+        """
+    )
+
+    left_res = left.groupby(left.pet).reduce(
+        left.pet, var=pw.reducers.var(left.age, ddof=1)
+    )
+
+    assert_table_equality(
+        left_res,
+        T(
+            """
+                pet | var
+                dog | 0.5
+                cat |
+            """,
+            id_from=["pet"],
+        ).update_types(var=float | None),
+    )
+
+
+def test_cov_corr():
+    left = T(
+        """
+            pet  | x | y  | __time__ | __diff__
+            dog  | 1 | 2  | 0        | 1
+            dog  | 2 | 4  | 0        | 1
+            dog  | 3 | 6  | 0        | 1
+            dog  | 4 | -8 | 0        | 1
+            cat  | 1 | 1  | 0        | 1
+            cat  | 2 | 1  | 0        | 1
+            dog  | 4 | -8 | 2        | -1
+        """
+    )
+
+    left_res = left.groupby(left.pet).reduce(
+        left.pet,
+        cov=pw.reducers.cov(left.x, left.y),
+        corr=pw.reducers.corr(left.x, left.y),
+    )
+    left_res = left_res.select(
+        pw.this.pet,
+        cov=pw.apply(lambda x: round(x, 9), pw.this.cov),
+        corr=pw.apply_with_type(
+            lambda x: round(x, 9) if x is not None else None,
+            float | None,
+            pw.this.corr,
+        ),
+    )
+
+    assert_table_equality_wo_types(
+        left_res,
+        T(
+            """
+                pet | cov         | corr
+                dog | 1.333333333 | 1.0
+                cat | 0.0         |
+            """,
+            id_from=["pet"],
+        ),
+    )
+
+
+def test_var_rejects_non_numeric():
+    left = T(
+        """
+            pet  | owner
+            dog  | Alice
+        """
+    )
+
+    with pytest.raises(TypeError):
+        left.reduce(var=pw.reducers.var(left.owner))
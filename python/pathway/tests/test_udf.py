@@ -6,9 +6,12 @@ import asyncio
 import os
 import pathlib
 import re
+import subprocess
 import sys
 import threading
+import time
 import warnings
+from dataclasses import dataclass
 from typing import Optional
 from unittest import mock
 
@@ -16,6 +19,7 @@ import pytest
 
 import pathway as pw
 from pathway.internals import api
+from pathway.internals.udfs.caches import get_cache_stats
 from pathway.tests.utils import (
     T,
     assert_stream_equality,
@@ -609,6 +613,89 @@ def test_udf_cache(monkeypatch, tmp_path: pathlib.Path):
     assert internal_inc.call_count == 3
 
 
+@dataclass
+class _ValueWithConstantRepr:
+    value: int
+
+    def __repr__(self) -> str:
+        return "value"
+
+
+def test_disk_cache_keys_do_not_depend_on_repr(monkeypatch, tmp_path: pathlib.Path):
+    monkeypatch.setenv("PATHWAY_PERSISTENT_STORAGE", str(tmp_path))
+    internal_get = mock.Mock()
+
+    def get(x: _ValueWithConstantRepr) -> int:
+        internal_get(x.value)
+        return x.value
+
+    cached_get = pw.udfs.DiskCache().wrap_sync(get)
+
+    assert cached_get(_ValueWithConstantRepr(1)) == 1
+    assert cached_get(_ValueWithConstantRepr(2)) == 2
+    assert cached_get(_ValueWithConstantRepr(1)) == 1
+    assert internal_get.call_count == 2
+
+
+def test_disk_cache_keys_do_not_depend_on_hash_seed():
+    script = """
+from pathway.internals.udfs.caches import _compute_key
+print(_compute_key(
+    ({"a", "b", "c", "d"}, [frozenset({"x", "y"}), {"q": {"r", "s"}, "p": 1}]),
+    {"kwarg": {"k2": {"m", "n"}, "k1": 1}},
+))
+"""
+    keys = set()
+    for seed in ["0", "1", "2"]:
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            env=os.environ | {"PYTHONHASHSEED": seed},
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        keys.add(result.stdout)
+    assert len(keys) == 1
+
+
+def test_disk_cache_ttl(monkeypatch, tmp_path: pathlib.Path):
+    monkeypatch.setenv("PATHWAY_PERSISTENT_STORAGE", str(tmp_path))
+    internal_inc = mock.Mock()
+
+    def inc(a: int) -> int:
+        internal_inc(a)
+        return a + 1
+
+    cached_inc = pw.udfs.DiskCache(ttl=0.2).wrap_sync(inc)
+
+    assert cached_inc(1) == 2
+    assert cached_inc(1) == 2
+    assert internal_inc.call_count == 1
+    time.sleep(0.3)
+    assert cached_inc(1) == 2
+    assert internal_inc.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "eviction_policy", ["least-recently-stored", "least-recently-used"]
+)
+def test_disk_cache_size_limit(monkeypatch, tmp_path: pathlib.Path, eviction_policy):
+    monkeypatch.setenv("PATHWAY_PERSISTENT_STORAGE", str(tmp_path))
+    cache_strategy = pw.udfs.DiskCache(
+        size_limit=1_000_000, eviction_policy=eviction_policy
+    )
+
+    def payload(a: int) -> bytes:
+        return bytes([a % 256]) * 200_000
+
+    cached_payload = cache_strategy.wrap_sync(payload)
+    for i in range(50):
+        assert cached_payload(i) == payload(i)
+
+    assert len(cache_strategy._cache) < 50
+    assert cache_strategy._cache.volume() < 2_000_000
+
+
 @pytest.mark.parametrize("sync", [True, False])
 def test_udf_deterministic_not_stored(monkeypatch, tmp_path: pathlib.Path, sync):
     monkeypatch.delenv("PATHWAY_PERSISTENT_STORAGE", raising=False)
@@ -993,3 +1080,283 @@ def test_udf_dont_warn_on_broader_return_type() -> None:
     with warnings.catch_warnings():
         warnings.simplefilter("error")
         f(pw.this.a)
+
+
+@pytest.mark.parametrize("max_batch_size", [None, 1, 2])
+def test_udf_batch(max_batch_size: int | None) -> None:
+    batch_sizes = []
+
+    @pw.udf(batch=True, max_batch_size=max_batch_size)
+    def add(a: list[int], b: list[int]) -> list[int]:
+        batch_sizes.append(len(a))
+        return [x + y for x, y in zip(a, b)]
+
+    input = T(
+        """
+        a | b
+        1 | 6
+        2 | 7
+        3 | 8
+        """
+    )
+
+    result = input.select(ret=add(pw.this.a, b=pw.this.b))
+
+    assert_table_equality(
+        result,
+        T(
+            """
+            ret
+            7
+            9
+            11
+            """,
+        ),
+    )
+    assert sum(batch_sizes) == 3
+    if max_batch_size is not None:
+        assert max(batch_sizes) <= max_batch_size
+
+
+def test_udf_batch_propagate_none() -> None:
+    @pw.udf(batch=True, propagate_none=True)
+    def add(a: list[int], b: list[int]) -> list[int]:
+        assert all(x is not None for x in a + b)
+        return [x + y for x, y in zip(a, b)]
+
+    input = T(
+        """
+        a | b
+        1 | 6
+        2 |
+          | 8
+        """
+    )
+
+    result = input.select(ret=add(pw.this.a, pw.this.b))
+
+    assert_table_equality(
+        result,
+        T(
+            """
+            ret
+            7
+            None
+            None
+            """,
+        ),
+    )
+
+
+def test_udf_batch_make_deterministic() -> None:
+    internal_inc = mock.Mock()
+
+    @pw.udf(batch=True)
+    def inc(a: list[int]) -> list[int]:
+        for x in a:
+            internal_inc(x)
+        return [x + 1 for x in a]
+
+    input = T(
+        """
+          | a | __time__ | __diff__
+        1 | 1 |     2    |     1
+        2 | 2 |     2    |     1
+        2 | 2 |     4    |    -1
+        3 | 3 |     6    |     1
+        4 | 1 |     8    |     1
+        3 | 3 |     8    |    -1
+        3 | 4 |     8    |     1
+        """
+    )
+
+    result = input.select(ret=inc(pw.this.a))
+
+    assert_table_equality(
+        result,
+        T(
+            """
+              | ret
+            1 | 2
+            3 | 5
+            4 | 2
+            """,
+        ),
+    )
+    assert internal_inc.call_count == 5
+
+
+def test_udf_batch_wrong_number_of_results() -> None:
+    @pw.udf(batch=True)
+    def f(a: list[int]) -> list[int]:
+        return a[:1]
+
+    input = T(
+        """
+        a
+        1
+        2
+        """
+    )
+
+    input.select(ret=f(pw.this.a))
+    with pytest.raises(ValueError, match="batched UDF returned 1 values"):
+        run_all()
+
+
+def test_udf_batch_options_validation() -> None:
+    with pytest.raises(ValueError, match="max_batch_size can only be set"):
+
+        @pw.udf(max_batch_size=10)
+        def f(a: int) -> int:
+            return a
+
+    with pytest.raises(ValueError, match="synchronous executor"):
+
+        @pw.udf(batch=True)
+        async def g(a: list[int]) -> list[int]:
+            return a
+
+
+def test_with_batching() -> None:
+    calls = []
+
+    async def double(items: list[int], *, factor: int) -> list[int]:
+        calls.append(list(items))
+        return [factor * item for item in items]
+
+    batched_double = pw.udfs.with_batching(double, max_batch_size=2, max_wait=0.01)
+
+    async def main():
+        return await asyncio.gather(
+            *(batched_double(i, factor=2) for i in range(5)),
+            batched_double(10, factor=3),
+        )
+
+    assert asyncio.run(main()) == [0, 2, 4, 6, 8, 30]
+    assert sorted(calls) == [[0, 1], [2, 3], [4], [10]]
+
+
+def test_with_batching_keeps_event_loops_apart() -> None:
+    calls = []
+
+    async def double(items: list[int]) -> list[int]:
+        calls.append(items)
+        return [2 * item for item in items]
+
+    batched_double = pw.udfs.with_batching(double, max_batch_size=4, max_wait=0.1)
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def run(items: list[int]) -> None:
+        async def main():
+            barrier.wait()
+            return await asyncio.gather(*(batched_double(i) for i in items))
+
+        results[items[0]] = asyncio.run(main())
+
+    threads = [
+        threading.Thread(target=run, args=(items,)) for items in [[0, 1], [10, 11]]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {0: [0, 2], 10: [20, 22]}
+    assert sorted(calls) == [[0, 1], [10, 11]]
+
+
+def test_with_batching_propagates_errors() -> None:
+    async def fail(items: list[int]) -> list[int]:
+        raise ValueError("boom")
+
+    batched_fail = pw.udfs.with_batching(fail, max_batch_size=10)
+
+    async def main():
+        return await asyncio.gather(
+            *(batched_fail(i) for i in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_tiered_cache(monkeypatch, tmp_path: pathlib.Path):
+    monkeypatch.setenv("PATHWAY_PERSISTENT_STORAGE", str(tmp_path))
+    internal_inc = mock.Mock()
+
+    def inc(a: int) -> int:
+        internal_inc(a)
+        return a + 1
+
+    monkeypatch.setattr(pw.udfs.DiskCache, "_custom_names", set())
+    cache_strategy = pw.udfs.TieredCache("tiered_inc", max_memory_entries=2)
+    cached_inc = cache_strategy.wrap_sync(inc)
+    for a in [1, 2, 1, 3, 1, 2]:
+        assert cached_inc(a) == a + 1
+
+    assert internal_inc.call_count == 3
+    assert cache_strategy.stats.misses == 3
+    assert cache_strategy.stats.memory_hits == 2
+    assert cache_strategy.stats.disk_hits == 1
+    assert cache_strategy.stats.evictions == 2
+
+    # a restarted program defines the cache of the same name again
+    monkeypatch.setattr(pw.udfs.DiskCache, "_custom_names", set())
+    restarted_cache_strategy = pw.udfs.TieredCache("tiered_inc", max_memory_entries=2)
+    restarted_inc = restarted_cache_strategy.wrap_sync(inc)
+    for a in [1, 2, 3]:
+        assert restarted_inc(a) == a + 1
+    assert internal_inc.call_count == 3
+    assert restarted_cache_strategy.stats.disk_hits == 3
+    # the statistics of the restarted cache replace those of the previous one
+    assert get_cache_stats()["tiered_inc"] is restarted_cache_strategy.stats
+
+
+@pytest.mark.parametrize("sync", [True, False])
+def test_udf_tiered_cache_without_persistence(monkeypatch, sync: bool) -> None:
+    monkeypatch.delenv("PATHWAY_PERSISTENT_STORAGE", raising=False)
+    internal_inc = mock.Mock()
+
+    if sync:
+
+        @pw.udf(deterministic=True, cache_strategy=pw.udfs.TieredCache())
+        def inc(a: int) -> int:
+            internal_inc(a)
+            return a + 1
+
+    else:
+
+        @pw.udf(deterministic=True, cache_strategy=pw.udfs.TieredCache())
+        async def inc(a: int) -> int:
+            internal_inc(a)
+            return a + 1
+
+    input = T(
+        """
+        a
+        1
+        2
+        2
+        3
+        1
+        """
+    )
+
+    result = input.select(ret=inc(pw.this.a))
+
+    assert_table_equality(
+        result,
+        T(
+            """
+            ret
+            2
+            3
+            3
+            4
+            2
+            """,
+        ),
+    )
+    assert internal_inc.call_count == 3
@@ -53,12 +53,14 @@ from pathway.internals.udfs import (
     FixedDelayRetryStrategy,
     InMemoryCache,
     NoRetryStrategy,
+    TieredCache,
     async_executor,
     async_options,
     auto_executor,
     coerce_async,
     sync_executor,
     udf,
+    with_batching,
     with_cache_strategy,
     with_capacity,
     with_retry_strategy,
@@ -73,12 +75,14 @@ __all__ = [
     "DefaultCache",
     "DiskCache",
     "InMemoryCache",
+    "TieredCache",
     "AsyncRetryStrategy",
     "ExponentialBackoffRetryStrategy",
     "FixedDelayRetryStrategy",
     "NoRetryStrategy",
     "async_options",
     "coerce_async",
+    "with_batching",
     "with_cache_strategy",
     "with_capacity",
     "with_retry_strategy",
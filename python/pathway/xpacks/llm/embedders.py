@@ -3,6 +3,7 @@
 Pathway embedder UDFs.
 """
 import asyncio
+from collections.abc import Awaitable, Callable
 
 import openai as openai_mod
 
@@ -53,6 +54,24 @@ def _mokeypatch_openai_async():
         pass
 
 
+def _batched_requests(
+    embed_batch: Callable[..., Awaitable[list[list[float]]]],
+    *,
+    capacity: int | None,
+    retry_strategy: udfs.AsyncRetryStrategy | None,
+    max_batch_size: int | None,
+    max_batch_wait: float,
+) -> Callable[..., Awaitable[list[float]]]:
+    """Applies capacity and retries to whole requests and coalesces single texts
+    into requests with up to ``max_batch_size`` inputs."""
+    embed_batch = udfs.async_options(capacity=capacity, retry_strategy=retry_strategy)(
+        embed_batch
+    )
+    return udfs.with_batching(
+        embed_batch, max_batch_size=max_batch_size or 1, max_wait=max_batch_wait
+    )
+
+
 class OpenAIEmbedder(pw.UDF):
     """Pathway wrapper for OpenAI Embedding services.
 
@@ -60,7 +79,7 @@ class OpenAIEmbedder(pw.UDF):
     construction. All other arguments can be overridden during application.
 
     Args:
-        - capacity: Maximum number of concurrent operations allowed.
+        - capacity: Maximum number of concurrent requests allowed.
             Defaults to None, indicating no specific limit.
         - retry_strategy: Strategy for handling retries in case of failures.
             Defaults to None, meaning no retries.
@@ -68,6 +87,11 @@ class OpenAIEmbedder(pw.UDF):
             a valid `CacheStrategy` should be provided.
             See `Cache strategy <https://pathway.com/developers/api-docs/udfs#pathway.udfs.CacheStrategy>`_
             for more information. Defaults to None.
+        - max_batch_size: Maximum number of texts embedded in a single request.
+            Concurrent calls are coalesced into one request with up to this many inputs.
+            Defaults to None, meaning that each text is sent in a separate request.
+        - max_batch_wait: Maximum time (in seconds) to wait for more texts before
+            sending a request. Only used if ``max_batch_size`` is set. Defaults to 0.01.
         - model: ID of the model to use. You can use the
             `List models <https://platform.openai.com/docs/api-reference/models/list>`_ API to
             see all of your available models, or see
@@ -115,18 +139,32 @@ class OpenAIEmbedder(pw.UDF):
         capacity: int | None = None,
         retry_strategy: udfs.AsyncRetryStrategy | None = None,
         cache_strategy: udfs.CacheStrategy | None = None,
+        max_batch_size: int | None = None,
+        max_batch_wait: float = 0.01,
         model: str | None = "text-embedding-ada-002",
         **openai_kwargs,
     ):
         _mokeypatch_openai_async()
-        executor = udfs.async_executor(capacity=capacity, retry_strategy=retry_strategy)
         super().__init__(
-            executor=executor,
+            executor=udfs.async_executor(),
             cache_strategy=cache_strategy,
         )
         self.kwargs = dict(openai_kwargs)
         if model is not None:
             self.kwargs["model"] = model
+        self._embed = _batched_requests(
+            self._embed_batch,
+            capacity=capacity,
+            retry_strategy=retry_strategy,
+            max_batch_size=max_batch_size,
+            max_batch_wait=max_batch_wait,
+        )
+
+    async def _embed_batch(self, inputs: list[str], **kwargs) -> list[list[float]]:
+        api_key = kwargs.pop("api_key", None)
+        client = openai_mod.AsyncOpenAI(api_key=api_key)
+        ret = await client.embeddings.create(input=inputs, **kwargs)
+        return [item.embedding for item in sorted(ret.data, key=lambda x: x.index)]
 
     async def __wrapped__(self, input, **kwargs) -> list[float]:
         """Embed the documents
@@ -137,10 +175,7 @@ class OpenAIEmbedder(pw.UDF):
               will be taken.
         """
         kwargs = {**self.kwargs, **kwargs}
-        api_key = kwargs.pop("api_key", None)
-        client = openai_mod.AsyncOpenAI(api_key=api_key)
-        ret = await client.embeddings.create(input=[input or "."], **kwargs)
-        return ret.data[0].embedding
+        return await self._embed(input or ".", **kwargs)
 
 
 class LiteLLMEmbedder(pw.UDF):
@@ -151,7 +186,7 @@ class LiteLLMEmbedder(pw.UDF):
     during object construction. All other arguments can be overridden during application.
 
     Args:
-        - capacity: Maximum number of concurrent operations allowed.
+        - capacity: Maximum number of concurrent requests allowed.
             Defaults to None, indicating no specific limit.
         - retry_strategy: Strategy for handling retries in case of failures.
             Defaults to None, meaning no retries.
@@ -159,6 +194,11 @@ class LiteLLMEmbedder(pw.UDF):
             a valid `CacheStrategy` should be provided.
             See `Cache strategy <https://pathway.com/developers/api-docs/udfs#pathway.udfs.CacheStrategy>`_
             for more information. Defaults to None.
+        - max_batch_size: Maximum number of texts embedded in a single request.
+            Concurrent calls are coalesced into one request with up to this many inputs.
+            Defaults to None, meaning that each text is sent in a separate request.
+        - max_batch_wait: Maximum time (in seconds) to wait for more texts before
+            sending a request. Only used if ``max_batch_size`` is set. Defaults to 0.01.
         - model: The embedding model to use.
         - timeout: The timeout value for the API call, default 10 mins
         - litellm_call_id: The call ID for litellm logging.
@@ -202,6 +242,8 @@ class LiteLLMEmbedder(pw.UDF):
         capacity: int | None = None,
         retry_strategy: udfs.AsyncRetryStrategy | None = None,
         cache_strategy: udfs.CacheStrategy | None = None,
+        max_batch_size: int | None = None,
+        max_batch_wait: float = 0.01,
         model: str | None = None,
         **llmlite_kwargs,
     ):
@@ -211,14 +253,28 @@ class LiteLLMEmbedder(pw.UDF):
             raise ImportError("Please install litellm: `pip install litellm`")
 
         _mokeypatch_openai_async()
-        executor = udfs.async_executor(capacity=capacity, retry_strategy=retry_strategy)
         super().__init__(
-            executor=executor,
+            executor=udfs.async_executor(),
             cache_strategy=cache_strategy,
         )
         self.kwargs = dict(llmlite_kwargs)
         if model is not None:
             self.kwargs["model"] = model
+        self._embed = _batched_requests(
+            self._embed_batch,
+            capacity=capacity,
+            retry_strategy=retry_strategy,
+            max_batch_size=max_batch_size,
+            max_batch_wait=max_batch_wait,
+        )
+
+    async def _embed_batch(self, inputs: list[str], **kwargs) -> list[list[float]]:
+        import litellm as litellm_mod
+
+        ret = await litellm_mod.aembedding(input=inputs, **kwargs)
+        return [
+            item["embedding"] for item in sorted(ret.data, key=lambda x: x["index"])
+        ]
 
     async def __wrapped__(self, input, **kwargs) -> list[float]:
         """Embed the documents
@@ -228,11 +284,8 @@ class LiteLLMEmbedder(pw.UDF):
             - **kwargs: optional parameters, if unset defaults from the constructor
               will be taken.
         """
-        import litellm as litellm_mod
-
         kwargs = {**self.kwargs, **kwargs}
-        ret = await litellm_mod.aembedding(input=[input or "."], **kwargs)
-        return ret.data[0]["embedding"]
+        return await self._embed(input or ".", **kwargs)
 
 
 class SentenceTransformerEmbedder(pw.UDF):
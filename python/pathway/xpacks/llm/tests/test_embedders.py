@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
+import http.server
 import json
 import os
+import threading
+import types
 
 import pytest
 
@@ -35,3 +39,75 @@ def test_oai_vs_llm():
     r2 = t.select(ret=embedder_oai(pw.this.txt, model=pw.this.model))
 
     assert_table_equality(r1, r2)
+
+
+def test_openai_embedder_batches_requests(monkeypatch):
+    requests = []
+
+    class StubEmbeddingsHandler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            requests.append(body["input"])
+            response = {
+                "object": "list",
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": [float(len(text))]}
+                    for i, text in enumerate(body["input"])
+                ],
+                "model": body["model"],
+                "usage": {"prompt_tokens": 0, "total_tokens": 0},
+            }
+            payload = json.dumps(response).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubEmbeddingsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setenv("OPENAI_API_KEY", "stub")
+
+    try:
+        embedder = embedders.OpenAIEmbedder(max_batch_size=3, max_batch_wait=10.0)
+        t = pw.debug.table_from_markdown(
+            """
+            txt
+            a
+            bb
+            ccc
+            """
+        )
+        result = t.select(ret=embedder(pw.this.txt))
+        _, columns = pw.debug.table_to_dicts(result)
+    finally:
+        server.shutdown()
+
+    assert sorted(list(ret) for ret in columns["ret"].values()) == [[1.0], [2.0], [3.0]]
+    assert len(requests) == 1
+    assert sorted(requests[0]) == ["a", "bb", "ccc"]
+
+
+def test_litellm_embedder_keeps_order_of_inputs(monkeypatch):
+    litellm = pytest.importorskip("litellm")
+
+    async def aembedding(input, **kwargs):
+        # the embeddings are returned out of order, identified by their indices
+        return types.SimpleNamespace(
+            data=[
+                {"object": "embedding", "index": i, "embedding": [float(len(text))]}
+                for i, text in reversed(list(enumerate(input)))
+            ]
+        )
+
+    monkeypatch.setattr(litellm, "aembedding", aembedding)
+    embedder = embedders.LiteLLMEmbedder(model="text-embedding-ada-002")
+
+    result = asyncio.run(embedder._embed_batch(["a", "bb", "ccc"], model="stub"))
+
+    assert result == [[1.0], [2.0], [3.0]]
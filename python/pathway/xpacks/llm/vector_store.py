@@ -86,6 +86,9 @@ class VectorStoreServer:
         - embedder: callable that embeds a single document
         - parser: callable that parses file contents into a list of documents
         - splitter: callable that splits long documents
+        - doc_post_processors: callables that transform the parsed documents and their metadata
+        - index_params: keyword arguments passed to the ``KNNIndex``, e.g.
+          ``{"backend": "usearch"}`` to keep embeddings in a native incrementally updated index
     """
 
     def __init__(
@@ -486,7 +489,13 @@ pw.io.fs.read('./sample_docs', format='binary', mode='static', with_metadata=Tru
             embedding=embedder(pw.this.query),
         )
 
-        retrieval_results = retrieval_queries + knn_index.get_nearest_items(
+        # the usearch backend answers queries against the current state of the index
+        get_nearest_items = (
+            knn_index.get_nearest_items_asof_now
+            if knn_index.backend == "usearch"
+            else knn_index.get_nearest_items
+        )
+        retrieval_results = retrieval_queries + get_nearest_items(
             retrieval_queries.embedding,
             k=pw.this.k,
             collapse_rows=True,
@@ -11,7 +11,9 @@ use std::mem::take;
 use std::str::{from_utf8, Utf8Error};
 
 use crate::connectors::metadata::SourceMetadata;
-use crate::connectors::ReaderContext::{Diff, KeyValue, PreparedEvent, RawBytes, TokenizedEntries};
+use crate::connectors::ReaderContext::{
+    Diff, KeyValue, MappedBytes, PreparedEvent, RawBytes, TokenizedEntries,
+};
 use crate::connectors::{DataEventType, Offset, ReaderContext, SessionType, SnapshotEvent};
 use crate::engine::error::DynError;
 use crate::engine::{Key, Result, Timestamp, Type, Value};
@@ -182,6 +184,12 @@ pub trait Parser: Send {
     fn session_type(&self) -> SessionType {
         SessionType::Native
     }
+
+    /// Returns a parser with the same settings to parse the entries on another thread,
+    /// or `None` if the parsed values depend on the previously parsed entries.
+    fn fork(&self) -> Option<Box<dyn Parser>> {
+        None
+    }
 }
 
 #[derive(Debug)]
@@ -566,6 +574,7 @@ impl Parser for DsvParser {
     fn parse(&mut self, data: &ReaderContext) -> ParseResult {
         match data {
             RawBytes(event, raw_bytes) => self.parse_bytes_simple(*event, raw_bytes),
+            MappedBytes(event, mapped_bytes) => self.parse_bytes_simple(*event, mapped_bytes),
             TokenizedEntries(event, tokenized_entries) => {
                 self.parse_tokenized_entries(*event, tokenized_entries)
             }
@@ -591,6 +600,7 @@ impl Parser for DsvParser {
     }
 }
 
+#[derive(Clone)]
 pub struct IdentityParser {
     value_fields: Vec<String>,
     parse_utf8: bool,
@@ -625,6 +635,9 @@ impl Parser for IdentityParser {
     fn parse(&mut self, data: &ReaderContext) -> ParseResult {
         let (event, key, value, metadata) = match data {
             RawBytes(event, raw_bytes) => (*event, None, self.prepare_bytes(raw_bytes)?, None),
+            MappedBytes(event, mapped_bytes) => {
+                (*event, None, self.prepare_bytes(mapped_bytes)?, None)
+            }
             KeyValue((key, value)) => {
                 let prepared_key = match key {
                     Some(bytes) => Some(vec![self.prepare_bytes(bytes)?]),
@@ -703,6 +716,10 @@ impl Parser for IdentityParser {
     fn session_type(&self) -> SessionType {
         self.session_type
     }
+
+    fn fork(&self) -> Option<Box<dyn Parser>> {
+        Some(Box::new(self.clone()))
+    }
 }
 
 pub struct DsvFormatter {
@@ -820,6 +837,7 @@ pub enum DebeziumDBType {
     MongoDB,
 }
 
+#[derive(Clone)]
 pub struct DebeziumMessageParser {
     key_field_names: Option<Vec<String>>,
     value_field_names: Vec<String>,
@@ -1125,7 +1143,7 @@ impl Parser for DebeziumMessageParser {
                 };
                 (key, value)
             }
-            Diff(_) | TokenizedEntries(_, _) | PreparedEvent(_) => {
+            Diff(_) | MappedBytes(..) | TokenizedEntries(_, _) | PreparedEvent(_) => {
                 return Err(ParseError::UnsupportedReaderContext);
             }
         };
@@ -1185,8 +1203,13 @@ impl Parser for DebeziumMessageParser {
             DebeziumDBType::MongoDB => SessionType::Upsert,
         }
     }
+
+    fn fork(&self) -> Option<Box<dyn Parser>> {
+        Some(Box::new(self.clone()))
+    }
 }
 
+#[derive(Clone)]
 pub struct JsonLinesParser {
     key_field_names: Option<Vec<String>>,
     value_field_names: Vec<String>,
@@ -1225,6 +1248,10 @@ impl Parser for JsonLinesParser {
                 let line = prepare_plaintext_string(line)?;
                 (*event, None, line)
             }
+            MappedBytes(event, line) => {
+                let line = prepare_plaintext_string(line)?;
+                (*event, None, line)
+            }
             KeyValue((_key, value)) => {
                 if let Some(line) = value {
                     let line = prepare_plaintext_string(line)?;
@@ -1312,6 +1339,10 @@ impl Parser for JsonLinesParser {
     fn session_type(&self) -> SessionType {
         self.session_type
     }
+
+    fn fork(&self) -> Option<Box<dyn Parser>> {
+        Some(Box::new(self.clone()))
+    }
 }
 
 /// Receives `ParsedEvent` objects directly from Reader and passes them
@@ -1319,6 +1350,7 @@ impl Parser for JsonLinesParser {
 ///
 /// This is useful for cases where there is no benefit from Reader/Parser
 /// separation.
+#[derive(Clone)]
 pub struct TransparentParser {
     column_count: usize,
 }
@@ -1342,6 +1374,10 @@ impl Parser for TransparentParser {
     fn column_count(&self) -> usize {
         self.column_count
     }
+
+    fn fork(&self) -> Option<Box<dyn Parser>> {
+        Some(Box::new(self.clone()))
+    }
 }
 
 #[derive(Debug)]
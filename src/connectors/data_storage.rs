@@ -16,6 +16,7 @@ use std::io;
 use std::io::BufRead;
 use std::io::BufReader;
 use std::io::BufWriter;
+use std::io::Read;
 use std::io::Write;
 use std::io::{Seek, SeekFrom};
 use std::mem::take;
@@ -25,7 +26,7 @@ use std::str::{from_utf8, Utf8Error};
 use std::sync::Arc;
 use std::thread;
 use std::thread::sleep;
-use std::time::{Duration, SystemTime};
+use std::time::{Duration, Instant, SystemTime};
 
 use chrono::{DateTime, FixedOffset};
 use log::{error, warn};
@@ -34,6 +35,7 @@ use tempfile::{tempdir, TempDir};
 use xxhash_rust::xxh3::Xxh3 as Hasher;
 
 use crate::connectors::data_format::FormatterContext;
+use crate::connectors::mapped_file::{MappedBytes, MappedFile};
 use crate::connectors::metadata::SourceMetadata;
 use crate::connectors::offset::EMPTY_OFFSET;
 use crate::connectors::{Offset, OffsetKey, OffsetValue, ParsedEvent};
@@ -71,61 +73,116 @@ use serde::{Deserialize, Serialize};
 
 #[cfg(target_os = "linux")]
 mod inotify_support {
-    use inotify::WatchMask;
-    use std::path::Path;
-    use std::thread::sleep;
-    use std::time::Duration;
+    use std::collections::{HashMap, HashSet};
+    use std::io::ErrorKind;
+    use std::path::{Path, PathBuf};
 
-    pub use inotify::Inotify;
+    use inotify::{EventMask, Inotify, WatchDescriptor, WatchMask};
 
-    #[allow(dead_code)]
-    pub fn subscribe_inotify(path: impl AsRef<Path>) -> Option<Inotify> {
-        let inotify = Inotify::init().ok()?;
+    /// Watches directories for the changes of the files inside them.
+    #[derive(Debug)]
+    pub struct DirectoryWatcher {
+        inotify: Inotify,
+        directories: HashMap<WatchDescriptor, PathBuf>,
+    }
 
-        inotify
-            .watches()
-            .add(
-                path,
+    impl DirectoryWatcher {
+        pub fn new() -> Option<Self> {
+            Some(Self {
+                inotify: Inotify::init().ok()?,
+                directories: HashMap::new(),
+            })
+        }
+
+        pub fn watch(&mut self, directory: &Path) -> bool {
+            let watched_path = if directory.as_os_str().is_empty() {
+                Path::new(".")
+            } else {
+                directory
+            };
+            let descriptor = self.inotify.watches().add(
+                watched_path,
                 WatchMask::ATTRIB
                     | WatchMask::CLOSE_WRITE
+                    | WatchMask::MODIFY
+                    | WatchMask::CREATE
                     | WatchMask::DELETE
                     | WatchMask::DELETE_SELF
                     | WatchMask::MOVE_SELF
                     | WatchMask::MOVED_FROM
                     | WatchMask::MOVED_TO,
-            )
-            .ok()?;
-
-        Some(inotify)
-    }
-
-    #[allow(clippy::unnecessary_wraps)]
-    pub fn wait(_inotify: &mut Inotify) -> Option<()> {
-        sleep(Duration::from_millis(500));
-        None
+            );
+            match descriptor {
+                Ok(descriptor) => {
+                    self.directories.insert(descriptor, directory.to_path_buf());
+                    true
+                }
+                Err(_) => false,
+            }
+        }
 
-        // Commented out due to using recursive subdirs
-        //
-        // inotify
-        //     .read_events_blocking(&mut [0; 1024])
-        //     .ok()
-        //     .map(|_events| ())
+        /// Adds the paths of the files changed since the previous call to `changed_paths`.
+        ///
+        /// Returns `false` if the changes can't be described by file paths alone, i.e.
+        /// a watched directory changed or the events were lost, and the watched
+        /// directories have to be scanned again.
+        pub fn read_changes(&mut self, changed_paths: &mut HashSet<PathBuf>) -> bool {
+            let mut buffer = [0; 4096];
+            let mut complete = true;
+            loop {
+                let events = match self.inotify.read_events(&mut buffer) {
+                    Ok(events) => events,
+                    Err(e) if e.kind() == ErrorKind::WouldBlock => return complete,
+                    Err(_) => return false,
+                };
+                let mut has_events = false;
+                for event in events {
+                    has_events = true;
+                    if event.mask.contains(EventMask::IGNORED) {
+                        self.directories.remove(&event.wd);
+                    }
+                    if event.mask.intersects(
+                        EventMask::Q_OVERFLOW
+                            | EventMask::ISDIR
+                            | EventMask::DELETE_SELF
+                            | EventMask::MOVE_SELF
+                            | EventMask::IGNORED,
+                    ) {
+                        complete = false;
+                    } else if let (Some(directory), Some(name)) =
+                        (self.directories.get(&event.wd), event.name)
+                    {
+                        changed_paths.insert(directory.join(name));
+                    }
+                }
+                if !has_events {
+                    return complete;
+                }
+            }
+        }
     }
 }
 
 #[cfg(not(target_os = "linux"))]
 mod inotify_support {
-    use std::path::Path;
+    use std::collections::HashSet;
+    use std::path::{Path, PathBuf};
 
     #[derive(Debug)]
-    pub struct Inotify;
+    pub struct DirectoryWatcher;
 
-    pub fn subscribe_inotify(_path: impl AsRef<Path>) -> Option<Inotify> {
-        None
-    }
+    impl DirectoryWatcher {
+        pub fn new() -> Option<Self> {
+            None
+        }
 
-    pub fn wait(_inotify: &mut Inotify) -> Option<()> {
-        None
+        pub fn watch(&mut self, _directory: &Path) -> bool {
+            false
+        }
+
+        pub fn read_changes(&mut self, _changed_paths: &mut HashSet<PathBuf>) -> bool {
+            false
+        }
     }
 }
 
@@ -149,6 +206,7 @@ pub enum DataEventType {
 #[derive(PartialEq, Eq, Debug)]
 pub enum ReaderContext {
     RawBytes(DataEventType, Vec<u8>),
+    MappedBytes(DataEventType, MappedBytes),
     TokenizedEntries(DataEventType, Vec<String>),
     KeyValue((Option<Vec<u8>>, Option<Vec<u8>>)),
     Diff((DataEventType, Option<Value>, Vec<u8>, Option<Vec<u8>>)),
@@ -160,6 +218,10 @@ impl ReaderContext {
         ReaderContext::RawBytes(event, raw_bytes)
     }
 
+    pub fn from_mapped_bytes(event: DataEventType, mapped_bytes: MappedBytes) -> ReaderContext {
+        ReaderContext::MappedBytes(event, mapped_bytes)
+    }
+
     pub fn from_diff(
         event: DataEventType,
         key: Option<Value>,
@@ -475,11 +537,88 @@ impl ReadMethod {
     }
 }
 
+/// Files of at least this size are memory-mapped when read by lines, if it's safe.
+const MIN_MAPPED_FILE_SIZE: u64 = 1024 * 1024;
+
+/// Reads the entries of a file, either through a buffer or, for the large files read
+/// by lines, from the memory mapping of the file, without copying the lines.
+enum FileEntries {
+    Buffered(BufReader<std::fs::File>),
+    Mapped {
+        contents: Arc<MappedFile>,
+        position: usize,
+    },
+}
+
+impl FileEntries {
+    fn open(
+        path: &Path,
+        read_method: ReadMethod,
+        start_offset: u64,
+        can_map: bool,
+    ) -> io::Result<Self> {
+        let file = File::open(path)?;
+        if can_map
+            && read_method == ReadMethod::ByLine
+            && file.metadata()?.len() >= MIN_MAPPED_FILE_SIZE
+        {
+            if let Some(contents) = MappedFile::new(&file)? {
+                return Ok(Self::Mapped {
+                    contents: Arc::new(contents),
+                    position: usize::try_from(start_offset).unwrap_or(usize::MAX),
+                });
+            }
+        }
+        let mut reader = BufReader::new(file);
+        if start_offset > 0 {
+            reader.seek(SeekFrom::Start(start_offset))?;
+        }
+        Ok(Self::Buffered(reader))
+    }
+
+    /// Returns the next entry together with the byte offset of its end, or `None` if
+    /// there are no more entries
+    fn read_next(
+        &mut self,
+        read_method: ReadMethod,
+        event: DataEventType,
+    ) -> Result<Option<(ReaderContext, u64)>, ReadError> {
+        match self {
+            Self::Buffered(reader) => {
+                let mut line = Vec::new();
+                let len = read_method.read_next_bytes(reader, &mut line)?;
+                if len == 0 && read_method == ReadMethod::ByLine {
+                    return Ok(None);
+                }
+                let bytes_offset = reader.stream_position()?;
+                Ok(Some((
+                    ReaderContext::from_raw_bytes(event, line),
+                    bytes_offset,
+                )))
+            }
+            Self::Mapped { contents, position } => {
+                let remaining = contents.get(*position..).unwrap_or_default();
+                if remaining.is_empty() {
+                    return Ok(None);
+                }
+                let length =
+                    memchr::memchr(b'\n', remaining).map_or(remaining.len(), |index| index + 1);
+                let line = MappedBytes::new(contents.clone(), *position..*position + length);
+                *position += length;
+                Ok(Some((
+                    ReaderContext::from_mapped_bytes(event, line),
+                    *position as u64,
+                )))
+            }
+        }
+    }
+}
+
 pub struct FilesystemReader {
     persistent_id: Option<PersistentId>,
     read_method: ReadMethod,
 
-    reader: Option<BufReader<std::fs::File>>,
+    reader: Option<FileEntries>,
     filesystem_scanner: FilesystemScanner,
     total_entries_read: u64,
     deferred_read_result: Option<ReadResult>,
@@ -506,6 +645,35 @@ impl FilesystemReader {
             deferred_read_result: None,
         })
     }
+
+    /// Sets how the modified files are processed. Files read in full are always reread.
+    #[must_use]
+    pub fn with_modification_mode(mut self, modification_mode: ModificationMode) -> Self {
+        let modification_mode = match self.read_method {
+            ReadMethod::ByLine => modification_mode,
+            ReadMethod::Full => ModificationMode::Reread,
+        };
+        self.filesystem_scanner
+            .set_modification_mode(modification_mode);
+        self
+    }
+
+    /// Makes the reader read only its part of the files. In the static mode, the large
+    /// files read by lines are split into byte ranges read by all of the readers.
+    #[must_use]
+    pub fn with_partition(mut self, partition: FilesPartition) -> Self {
+        self.filesystem_scanner
+            .set_partition(partition, self.read_method == ReadMethod::ByLine);
+        self
+    }
+
+    /// Sets the size from which the files are split between the readers.
+    #[must_use]
+    pub fn with_min_split_file_size(mut self, min_split_file_size: u64) -> Self {
+        self.filesystem_scanner
+            .set_min_split_file_size(min_split_file_size);
+        self
+    }
 }
 
 impl Reader for FilesystemReader {
@@ -527,12 +695,12 @@ impl Reader for FilesystemReader {
             .seek_to_file(file_path_arc.as_path())?;
 
         // Seek within a particular file
-        self.reader = {
-            let file = File::open(file_path_arc.as_path())?;
-            let mut reader = BufReader::new(file);
-            reader.seek(SeekFrom::Start(*bytes_offset))?;
-            Some(reader)
-        };
+        self.reader = Some(FileEntries::open(
+            file_path_arc.as_path(),
+            self.read_method,
+            *bytes_offset,
+            false,
+        )?);
         self.total_entries_read = *total_entries_read;
 
         Ok(())
@@ -545,9 +713,20 @@ impl Reader for FilesystemReader {
 
         loop {
             if let Some(reader) = &mut self.reader {
-                let mut line = Vec::new();
-                let len = self.read_method.read_next_bytes(reader, &mut line)?;
-                if len > 0 || self.read_method == ReadMethod::Full {
+                let data_event_type = self
+                    .filesystem_scanner
+                    .data_event_type()
+                    .expect("scanner action can't be empty");
+                let next_entry = reader.read_next(self.read_method, data_event_type)?;
+                // A line ending past the end of the read range starts in the next one
+                let end_offset = self.filesystem_scanner.current_end_offset();
+                let next_entry = next_entry.filter(|(_, bytes_offset)| {
+                    end_offset.map_or(true, |end_offset| *bytes_offset <= end_offset)
+                });
+                if let Some((entry, bytes_offset)) = next_entry {
+                    if !self.filesystem_scanner.is_line_selected(bytes_offset) {
+                        continue;
+                    }
                     self.total_entries_read += 1;
 
                     let offset = (
@@ -559,13 +738,9 @@ impl Reader for FilesystemReader {
                                 .current_offset_file()
                                 .clone()
                                 .unwrap(),
-                            bytes_offset: reader.stream_position().unwrap(),
+                            bytes_offset,
                         },
                     );
-                    let data_event_type = self
-                        .filesystem_scanner
-                        .data_event_type()
-                        .expect("scanner action can't be empty");
 
                     if self.read_method == ReadMethod::Full {
                         self.deferred_read_result = Some(ReadResult::FinishedSource {
@@ -574,10 +749,7 @@ impl Reader for FilesystemReader {
                         self.reader = None;
                     }
 
-                    return Ok(ReadResult::Data(
-                        ReaderContext::from_raw_bytes(data_event_type, line),
-                        offset,
-                    ));
+                    return Ok(ReadResult::Data(entry, offset));
                 }
 
                 self.reader = None;
@@ -589,8 +761,12 @@ impl Reader for FilesystemReader {
             let next_read_result = self.filesystem_scanner.next_action_determined()?;
             if let Some(next_read_result) = next_read_result {
                 if let Some(selected_file) = self.filesystem_scanner.current_file() {
-                    let file = File::open(&*selected_file)?;
-                    self.reader = Some(BufReader::new(file));
+                    self.reader = Some(FileEntries::open(
+                        &selected_file,
+                        self.read_method,
+                        self.filesystem_scanner.current_start_offset(),
+                        self.filesystem_scanner.can_map_current_file(),
+                    )?);
                 }
                 return Ok(next_read_result);
             }
@@ -745,26 +921,375 @@ impl KafkaReader {
     }
 }
 
+/// Describes how the rows of a file modified after it was read are updated.
+#[derive(Clone, Copy, Debug, Eq, PartialEq)]
+pub enum ModificationMode {
+    /// The rows of the old version are removed and the new version is read in full.
+    Reread,
+    /// If the previously read content is the prefix of the new one, only the appended
+    /// lines are read. Otherwise, the file is reread.
+    Append,
+    /// As `Append`, but if a small file was rewritten, only the changed lines are
+    /// removed and inserted.
+    Diff,
+}
+
+/// Files larger than that are reread in full when modified in the `Diff` mode.
+const MAX_DIFFED_FILE_SIZE: u64 = 16 * 1024 * 1024;
+
+/// The size of the windows at the beginning and at the end of the previously read
+/// content, which are compared to tell whether the file was only appended to.
+const APPEND_CHECK_WINDOW_SIZE: u64 = 64 * 1024;
+
+/// Files of at least this size are split into byte ranges between the parallel readers,
+/// if the splitting is enabled and no other threshold is set.
+const DEFAULT_MIN_SPLIT_FILE_SIZE: u64 = 64 * 1024 * 1024;
+
+/// Identifies the part of the matched files read by one of the parallel readers.
+///
+/// The files are assigned to the readers by the hash of their paths. Large files may
+/// be split into newline-aligned byte ranges read by all of the readers.
+#[derive(Clone, Copy, Debug, Eq, PartialEq)]
+pub struct FilesPartition {
+    index: usize,
+    count: usize,
+}
+
+impl Default for FilesPartition {
+    fn default() -> Self {
+        Self { index: 0, count: 1 }
+    }
+}
+
+impl FilesPartition {
+    pub fn new(index: usize, count: usize) -> Self {
+        assert!(index < count, "partition index out of range");
+        Self { index, count }
+    }
+
+    fn is_assigned(&self, path: &Path) -> bool {
+        if self.count == 1 {
+            return true;
+        }
+        let mut hasher = Hasher::default();
+        hasher.update(path.as_os_str().as_bytes());
+        hasher.digest() % self.count as u64 == self.index as u64
+    }
+
+    /// Returns the range of bytes of a file of the given size read by this reader.
+    /// The ends of the range are moved to the beginnings of the lines, so that every
+    /// line is read by exactly one reader.
+    fn byte_range(&self, path: &Path, size: u64) -> io::Result<(u64, u64)> {
+        let boundary = |part: usize| {
+            if part == self.count {
+                Ok(u64::MAX)
+            } else {
+                line_start_at_or_after(path, size * part as u64 / self.count as u64)
+            }
+        };
+        Ok((boundary(self.index)?, boundary(self.index + 1)?))
+    }
+}
+
+fn line_start_at_or_after(path: &Path, offset: u64) -> io::Result<u64> {
+    if offset == 0 {
+        return Ok(0);
+    }
+    let mut reader = BufReader::new(File::open(path)?);
+    reader.seek(SeekFrom::Start(offset - 1))?;
+    let mut line_end = Vec::new();
+    let length = reader.read_until(b'\n', &mut line_end)?;
+    Ok(offset - 1 + length as u64)
+}
+
 #[derive(Debug)]
 enum PosixScannerAction {
     Read(Arc<PathBuf>),
     Delete(Arc<PathBuf>),
+    // Read the file from the given byte offset
+    Append(Arc<PathBuf>, u64),
+    // Read the lines starting in the given range of bytes of the file
+    ReadRange(Arc<PathBuf>, u64, u64),
+    // Delete or read only the lines ending at the given byte offsets
+    DeleteLines(Arc<PathBuf>, Arc<HashSet<u64>>),
+    ReadLines(Arc<PathBuf>, Arc<HashSet<u64>>),
 }
 
+impl PosixScannerAction {
+    fn path(&self) -> &Arc<PathBuf> {
+        match self {
+            Self::Read(path)
+            | Self::Delete(path)
+            | Self::Append(path, _)
+            | Self::ReadRange(path, ..)
+            | Self::DeleteLines(path, _)
+            | Self::ReadLines(path, _) => path,
+        }
+    }
+}
+
+fn read_file_range(path: &Path, start: u64, length: u64) -> io::Result<Vec<u8>> {
+    let mut file = File::open(path)?;
+    file.seek(SeekFrom::Start(start))?;
+    let mut buffer = Vec::new();
+    file.take(length).read_to_end(&mut buffer)?;
+    Ok(buffer)
+}
+
+/// Tells whether the first `length` bytes of the file at `path` are still the same as
+/// the ones of `previous_path`, comparing the windows at the beginning and at the end.
+/// The bytes between the windows aren't compared, so that the check doesn't read the
+/// whole file on every append, and their changes go unnoticed.
+fn is_same_prefix(previous_path: &Path, path: &Path, length: u64) -> io::Result<bool> {
+    let tail_start = length.saturating_sub(APPEND_CHECK_WINDOW_SIZE);
+    for (start, window_length) in [
+        (0, APPEND_CHECK_WINDOW_SIZE.min(length)),
+        (tail_start, length - tail_start),
+    ] {
+        if read_file_range(previous_path, start, window_length)?
+            != read_file_range(path, start, window_length)?
+        {
+            return Ok(false);
+        }
+    }
+    Ok(true)
+}
+
+/// Splits the contents into lines, identified by the byte offsets of their ends.
+fn lines_by_end_offset(contents: &[u8]) -> HashSet<(u64, &[u8])> {
+    let mut end_offset = 0;
+    contents
+        .split_inclusive(|byte| *byte == b'\n')
+        .map(|line| {
+            end_offset += line.len() as u64;
+            (end_offset, line)
+        })
+        .collect()
+}
+
+/// Returns the end offsets of the lines removed from the old contents and of the lines
+/// added in the new ones. The lines are compared together with their positions, as the
+/// positions identify the rows read from the file.
+fn diff_lines(old_contents: &[u8], new_contents: &[u8]) -> (HashSet<u64>, HashSet<u64>) {
+    let old_lines = lines_by_end_offset(old_contents);
+    let new_lines = lines_by_end_offset(new_contents);
+    let removed = old_lines
+        .difference(&new_lines)
+        .map(|(end_offset, _)| *end_offset)
+        .collect();
+    let added = new_lines
+        .difference(&old_lines)
+        .map(|(end_offset, _)| *end_offset)
+        .collect();
+    (removed, added)
+}
+
+fn unix_timestamp_secs(time: SystemTime) -> u64 {
+    time.duration_since(SystemTime::UNIX_EPOCH)
+        .expect("System time should be after the Unix epoch")
+        .as_secs()
+}
+
+/// Lists the files matching the scanned pattern together with their modification times.
+///
+/// If the pattern is a plain path and inotify is available, the traversed directories
+/// are watched, and between the scans only the paths reported by the watcher are examined
+/// again. The tree is scanned in full at the start, after a change of the directory
+/// structure, after the events were lost and every `FULL_SCAN_INTERVAL`, since the
+/// writes through a memory mapping aren't reported. Otherwise it is listed once per poll.
 #[derive(Debug)]
-struct FilesystemScanner {
+struct FileIndex {
     path: GlobPattern,
+    object_pattern: String,
+    watcher: Option<inotify_support::DirectoryWatcher>,
+    watched_files_pattern: Option<GlobPattern>,
+    full_scan_needed: bool,
+    last_full_scan_at: Option<Instant>,
+}
+
+const FULL_SCAN_INTERVAL: Duration = Duration::from_secs(60);
+
+impl FileIndex {
+    fn new(
+        path: GlobPattern,
+        object_pattern: &str,
+        watch_changes: bool,
+    ) -> Result<FileIndex, ReadError> {
+        // A wildcard may match directories anywhere, so only plain paths are watched
+        let is_plain_path = GlobPattern::escape(path.as_str()) == path.as_str();
+        let watcher = if watch_changes && is_plain_path {
+            inotify_support::DirectoryWatcher::new()
+        } else {
+            None
+        };
+        let watched_files_pattern = if watcher.is_some() {
+            Some(GlobPattern::new(&format!(
+                "{}/**/{object_pattern}",
+                path.as_str().trim_end_matches('/')
+            ))?)
+        } else {
+            None
+        };
+
+        Ok(Self {
+            path,
+            object_pattern: object_pattern.to_string(),
+            watcher,
+            watched_files_pattern,
+            full_scan_needed: true,
+            last_full_scan_at: None,
+        })
+    }
+
+    /// Lists all matching files, taking a single `stat` of each of them, and watches
+    /// the traversed directories. The returned flag tells if all of them are watched.
+    fn scan(&mut self) -> Result<(HashMap<PathBuf, SystemTime>, bool), ReadError> {
+        let mut files = HashMap::new();
+        let mut is_watched = false;
+        if let Some(watcher) = &mut self.watcher {
+            is_watched = true;
+            // changes of the file at the plain path are reported for its directory
+            let path = Path::new(self.path.as_str());
+            if !path.is_dir() {
+                is_watched = path.parent().is_some_and(|parent| watcher.watch(parent));
+            }
+        }
+
+        let mut has_matches = false;
+        for entry in glob::glob(self.path.as_str())?.flatten() {
+            has_matches = true;
+            let Ok(metadata) = std::fs::metadata(&entry) else {
+                continue;
+            };
+            if metadata.is_file() {
+                if let Ok(modified_at) = metadata.modified() {
+                    files.insert(entry, modified_at);
+                }
+                continue;
+            }
+
+            // Otherwise scan all files in all subdirectories and add them
+            let Some(path) = entry.to_str() else {
+                error!("Non-unicode paths are not supported. Ignoring: {entry:?}");
+                continue;
+            };
+            let files_pattern = GlobPattern::new(&format!("{path}/**/{}", self.object_pattern))?;
+            let mut directories = vec![entry];
+            while let Some(directory) = directories.pop() {
+                if let Some(watcher) = &mut self.watcher {
+                    is_watched &= watcher.watch(&directory);
+                }
+                let Ok(directory_entries) = std::fs::read_dir(&directory) else {
+                    continue;
+                };
+                for directory_entry in directory_entries.flatten() {
+                    let Ok(file_type) = directory_entry.file_type() else {
+                        continue;
+                    };
+                    let nested_entry = directory_entry.path();
+                    if file_type.is_dir() {
+                        directories.push(nested_entry);
+                        continue;
+                    }
+                    let is_matching = files_pattern.matches_path(&nested_entry);
+                    if !is_matching && !file_type.is_symlink() {
+                        continue;
+                    }
+                    let Ok(metadata) = std::fs::metadata(&nested_entry) else {
+                        continue;
+                    };
+                    if metadata.is_dir() {
+                        directories.push(nested_entry);
+                    } else if is_matching && metadata.is_file() {
+                        if let Ok(modified_at) = metadata.modified() {
+                            files.insert(nested_entry, modified_at);
+                        }
+                    }
+                }
+            }
+        }
+
+        Ok((files, is_watched && has_matches))
+    }
+
+    fn watched_file_modification_time(&self, path: &Path) -> Option<SystemTime> {
+        let is_matching = path == Path::new(self.path.as_str())
+            || self
+                .watched_files_pattern
+                .as_ref()
+                .is_some_and(|pattern| pattern.matches_path(path));
+        if !is_matching {
+            return None;
+        }
+        let metadata = std::fs::metadata(path).ok()?;
+        if metadata.is_file() {
+            metadata.modified().ok()
+        } else {
+            None
+        }
+    }
+
+    /// Returns the files that might have changed since the previous call, with their
+    /// modification times, or `None` if they no longer match the pattern.
+    fn changes(
+        &mut self,
+        known_files: &HashMap<PathBuf, u64>,
+    ) -> Result<Vec<(PathBuf, Option<SystemTime>)>, ReadError> {
+        let mut changed_paths = HashSet::new();
+        if !self.full_scan_needed {
+            if let Some(watcher) = &mut self.watcher {
+                self.full_scan_needed = !watcher.read_changes(&mut changed_paths)
+                    || self.last_full_scan_at.map_or(true, |scanned_at| {
+                        scanned_at.elapsed() >= FULL_SCAN_INTERVAL
+                    });
+            }
+        }
+
+        if self.full_scan_needed {
+            let (files, is_watched) = self.scan()?;
+            self.full_scan_needed = !is_watched;
+            self.last_full_scan_at = Some(Instant::now());
+            let mut changes: Vec<_> = known_files
+                .keys()
+                .filter(|path| !files.contains_key(*path))
+                .map(|path| (path.clone(), None))
+                .collect();
+            changes.extend(
+                files
+                    .into_iter()
+                    .map(|(path, modified_at)| (path, Some(modified_at))),
+            );
+            return Ok(changes);
+        }
+
+        Ok(changed_paths
+            .into_iter()
+            .map(|path| {
+                let modified_at = self.watched_file_modification_time(&path);
+                (path, modified_at)
+            })
+            .collect())
+    }
+}
+
+#[derive(Debug)]
+struct FilesystemScanner {
+    file_index: FileIndex,
     cache_directory_path: Option<PathBuf>,
     streaming_mode: ConnectorMode,
-    object_pattern: String,
 
     // Mapping from the path of the loaded file to its modification timestamp
     known_files: HashMap<PathBuf, u64>,
 
     current_action: Option<PosixScannerAction>,
-    cached_modify_times: HashMap<PathBuf, Option<SystemTime>>,
-    inotify: Option<inotify_support::Inotify>,
+    planned_deletions: VecDeque<PathBuf>,
+    planned_insertions: VecDeque<PathBuf>,
     next_file_for_insertion: Option<PathBuf>,
+    next_lines_for_insertion: Option<(PathBuf, Arc<HashSet<u64>>)>,
+    modification_mode: ModificationMode,
+    partition: FilesPartition,
+    split_large_files: bool,
+    min_split_file_size: u64,
     cached_metadata: HashMap<PathBuf, Option<SourceMetadata>>,
 
     // Storage is deleted on object destruction, so we need to store it
@@ -780,10 +1305,11 @@ impl FilesystemScanner {
         object_pattern: &str,
     ) -> Result<FilesystemScanner, ReadError> {
         let path_glob = GlobPattern::new(path)?;
-
-        // Alternative solution here is to do inotify_support::subscribe_inotify(path)
-        // if streaming mode allows polling.
-        let inotify = None;
+        let file_index = FileIndex::new(
+            path_glob,
+            object_pattern,
+            streaming_mode.is_polling_enabled(),
+        )?;
 
         let (cache_directory_path, connector_tmp_storage) = {
             if streaming_mode.are_deletions_enabled() {
@@ -809,23 +1335,27 @@ impl FilesystemScanner {
         };
 
         Ok(Self {
-            path: path_glob,
+            file_index,
             streaming_mode,
             cache_directory_path,
 
-            object_pattern: object_pattern.to_string(),
             known_files: HashMap::new(),
             current_action: None,
-            cached_modify_times: HashMap::new(),
-            inotify,
+            planned_deletions: VecDeque::new(),
+            planned_insertions: VecDeque::new(),
             next_file_for_insertion: None,
+            next_lines_for_insertion: None,
+            modification_mode: ModificationMode::Reread,
+            partition: FilesPartition::default(),
+            split_large_files: false,
+            min_split_file_size: DEFAULT_MIN_SPLIT_FILE_SIZE,
             cached_metadata: HashMap::new(),
             _connector_tmp_storage: connector_tmp_storage,
         })
     }
 
     fn has_planned_insertion(&self) -> bool {
-        self.next_file_for_insertion.is_some()
+        self.next_file_for_insertion.is_some() || self.next_lines_for_insertion.is_some()
     }
 
     fn is_polling_enabled(&self) -> bool {
@@ -836,29 +1366,112 @@ impl FilesystemScanner {
         self.current_action
             .as_ref()
             .map(|current_action| match current_action {
-                PosixScannerAction::Read(_) => DataEventType::Insert,
-                PosixScannerAction::Delete(_) => DataEventType::Delete,
+                PosixScannerAction::Read(_)
+                | PosixScannerAction::Append(..)
+                | PosixScannerAction::ReadRange(..)
+                | PosixScannerAction::ReadLines(..) => DataEventType::Insert,
+                PosixScannerAction::Delete(_) | PosixScannerAction::DeleteLines(..) => {
+                    DataEventType::Delete
+                }
             })
     }
 
     /// Returns the actual file path, which needs to be read
     /// It is either a path to the file in the input directory, or a path to the file
-    /// which is saved in cache
+    /// which is saved in cache. If the cache is enabled, the files are read from it,
+    /// so that it always holds exactly what was read.
     fn current_file(&self) -> Option<Arc<PathBuf>> {
-        match &self.current_action {
-            Some(PosixScannerAction::Read(path)) => Some(path.clone()),
-            Some(PosixScannerAction::Delete(path)) => self.cached_file_path(path).map(Arc::new),
-            None => None,
-        }
+        let path = self.current_action.as_ref()?.path();
+        Some(
+            self.cached_file_path(path)
+                .map_or_else(|| path.clone(), Arc::new),
+        )
     }
 
     /// Returns the name of the currently processed file in the input directory
     fn current_offset_file(&self) -> Option<Arc<PathBuf>> {
+        self.current_action
+            .as_ref()
+            .map(|current_action| current_action.path().clone())
+    }
+
+    /// Tells whether the current file can be memory-mapped. Only the cached copies owned
+    /// by the connector are mapped, as they are never truncated: reading the pages past
+    /// the end of a truncated file raises `SIGBUS`, while the input files can be truncated
+    /// by other processes at any time.
+    fn can_map_current_file(&self) -> bool {
+        self.cache_directory_path.is_some()
+    }
+
+    /// Returns the byte offset the current file needs to be read from
+    fn current_start_offset(&self) -> u64 {
         match &self.current_action {
-            Some(PosixScannerAction::Read(path) | PosixScannerAction::Delete(path)) => {
-                Some(path.clone())
-            }
-            None => None,
+            Some(
+                PosixScannerAction::Append(_, offset) | PosixScannerAction::ReadRange(_, offset, _),
+            ) => *offset,
+            _ => 0,
+        }
+    }
+
+    /// Returns the byte offset the lines of the current file need to start before,
+    /// if only a part of the file is read
+    fn current_end_offset(&self) -> Option<u64> {
+        match &self.current_action {
+            Some(PosixScannerAction::ReadRange(_, _, end_offset)) => Some(*end_offset),
+            _ => None,
+        }
+    }
+
+    /// Tells whether the line of the current file ending at the given byte offset
+    /// needs to be processed
+    fn is_line_selected(&self, end_offset: u64) -> bool {
+        match &self.current_action {
+            Some(
+                PosixScannerAction::DeleteLines(_, lines) | PosixScannerAction::ReadLines(_, lines),
+            ) => lines.contains(&end_offset),
+            _ => true,
+        }
+    }
+
+    fn set_modification_mode(&mut self, modification_mode: ModificationMode) {
+        self.modification_mode = modification_mode;
+    }
+
+    /// Restricts the scanner to the given part of the files. Large files are split
+    /// between the readers only if requested and only if the files don't need to be
+    /// tracked for deletions, which requires reading them in full.
+    fn set_partition(&mut self, partition: FilesPartition, split_large_files: bool) {
+        self.partition = partition;
+        self.split_large_files = split_large_files
+            && partition.count > 1
+            && !self.streaming_mode.are_deletions_enabled();
+    }
+
+    fn set_min_split_file_size(&mut self, min_split_file_size: u64) {
+        self.min_split_file_size = min_split_file_size;
+    }
+
+    /// Tells whether the file is read by this reader. The files split into byte ranges
+    /// are read by all of them.
+    fn is_assigned(&self, path: &Path) -> bool {
+        self.partition.is_assigned(path)
+            || (self.split_large_files
+                && std::fs::metadata(path)
+                    .is_ok_and(|metadata| metadata.len() >= self.min_split_file_size))
+    }
+
+    /// Returns the action reading the file, or the part of it assigned to this reader
+    fn read_action(&self, path: &Path, size: u64) -> io::Result<PosixScannerAction> {
+        let path = Arc::new(path.to_path_buf());
+        if self.split_large_files && size >= self.min_split_file_size {
+            let (start_offset, end_offset) = self.partition.byte_range(&path, size)?;
+            Ok(PosixScannerAction::ReadRange(
+                path,
+                start_offset,
+                end_offset,
+            ))
+        } else {
+            Ok(PosixScannerAction::Read(path))
         }
     }
 
@@ -868,8 +1481,8 @@ impl FilesystemScanner {
         }
 
         self.known_files.clear();
-        let target_modify_time = match std::fs::metadata(seek_file_path) {
-            Ok(metadata) => metadata.modified()?,
+        let target_metadata = match std::fs::metadata(seek_file_path) {
+            Ok(metadata) => metadata,
             Err(e) => {
                 if !matches!(e.kind(), std::io::ErrorKind::NotFound) {
                     return Err(ReadError::Io(e));
@@ -880,42 +1493,23 @@ impl FilesystemScanner {
                 return Ok(());
             }
         };
-        let matching_files: Vec<PathBuf> = self.get_matching_file_paths()?;
-        for entry in matching_files {
-            if !entry.is_file() {
-                continue;
-            }
-            let Some(modify_time) = self.modify_time(&entry) else {
-                continue;
-            };
-            if (modify_time, entry.as_path()) <= (target_modify_time, seek_file_path) {
-                let modify_timestamp = modify_time
-                    .duration_since(SystemTime::UNIX_EPOCH)
-                    .expect("System time should be after the Unix epoch")
-                    .as_secs();
-                self.known_files.insert(entry, modify_timestamp);
+        let target_modify_time = target_metadata.modified()?;
+        let (matching_files, _) = self.file_index.scan()?;
+        for (entry, modify_time) in matching_files {
+            if (modify_time, entry.as_path()) <= (target_modify_time, seek_file_path)
+                && self.is_assigned(&entry)
+            {
+                self.known_files
+                    .insert(entry, unix_timestamp_secs(modify_time));
             }
         }
-        self.current_action = Some(PosixScannerAction::Read(Arc::new(
-            seek_file_path.to_path_buf(),
-        )));
+        self.planned_deletions.clear();
+        self.planned_insertions.clear();
+        self.current_action = Some(self.read_action(seek_file_path, target_metadata.len())?);
 
         Ok(())
     }
 
-    fn modify_time(&mut self, entry: &Path) -> Option<SystemTime> {
-        if self.streaming_mode.are_deletions_enabled() {
-            // If deletions are enabled, we also need to handle the case when the modification
-            // time of an entry changes. Hence, we can't just memorize it once.
-            entry.metadata().ok()?.modified().ok()
-        } else {
-            *self
-                .cached_modify_times
-                .entry(entry.to_path_buf())
-                .or_insert_with(|| entry.metadata().ok()?.modified().ok())
-        }
-    }
-
     /// Finish reading the current file and find the next one to read from.
     /// If there is a file to read from, the method returns a `ReadResult`
     /// specifying the action to be provided downstream.
@@ -926,11 +1520,27 @@ impl FilesystemScanner {
     /// scheduled action.
     fn next_action_determined(&mut self) -> Result<Option<ReadResult>, ReadError> {
         // Finalize the current processing action
-        if let Some(PosixScannerAction::Delete(path)) = take(&mut self.current_action) {
-            let cached_path = self
-                .cached_file_path(&path)
-                .expect("in case of enabled deletions cache should exist");
-            std::fs::remove_file(cached_path)?;
+        match take(&mut self.current_action) {
+            Some(PosixScannerAction::Delete(path)) => {
+                let cached_path = self
+                    .cached_file_path(&path)
+                    .expect("in case of enabled deletions cache should exist");
+                std::fs::remove_file(cached_path)?;
+            }
+            Some(PosixScannerAction::DeleteLines(path, _)) => {
+                let cached_path = self
+                    .cached_file_path(&path)
+                    .expect("in case of enabled deletions cache should exist");
+                std::fs::rename(Self::next_cached_file_path(&cached_path), cached_path)?;
+            }
+            _ => {}
+        }
+
+        // The removed lines of a diffed file are followed by the added ones
+        if let Some((path, lines)) = take(&mut self.next_lines_for_insertion) {
+            let metadata = self.cached_metadata.get(&path).cloned().flatten();
+            self.current_action = Some(PosixScannerAction::ReadLines(Arc::new(path), lines));
+            return Ok(Some(ReadResult::NewSource(metadata)));
         }
 
         // File modification is handled as combination of its deletion and insertion
@@ -951,140 +1561,173 @@ impl FilesystemScanner {
             }));
         }
 
+        if self.planned_deletions.is_empty() && self.planned_insertions.is_empty() {
+            self.plan_actions()?;
+        }
+
         // First check if we need to delete something
-        if self.streaming_mode.are_deletions_enabled() {
-            let next_for_deletion = self.next_deletion_entry();
-            if next_for_deletion.is_some() {
-                return Ok(next_for_deletion);
+        if let Some(path) = self.planned_deletions.pop_front() {
+            if let Some(read_result) = self.initiate_incremental_update(&path)? {
+                return Ok(Some(read_result));
             }
+            return Ok(Some(self.initiate_file_deletion(path)));
         }
 
         // If there is nothing to delete, ingest the new entries
-        self.next_insertion_entry()
-    }
-
-    fn next_deletion_entry(&mut self) -> Option<ReadResult> {
-        let mut path_for_deletion: Option<PathBuf> = None;
-        for (path, modified_at) in &self.known_files {
-            let metadata = std::fs::metadata(path);
-            let needs_deletion = {
-                match metadata {
-                    Err(e) => e.kind() == std::io::ErrorKind::NotFound,
-                    Ok(metadata) => {
-                        if let Ok(new_modification_time) = metadata.modified() {
-                            let modified_at_new = new_modification_time
-                                .duration_since(SystemTime::UNIX_EPOCH)
-                                .expect("System time should be after the Unix epoch")
-                                .as_secs();
-                            modified_at_new != *modified_at
-                        } else {
-                            false
-                        }
+        while let Some(path) = self.planned_insertions.pop_front() {
+            match self.initiate_file_insertion(&path) {
+                Ok(read_result) => return Ok(Some(read_result)),
+                // The file was deleted after the insertion had been planned
+                Err(e) if e.kind() == std::io::ErrorKind::NotFound => continue,
+                Err(e) => return Err(ReadError::Io(e)),
+            }
+        }
+
+        Ok(None)
+    }
+
+    /// Compares the changed files with the known ones and plans the deletions and
+    /// insertions for the whole batch at once: deletions ordered by path, then
+    /// insertions ordered by modification time and path.
+    fn plan_actions(&mut self) -> Result<(), ReadError> {
+        let mut deletions = Vec::new();
+        let mut insertions = Vec::new();
+        for (path, modified_at) in self.file_index.changes(&self.known_files)? {
+            match (self.known_files.get(&path), modified_at) {
+                (None, Some(modified_at)) => {
+                    if self.is_assigned(&path) {
+                        insertions.push((modified_at, path));
                     }
                 }
-            };
-            if needs_deletion {
-                match &path_for_deletion {
-                    None => path_for_deletion = Some(path.clone()),
-                    Some(other_path) => {
-                        if other_path > path {
-                            path_for_deletion = Some(path.clone());
-                        }
-                    }
+                (Some(_), None) => deletions.push(path),
+                (Some(known_modified_at), Some(modified_at))
+                    if unix_timestamp_secs(modified_at) != *known_modified_at =>
+                {
+                    deletions.push(path);
                 }
+                _ => {}
             }
         }
 
-        match path_for_deletion {
-            Some(path) => {
-                // Metadata of the deleted file must be the same as when it was added
-                // so that the deletion event is processed correctly by timely. To achieve
-                // this, we just take the cached metadata
-                let old_metadata = self
-                    .cached_metadata
-                    .remove(&path)
-                    .expect("inconsistency between known_files and cached_metadata");
-
-                self.known_files.remove(&path.clone().clone());
-                self.current_action = Some(PosixScannerAction::Delete(Arc::new(path.clone())));
-                if path.exists() {
-                    self.next_file_for_insertion = Some(path);
-                }
-                Some(ReadResult::NewSource(old_metadata))
-            }
-            None => None,
+        if self.streaming_mode.are_deletions_enabled() {
+            deletions.sort_unstable();
+            self.planned_deletions.extend(deletions);
         }
-    }
+        insertions.sort_unstable();
+        self.planned_insertions
+            .extend(insertions.into_iter().map(|(_, path)| path));
 
-    fn cached_file_path(&self, path: &Path) -> Option<PathBuf> {
-        self.cache_directory_path.as_ref().map(|root_path| {
-            let mut hasher = Hasher::default();
-            hasher.update(path.as_os_str().as_bytes());
-            root_path.join(format!("{}", hasher.digest128()))
-        })
+        Ok(())
     }
 
-    fn get_matching_file_paths(&self) -> Result<Vec<PathBuf>, ReadError> {
-        let mut result = Vec::new();
+    fn initiate_file_deletion(&mut self, path: PathBuf) -> ReadResult {
+        // Metadata of the deleted file must be the same as when it was added
+        // so that the deletion event is processed correctly by timely. To achieve
+        // this, we just take the cached metadata
+        let old_metadata = self
+            .cached_metadata
+            .remove(&path)
+            .expect("inconsistency between known_files and cached_metadata");
 
-        let file_and_folder_paths = glob::glob(self.path.as_str())?.flatten();
-        for entry in file_and_folder_paths {
-            // If an entry is a file, it should just be added to result
-            if entry.is_file() {
-                result.push(entry);
-                continue;
-            }
-
-            // Otherwise scan all files in all subdirectories and add them
-            let Some(path) = entry.to_str() else {
-                error!("Non-unicode paths are not supported. Ignoring: {entry:?}");
-                continue;
-            };
-
-            let folder_scan_pattern = format!("{path}/**/{}", self.object_pattern);
-            let folder_contents = glob::glob(&folder_scan_pattern)?.flatten();
-            for nested_entry in folder_contents {
-                if nested_entry.is_file() {
-                    result.push(nested_entry);
-                }
-            }
+        self.known_files.remove(&path);
+        self.current_action = Some(PosixScannerAction::Delete(Arc::new(path.clone())));
+        if path.exists() {
+            self.next_file_for_insertion = Some(path);
         }
-
-        Ok(result)
+        ReadResult::NewSource(old_metadata)
     }
 
-    fn next_insertion_entry(&mut self) -> Result<Option<ReadResult>, ReadError> {
-        let matching_files: Vec<PathBuf> = self.get_matching_file_paths()?;
-        let mut selected_file: Option<(PathBuf, SystemTime)> = None;
-        for entry in matching_files {
-            if !entry.is_file() || self.known_files.contains_key(&(*entry)) {
-                continue;
-            }
-
-            let Some(modify_time) = self.modify_time(&entry) else {
-                continue;
-            };
-
-            match &selected_file {
-                Some((currently_selected_name, selected_file_created_at)) => {
-                    if (selected_file_created_at, currently_selected_name) > (&modify_time, &entry)
-                    {
-                        selected_file = Some((entry, modify_time));
-                    }
-                }
-                None => selected_file = Some((entry, modify_time)),
-            }
-        }
+    /// Handles the modification of a file without rereading it in full, if the
+    /// modification mode allows it. Returns `None` if the file needs to be reread.
+    ///
+    /// The metadata of the rows stays the one of the first read of the file, so that
+    /// the rows can be removed consistently later.
+    fn initiate_incremental_update(&mut self, path: &Path) -> io::Result<Option<ReadResult>> {
+        if self.modification_mode == ModificationMode::Reread {
+            return Ok(None);
+        }
+        let Some(cached_path) = self.cached_file_path(path) else {
+            return Ok(None);
+        };
+        let (Ok(metadata), Ok(cached_file_metadata)) =
+            (std::fs::metadata(path), std::fs::metadata(&cached_path))
+        else {
+            return Ok(None);
+        };
+        if !metadata.is_file() {
+            return Ok(None);
+        }
+        let old_size = cached_file_metadata.len();
+        let new_size = metadata.len();
+        let old_metadata = self.cached_metadata.get(path).cloned().flatten();
+        let modified_at = metadata
+            .modified()
+            .map_or_else(|_| current_unix_timestamp_secs(), unix_timestamp_secs);
+
+        // The last previously read line must be complete, otherwise it changes too
+        let ends_with_newline =
+            old_size == 0 || read_file_range(&cached_path, old_size - 1, 1)? == b"\n".as_slice();
+        if new_size > old_size && ends_with_newline && is_same_prefix(&cached_path, path, old_size)?
+        {
+            // Only the complete lines are taken, the rest is read after the next update
+            let mut appended = read_file_range(path, old_size, new_size - old_size)?;
+            let complete_length = appended
+                .iter()
+                .rposition(|byte| *byte == b'\n')
+                .map_or(0, |position| position + 1);
+            appended.truncate(complete_length);
+            std::fs::OpenOptions::new()
+                .append(true)
+                .open(&cached_path)?
+                .write_all(&appended)?;
+
+            self.known_files.insert(path.to_path_buf(), modified_at);
+            self.current_action = Some(PosixScannerAction::Append(
+                Arc::new(path.to_path_buf()),
+                old_size,
+            ));
+            return Ok(Some(ReadResult::NewSource(old_metadata)));
+        }
+
+        if self.modification_mode == ModificationMode::Diff
+            && old_size.max(new_size) <= MAX_DIFFED_FILE_SIZE
+        {
+            let old_contents = std::fs::read(&cached_path)?;
+            let new_contents = std::fs::read(path)?;
+            let (removed_lines, added_lines) = diff_lines(&old_contents, &new_contents);
+            std::fs::write(Self::next_cached_file_path(&cached_path), &new_contents)?;
+
+            self.known_files.insert(path.to_path_buf(), modified_at);
+            self.current_action = Some(PosixScannerAction::DeleteLines(
+                Arc::new(path.to_path_buf()),
+                Arc::new(removed_lines),
+            ));
+            self.next_lines_for_insertion = Some((path.to_path_buf(), Arc::new(added_lines)));
+            return Ok(Some(ReadResult::NewSource(old_metadata)));
+        }
+
+        Ok(None)
+    }
+
+    /// The new version of a diffed file is stored here until the removed lines are read
+    /// from the old one
+    fn next_cached_file_path(cached_path: &Path) -> PathBuf {
+        let mut path = cached_path.as_os_str().to_owned();
+        path.push(".next");
+        PathBuf::from(path)
+    }
 
-        match selected_file {
-            Some((new_file_name, _)) => Ok(Some(self.initiate_file_insertion(&new_file_name)?)),
-            None => Ok(None),
-        }
+    fn cached_file_path(&self, path: &Path) -> Option<PathBuf> {
+        self.cache_directory_path.as_ref().map(|root_path| {
+            let mut hasher = Hasher::default();
+            hasher.update(path.as_os_str().as_bytes());
+            root_path.join(format!("{}", hasher.digest128()))
+        })
     }
 
     fn initiate_file_insertion(&mut self, new_file_name: &PathBuf) -> io::Result<ReadResult> {
-        let new_file_meta =
-            SourceMetadata::from_fs_meta(new_file_name, &std::fs::metadata(new_file_name)?);
+        let fs_metadata = std::fs::metadata(new_file_name)?;
+        let new_file_meta = SourceMetadata::from_fs_meta(new_file_name, &fs_metadata);
         self.cached_metadata
             .insert(new_file_name.clone(), Some(new_file_meta.clone()));
         self.known_files.insert(
@@ -1096,10 +1739,14 @@ impl FilesystemScanner {
 
         let cached_path = self.cached_file_path(new_file_name);
         if let Some(cached_path) = cached_path {
-            std::fs::copy(new_file_name, cached_path)?;
+            // The copy replaces the previous one instead of overwriting it, since the
+            // previous one may still be mapped
+            let next_cached_path = Self::next_cached_file_path(&cached_path);
+            std::fs::copy(new_file_name, &next_cached_path)?;
+            std::fs::rename(next_cached_path, cached_path)?;
         }
 
-        self.current_action = Some(PosixScannerAction::Read(Arc::new(new_file_name.clone())));
+        self.current_action = Some(self.read_action(new_file_name, fs_metadata.len())?);
         Ok(ReadResult::NewSource(Some(new_file_meta)))
     }
 
@@ -1107,13 +1754,8 @@ impl FilesystemScanner {
         Duration::from_millis(500)
     }
 
-    fn wait_for_new_files(&mut self) {
-        self.inotify
-            .as_mut()
-            .and_then(inotify_support::wait)
-            .unwrap_or_else(|| {
-                sleep(Self::sleep_duration());
-            });
+    fn wait_for_new_files(&self) {
+        sleep(Self::sleep_duration());
     }
 }
 
@@ -1170,6 +1812,67 @@ impl CsvFilesystemReader {
             deferred_read_result: None,
         })
     }
+
+    /// Sets how the modified files are processed. As a record may span several lines,
+    /// the changed lines aren't diffed and `Diff` works as `Append`.
+    #[must_use]
+    pub fn with_modification_mode(mut self, modification_mode: ModificationMode) -> Self {
+        let modification_mode = match modification_mode {
+            ModificationMode::Diff => ModificationMode::Append,
+            modification_mode => modification_mode,
+        };
+        self.filesystem_scanner
+            .set_modification_mode(modification_mode);
+        self
+    }
+
+    /// Makes the reader read only its part of the files. As a record may span several
+    /// lines, the files are never split.
+    #[must_use]
+    pub fn with_partition(mut self, partition: FilesPartition) -> Self {
+        self.filesystem_scanner.set_partition(partition, false);
+        self
+    }
+
+    /// Moves the reader to the offset the current file needs to be read from. The header
+    /// is read first and emitted before the records, so that the parser can use it.
+    fn seek_to_start_offset(
+        &mut self,
+        reader: &mut csv::Reader<std::fs::File>,
+    ) -> Result<(), ReadError> {
+        let start_offset = self.filesystem_scanner.current_start_offset();
+        if start_offset == 0 {
+            return Ok(());
+        }
+        let mut header_record = csv::StringRecord::new();
+        if reader.read_record(&mut header_record)? {
+            let header_reader_context = ReaderContext::from_tokenized_entries(
+                self.filesystem_scanner
+                    .data_event_type()
+                    .expect("scanner action can't be empty"),
+                header_record
+                    .iter()
+                    .map(std::string::ToString::to_string)
+                    .collect(),
+            );
+            let offset = (
+                OffsetKey::Empty,
+                OffsetValue::FilePosition {
+                    total_entries_read: self.total_entries_read,
+                    path: self
+                        .filesystem_scanner
+                        .current_offset_file()
+                        .expect("scanner action can't be empty"),
+                    bytes_offset: start_offset,
+                },
+            );
+            self.deferred_read_result = Some(ReadResult::Data(header_reader_context, offset));
+        }
+        let mut seek_position = csv::Position::new();
+        seek_position.set_byte(start_offset);
+        reader.seek(seek_position)?;
+        Ok(())
+    }
 }
 
 impl Reader for CsvFilesystemReader {
@@ -1268,7 +1971,9 @@ impl Reader for CsvFilesystemReader {
                     let next_read_result = self.filesystem_scanner.next_action_determined()?;
                     if let Some(next_read_result) = next_read_result {
                         if let Some(selected_file) = self.filesystem_scanner.current_file() {
-                            self.reader = Some(self.parser_builder.from_path(&*selected_file)?);
+                            let mut reader = self.parser_builder.from_path(&*selected_file)?;
+                            self.seek_to_start_offset(&mut reader)?;
+                            self.reader = Some(reader);
                         }
                         return Ok(next_read_result);
                     }
@@ -1282,11 +1987,12 @@ impl Reader for CsvFilesystemReader {
                     let next_read_result = self.filesystem_scanner.next_action_determined()?;
                     if let Some(next_read_result) = next_read_result {
                         if let Some(selected_file) = self.filesystem_scanner.current_file() {
-                            self.reader = Some(
-                                self.parser_builder
-                                    .flexible(true)
-                                    .from_path(&*selected_file)?,
-                            );
+                            let mut reader = self
+                                .parser_builder
+                                .flexible(true)
+                                .from_path(&*selected_file)?;
+                            self.seek_to_start_offset(&mut reader)?;
+                            self.reader = Some(reader);
                         }
                         return Ok(next_read_result);
                     }
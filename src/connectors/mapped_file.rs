@@ -0,0 +1,120 @@
+// Copyright © 2024 Pathway
+
+//! Read-only memory mappings of the cached copies of the input files.
+//!
+//! The lines of a mapped file are passed to the parsers as [`MappedBytes`], which share
+//! the mapping instead of copying the lines, so that only the parsed values are copied.
+
+use std::ffi::c_void;
+use std::fmt;
+use std::fs::File;
+use std::io;
+use std::num::NonZeroUsize;
+use std::ops::{Deref, Range};
+use std::ptr::NonNull;
+use std::sync::Arc;
+
+use log::warn;
+use nix::sys::mman::{madvise, mmap, munmap, MapFlags, MmapAdvise, ProtFlags};
+
+/// A read-only mapping of the whole file.
+///
+/// The file must not be truncated while it is mapped, as reading the pages past its
+/// new end raises `SIGBUS`.
+pub struct MappedFile {
+    address: NonNull<c_void>,
+    length: usize,
+}
+
+// The mapping is never written to, so it can be read from any thread
+unsafe impl Send for MappedFile {}
+unsafe impl Sync for MappedFile {}
+
+impl MappedFile {
+    /// Maps the file. Returns `None` if it is empty, since empty mappings aren't allowed.
+    pub fn new(file: &File) -> io::Result<Option<Self>> {
+        let length = usize::try_from(file.metadata()?.len())
+            .map_err(|_| io::Error::new(io::ErrorKind::Other, "file too large to be mapped"))?;
+        let Some(non_zero_length) = NonZeroUsize::new(length) else {
+            return Ok(None);
+        };
+        let address = unsafe {
+            mmap(
+                None,
+                non_zero_length,
+                ProtFlags::PROT_READ,
+                MapFlags::MAP_PRIVATE,
+                file,
+                0,
+            )
+        }?;
+        // The file is read from the beginning to the end, so the kernel can read ahead
+        if let Err(e) = unsafe { madvise(address, length, MmapAdvise::MADV_SEQUENTIAL) } {
+            warn!("Failed to advise sequential access to a mapped file: {e}");
+        }
+        Ok(Some(Self { address, length }))
+    }
+}
+
+impl Deref for MappedFile {
+    type Target = [u8];
+
+    fn deref(&self) -> &[u8] {
+        unsafe { std::slice::from_raw_parts(self.address.as_ptr().cast::<u8>(), self.length) }
+    }
+}
+
+impl Drop for MappedFile {
+    fn drop(&mut self) {
+        if let Err(e) = unsafe { munmap(self.address, self.length) } {
+            warn!("Failed to unmap a file: {e}");
+        }
+    }
+}
+
+impl fmt::Debug for MappedFile {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.debug_struct("MappedFile")
+            .field("length", &self.length)
+            .finish()
+    }
+}
+
+/// A range of bytes of a mapped file. The mapping is kept while any of its ranges exist.
+#[derive(Clone)]
+pub struct MappedBytes {
+    file: Arc<MappedFile>,
+    range: Range<usize>,
+}
+
+impl MappedBytes {
+    pub fn new(file: Arc<MappedFile>, range: Range<usize>) -> Self {
+        assert!(
+            range.start <= range.end && range.end <= file.len(),
+            "range out of the mapped file"
+        );
+        Self { file, range }
+    }
+}
+
+impl Deref for MappedBytes {
+    type Target = [u8];
+
+    fn deref(&self) -> &[u8] {
+        &self.file[self.range.clone()]
+    }
+}
+
+impl PartialEq for MappedBytes {
+    fn eq(&self, other: &Self) -> bool {
+        **self == **other
+    }
+}
+
+impl Eq for MappedBytes {}
+
+impl fmt::Debug for MappedBytes {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        fmt::Debug::fmt(&**self, f)
+    }
+}
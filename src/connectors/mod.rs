@@ -7,7 +7,7 @@ use std::collections::HashMap;
 use std::env;
 use std::ops::ControlFlow;
 use std::rc::Rc;
-use std::sync::mpsc::{self, Sender, TryRecvError};
+use std::sync::mpsc::{self, Receiver, Sender, TryRecvError};
 use std::sync::{Arc, Mutex};
 use std::thread;
 use std::thread::Thread;
@@ -19,9 +19,11 @@ use timely::dataflow::operators::probe::Handle;
 pub mod adaptors;
 pub mod data_format;
 pub mod data_storage;
+pub mod mapped_file;
 pub mod metadata;
 pub mod monitoring;
 pub mod offset;
+pub mod parser_pool;
 pub mod snapshot;
 
 use crate::connectors::monitoring::ConnectorMonitor;
@@ -39,6 +41,7 @@ use crate::timestamp::current_unix_timestamp_ms;
 
 use data_format::{ParseResult, ParsedEvent, Parser};
 use data_storage::{DataEventType, ReadResult, Reader, ReaderBuilder, ReaderContext, WriteError};
+use parser_pool::ParserPool;
 
 pub use adaptors::SessionType;
 pub use data_storage::StorageType;
@@ -97,6 +100,22 @@ pub enum Entry {
     Snapshot(SnapshotEvent),
     RewindFinishSentinel,
     Realtime(ReadResult),
+    // Data already parsed by a parser thread, along with the keys of its events
+    Parsed(Vec<(ParsedEvent, Option<Key>)>, Offset),
+}
+
+enum EntryReceiver {
+    Reader(Receiver<Entry>),
+    ParserPool(ParserPool),
+}
+
+impl EntryReceiver {
+    fn try_recv(&mut self) -> Result<Entry, TryRecvError> {
+        match self {
+            EntryReceiver::Reader(receiver) => receiver.try_recv(),
+            EntryReceiver::ParserPool(parser_pool) => parser_pool.try_recv(),
+        }
+    }
 }
 
 #[derive(Debug, Clone, Copy)]
@@ -235,6 +254,11 @@ impl Connector {
                 }
             }
         }
+
+        persistent_storage
+            .lock()
+            .unwrap()
+            .snapshot_rewind_finished(persistent_id);
     }
 
     pub fn read_realtime_updates(
@@ -349,6 +373,33 @@ impl Connector {
         }
     }
 
+    fn entry_receiver(
+        thread_name: &str,
+        receiver: Receiver<Entry>,
+        parser: &dyn Parser,
+        parse_threads: usize,
+        values_to_key: impl FnMut(Option<&Vec<Value>>, Option<&Offset>) -> Key + Clone + Send + 'static,
+        main_thread: &Thread,
+    ) -> EntryReceiver {
+        if parse_threads > 1 {
+            let parsers: Option<Vec<_>> = (0..parse_threads).map(|_| parser.fork()).collect();
+            if let Some(parsers) = parsers {
+                return EntryReceiver::ParserPool(ParserPool::new(
+                    thread_name,
+                    receiver,
+                    parsers,
+                    values_to_key,
+                    main_thread,
+                ));
+            }
+            warn!(
+                "Parser {} can't parse entries in parallel, using a single thread",
+                parser.short_description()
+            );
+        }
+        EntryReceiver::Reader(receiver)
+    }
+
     #[allow(clippy::too_many_arguments)]
     #[allow(clippy::too_many_lines)]
     pub fn run(
@@ -356,9 +407,13 @@ impl Connector {
         reader: Box<dyn ReaderBuilder>,
         mut parser: Box<dyn Parser>,
         mut input_session: Box<dyn InputAdaptor<Timestamp>>,
-        mut values_to_key: impl FnMut(Option<&Vec<Value>>, Option<&Offset>) -> Key + 'static,
+        mut values_to_key: impl FnMut(Option<&Vec<Value>>, Option<&Offset>) -> Key
+            + Clone
+            + Send
+            + 'static,
         probe: Handle<Timestamp>,
         persistent_storage: Option<Arc<Mutex<SingleWorkerPersistentStorage>>>,
+        parse_threads: usize,
         connector_id: usize,
         realtime_reader_needed: bool,
         external_persistent_id: Option<&ExternalPersistentId>,
@@ -377,6 +432,14 @@ impl Connector {
             parser.short_description()
         );
         let reader_name = reader.name(external_persistent_id, connector_id);
+        let mut receiver = Self::entry_receiver(
+            &thread_name,
+            receiver,
+            parser.as_ref(),
+            parse_threads,
+            values_to_key.clone(),
+            &main_thread,
+        );
 
         let mut snapshot_writer = Self::snapshot_writer(
             reader.as_ref(),
@@ -568,19 +631,32 @@ impl Connector {
                         snapshot_writer,
                         connector_monitor,
                     );
-
-                    let (offset_key, offset_value) = offset;
-                    if has_persistent_storage {
-                        assert!(*backfilling_finished);
-                        offsets_by_time_writer
-                            .lock()
-                            .unwrap()
-                            .entry(self.current_timestamp)
-                            .or_default()
-                            .advance_offset(offset_key, offset_value);
-                    }
+                    self.advance_offset(
+                        offset,
+                        has_persistent_storage,
+                        *backfilling_finished,
+                        offsets_by_time_writer,
+                    );
                 }
             },
+            Entry::Parsed(mut keyed_entries, offset) => {
+                if !*backfilling_finished {
+                    keyed_entries.retain(|(x, _)| !matches!(x, ParsedEvent::AdvanceTime));
+                }
+
+                self.on_keyed_data(
+                    keyed_entries,
+                    input_session,
+                    snapshot_writer,
+                    connector_monitor,
+                );
+                self.advance_offset(
+                    offset,
+                    has_persistent_storage,
+                    *backfilling_finished,
+                    offsets_by_time_writer,
+                );
+            }
             Entry::RewindFinishSentinel => {
                 assert!(!*backfilling_finished);
                 *backfilling_finished = true;
@@ -614,6 +690,25 @@ impl Connector {
         }
     }
 
+    fn advance_offset(
+        &self,
+        offset: Offset,
+        has_persistent_storage: bool,
+        backfilling_finished: bool,
+        offsets_by_time_writer: &Mutex<HashMap<Timestamp, OffsetAntichain>>,
+    ) {
+        let (offset_key, offset_value) = offset;
+        if has_persistent_storage {
+            assert!(backfilling_finished);
+            offsets_by_time_writer
+                .lock()
+                .unwrap()
+                .entry(self.current_timestamp)
+                .or_default()
+                .advance_offset(offset_key, offset_value);
+        }
+    }
+
     /*
         The implementation for non-str pulls.
     */
@@ -698,8 +793,26 @@ impl Connector {
         snapshot_writer: &mut Option<SharedSnapshotWriter>,
         connector_monitor: &mut Option<&mut ConnectorMonitor>,
     ) {
-        for entry in parsed_entries {
+        let keyed_entries = parsed_entries.into_iter().map(|entry| {
             let key = entry.key(&mut values_to_key, offset);
+            (entry, key)
+        });
+        self.on_keyed_data(
+            keyed_entries,
+            input_session,
+            snapshot_writer,
+            connector_monitor,
+        );
+    }
+
+    fn on_keyed_data(
+        &mut self,
+        keyed_entries: impl IntoIterator<Item = (ParsedEvent, Option<Key>)>,
+        input_session: &mut dyn InputAdaptor<Timestamp>,
+        snapshot_writer: &mut Option<SharedSnapshotWriter>,
+        connector_monitor: &mut Option<&mut ConnectorMonitor>,
+    ) {
+        for (entry, key) in keyed_entries {
             if let Some(key) = key {
                 // true for Insert, Remove, Upsert
                 if let Some(ref mut connector_monitor) = connector_monitor {
@@ -796,7 +909,7 @@ pub fn read_persisted_state(
                 | SnapshotEvent::AdvanceTime(_)
                 | SnapshotEvent::Finished => unreachable!(),
             },
-            Ok(Entry::Realtime(_)) => unreachable!(),
+            Ok(Entry::Realtime(_) | Entry::Parsed(..)) => unreachable!(),
             Ok(Entry::RewindFinishSentinel) | Err(_) => return ControlFlow::Break(()),
         }
     });
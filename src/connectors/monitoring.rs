@@ -1,7 +1,7 @@
 // Copyright © 2024 Pathway
 
 use std::collections::VecDeque;
-use std::time::{Duration, Instant};
+use std::time::{Duration, Instant, SystemTime};
 
 use log::{info, warn};
 use pyo3::pyclass;
@@ -16,9 +16,30 @@ pub struct ConnectorStats {
     #[pyo3(get, set)]
     pub num_messages_recently_committed: usize,
     #[pyo3(get, set)]
+    pub num_commits_from_start: usize,
+    #[pyo3(get, set)]
+    pub last_commit_at: Option<u64>,
+    #[pyo3(get, set)]
     pub finished: bool,
 }
 
+impl ConnectorStats {
+    /// Milliseconds elapsed since the last commit, `None` if finished or not committed yet.
+    pub fn commit_lag(&self, now: SystemTime) -> Option<u64> {
+        if self.finished {
+            return None;
+        }
+        let now = u64::try_from(
+            now.duration_since(SystemTime::UNIX_EPOCH)
+                .unwrap()
+                .as_millis(),
+        )
+        .unwrap();
+        self.last_commit_at
+            .map(|last_commit_at| now.saturating_sub(last_commit_at))
+    }
+}
+
 struct ConnectorLogger {
     name: String,
     previously_reported_messages: usize,
@@ -99,6 +120,8 @@ impl ConnectorMonitor {
                 num_messages_from_start: 0,
                 num_messages_in_last_minute: 0,
                 num_messages_recently_committed: 0,
+                num_commits_from_start: 0,
+                last_commit_at: None,
                 finished: false,
             },
             last_minute_queue: VecDeque::new(),
@@ -132,6 +155,16 @@ impl ConnectorMonitor {
         self.last_minute_queue
             .push_back((self.current_num_messages, now));
         self.stats.num_messages_from_start += self.current_num_messages;
+        self.stats.num_commits_from_start += 1;
+        self.stats.last_commit_at = Some(
+            u64::try_from(
+                SystemTime::now()
+                    .duration_since(SystemTime::UNIX_EPOCH)
+                    .unwrap()
+                    .as_millis(),
+            )
+            .unwrap(),
+        );
         self.logger.on_commit(now, self.current_num_messages);
         self.current_num_messages = 0;
     }
@@ -0,0 +1,185 @@
+// Copyright © 2024 Pathway
+
+//! Parsing of the read entries on several threads.
+//!
+//! The entries are dealt to the parser threads in turns and their results are collected
+//! in the same turns, so that they reach the input session, and advance the offsets, in
+//! the order they were read.
+
+use std::panic::resume_unwind;
+use std::sync::mpsc::{self, Receiver, Sender, TryRecvError};
+use std::thread::{self, JoinHandle, Thread};
+
+use log::error;
+use scopeguard::guard;
+
+use super::data_format::Parser;
+use super::data_storage::ReadResult;
+use super::{Entry, Offset};
+use crate::engine::{Key, Value};
+
+struct Job {
+    entry: Entry,
+    // the entries which aren't forwarded only update the state of the parser
+    is_forwarded: bool,
+}
+
+pub struct ParserPool {
+    receivers: Vec<Receiver<Option<Entry>>>,
+    parser_threads: Vec<Option<JoinHandle<()>>>,
+    next_receiver: usize,
+}
+
+impl ParserPool {
+    pub fn new(
+        thread_name: &str,
+        receiver: Receiver<Entry>,
+        parsers: Vec<Box<dyn Parser>>,
+        values_to_key: impl FnMut(Option<&Vec<Value>>, Option<&Offset>) -> Key + Clone + Send + 'static,
+        main_thread: &Thread,
+    ) -> Self {
+        assert!(!parsers.is_empty());
+
+        let mut job_senders = Vec::with_capacity(parsers.len());
+        let mut receivers = Vec::with_capacity(parsers.len());
+        let mut parser_threads = Vec::with_capacity(parsers.len());
+        for (index, parser) in parsers.into_iter().enumerate() {
+            let (job_sender, job_receiver) = mpsc::channel();
+            let (parsed_sender, parsed_receiver) = mpsc::channel();
+            let values_to_key = values_to_key.clone();
+            let main_thread = main_thread.clone();
+            let parser_thread = thread::Builder::new()
+                .name(format!("{thread_name}-parser-{index}"))
+                .spawn(move || {
+                    let sender = guard(parsed_sender, |sender| {
+                        // the main thread must notice that the parsing has finished
+                        drop(sender);
+                        main_thread.unpark();
+                    });
+                    Self::parse_entries(
+                        parser,
+                        values_to_key,
+                        &job_receiver,
+                        &sender,
+                        &main_thread,
+                    );
+                })
+                .expect("parser thread creation failed");
+            job_senders.push(job_sender);
+            receivers.push(parsed_receiver);
+            parser_threads.push(Some(parser_thread));
+        }
+
+        thread::Builder::new()
+            .name(format!("{thread_name}-dispatcher"))
+            .spawn(move || Self::dispatch_entries(&receiver, &job_senders))
+            .expect("parser dispatcher thread creation failed");
+
+        Self {
+            receivers,
+            parser_threads,
+            next_receiver: 0,
+        }
+    }
+
+    fn dispatch_entries(receiver: &Receiver<Entry>, job_senders: &[Sender<Job>]) {
+        let mut next_sender = 0;
+        for entry in receiver {
+            if let Entry::Realtime(ReadResult::NewSource(metadata)) = &entry {
+                // every parser must know the source of the entries it parses next
+                for (index, job_sender) in job_senders.iter().enumerate() {
+                    if index == next_sender {
+                        continue;
+                    }
+                    let job = Job {
+                        entry: Entry::Realtime(ReadResult::NewSource(metadata.clone())),
+                        is_forwarded: false,
+                    };
+                    if job_sender.send(job).is_err() {
+                        return;
+                    }
+                }
+            }
+            let job = Job {
+                entry,
+                is_forwarded: true,
+            };
+            if job_senders[next_sender].send(job).is_err() {
+                return;
+            }
+            next_sender = (next_sender + 1) % job_senders.len();
+        }
+    }
+
+    fn parse_entries(
+        mut parser: Box<dyn Parser>,
+        mut values_to_key: impl FnMut(Option<&Vec<Value>>, Option<&Offset>) -> Key,
+        job_receiver: &Receiver<Job>,
+        sender: &Sender<Option<Entry>>,
+        main_thread: &Thread,
+    ) {
+        for Job {
+            entry,
+            is_forwarded,
+        } in job_receiver
+        {
+            if let Entry::Realtime(ReadResult::NewSource(metadata)) = &entry {
+                parser.on_new_source_started(metadata.as_ref());
+            }
+            if !is_forwarded {
+                continue;
+            }
+
+            // A failed entry is still sent as `None` to keep the turns
+            let parsed_entry = match entry {
+                Entry::Realtime(ReadResult::Data(reader_context, offset)) => {
+                    match parser.parse(&reader_context) {
+                        Ok(parsed_entries) => {
+                            let keyed_entries = parsed_entries
+                                .into_iter()
+                                .map(|entry| {
+                                    let key = entry.key(&mut values_to_key, Some(&offset));
+                                    (entry, key)
+                                })
+                                .collect();
+                            Some(Entry::Parsed(keyed_entries, offset))
+                        }
+                        Err(e) => {
+                            error!("Read data parsed unsuccessfully. {e}");
+                            None
+                        }
+                    }
+                }
+                entry => Some(entry),
+            };
+            if sender.send(parsed_entry).is_err() {
+                break;
+            }
+            main_thread.unpark();
+        }
+    }
+
+    /// Returns the next entry in the order the entries were read.
+    pub fn try_recv(&mut self) -> Result<Entry, TryRecvError> {
+        loop {
+            match self.receivers[self.next_receiver].try_recv() {
+                Ok(parsed_entry) => {
+                    self.next_receiver = (self.next_receiver + 1) % self.receivers.len();
+                    if let Some(entry) = parsed_entry {
+                        return Ok(entry);
+                    }
+                }
+                Err(TryRecvError::Disconnected) => {
+                    // a parser thread stops early only if the parser panics
+                    if let Some(parser_thread) = self.parser_threads[self.next_receiver].take() {
+                        if let Err(payload) = parser_thread.join() {
+                            resume_unwind(payload);
+                        }
+                    }
+                    return Err(TryRecvError::Disconnected);
+                }
+                Err(TryRecvError::Empty) => return Err(TryRecvError::Empty),
+            }
+        }
+    }
+}
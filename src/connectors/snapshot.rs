@@ -1,31 +1,33 @@
 // Copyright © 2024 Pathway
 
 use log::{error, info, warn};
+use std::collections::{HashMap, VecDeque};
 use std::fs;
 use std::fs::File;
 use std::fs::OpenOptions;
-use std::io::{BufReader, BufWriter, ErrorKind as IoErrorKind, Seek, Write};
-use std::mem::take;
+use std::io::{
+    BufReader, BufWriter, Chain, Cursor, Error as IoError, ErrorKind as IoErrorKind, Read, Seek,
+    SeekFrom, Write,
+};
+use std::mem::{replace, take};
+use std::num::NonZeroUsize;
 use std::path::Path;
 use std::path::PathBuf;
 use std::sync::mpsc;
-use std::sync::mpsc::Sender;
+use std::sync::mpsc::{Receiver, Sender, SyncSender};
 use std::thread;
 
 use bincode::{deserialize_from, serialize, serialize_into, ErrorKind as BincodeError};
 use futures::channel::oneshot;
 use futures::channel::oneshot::Receiver as OneShotReceiver;
 use futures::channel::oneshot::Sender as OneShotSender;
-use pipe::PipeReader;
 use s3::bucket::Bucket as S3Bucket;
 use s3::error::S3Error;
 use s3::serde_types::Part as S3Part;
 use serde::{Deserialize, Serialize};
 
 use crate::connectors::data_storage::S3CommandName;
-use crate::connectors::data_storage::{
-    CurrentlyProcessedS3Object, ReadError, S3Scanner, WriteError,
-};
+use crate::connectors::data_storage::{ReadError, S3Scanner, WriteError};
 use crate::deepcopy::DeepCopy;
 use crate::engine::Timestamp;
 use crate::engine::{Key, Value};
@@ -41,6 +43,732 @@ pub enum Event {
     Finished,
 }
 
+/// Layout of the snapshot files created by the writers.
+///
+/// Readers detect the format of every file on their own, so the format may be changed
+/// between the runs of the same program.
+#[allow(clippy::module_name_repetitions)]
+#[derive(Clone, Copy, Debug, Default, Eq, PartialEq)]
+pub enum SnapshotFormat {
+    /// Every event is serialized separately with bincode.
+    #[default]
+    Plain,
+
+    /// Events are grouped into zstd-compressed blocks. Within a block, row values are
+    /// stored column by column, each column dictionary-encoded.
+    CompressedBlocks,
+}
+
+const COMPRESSED_SNAPSHOT_MAGIC: &[u8] = b"PWSNAPZ1";
+const EVENTS_PER_BLOCK: usize = 16_384;
+const BLOCK_COMPRESSION_LEVEL: i32 = 3;
+
+const EVENT_KIND_INSERT: u8 = 0;
+const EVENT_KIND_DELETE: u8 = 1;
+const EVENT_KIND_UPSERT: u8 = 2;
+const EVENT_KIND_UPSERT_NONE: u8 = 3;
+const EVENT_KIND_ADVANCE_TIME: u8 = 4;
+const EVENT_KIND_FINISHED: u8 = 5;
+
+const COMPACTED_PART_SUFFIX: &str = "-compacted";
+const TEMPORARY_PART_PREFIX: &str = ".";
+const MAX_LOCAL_PART_SIZE: u64 = 64 * 1024 * 1024;
+
+const MAX_PREFETCHED_PARTS: usize = 4;
+const PREFETCHED_BATCHES_PER_PART: usize = 4;
+const MAX_BLOCK_DECODING_THREADS: usize = 8;
+
+#[derive(Default, Serialize, Deserialize)]
+struct DictionaryColumn {
+    dictionary: Vec<Value>,
+    indices: Vec<u32>,
+}
+
+/// Columnar representation of a sequence of events.
+///
+/// Keys, times and row lengths are stored in separate vectors, the `i`-th value of
+/// every row is stored in the `i`-th column. Since rows of a single source tend
+/// to repeat values, each column keeps distinct values only once.
+#[derive(Default, Serialize, Deserialize)]
+struct EventBlock {
+    kinds: Vec<u8>,
+    keys: Vec<Key>,
+    times: Vec<Timestamp>,
+    row_lengths: Vec<u32>,
+    columns: Vec<DictionaryColumn>,
+}
+
+impl EventBlock {
+    fn encode(events: &[Event]) -> Self {
+        let mut block = Self::default();
+        let mut dictionaries: Vec<HashMap<&Value, u32>> = Vec::new();
+        for event in events {
+            let (kind, row) = match event {
+                Event::Insert(key, values) => {
+                    block.keys.push(*key);
+                    (EVENT_KIND_INSERT, Some(values))
+                }
+                Event::Delete(key, values) => {
+                    block.keys.push(*key);
+                    (EVENT_KIND_DELETE, Some(values))
+                }
+                Event::Upsert(key, Some(values)) => {
+                    block.keys.push(*key);
+                    (EVENT_KIND_UPSERT, Some(values))
+                }
+                Event::Upsert(key, None) => {
+                    block.keys.push(*key);
+                    (EVENT_KIND_UPSERT_NONE, None)
+                }
+                Event::AdvanceTime(time) => {
+                    block.times.push(*time);
+                    (EVENT_KIND_ADVANCE_TIME, None)
+                }
+                Event::Finished => (EVENT_KIND_FINISHED, None),
+            };
+            block.kinds.push(kind);
+            let Some(values) = row else {
+                continue;
+            };
+            block
+                .row_lengths
+                .push(u32::try_from(values.len()).expect("too many values in a row"));
+            for (column_idx, value) in values.iter().enumerate() {
+                if block.columns.len() == column_idx {
+                    block.columns.push(DictionaryColumn::default());
+                    dictionaries.push(HashMap::new());
+                }
+                let column = &mut block.columns[column_idx];
+                let index = *dictionaries[column_idx].entry(value).or_insert_with(|| {
+                    column.dictionary.push(value.clone());
+                    u32::try_from(column.dictionary.len() - 1)
+                        .expect("too many distinct values in a block")
+                });
+                column.indices.push(index);
+            }
+        }
+        block
+    }
+
+    fn decode(self) -> Result<Vec<Event>, ReadError> {
+        let mut keys = self.keys.into_iter();
+        let mut times = self.times.into_iter();
+        let mut row_lengths = self.row_lengths.into_iter();
+        let mut columns: Vec<_> = self
+            .columns
+            .into_iter()
+            .map(|column| (column.dictionary, column.indices.into_iter()))
+            .collect();
+
+        let mut next_row = || -> Result<Vec<Value>, ReadError> {
+            let row_length = row_lengths.next().ok_or(ReadError::MalformedData)?;
+            let row_length = usize::try_from(row_length).map_err(|_| ReadError::MalformedData)?;
+            columns
+                .iter_mut()
+                .take(row_length)
+                .map(|(dictionary, indices)| {
+                    let index = indices.next().ok_or(ReadError::MalformedData)?;
+                    let index = usize::try_from(index).map_err(|_| ReadError::MalformedData)?;
+                    dictionary
+                        .get(index)
+                        .cloned()
+                        .ok_or(ReadError::MalformedData)
+                })
+                .collect::<Result<Vec<_>, _>>()
+                .and_then(|row| {
+                    if row.len() == row_length {
+                        Ok(row)
+                    } else {
+                        Err(ReadError::MalformedData)
+                    }
+                })
+        };
+
+        let mut events = Vec::with_capacity(self.kinds.len());
+        for kind in self.kinds {
+            let event = if kind == EVENT_KIND_ADVANCE_TIME {
+                Event::AdvanceTime(times.next().ok_or(ReadError::MalformedData)?)
+            } else if kind == EVENT_KIND_FINISHED {
+                Event::Finished
+            } else {
+                let key = keys.next().ok_or(ReadError::MalformedData)?;
+                match kind {
+                    EVENT_KIND_INSERT => Event::Insert(key, next_row()?),
+                    EVENT_KIND_DELETE => Event::Delete(key, next_row()?),
+                    EVENT_KIND_UPSERT => Event::Upsert(key, Some(next_row()?)),
+                    EVENT_KIND_UPSERT_NONE => Event::Upsert(key, None),
+                    _ => return Err(ReadError::MalformedData),
+                }
+            };
+            events.push(event);
+        }
+        Ok(events)
+    }
+}
+
+/// Serializes events into a single length-prefixed compressed block.
+fn encode_block(events: &[Event]) -> Vec<u8> {
+    let serialized = serialize(&EventBlock::encode(events)).expect("unable to serialize a block");
+    let compressed = zstd::bulk::compress(&serialized, BLOCK_COMPRESSION_LEVEL)
+        .expect("compression in memory should not fail");
+
+    let length = u64::try_from(compressed.len()).expect("block length should fit in 64 bits");
+    let mut block = Vec::with_capacity(compressed.len() + 8);
+    block.extend_from_slice(&length.to_le_bytes());
+    block.extend_from_slice(&compressed);
+    block
+}
+
+/// Serializes events in the given format, without the file header.
+fn serialize_events(events: &[Event], format: SnapshotFormat) -> Vec<u8> {
+    let mut serialized = Vec::new();
+    match format {
+        SnapshotFormat::Plain => {
+            for event in events {
+                serialize_into(&mut serialized, event).expect("unable to serialize an entry");
+            }
+        }
+        SnapshotFormat::CompressedBlocks => {
+            for block_events in events.chunks(EVENTS_PER_BLOCK) {
+                serialized.append(&mut encode_block(block_events));
+            }
+        }
+    }
+    serialized
+}
+
+/// Reads the next block without decompressing it. Returns `None` if the end of the file
+/// is reached, including the case when the last block wasn't written completely.
+fn read_raw_block(reader: &mut impl Read) -> Result<Option<Vec<u8>>, ReadError> {
+    let mut length = [0; 8];
+    if let Err(e) = reader.read_exact(&mut length) {
+        if matches!(e.kind(), IoErrorKind::UnexpectedEof) {
+            return Ok(None);
+        }
+        return Err(ReadError::Io(e));
+    }
+    let length = u64::from_le_bytes(length);
+
+    let mut compressed = Vec::new();
+    let bytes_read = reader.by_ref().take(length).read_to_end(&mut compressed)?;
+    if bytes_read < usize::try_from(length).map_err(|_| ReadError::MalformedData)? {
+        return Ok(None);
+    }
+    Ok(Some(compressed))
+}
+
+fn decode_block(compressed: &[u8]) -> Result<Vec<Event>, ReadError> {
+    let block: EventBlock = deserialize_from(zstd::Decoder::new(compressed)?)?;
+    block.decode()
+}
+
+/// Reads the next block of events. Returns `None` if the end of the file is reached,
+/// including the case when the last block wasn't written completely.
+fn read_block(reader: &mut impl Read) -> Result<Option<Vec<Event>>, ReadError> {
+    read_raw_block(reader)?
+        .map(|compressed| decode_block(&compressed))
+        .transpose()
+}
+
+/// Reads the next event of a plain snapshot file, `None` denotes the end of the file.
+fn read_plain_event(reader: &mut impl Read) -> Result<Option<Event>, ReadError> {
+    match deserialize_from(reader) {
+        Ok(entry) => Ok(Some(entry)),
+        Err(e) => match *e {
+            BincodeError::Io(e) => {
+                if !matches!(e.kind(), IoErrorKind::UnexpectedEof) {
+                    return Err(ReadError::Io(e));
+                }
+                Ok(None)
+            }
+            _ => Err(ReadError::Bincode(*e)),
+        },
+    }
+}
+
+fn read_header(reader: &mut impl Read) -> Result<Vec<u8>, IoError> {
+    let mut header = Vec::with_capacity(COMPRESSED_SNAPSHOT_MAGIC.len());
+    let header_len = u64::try_from(COMPRESSED_SNAPSHOT_MAGIC.len())
+        .expect("header length should fit in 64 bits");
+    reader.by_ref().take(header_len).read_to_end(&mut header)?;
+    Ok(header)
+}
+
+type PrefixedReader<R> = Chain<Cursor<Vec<u8>>, R>;
+
+/// Sequential reader of the events from a non-seekable source of any format.
+struct SnapshotEventStream<R: Read> {
+    reader: PrefixedReader<R>,
+    format: SnapshotFormat,
+    block: VecDeque<Event>,
+}
+
+impl<R: Read> SnapshotEventStream<R> {
+    fn new(mut reader: R) -> Result<Self, IoError> {
+        let header = read_header(&mut reader)?;
+        let (format, prefix) = if header == COMPRESSED_SNAPSHOT_MAGIC {
+            (SnapshotFormat::CompressedBlocks, Vec::new())
+        } else {
+            // the bytes belong to the first event of a plain file
+            (SnapshotFormat::Plain, header)
+        };
+        Ok(Self {
+            reader: Cursor::new(prefix).chain(reader),
+            format,
+            block: VecDeque::new(),
+        })
+    }
+
+    fn next_event(&mut self) -> Result<Option<Event>, ReadError> {
+        match self.format {
+            SnapshotFormat::Plain => read_plain_event(&mut self.reader),
+            SnapshotFormat::CompressedBlocks => loop {
+                if let Some(event) = self.block.pop_front() {
+                    return Ok(Some(event));
+                }
+                match read_block(&mut self.reader)? {
+                    Some(events) => self.block = events.into(),
+                    None => return Ok(None),
+                }
+            },
+        }
+    }
+}
+
+/// A single file or S3 object of a snapshot.
+///
+/// Regular parts are named after the time of their creation. A compacted part is
+/// named `{time}-compacted` and replaces all parts created not later than `time`.
+/// Parts with names starting with a dot are being written and aren't visible yet.
+#[derive(Clone, Debug, Eq, PartialEq)]
+struct SnapshotPart {
+    name: String,
+    time: Timestamp,
+    is_compacted: bool,
+}
+
+impl SnapshotPart {
+    fn parse(name: &str) -> Option<Self> {
+        let (time, is_compacted) = match name.strip_suffix(COMPACTED_PART_SUFFIX) {
+            Some(time) => (time, true),
+            None => (name, false),
+        };
+        Some(Self {
+            name: name.to_string(),
+            time: time.parse().ok()?,
+            is_compacted,
+        })
+    }
+}
+
+/// Splits the parts of a snapshot into the ones that need to be read, in the order
+/// of reading, and the ones that are replaced by the newest compacted part.
+fn split_superseded_parts(parts: Vec<SnapshotPart>) -> (Vec<SnapshotPart>, Vec<SnapshotPart>) {
+    let last_compacted_time = parts
+        .iter()
+        .filter(|part| part.is_compacted)
+        .map(|part| part.time)
+        .max();
+    let (mut actual_parts, superseded_parts): (Vec<_>, Vec<_>) =
+        parts
+            .into_iter()
+            .partition(|part| match last_compacted_time {
+                Some(time) => part.time > time || (part.is_compacted && part.time == time),
+                None => true,
+            });
+    actual_parts.sort_unstable_by_key(|part| part.time);
+    (actual_parts, superseded_parts)
+}
+
+fn list_local_snapshot_parts(root_path: &Path) -> Result<Vec<SnapshotPart>, ReadError> {
+    let mut parts = Vec::new();
+    let entries = fs::read_dir(root_path).map_err(ReadError::Io)?;
+    for entry in entries {
+        let entry = entry.map_err(ReadError::Io)?;
+        if let Ok(file_name) = entry.file_name().into_string() {
+            if file_name.starts_with(TEMPORARY_PART_PREFIX) {
+                continue;
+            }
+            if let Some(part) = SnapshotPart::parse(&file_name) {
+                parts.push(part);
+            } else {
+                error!("Unparsable timestamp: {file_name}");
+            }
+        } else {
+            error!("Unparsable file name: {entry:#?}");
+        }
+    }
+    Ok(parts)
+}
+
+fn list_s3_snapshot_parts(bucket: &S3Bucket, path: &str) -> Result<Vec<SnapshotPart>, ReadError> {
+    let mut parts = Vec::new();
+
+    let object_lists = bucket
+        .list(path.to_string(), None)
+        .map_err(|e| ReadError::S3(S3CommandName::ListObjectsV2, e))?;
+
+    for list in &object_lists {
+        for object in &list.contents {
+            let path_obj = Path::new(&object.key);
+            let Some(file_name) = path_obj.file_name() else {
+                warn!("Not file-like path: {}", object.key);
+                continue;
+            };
+            let Some(file_name_str) = file_name.to_str() else {
+                error!("Unparsable file name in path {}", object.key);
+                continue;
+            };
+            if let Some(part) = SnapshotPart::parse(file_name_str) {
+                parts.push(part);
+            } else {
+                error!("Unparsable timestamp. Full path: {}", object.key);
+            }
+        }
+    }
+
+    Ok(parts)
+}
+
+fn remove_local_parts(root_path: &Path, parts: &[SnapshotPart]) -> Result<(), IoError> {
+    for part in parts {
+        let snapshot_file_to_remove = root_path.join(&part.name);
+        info!("Remove {snapshot_file_to_remove:?}");
+        fs::remove_file(snapshot_file_to_remove)?;
+    }
+    Ok(())
+}
+
+fn remove_s3_parts(bucket: &S3Bucket, path: &str, parts: &[SnapshotPart]) -> Result<(), ReadError> {
+    for part in parts {
+        let snapshot_file_to_remove = format!("{path}/{}", part.name);
+        info!("Remove {snapshot_file_to_remove}");
+        bucket
+            .delete_object(snapshot_file_to_remove)
+            .map_err(|e| ReadError::S3(S3CommandName::DeleteObject, e))?;
+    }
+    Ok(())
+}
+
+/// Reader keeping track of the number of bytes read through it.
+struct CountingReader<R: Read> {
+    inner: R,
+    position: u64,
+}
+
+impl<R: Read> CountingReader<R> {
+    fn new(inner: R, position: u64) -> Self {
+        Self { inner, position }
+    }
+}
+
+impl<R: Read> Read for CountingReader<R> {
+    fn read(&mut self, buf: &mut [u8]) -> Result<usize, IoError> {
+        let bytes_read = self.inner.read(buf)?;
+        self.position += u64::try_from(bytes_read).expect("read size should fit in 64 bits");
+        Ok(bytes_read)
+    }
+}
+
+/// A snapshot part to be loaded in the background.
+enum PartSource {
+    Local(PathBuf),
+    S3 { bucket: S3Bucket, path: String },
+}
+
+/// Consecutive events of a snapshot part, along with their positions in the part.
+struct DecodedBatch {
+    events: Vec<Event>,
+    format: SnapshotFormat,
+    // The offset of the block for the compressed format, of the first event otherwise
+    start_offset: u64,
+    // The offsets right after each of the events, only for the plain format
+    event_ends: Vec<u64>,
+}
+
+type DecodedBatchSender = SyncSender<Result<DecodedBatch, ReadError>>;
+type DecodedBatchReceiver = Receiver<Result<DecodedBatch, ReadError>>;
+
+/// The place, up to which the part has been consumed.
+enum TruncationPoint {
+    Offset(u64),
+    WithinBlock {
+        block_start: u64,
+        events_read: usize,
+    },
+}
+
+fn block_decoding_parallelism() -> usize {
+    thread::available_parallelism()
+        .map_or(1, NonZeroUsize::get)
+        .min(MAX_BLOCK_DECODING_THREADS)
+}
+
+/// Decodes compressed blocks, each of them in a separate thread.
+fn decode_blocks(raw_blocks: &[(u64, Vec<u8>)]) -> Vec<Result<Vec<Event>, ReadError>> {
+    if raw_blocks.len() <= 1 {
+        return raw_blocks
+            .iter()
+            .map(|(_, compressed)| decode_block(compressed))
+            .collect();
+    }
+    thread::scope(|scope| {
+        let decoders: Vec<_> = raw_blocks
+            .iter()
+            .map(|(_, compressed)| scope.spawn(move || decode_block(compressed)))
+            .collect();
+        decoders
+            .into_iter()
+            .map(|decoder| decoder.join().expect("snapshot block decoder panicked"))
+            .collect()
+    })
+}
+
+/// Sends the events of a plain part in batches. Returns `false` if the receiver is gone.
+fn decode_plain_part<R: Read>(
+    reader: &mut CountingReader<R>,
+    sender: &DecodedBatchSender,
+) -> Result<bool, ReadError> {
+    loop {
+        let mut batch = DecodedBatch {
+            events: Vec::new(),
+            format: SnapshotFormat::Plain,
+            start_offset: reader.position,
+            event_ends: Vec::new(),
+        };
+        let mut error = None;
+        while batch.events.len() < EVENTS_PER_BLOCK {
+            match read_plain_event(reader) {
+                Ok(Some(event)) => {
+                    batch.events.push(event);
+                    batch.event_ends.push(reader.position);
+                }
+                Ok(None) => break,
+                Err(e) => {
+                    error = Some(e);
+                    break;
+                }
+            }
+        }
+        let is_last_batch = error.is_some() || batch.events.len() < EVENTS_PER_BLOCK;
+        if !batch.events.is_empty() && sender.send(Ok(batch)).is_err() {
+            return Ok(false);
+        }
+        if let Some(error) = error {
+            return Err(error);
+        }
+        if is_last_batch {
+            return Ok(true);
+        }
+    }
+}
+
+/// Sends the blocks of a compressed part, decoding several blocks at once.
+/// Returns `false` if the receiver is gone.
+fn decode_compressed_part<R: Read>(
+    reader: &mut CountingReader<R>,
+    sender: &DecodedBatchSender,
+) -> Result<bool, ReadError> {
+    let parallelism = block_decoding_parallelism();
+    loop {
+        let mut raw_blocks = Vec::with_capacity(parallelism);
+        let mut error = None;
+        while raw_blocks.len() < parallelism {
+            let block_start = reader.position;
+            match read_raw_block(reader) {
+                Ok(Some(compressed)) => raw_blocks.push((block_start, compressed)),
+                Ok(None) => break,
+                Err(e) => {
+                    error = Some(e);
+                    break;
+                }
+            }
+        }
+        let is_last_group = error.is_some() || raw_blocks.len() < parallelism;
+        for ((block_start, _), events) in raw_blocks.iter().zip(decode_blocks(&raw_blocks)) {
+            let batch = DecodedBatch {
+                events: events?,
+                format: SnapshotFormat::CompressedBlocks,
+                start_offset: *block_start,
+                event_ends: Vec::new(),
+            };
+            if sender.send(Ok(batch)).is_err() {
+                return Ok(false);
+            }
+        }
+        if let Some(error) = error {
+            return Err(error);
+        }
+        if is_last_group {
+            return Ok(true);
+        }
+    }
+}
+
+fn decode_part(reader: impl Read, sender: &DecodedBatchSender) -> Result<bool, ReadError> {
+    let mut reader = BufReader::new(reader);
+    let header = read_header(&mut reader)?;
+    if header == COMPRESSED_SNAPSHOT_MAGIC {
+        let header_len = u64::try_from(header.len()).expect("header length should fit in 64 bits");
+        decode_compressed_part(&mut CountingReader::new(reader, header_len), sender)
+    } else {
+        // the bytes belong to the first event of a plain file
+        decode_plain_part(
+            &mut CountingReader::new(Cursor::new(header).chain(reader), 0),
+            sender,
+        )
+    }
+}
+
+fn load_part(source: PartSource, sender: &DecodedBatchSender) -> Result<(), ReadError> {
+    match source {
+        PartSource::Local(path) => {
+            decode_part(File::open(path)?, sender)?;
+            Ok(())
+        }
+        PartSource::S3 { bucket, path } => {
+            let (object, pipe_reader) =
+                S3Scanner::stream_object_from_path_and_bucket(&path, bucket);
+            let is_read_fully = decode_part(pipe_reader, sender);
+            // If the object wasn't read until the end, the download fails and it's fine
+            let download_result = object.finalize();
+            if is_read_fully? {
+                download_result?;
+            }
+            Ok(())
+        }
+    }
+}
+
+fn spawn_part_loader(source: PartSource) -> DecodedBatchReceiver {
+    let (sender, receiver) = mpsc::sync_channel(PREFETCHED_BATCHES_PER_PART);
+    thread::Builder::new()
+        .name("pathway:snapshot-prefetch".to_string())
+        .spawn(move || {
+            if let Err(e) = load_part(source, &sender) {
+                // the reader may be already gone, then nobody is interested in the error
+                sender.send(Err(e)).ok();
+            }
+        })
+        .expect("snapshot prefetch thread creation failed");
+    receiver
+}
+
+/// Reads the events of snapshot parts in order. The parts that come next are loaded
+/// and decoded in background threads meanwhile, so that reading the disk or the network,
+/// decompression and deserialization of several parts happen in parallel.
+///
+/// The number of parts loaded at once and the number of batches decoded ahead within
+/// each part are bounded, which limits the memory used by the prefetching.
+struct PrefetchingPartsReader {
+    sources: VecDeque<PartSource>,
+    prefetched_parts: VecDeque<DecodedBatchReceiver>,
+    current_part: Option<DecodedBatchReceiver>,
+    parts_started: usize,
+    events_read_from_part: usize,
+
+    current_batch: Option<DecodedBatch>,
+    current_batch_position: usize,
+}
+
+impl PrefetchingPartsReader {
+    fn new(sources: Vec<PartSource>) -> Self {
+        Self {
+            sources: sources.into(),
+            prefetched_parts: VecDeque::new(),
+            current_part: None,
+            parts_started: 0,
+            events_read_from_part: 0,
+            current_batch: None,
+            current_batch_position: 0,
+        }
+    }
+
+    fn next_event(&mut self) -> Result<Option<Event>, ReadError> {
+        loop {
+            if let Some(batch) = &mut self.current_batch {
+                if let Some(event) = batch.events.get_mut(self.current_batch_position) {
+                    self.current_batch_position += 1;
+                    self.events_read_from_part += 1;
+                    return Ok(Some(replace(event, Event::Finished)));
+                }
+            }
+
+            if let Some(current_part) = &self.current_part {
+                match current_part.recv() {
+                    Ok(Ok(batch)) => {
+                        self.current_batch = Some(batch);
+                        self.current_batch_position = 0;
+                    }
+                    Ok(Err(e)) => return Err(e),
+                    Err(_) => {
+                        // the whole part has been read
+                        self.current_part = None;
+                        self.current_batch = None;
+                    }
+                }
+                continue;
+            }
+
+            while self.prefetched_parts.len() < MAX_PREFETCHED_PARTS {
+                let Some(source) = self.sources.pop_front() else {
+                    break;
+                };
+                self.prefetched_parts.push_back(spawn_part_loader(source));
+            }
+            let Some(next_part) = self.prefetched_parts.pop_front() else {
+                return Ok(None);
+            };
+            self.current_part = Some(next_part);
+            self.parts_started += 1;
+            self.events_read_from_part = 0;
+        }
+    }
+
+    /// The number of parts, from which the reading has started.
+    fn parts_started(&self) -> usize {
+        self.parts_started
+    }
+
+    /// The number of events read from the last started part.
+    fn events_read_from_part(&self) -> usize {
+        self.events_read_from_part
+    }
+
+    /// The place, up to which the current part has been consumed, or `None` if the
+    /// current part has been read until the end.
+    fn truncation_point(&self) -> Option<TruncationPoint> {
+        if self.current_part.is_none() {
+            return None;
+        }
+        let Some(batch) = &self.current_batch else {
+            // nothing has been received from the current part yet
+            return Some(TruncationPoint::Offset(0));
+        };
+        let position = self.current_batch_position;
+        let truncation_point = if position == 0 {
+            TruncationPoint::Offset(batch.start_offset)
+        } else {
+            match batch.format {
+                SnapshotFormat::Plain => TruncationPoint::Offset(batch.event_ends[position - 1]),
+                SnapshotFormat::CompressedBlocks => TruncationPoint::WithinBlock {
+                    block_start: batch.start_offset,
+                    events_read: position,
+                },
+            }
+        };
+        Some(truncation_point)
+    }
+
+    /// Stops the background loading. No events can be read afterwards.
+    fn stop(&mut self) {
+        self.sources.clear();
+        self.prefetched_parts.clear();
+        self.current_part = None;
+        self.current_batch = None;
+    }
+}
+
 #[allow(clippy::module_name_repetitions)]
 pub trait SnapshotReaderImpl {
     /// This method will be called every so often to read the persisted snapshot.
@@ -82,89 +810,78 @@ pub trait SnapshotWriter: Send {
 
 pub struct LocalBinarySnapshotReader {
     root_path: PathBuf,
-    reader: Option<BufReader<std::fs::File>>,
-    next_file_idx: usize,
-    times_advanced: Vec<Timestamp>,
+    parts: Vec<SnapshotPart>,
+    superseded_parts: Vec<SnapshotPart>,
+    prefetcher: PrefetchingPartsReader,
 }
 
 impl LocalBinarySnapshotReader {
     pub fn new(root_path: PathBuf) -> Result<LocalBinarySnapshotReader, ReadError> {
-        let mut times_advanced = Vec::new();
-        let entries = fs::read_dir(&root_path).map_err(ReadError::Io)?;
-        for entry in entries {
-            let entry = entry.map_err(ReadError::Io)?;
-            if let Ok(file_name) = entry.file_name().into_string() {
-                if let Ok(parsed_time) = file_name.parse() {
-                    times_advanced.push(parsed_time);
-                } else {
-                    error!("Unparsable timestamp: {file_name}");
-                }
-            } else {
-                error!("Unparsable file name: {entry:#?}");
-            }
-        }
-        times_advanced.sort_unstable();
+        let (parts, superseded_parts) =
+            split_superseded_parts(list_local_snapshot_parts(&root_path)?);
+        let prefetcher = PrefetchingPartsReader::new(
+            parts
+                .iter()
+                .map(|part| PartSource::Local(root_path.join(&part.name)))
+                .collect(),
+        );
 
         Ok(Self {
             root_path,
-            reader: None,
-            next_file_idx: 0,
-            times_advanced,
+            parts,
+            superseded_parts,
+            prefetcher,
         })
     }
 }
 
 impl SnapshotReaderImpl for LocalBinarySnapshotReader {
     fn read(&mut self) -> Result<Event, ReadError> {
-        loop {
-            match &mut self.reader {
-                Some(reader) => match deserialize_from(reader) {
-                    Ok(entry) => return Ok(entry),
-                    Err(e) => match *e {
-                        BincodeError::Io(e) => {
-                            if !matches!(e.kind(), IoErrorKind::UnexpectedEof) {
-                                return Err(ReadError::Io(e));
-                            }
-                            self.reader = None;
-                            continue;
-                        }
-                        _ => return Err(ReadError::Bincode(*e)),
-                    },
-                },
-                None => {
-                    if self.next_file_idx >= self.times_advanced.len() {
-                        break;
-                    }
-                    let current_file_path = Path::new(&self.root_path)
-                        .join(format!("{}", self.times_advanced[self.next_file_idx]));
-                    self.reader = Some(BufReader::new(
-                        File::open(current_file_path).map_err(ReadError::Io)?,
-                    ));
-                    self.next_file_idx += 1;
-                }
-            }
-        }
-        Ok(Event::Finished)
+        Ok(self.prefetcher.next_event()?.unwrap_or(Event::Finished))
     }
 
     fn truncate(&mut self) -> Result<(), ReadError> {
-        if let Some(ref mut reader) = &mut self.reader {
-            let stable_position = reader.stream_position()?;
-            let file_path = Path::new(&self.root_path)
-                .join(format!("{}", self.times_advanced[self.next_file_idx - 1]));
-
-            info!("Truncate: Shrink {file_path:?} to {stable_position} bytes");
+        // These parts are left by an interrupted compaction. They must not
+        // become visible once the compacted part is shrunk or removed.
+        remove_local_parts(&self.root_path, &take(&mut self.superseded_parts))?;
+
+        let parts_started = self.prefetcher.parts_started();
+        let truncation_point = self.prefetcher.truncation_point();
+        self.prefetcher.stop();
+
+        if let Some(truncation_point) = truncation_point {
+            let file_path = Path::new(&self.root_path).join(&self.parts[parts_started - 1].name);
+            match truncation_point {
+                TruncationPoint::Offset(stable_position) => {
+                    info!("Truncate: Shrink {file_path:?} to {stable_position} bytes");
+
+                    let file = OpenOptions::new().write(true).open(file_path)?;
+                    file.set_len(stable_position)?;
+                }
+                TruncationPoint::WithinBlock {
+                    block_start,
+                    events_read,
+                } => {
+                    // The block that is being read is replaced by a block with
+                    // the events that were already read from it.
+                    let mut file = OpenOptions::new().read(true).write(true).open(&file_path)?;
+                    file.seek(SeekFrom::Start(block_start))?;
+                    let mut events = read_block(&mut BufReader::new(&mut file))?
+                        .ok_or(ReadError::MalformedData)?;
+                    events.truncate(events_read);
+                    info!(
+                        "Truncate: Shrink {file_path:?} to {block_start} bytes and rewrite {} events of the last block",
+                        events.len()
+                    );
 
-            let file = OpenOptions::new().write(true).open(file_path)?;
-            file.set_len(stable_position)?;
+                    file.set_len(block_start)?;
+                    file.seek(SeekFrom::End(0))?;
+                    file.write_all(&encode_block(&events))?;
+                }
+            }
         }
 
-        for unreachable_part in &self.times_advanced[self.next_file_idx..] {
-            let snapshot_file_to_remove =
-                Path::new(&self.root_path).join(format!("{unreachable_part}"));
-            info!("Truncate: Remove {snapshot_file_to_remove:?}");
-            std::fs::remove_file(snapshot_file_to_remove)?;
-        }
+        remove_local_parts(&self.root_path, &self.parts[parts_started..])?;
 
         Ok(())
     }
@@ -172,18 +889,50 @@ impl SnapshotReaderImpl for LocalBinarySnapshotReader {
 
 pub struct LocalBinarySnapshotWriter {
     root_path: PathBuf,
+    format: SnapshotFormat,
     lazy_writer: Option<BufWriter<std::fs::File>>,
+    pending_block: Vec<Event>,
+    last_part_time: u128,
 }
 
 impl LocalBinarySnapshotWriter {
     pub fn new(path: &Path) -> Result<LocalBinarySnapshotWriter, WriteError> {
+        Self::with_format(path, SnapshotFormat::Plain)
+    }
+
+    pub fn with_format(
+        path: &Path,
+        format: SnapshotFormat,
+    ) -> Result<LocalBinarySnapshotWriter, WriteError> {
         ensure_directory(path)?;
 
         Ok(Self {
             root_path: path.to_owned(),
+            format,
             lazy_writer: None,
+            pending_block: Vec::new(),
+            last_part_time: 0,
         })
     }
+
+    fn write_pending_block(&mut self) -> Result<(), WriteError> {
+        if self.pending_block.is_empty() {
+            return Ok(());
+        }
+        let block = encode_block(&take(&mut self.pending_block));
+        if let Some(writer) = &mut self.lazy_writer {
+            writer.write_all(&block)?;
+        }
+        Ok(())
+    }
+}
+
+impl Drop for LocalBinarySnapshotWriter {
+    fn drop(&mut self) {
+        if let Err(e) = self.write_pending_block() {
+            error!("Failed to write the last block of the snapshot: {e}");
+        }
+    }
 }
 
 impl SnapshotWriter for LocalBinarySnapshotWriter {
@@ -192,27 +941,59 @@ impl SnapshotWriter for LocalBinarySnapshotWriter {
             if let Some(lazy_writer) = &mut self.lazy_writer {
                 lazy_writer
             } else {
-                let current_timestamp = current_unix_timestamp_ms();
+                // parts must not share a name, even if they are created in the same millisecond
+                let current_timestamp = current_unix_timestamp_ms().max(self.last_part_time + 1);
+                self.last_part_time = current_timestamp;
                 let path = self.root_path.join(format!("{current_timestamp}"));
 
-                self.lazy_writer = Some(BufWriter::new(File::create(path)?));
-                self.lazy_writer.as_mut().unwrap()
+                let mut writer = BufWriter::new(File::create(path)?);
+                if self.format == SnapshotFormat::CompressedBlocks {
+                    writer.write_all(COMPRESSED_SNAPSHOT_MAGIC)?;
+                }
+                self.lazy_writer.insert(writer)
             }
         };
 
-        serialize_into(writer, &event).map_err(|e| match *e {
-            BincodeError::Io(io_error) => WriteError::Io(*Box::new(io_error)),
-            _ => WriteError::Bincode(*e),
-        })
+        match self.format {
+            SnapshotFormat::Plain => serialize_into(writer, &event).map_err(|e| match *e {
+                BincodeError::Io(io_error) => WriteError::Io(*Box::new(io_error)),
+                _ => WriteError::Bincode(*e),
+            }),
+            SnapshotFormat::CompressedBlocks => {
+                self.pending_block.push(event.clone());
+                if self.pending_block.len() >= EVENTS_PER_BLOCK {
+                    self.write_pending_block()?;
+                }
+                Ok(())
+            }
+        }
     }
 
     fn flush(&mut self) -> OneShotReceiver<Result<(), WriteError>> {
         let (sender, receiver) = oneshot::channel();
 
-        let internal_flush_result: Result<(), WriteError> = match &mut self.lazy_writer {
-            Some(ref mut writer) => writer.flush().map_err(WriteError::Io),
-            None => Ok(()),
-        };
+        let internal_flush_result: Result<(), WriteError> =
+            self.write_pending_block()
+                .and_then(|()| match &mut self.lazy_writer {
+                    Some(ref mut writer) => writer.flush().map_err(WriteError::Io),
+                    None => Ok(()),
+                });
+
+        // Large parts are closed, so that they can be compacted while the program runs.
+        // The next write starts a new part.
+        if internal_flush_result.is_ok() {
+            let part_metadata = self
+                .lazy_writer
+                .as_ref()
+                .map(|writer| writer.get_ref().metadata());
+            match part_metadata {
+                Some(Ok(metadata)) if metadata.len() >= MAX_LOCAL_PART_SIZE => {
+                    self.lazy_writer = None;
+                }
+                Some(Err(e)) => warn!("Failed to get the size of the snapshot part: {e}"),
+                _ => {}
+            }
+        }
 
         let send_result = sender.send(internal_flush_result);
         if let Err(unsent_flush_result) = send_result {
@@ -231,10 +1012,15 @@ pub struct S3Writer {
     key: String,
     upload_id: String,
     upload_parts: Vec<S3Part>,
+    format: SnapshotFormat,
 }
 
 impl S3Writer {
-    pub fn new(bucket: S3Bucket, path: &str) -> Result<Self, (S3CommandName, S3Error)> {
+    pub fn new(
+        bucket: S3Bucket,
+        path: &str,
+        format: SnapshotFormat,
+    ) -> Result<Self, (S3CommandName, S3Error)> {
         let start_upload_response = bucket
             .initiate_multipart_upload(path, SNAPSHOT_CONTENT_TYPE)
             .map_err(|e| (S3CommandName::InitiateMultipartUpload, e))?;
@@ -244,18 +1030,16 @@ impl S3Writer {
             key: start_upload_response.key,
             upload_id: start_upload_response.upload_id,
             upload_parts: Vec::new(),
+            format,
         })
     }
 
     pub fn put_chunk(&mut self, buffer: Vec<Event>) -> Result<(), (S3CommandName, S3Error)> {
-        let chunk = {
-            let mut chunk = Vec::new();
-            for entry in buffer {
-                let mut entry_serialized = serialize(&entry).expect("unable to serialize an entry");
-                chunk.append(&mut entry_serialized);
-            }
-            chunk
-        };
+        let mut chunk = Vec::new();
+        if self.format == SnapshotFormat::CompressedBlocks && self.upload_parts.is_empty() {
+            chunk.extend_from_slice(COMPRESSED_SNAPSHOT_MAGIC);
+        }
+        chunk.append(&mut serialize_events(&buffer, self.format));
 
         let part_number =
             u32::try_from(self.upload_parts.len()).expect("too many upload parts") + 1;
@@ -292,129 +1076,87 @@ impl S3Writer {
 
 pub struct S3SnapshotReader {
     root_path: String,
-    reader: Option<PipeReader>,
-    next_object_idx: usize,
-    times_advanced: Vec<Timestamp>,
+    parts: Vec<SnapshotPart>,
+    superseded_parts: Vec<SnapshotPart>,
+    prefetcher: PrefetchingPartsReader,
 
     bucket: S3Bucket,
-    current_state: Option<CurrentlyProcessedS3Object>,
-    current_chunk_len: usize,
 }
 
 impl S3SnapshotReader {
     pub fn new(bucket: S3Bucket, path: &str) -> Result<S3SnapshotReader, ReadError> {
-        let mut times_advanced = Vec::new();
-
-        let object_lists = bucket
-            .list(path.to_string(), None)
-            .map_err(|e| ReadError::S3(S3CommandName::ListObjectsV2, e))?;
-
-        for list in &object_lists {
-            for object in &list.contents {
-                let path_obj = Path::new(&object.key);
-                let Some(file_name) = path_obj.file_name() else {
-                    warn!("Not file-like path: {}", object.key);
-                    continue;
-                };
-                let Some(file_name_str) = file_name.to_str() else {
-                    error!("Unparsable file name in path {}", object.key);
-                    continue;
-                };
-                if let Ok(timestamp) = file_name_str.parse() {
-                    times_advanced.push(timestamp);
-                } else {
-                    error!("Unparsable timestamp. Full path: {}", object.key);
-                }
-            }
-        }
-
-        times_advanced.sort_unstable();
+        let (parts, superseded_parts) =
+            split_superseded_parts(list_s3_snapshot_parts(&bucket, path)?);
+        let prefetcher = PrefetchingPartsReader::new(
+            parts
+                .iter()
+                .map(|part| PartSource::S3 {
+                    bucket: bucket.deep_copy(),
+                    path: format!("{path}/{}", part.name),
+                })
+                .collect(),
+        );
 
         Ok(Self {
             bucket,
             root_path: path.to_string(),
-            reader: None,
-            next_object_idx: 0,
-            times_advanced,
-            current_state: None,
-            current_chunk_len: 0,
+            parts,
+            superseded_parts,
+            prefetcher,
         })
     }
 }
 
 impl SnapshotReaderImpl for S3SnapshotReader {
     fn read(&mut self) -> Result<Event, ReadError> {
-        loop {
-            match &mut self.reader {
-                Some(reader) => match deserialize_from::<&mut PipeReader, Event>(reader) {
-                    Ok(entry) => {
-                        self.current_chunk_len += 1;
-                        return Ok(entry);
-                    }
-                    Err(e) => match *e {
-                        BincodeError::Io(e) => {
-                            if !matches!(e.kind(), IoErrorKind::UnexpectedEof) {
-                                return Err(ReadError::Io(e));
-                            }
-                            self.reader = None;
-                            continue;
-                        }
-                        _ => return Err(ReadError::Bincode(*e)),
-                    },
-                },
-                None => {
-                    if self.next_object_idx >= self.times_advanced.len() {
-                        break;
-                    }
-                    let current_file_path = format!(
-                        "{}/{}",
-                        self.root_path, self.times_advanced[self.next_object_idx]
-                    );
-                    let (new_current_state, pipe_reader) =
-                        S3Scanner::stream_object_from_path_and_bucket(
-                            &current_file_path,
-                            self.bucket.deep_copy(),
-                        );
-
-                    if let Some(state) = self.current_state.take() {
-                        state.finalize()?;
-                    }
-
-                    self.current_chunk_len = 0;
-                    self.current_state = Some(new_current_state);
-                    self.reader = Some(pipe_reader);
-                    self.next_object_idx += 1;
-                }
-            }
-        }
-        Ok(Event::Finished)
+        Ok(self.prefetcher.next_event()?.unwrap_or(Event::Finished))
     }
 
     fn truncate(&mut self) -> Result<(), ReadError> {
+        // These parts are left by an interrupted compaction. They must not
+        // become visible once the compacted part is replaced or removed.
+        remove_s3_parts(
+            &self.bucket,
+            &self.root_path,
+            &take(&mut self.superseded_parts),
+        )?;
+
+        let parts_started = self.prefetcher.parts_started();
+        let current_chunk_len = self.prefetcher.events_read_from_part();
+        self.prefetcher.stop();
+
         // Truncate the current file by saving the currently read chunk
-        if self.next_object_idx > 0 && self.current_chunk_len > 0 {
-            let object_for_truncation = format!(
-                "{}/{}",
+        if parts_started > 0 && current_chunk_len > 0 {
+            let part_for_truncation = &self.parts[parts_started - 1];
+            let object_for_truncation = format!("{}/{}", self.root_path, part_for_truncation.name);
+
+            let object_after_truncation = format!(
+                "{}/{}{}",
                 self.root_path,
-                self.times_advanced[self.next_object_idx - 1]
+                current_unix_timestamp_ms(),
+                if part_for_truncation.is_compacted {
+                    COMPACTED_PART_SUFFIX
+                } else {
+                    ""
+                }
             );
 
-            let object_after_truncation =
-                format!("{}/{}", self.root_path, current_unix_timestamp_ms());
-
-            let (_new_current_state, mut pipe_reader) =
-                S3Scanner::stream_object_from_path_and_bucket(
-                    &object_for_truncation,
-                    self.bucket.deep_copy(),
-                );
-            let mut writer = S3Writer::new(self.bucket.deep_copy(), &object_after_truncation)
-                .map_err(|(command, error)| ReadError::S3(command, error))?;
+            let (_new_current_state, pipe_reader) = S3Scanner::stream_object_from_path_and_bucket(
+                &object_for_truncation,
+                self.bucket.deep_copy(),
+            );
+            let mut events = SnapshotEventStream::new(pipe_reader)?;
+            let mut writer = S3Writer::new(
+                self.bucket.deep_copy(),
+                &object_after_truncation,
+                events.format,
+            )
+            .map_err(|(command, error)| ReadError::S3(command, error))?;
 
             let mut n_entries_processed = 0;
             let mut current_chunk = Vec::new();
-            while n_entries_processed < self.current_chunk_len {
-                let maybe_entry_read = deserialize_from::<&mut PipeReader, Event>(&mut pipe_reader);
-                if let Ok(entry) = maybe_entry_read {
+            while n_entries_processed < current_chunk_len {
+                if let Ok(Some(entry)) = events.next_event() {
                     current_chunk.push(entry);
                 } else {
                     error!("Unexpected end of dump object {object_for_truncation}");
@@ -439,13 +1181,12 @@ impl SnapshotReaderImpl for S3SnapshotReader {
         }
 
         // Delete all further non-read files
-        let removal_files_start = self.next_object_idx.saturating_sub(1);
-        for unreachable_part in &self.times_advanced[removal_files_start..] {
-            let snapshot_file_to_remove = format!("{}/{unreachable_part}", self.root_path);
-            self.bucket
-                .delete_object(snapshot_file_to_remove)
-                .map_err(|e| ReadError::S3(S3CommandName::DeleteObject, e))?;
-        }
+        let removal_files_start = parts_started.saturating_sub(1);
+        remove_s3_parts(
+            &self.bucket,
+            &self.root_path,
+            &self.parts[removal_files_start..],
+        )?;
 
         Ok(())
     }
@@ -478,14 +1219,14 @@ impl Drop for S3SnapshotWriter {
 }
 
 impl S3SnapshotWriter {
-    pub fn new(bucket: S3Bucket, chunks_root_path: &str) -> Self {
+    pub fn new(bucket: S3Bucket, chunks_root_path: &str, format: SnapshotFormat) -> Self {
         let (chunk_events_sender, chunk_events_receiver) = mpsc::channel();
 
         let inner_chunks_root_path = chunks_root_path.to_string();
         let uploader_thread = thread::Builder::new()
             .name("pathway:s3_snapshot-bg-writer".to_string())
             .spawn(move || {
-                let mut s3_writer = S3Writer::new(bucket.deep_copy(), &format!("{}/{}", inner_chunks_root_path, current_unix_timestamp_ms())).expect("failed to construct s3 writer");
+                let mut s3_writer = S3Writer::new(bucket.deep_copy(), &format!("{}/{}", inner_chunks_root_path, current_unix_timestamp_ms()), format).expect("failed to construct s3 writer");
                 loop {
                     let event = chunk_events_receiver.recv().expect("unexpected termination for s3 events sender");
                     match event {
@@ -494,7 +1235,7 @@ impl S3SnapshotWriter {
                         }
                         S3SnapshotWriterEvent::Flush(sender) => {
                             let flush_result = s3_writer.finalize().map_err(|(command, s3_error)| WriteError::S3(command, s3_error));
-                            s3_writer = S3Writer::new(bucket.deep_copy(), &format!("{}/{}", inner_chunks_root_path, current_unix_timestamp_ms())).expect("failed to construct s3 writer");
+                            s3_writer = S3Writer::new(bucket.deep_copy(), &format!("{}/{}", inner_chunks_root_path, current_unix_timestamp_ms()), format).expect("failed to construct s3 writer");
                             if let Err(unsent_flush_result) = sender.send(flush_result) {
                                 error!("The receiver no longer waits for the result of this flush: {unsent_flush_result:?}");
                             }
@@ -540,6 +1281,328 @@ impl SnapshotWriter for S3SnapshotWriter {
     }
 }
 
+/// Net state of a single key after folding its events.
+#[derive(Clone)]
+enum FoldedKeyState {
+    Diffs(HashMap<Vec<Value>, isize>),
+    Upserted(Vec<Value>),
+}
+
+/// Folds the events of consecutive snapshot parts into the net state per key.
+///
+/// Only the events followed by a time advancement below `threshold_time` are folded.
+/// The remaining ones are kept as they are, so that they are committed by the events
+/// of the next part in the same way as before the compaction.
+struct SnapshotFold {
+    threshold_time: Timestamp,
+    state: HashMap<Key, Option<FoldedKeyState>>,
+    pending: Vec<Event>,
+    last_time: Option<Timestamp>,
+    events_read: usize,
+
+    // The values from before the current part, so that the part can be rolled back
+    part_start_states: HashMap<Key, Option<FoldedKeyState>>,
+    part_start_pending: Vec<Event>,
+    part_start_last_time: Option<Timestamp>,
+    part_start_events_read: usize,
+}
+
+impl SnapshotFold {
+    fn new(threshold_time: Timestamp) -> Self {
+        Self {
+            threshold_time,
+            state: HashMap::new(),
+            pending: Vec::new(),
+            last_time: None,
+            events_read: 0,
+            part_start_states: HashMap::new(),
+            part_start_pending: Vec::new(),
+            part_start_last_time: None,
+            part_start_events_read: 0,
+        }
+    }
+
+    fn start_part(&mut self) {
+        self.part_start_states.clear();
+        self.part_start_pending.clone_from(&self.pending);
+        self.part_start_last_time = self.last_time;
+        self.part_start_events_read = self.events_read;
+    }
+
+    fn rollback_part(&mut self) {
+        for (key, state) in self.part_start_states.drain() {
+            self.state.insert(key, state);
+        }
+        self.state.retain(|_, state| state.is_some());
+        self.pending = take(&mut self.part_start_pending);
+        self.last_time = self.part_start_last_time;
+        self.events_read = self.part_start_events_read;
+    }
+
+    /// Returns `false` if the event can't be folded, so the part has to be rolled back.
+    fn push(&mut self, event: Event) -> bool {
+        self.events_read += 1;
+        match event {
+            Event::Insert(..) | Event::Delete(..) | Event::Upsert(..) => {
+                self.pending.push(event);
+                true
+            }
+            Event::AdvanceTime(time) => {
+                if time >= self.threshold_time {
+                    return false;
+                }
+                self.last_time = Some(time);
+                take(&mut self.pending)
+                    .into_iter()
+                    .all(|event| self.fold_event(event))
+            }
+            Event::Finished => true,
+        }
+    }
+
+    fn fold_event(&mut self, event: Event) -> bool {
+        let (key, change) = match event {
+            Event::Insert(key, values) => (key, Ok((values, 1))),
+            Event::Delete(key, values) => (key, Ok((values, -1))),
+            Event::Upsert(key, values) => (key, Err(values)),
+            Event::AdvanceTime(_) | Event::Finished => unreachable!(),
+        };
+        let state = self.state.entry(key).or_default();
+        self.part_start_states
+            .entry(key)
+            .or_insert_with(|| state.clone());
+
+        match (state.as_mut(), change) {
+            (None, Ok((values, diff))) => {
+                *state = Some(FoldedKeyState::Diffs(HashMap::from([(values, diff)])));
+            }
+            (Some(FoldedKeyState::Diffs(diffs)), Ok((values, diff))) => {
+                let count = diffs.entry(values.clone()).or_default();
+                *count += diff;
+                if *count == 0 {
+                    diffs.remove(&values);
+                }
+                if diffs.is_empty() {
+                    *state = None;
+                }
+            }
+            (None | Some(FoldedKeyState::Upserted(_)), Err(values)) => {
+                *state = values.map(FoldedKeyState::Upserted);
+            }
+            (Some(_), _) => {
+                warn!("Snapshot mixes upserts with insertions and deletions for key {key}, it can't be compacted");
+                return false;
+            }
+        }
+        if state.is_none() {
+            self.state.remove(&key);
+        }
+        true
+    }
+
+    /// Returns the events of the compacted part or `None` if no time was folded.
+    fn into_events(self) -> Option<Vec<Event>> {
+        let last_time = self.last_time?;
+        let mut events = Vec::new();
+        for (key, state) in self.state {
+            match state {
+                Some(FoldedKeyState::Diffs(diffs)) => {
+                    for (values, diff) in diffs {
+                        for _ in 0..diff.unsigned_abs() {
+                            events.push(if diff > 0 {
+                                Event::Insert(key, values.clone())
+                            } else {
+                                Event::Delete(key, values.clone())
+                            });
+                        }
+                    }
+                }
+                Some(FoldedKeyState::Upserted(values)) => {
+                    events.push(Event::Upsert(key, Some(values)));
+                }
+                None => {}
+            }
+        }
+        events.push(Event::AdvanceTime(last_time));
+        events.extend(self.pending);
+        Some(events)
+    }
+}
+
+/// Folds a whole snapshot part. Returns `false` if the part can't be compacted, in which
+/// case the fold is left as it was before the part.
+fn fold_part<R: Read>(
+    events: &mut SnapshotEventStream<R>,
+    fold: &mut SnapshotFold,
+) -> Result<bool, ReadError> {
+    fold.start_part();
+    while let Some(event) = events.next_event()? {
+        if !fold.push(event) {
+            fold.rollback_part();
+            return Ok(false);
+        }
+    }
+    Ok(true)
+}
+
+fn is_worth_compacting(parts: &[SnapshotPart]) -> bool {
+    match parts {
+        [] => false,
+        [part] => !part.is_compacted,
+        _ => true,
+    }
+}
+
+fn compacted_part_name(parts: &[SnapshotPart]) -> String {
+    let last_part = parts.last().expect("compacted parts can't be empty");
+    format!("{}{COMPACTED_PART_SUFFIX}", last_part.time)
+}
+
+/// Summary of a single snapshot compaction.
+#[derive(Clone, Copy, Debug, Eq, PartialEq)]
+pub struct CompactionStats {
+    pub parts_compacted: usize,
+    pub events_read: usize,
+    pub events_written: usize,
+}
+
+/// Replaces the oldest parts of a local snapshot with a single part, containing the
+/// net state of every key instead of the whole history of its changes.
+///
+/// Only the events committed before `threshold_time` are folded, so the threshold must
+/// not exceed the time saved in the metadata storage. The newest part is never
+/// compacted because the snapshot writer may still append to it. Returns `None` if
+/// there is nothing to compact.
+///
+/// The compacted part is written under a temporary name and then renamed, so the
+/// readers see either the old parts or the compacted one.
+pub fn compact_local_snapshot(
+    root_path: &Path,
+    threshold_time: Timestamp,
+    format: SnapshotFormat,
+) -> Result<Option<CompactionStats>, ReadError> {
+    let (mut parts, superseded_parts) =
+        split_superseded_parts(list_local_snapshot_parts(root_path)?);
+    remove_local_parts(root_path, &superseded_parts)?;
+    // the newest part may still be appended by the snapshot writer
+    parts.pop();
+
+    let mut fold = SnapshotFold::new(threshold_time);
+    let mut compacted_parts = Vec::new();
+    for part in parts {
+        let file = File::open(root_path.join(&part.name))?;
+        let mut events = SnapshotEventStream::new(BufReader::new(file))?;
+        if !fold_part(&mut events, &mut fold)? {
+            break;
+        }
+        compacted_parts.push(part);
+    }
+    if !is_worth_compacting(&compacted_parts) {
+        return Ok(None);
+    }
+    let events_read = fold.events_read;
+    let Some(events) = fold.into_events() else {
+        return Ok(None);
+    };
+
+    let compacted_name = compacted_part_name(&compacted_parts);
+    let temporary_path = root_path.join(format!("{TEMPORARY_PART_PREFIX}{compacted_name}"));
+    {
+        let mut file = File::create(&temporary_path)?;
+        if format == SnapshotFormat::CompressedBlocks {
+            file.write_all(COMPRESSED_SNAPSHOT_MAGIC)?;
+        }
+        file.write_all(&serialize_events(&events, format))?;
+        file.sync_all()?;
+    }
+    fs::rename(&temporary_path, root_path.join(&compacted_name))?;
+    let parts_compacted = compacted_parts.len();
+    info!(
+        "Compacted {parts_compacted} snapshot parts in {root_path:?}: {events_read} events replaced with {}",
+        events.len()
+    );
+
+    compacted_parts.retain(|part| part.name != compacted_name);
+    remove_local_parts(root_path, &compacted_parts)?;
+
+    Ok(Some(CompactionStats {
+        parts_compacted,
+        events_read,
+        events_written: events.len(),
+    }))
+}
+
+/// Same as [`compact_local_snapshot`], but for a snapshot stored in S3.
+///
+/// All objects can be compacted, because an object becomes visible only once its
+/// upload is completed. Likewise, the compacted object appears atomically.
+pub fn compact_s3_snapshot(
+    bucket: &S3Bucket,
+    path: &str,
+    threshold_time: Timestamp,
+    format: SnapshotFormat,
+) -> Result<Option<CompactionStats>, ReadError> {
+    let (parts, superseded_parts) = split_superseded_parts(list_s3_snapshot_parts(bucket, path)?);
+    remove_s3_parts(bucket, path, &superseded_parts)?;
+
+    let mut fold = SnapshotFold::new(threshold_time);
+    let mut compacted_parts = Vec::new();
+    for part in parts {
+        let (object, pipe_reader) = S3Scanner::stream_object_from_path_and_bucket(
+            &format!("{path}/{}", part.name),
+            bucket.deep_copy(),
+        );
+        let is_folded = SnapshotEventStream::new(pipe_reader)
+            .map_err(ReadError::Io)
+            .and_then(|mut events| fold_part(&mut events, &mut fold));
+        // If the object wasn't read until the end, the download fails and it's fine
+        let download_result = object.finalize();
+        if !is_folded? {
+            break;
+        }
+        download_result?;
+        compacted_parts.push(part);
+    }
+    if !is_worth_compacting(&compacted_parts) {
+        return Ok(None);
+    }
+    let events_read = fold.events_read;
+    let Some(events) = fold.into_events() else {
+        return Ok(None);
+    };
+
+    let compacted_name = compacted_part_name(&compacted_parts);
+    let events_written = events.len();
+    let mut writer = S3Writer::new(
+        bucket.deep_copy(),
+        &format!("{path}/{compacted_name}"),
+        format,
+    )
+    .map_err(|(command, error)| ReadError::S3(command, error))?;
+    let mut events = events.into_iter().peekable();
+    while events.peek().is_some() {
+        writer
+            .put_chunk(events.by_ref().take(MAX_CHUNK_LEN).collect())
+            .map_err(|(command, error)| ReadError::S3(command, error))?;
+    }
+    writer
+        .finalize()
+        .map_err(|(command, error)| ReadError::S3(command, error))?;
+    let parts_compacted = compacted_parts.len();
+    info!(
+        "Compacted {parts_compacted} snapshot parts in {path}: {events_read} events replaced with {events_written}"
+    );
+
+    compacted_parts.retain(|part| part.name != compacted_name);
+    remove_s3_parts(bucket, path, &compacted_parts)?;
+
+    Ok(Some(CompactionStats {
+        parts_compacted,
+        events_read,
+        events_written,
+    }))
+}
+
 pub struct MockSnapshotReader {
     events: Box<dyn Iterator<Item = Event>>,
 }
@@ -7,6 +7,7 @@ mod complex_columns;
 pub mod config;
 mod export;
 pub mod maybe_total;
+mod operator_metrics;
 pub mod operators;
 pub mod shard;
 
@@ -53,6 +54,7 @@ use arcstr::ArcStr;
 use crossbeam_channel::{bounded, never, select, Receiver, RecvError, Sender};
 use derivative::Derivative;
 use differential_dataflow::collection::concatenate;
+use differential_dataflow::difference::Multiply;
 use differential_dataflow::input::InputSession;
 use differential_dataflow::lattice::Lattice;
 use differential_dataflow::operators::arrange::{Arranged, TraceAgent};
@@ -76,6 +78,7 @@ use timely::dataflow::operators::ToStream as _;
 use timely::dataflow::operators::{Filter, Inspect, Probe};
 use timely::dataflow::scopes::Child;
 use timely::execute;
+use timely::logging::ApplicationEvent;
 use timely::order::{Product, TotalOrder};
 use timely::progress::timestamp::Refines;
 use timely::progress::Timestamp as TimestampTrait;
@@ -84,8 +87,16 @@ use xxhash_rust::xxh3::Xxh3 as Hasher;
 use self::complex_columns::complex_columns;
 use self::export::{export_table, import_table};
 use self::maybe_total::{MaybeTotalScope, MaybeTotalTimestamp, NotTotal, Total};
+use self::operator_metrics::MetricsCollector;
+use self::operators::asof_join::{AsofJoin, AsofJoinSettings};
+use self::operators::graph_algorithms::{
+    IncrementalGraph, PageRank, ShortestPaths, WeaklyConnectedComponents,
+};
+use self::operators::interval_join::IntervalJoin;
 use self::operators::output::{ConsolidateForOutput, OutputBatch};
+use self::operators::prefix_sum::PrefixSumUpperbound;
 use self::operators::prev_next::add_prev_next_pointers;
+use self::operators::session_windows::SessionWindows;
 use self::operators::stateful_reduce::StatefulReduce;
 use self::operators::time_column::{MaxTimestamp, TimeColumnBuffer};
 use self::operators::{ArrangeWithTypes, MapWithConsistentDeletions, MapWrapped};
@@ -94,15 +105,19 @@ use self::shard::Shard;
 use super::error::{DynError, DynResult, Trace};
 use super::expression::AnyExpression;
 use super::external_index_wrappers::{ExternalIndexData, ExternalIndexQuery};
-use super::graph::{DataRow, ExportedTable, SubscribeCallbacks};
+use super::graph::{
+    AsofJoinDirection, DataRow, ExportedTable, GraphAlgorithm, IntervalJoinBounds,
+    SessionPredicate, SubscribeCallbacks,
+};
 use super::http_server::maybe_run_http_server_thread;
 use super::license::License;
 use super::progress_reporter::{maybe_run_reporter, MonitoringLevel};
 use super::reduce::{
-    AnyReducer, ArgMaxReducer, ArgMinReducer, ArraySumReducer, CountReducer, EarliestReducer,
+    AnyReducer, ApproxCountDistinctReducer, ApproxQuantileReducer, ArgMaxReducer, ArgMinReducer,
+    ArraySumReducer, CorrelationReducer, CountReducer, CovarianceReducer, EarliestReducer,
     FloatSumReducer, IntSumReducer, LatestReducer, MaxReducer, MinReducer, ReducerImpl,
-    SemigroupReducerImpl, SortedTupleReducer, StatefulCombineFn, StatefulReducer, TupleReducer,
-    UniqueReducer,
+    SemigroupReducerImpl, SortedTupleReducer, StatefulCombineFn, StatefulReducer, TopKReducer,
+    TupleReducer, UniqueReducer, VarianceReducer,
 };
 use super::report_error::{
     LogError, ReportError, ReportErrorExt, SpawnWithReporter, UnwrapWithErrorLogger,
@@ -618,6 +633,7 @@ struct Prober {
     intermediate_probes_required: bool,
     run_callback_every_time: bool,
     stats: HashMap<usize, OperatorStats>,
+    busy_time_reported: HashMap<usize, Duration>,
     callback: Box<dyn FnMut(ProberStats)>,
 }
 
@@ -635,6 +651,7 @@ impl Prober {
             intermediate_probes_required,
             run_callback_every_time,
             stats: HashMap::new(),
+            busy_time_reported: HashMap::new(),
             callback,
         }
     }
@@ -677,6 +694,7 @@ impl Prober {
         output_probe: &ProbeHandle<Timestamp>,
         intermediate_probes: &HashMap<usize, ProbeHandle<Timestamp>>,
         connector_monitors: &[Rc<RefCell<ConnectorMonitor>>],
+        metrics_collector: Option<&RefCell<MetricsCollector>>,
     ) {
         let now = Lazy::new(SystemTime::now);
 
@@ -719,10 +737,31 @@ impl Prober {
             .collect();
 
         if changed || self.run_callback_every_time {
+            let mut operators_metrics = HashMap::new();
             if self.intermediate_probes_required {
+                let collected_metrics = metrics_collector.map(RefCell::borrow);
                 for (id, probe) in intermediate_probes {
-                    self.stats
-                        .insert(*id, Self::create_stats(probe, self.input_time));
+                    let stats = Self::create_stats(probe, self.input_time);
+                    let advanced = self
+                        .stats
+                        .insert(*id, stats)
+                        .map_or(true, |previous| previous.time != stats.time);
+                    let Some(mut metrics) = collected_metrics
+                        .as_ref()
+                        .and_then(|collected| collected.metrics().get(id).cloned())
+                    else {
+                        continue;
+                    };
+                    if advanced {
+                        // the busy time since the frontier last moved was spent on
+                        // the timestamps completed now
+                        let reported = self.busy_time_reported.entry(*id).or_default();
+                        metrics
+                            .processing_times
+                            .push(metrics.busy_time.saturating_sub(*reported));
+                        *reported = metrics.busy_time;
+                    }
+                    operators_metrics.insert(*id, metrics);
                 }
             }
 
@@ -731,6 +770,7 @@ impl Prober {
                 output_stats: Self::create_stats(output_probe, self.input_time),
                 operators_stats: self.stats.clone(),
                 connector_stats,
+                operators_metrics,
             };
 
             (self.callback)(prober_stats);
@@ -1509,6 +1549,70 @@ impl<S: MaybeTotalScope> DataflowGraphInner<S> {
             .alloc(Table::from_collection(new_values).with_properties(table_properties)))
     }
 
+    #[allow(clippy::too_many_arguments)]
+    fn batch_apply_table(
+        &mut self,
+        function: Arc<dyn Fn(&[Vec<Value>]) -> DynResult<Vec<Value>> + Send + Sync>,
+        table_handle: TableHandle,
+        column_paths: Vec<ColumnPath>,
+        max_batch_size: Option<usize>,
+        table_properties: Arc<TableProperties>,
+        trace: Trace,
+        deterministic: bool,
+    ) -> Result<TableHandle> {
+        let table = self
+            .tables
+            .get(table_handle)
+            .ok_or(Error::InvalidTableHandle)?;
+        let error_reporter = self.error_reporter.clone();
+        let error_logger = self.create_error_logger()?;
+        let compute = move |rows: &[(Key, Value)]| -> Vec<Value> {
+            let args: Vec<Vec<Value>> = rows
+                .iter()
+                .map(|(key, values)| {
+                    column_paths
+                        .iter()
+                        .map(|path| path.extract(key, values))
+                        .collect::<Result<_>>()
+                        .unwrap_with_reporter_and_trace(&error_reporter, &trace)
+                })
+                .collect();
+            function(&args)
+                .unwrap_or_log_with_trace(
+                    error_logger.as_ref(),
+                    &trace,
+                    vec![Value::Error; rows.len()],
+                )
+                .into_iter()
+                .map(|value| Value::from([value].as_slice()))
+                .collect()
+        };
+        let new_values = if deterministic {
+            table.values().map_wrapped_batched_named(
+                "expression_column::apply_batch",
+                BatchWrapper::None,
+                max_batch_size,
+                move |rows: Vec<(Key, Value)>| {
+                    let results = compute(&rows);
+                    rows.into_iter()
+                        .zip(results)
+                        .map(|((key, _values), result)| (key, result))
+                        .collect()
+                },
+            )
+        } else {
+            table.values().map_named_batched_with_consistent_deletions(
+                "expression_column::apply_batch",
+                BatchWrapper::None,
+                max_batch_size,
+                move |rows| compute(&rows),
+            )
+        };
+        Ok(self
+            .tables
+            .alloc(Table::from_collection(new_values).with_properties(table_properties)))
+    }
+
     fn filter_table(
         &mut self,
         table_handle: TableHandle,
@@ -2532,6 +2636,13 @@ impl<S: MaybeTotalScope> DataflowGraphInner<S> {
 
     fn set_operator_id(&mut self, operator_id: usize) -> Result<()> {
         self.current_operator_id = Some(operator_id);
+        if let Some(logger) = self.scope.logging() {
+            // lets operator metrics attribute the timely operators built from now on
+            logger.log(ApplicationEvent {
+                id: operator_id,
+                is_start: true,
+            });
+        }
         Ok(())
     }
 
@@ -2604,27 +2715,69 @@ impl<S: MaybeTotalScope, R: ReducerImpl> DataflowReducer<S> for R {
     }
 }
 
+fn reduce_semigroup<S, R>(
+    reducer: Rc<R>,
+    values: &Collection<S, (Key, Key, Vec<Value>)>,
+) -> Values<S>
+where
+    S: MaybeTotalScope,
+    R: SemigroupReducerImpl,
+    R::State: Multiply<isize, Output = R::State>,
+{
+    values
+        .map_named("SemigroupReducer::reduce::init", {
+            let reducer = reducer.clone();
+            move |(source_key, result_key, values)| {
+                let state = reducer.init(&source_key, &values).unwrap_or_else(|| {
+                    panic!(
+                        "{reducer_type}::init() failed for {values:?} of key {source_key:?}",
+                        reducer_type = type_name::<R>()
+                    )
+                }); // XXX
+                (result_key, state)
+            }
+        })
+        .explode(|(key, state)| once((key, state)))
+        .count()
+        .map_named("SemigroupReducer::reduce", move |(key, state)| {
+            (key, reducer.finish(state))
+        })
+        .into()
+}
+
 impl<S: MaybeTotalScope> DataflowReducer<S> for IntSumReducer {
     fn reduce(self: Rc<Self>, values: &Collection<S, (Key, Key, Vec<Value>)>) -> Values<S> {
-        values
-            .map_named("IntSumReducer::reduce::init", {
-                let self_ = self.clone();
-                move |(source_key, result_key, values)| {
-                    let state = self_.init(&source_key, &values[0]).unwrap_or_else(|| {
-                        panic!(
-                            "{reducer_type}::init() failed for {values:?} of key {source_key:?}",
-                            reducer_type = "IntSumReducer"
-                        )
-                    }); // XXX
-                    (result_key, state)
-                }
-            })
-            .explode(|(key, state)| once((key, state)))
-            .count()
-            .map_named("IntSumReducer::reduce", move |(key, state)| {
-                (key, self.finish(state))
-            })
-            .into()
+        reduce_semigroup(self, values)
+    }
+}
+
+impl<S: MaybeTotalScope> DataflowReducer<S> for ApproxCountDistinctReducer {
+    fn reduce(self: Rc<Self>, values: &Collection<S, (Key, Key, Vec<Value>)>) -> Values<S> {
+        reduce_semigroup(self, values)
+    }
+}
+
+impl<S: MaybeTotalScope> DataflowReducer<S> for ApproxQuantileReducer {
+    fn reduce(self: Rc<Self>, values: &Collection<S, (Key, Key, Vec<Value>)>) -> Values<S> {
+        reduce_semigroup(self, values)
+    }
+}
+
+impl<S: MaybeTotalScope> DataflowReducer<S> for VarianceReducer {
+    fn reduce(self: Rc<Self>, values: &Collection<S, (Key, Key, Vec<Value>)>) -> Values<S> {
+        reduce_semigroup(self, values)
+    }
+}
+
+impl<S: MaybeTotalScope> DataflowReducer<S> for CovarianceReducer {
+    fn reduce(self: Rc<Self>, values: &Collection<S, (Key, Key, Vec<Value>)>) -> Values<S> {
+        reduce_semigroup(self, values)
+    }
+}
+
+impl<S: MaybeTotalScope> DataflowReducer<S> for CorrelationReducer {
+    fn reduce(self: Rc<Self>, values: &Collection<S, (Key, Key, Vec<Value>)>) -> Values<S> {
+        reduce_semigroup(self, values)
     }
 }
 
@@ -2738,6 +2891,18 @@ where
             Reducer::Tuple { skip_nones } => Rc::new(TupleReducer::new(*skip_nones)),
 
             Reducer::Any => Rc::new(AnyReducer),
+            Reducer::ApproxCountDistinct { precision } => {
+                Rc::new(ApproxCountDistinctReducer::new(*precision))
+            }
+            Reducer::ApproxQuantile {
+                quantile,
+                relative_accuracy,
+            } => Rc::new(ApproxQuantileReducer::new(*quantile, *relative_accuracy)),
+            Reducer::TopK { k } => Rc::new(TopKReducer::new(*k)),
+            Reducer::Variance { ddof } => Rc::new(VarianceReducer::new(*ddof, false)),
+            Reducer::Stddev { ddof } => Rc::new(VarianceReducer::new(*ddof, true)),
+            Reducer::Covariance { ddof } => Rc::new(CovarianceReducer::new(*ddof)),
+            Reducer::Correlation => Rc::new(CorrelationReducer),
             Reducer::Stateful { .. } | Reducer::Earliest | Reducer::Latest => {
                 return Err(Error::NotSupportedInIteration)
             }
@@ -2871,6 +3036,398 @@ impl<S: MaybeTotalScope<MaybeTotalTimestamp = Timestamp>> DataflowGraphInner<S>
 where
     S::MaybeTotalTimestamp: TotalOrder,
 {
+    fn session_windows_table(
+        &mut self,
+        table_handle: TableHandle,
+        key_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        predicate: SessionPredicate,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        let table = self
+            .tables
+            .get(table_handle)
+            .ok_or(Error::InvalidTableHandle)?;
+
+        let error_reporter = self.error_reporter.clone();
+        let instance_key_id = table.values().map_named(
+            "session_windows_table::instance_key_id",
+            move |(id, values)| {
+                let instance = instance_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                let key = key_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                (Key::for_value(&instance), (key, id))
+            },
+        );
+
+        let error_reporter = self.error_reporter.clone();
+        let sessions: ArrangedByKey<S, Key, (Key, Value, Value)> = instance_key_id
+            .session_windows_named("session_windows_table::sessions", move |current, next| {
+                predicate
+                    .merges(current, next)
+                    .unwrap_with_reporter(&error_reporter)
+            })
+            .arrange();
+
+        let new_values =
+            table
+                .values_arranged()
+                .join_core(&sessions, |key, values, (window, start, end)| {
+                    once((
+                        *key,
+                        Value::from(
+                            [
+                                values.clone(),
+                                Value::Pointer(*window),
+                                start.clone(),
+                                end.clone(),
+                            ]
+                            .as_slice(),
+                        ),
+                    ))
+                });
+
+        Ok(self
+            .tables
+            .alloc(Table::from_collection(new_values).with_properties(table_properties)))
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn interval_join_table(
+        &mut self,
+        left_table_handle: TableHandle,
+        right_table_handle: TableHandle,
+        left_time_column_path: ColumnPath,
+        right_time_column_path: ColumnPath,
+        left_instance_column_path: ColumnPath,
+        right_instance_column_path: ColumnPath,
+        bounds: IntervalJoinBounds,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        let left_table = self
+            .tables
+            .get(left_table_handle)
+            .ok_or(Error::InvalidTableHandle)?;
+        let right_table = self
+            .tables
+            .get(right_table_handle)
+            .ok_or(Error::InvalidTableHandle)?;
+
+        let error_reporter = self.error_reporter.clone();
+        let left_instance_time_id = left_table.values().map_named(
+            "interval_join_table::left_instance_time_id",
+            move |(id, values)| {
+                let instance = left_instance_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                let time = left_time_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                (Key::for_value(&instance), (time, id))
+            },
+        );
+        let error_reporter = self.error_reporter.clone();
+        let right_instance_time_id = right_table.values().map_named(
+            "interval_join_table::right_instance_time_id",
+            move |(id, values)| {
+                let instance = right_instance_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                let time = right_time_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                (Key::for_value(&instance), (time, id))
+            },
+        );
+
+        let left_error_reporter = self.error_reporter.clone();
+        let right_error_reporter = self.error_reporter.clone();
+        let left_bounds = bounds.clone();
+        let new_values = left_instance_time_id
+            .interval_join_named(
+                "interval_join_table::join",
+                &right_instance_time_id,
+                move |left_time| {
+                    left_bounds
+                        .right_range(left_time)
+                        .unwrap_with_reporter(&left_error_reporter)
+                },
+                move |right_time| {
+                    bounds
+                        .left_range(right_time)
+                        .unwrap_with_reporter(&right_error_reporter)
+                },
+            )
+            .map_named("interval_join_table::new_values", |(left_id, right_id)| {
+                (
+                    Key::for_values(&[Value::Pointer(left_id), Value::Pointer(right_id)]),
+                    Value::from([Value::Pointer(left_id), Value::Pointer(right_id)].as_slice()),
+                )
+            });
+
+        Ok(self
+            .tables
+            .alloc(Table::from_collection(new_values).with_properties(table_properties)))
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn asof_join_table(
+        &mut self,
+        table_handle: TableHandle,
+        time_column_path: ColumnPath,
+        side_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        direction: AsofJoinDirection,
+        right_first: bool,
+        match_left: bool,
+        match_right: bool,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        let table = self
+            .tables
+            .get(table_handle)
+            .ok_or(Error::InvalidTableHandle)?;
+
+        let error_reporter = self.error_reporter.clone();
+        let instance_time_side_id = table.values().map_named(
+            "asof_join_table::instance_time_side_id",
+            move |(id, values)| {
+                let instance = instance_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                let time = time_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                let side = side_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter)
+                    .as_bool()
+                    .unwrap_with_reporter(&error_reporter);
+                (Key::for_value(&instance), (time, side, id))
+            },
+        );
+
+        let settings = AsofJoinSettings {
+            matched_sides: [match_left, match_right],
+            right_first,
+            backward: direction.backward(),
+            forward: direction.forward(),
+        };
+        let error_reporter = self.error_reporter.clone();
+        let peers: ArrangedByKey<S, Key, Option<Key>> = instance_time_side_id
+            .asof_join_named(
+                "asof_join_table::peers",
+                settings,
+                move |current, previous, next| {
+                    AsofJoinDirection::prefers_previous(current, previous, next)
+                        .unwrap_with_reporter(&error_reporter)
+                },
+            )
+            .arrange();
+
+        let new_values = table
+            .values_arranged()
+            .join_core(&peers, |key, values, peer| {
+                once((
+                    *key,
+                    Value::from(
+                        [values.clone(), peer.map_or(Value::None, Value::Pointer)].as_slice(),
+                    ),
+                ))
+            });
+
+        Ok(self
+            .tables
+            .alloc(Table::from_collection(new_values).with_properties(table_properties)))
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn prefix_sum_upperbound_table(
+        &mut self,
+        table_handle: TableHandle,
+        key_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        weight_column_path: ColumnPath,
+        queries_table_handle: TableHandle,
+        query_instance_column_path: ColumnPath,
+        threshold_column_path: ColumnPath,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        let table = self
+            .tables
+            .get(table_handle)
+            .ok_or(Error::InvalidTableHandle)?;
+        let queries_table = self
+            .tables
+            .get(queries_table_handle)
+            .ok_or(Error::InvalidTableHandle)?;
+
+        let error_reporter = self.error_reporter.clone();
+        let instance_key_id_weight = table.values().map_named(
+            "prefix_sum_upperbound_table::instance_key_id_weight",
+            move |(id, values)| {
+                let instance = instance_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                let key = key_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                let weight = weight_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter)
+                    .as_ordered_float()
+                    .unwrap_with_reporter(&error_reporter);
+                (Key::for_value(&instance), (key, id, weight))
+            },
+        );
+        let error_reporter = self.error_reporter.clone();
+        let instance_query_threshold = queries_table.values().map_named(
+            "prefix_sum_upperbound_table::instance_query_threshold",
+            move |(id, values)| {
+                let instance = query_instance_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                let threshold = threshold_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter)
+                    .as_ordered_float()
+                    .unwrap_with_reporter(&error_reporter);
+                (Key::for_value(&instance), (id, threshold))
+            },
+        );
+
+        let upperbounds: ArrangedByKey<S, Key, Option<Key>> = instance_key_id_weight
+            .prefix_sum_upperbound_named(
+                "prefix_sum_upperbound_table::upperbounds",
+                &instance_query_threshold,
+            )
+            .arrange();
+
+        let new_values =
+            queries_table
+                .values_arranged()
+                .join_core(&upperbounds, |key, values, upperbound| {
+                    once((
+                        *key,
+                        Value::from(
+                            [
+                                values.clone(),
+                                upperbound.map_or(Value::None, Value::Pointer),
+                            ]
+                            .as_slice(),
+                        ),
+                    ))
+                });
+
+        Ok(self
+            .tables
+            .alloc(Table::from_collection(new_values).with_properties(table_properties)))
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn graph_algorithm_table(
+        &mut self,
+        vertices_table_handle: TableHandle,
+        vertex_instance_column_path: ColumnPath,
+        is_source_column_path: ColumnPath,
+        edges_table_handle: TableHandle,
+        source_column_path: ColumnPath,
+        target_column_path: ColumnPath,
+        weight_column_path: ColumnPath,
+        edge_instance_column_path: ColumnPath,
+        algorithm: GraphAlgorithm,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        let vertices_table = self
+            .tables
+            .get(vertices_table_handle)
+            .ok_or(Error::InvalidTableHandle)?;
+        let edges_table = self
+            .tables
+            .get(edges_table_handle)
+            .ok_or(Error::InvalidTableHandle)?;
+
+        let error_reporter = self.error_reporter.clone();
+        let instance_vertex = vertices_table.values().map_named(
+            "graph_algorithm_table::instance_vertex",
+            move |(id, values)| {
+                let instance = vertex_instance_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                let is_source = is_source_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter)
+                    .as_bool()
+                    .unwrap_with_reporter(&error_reporter);
+                (Key::for_value(&instance), (id, is_source))
+            },
+        );
+        let error_reporter = self.error_reporter.clone();
+        let instance_edge = edges_table.values().map_named(
+            "graph_algorithm_table::instance_edge",
+            move |(id, values)| {
+                let instance = edge_instance_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter);
+                let source = source_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter)
+                    .as_pointer()
+                    .unwrap_with_reporter(&error_reporter);
+                let target = target_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter)
+                    .as_pointer()
+                    .unwrap_with_reporter(&error_reporter);
+                let weight = weight_column_path
+                    .extract(&id, &values)
+                    .unwrap_with_reporter(&error_reporter)
+                    .as_ordered_float()
+                    .unwrap_with_reporter(&error_reporter);
+                (Key::for_value(&instance), (id, source, target, weight))
+            },
+        );
+
+        let name = "graph_algorithm_table::results";
+        let results: ArrangedByKey<S, Key, Value> = match algorithm {
+            GraphAlgorithm::PageRank { damping, tolerance } => instance_vertex
+                .incremental_graph_named(name, &instance_edge, move || {
+                    PageRank::new(damping, tolerance)
+                })
+                .map_named("graph_algorithm_table::ranks", |(id, rank)| {
+                    (id, Value::Float(rank))
+                }),
+            GraphAlgorithm::WeaklyConnectedComponents => instance_vertex
+                .incremental_graph_named(name, &instance_edge, WeaklyConnectedComponents::new)
+                .map_named("graph_algorithm_table::components", |(id, label)| {
+                    (id, Value::Pointer(label))
+                }),
+            GraphAlgorithm::ShortestPaths => instance_vertex
+                .incremental_graph_named(name, &instance_edge, ShortestPaths::new)
+                .map_named("graph_algorithm_table::distances", |(id, distance)| {
+                    (id, Value::Float(distance))
+                }),
+        }
+        .arrange();
+
+        let new_values =
+            vertices_table
+                .values_arranged()
+                .join_core(&results, |key, values, result| {
+                    once((
+                        *key,
+                        Value::from([values.clone(), result.clone()].as_slice()),
+                    ))
+                });
+
+        Ok(self
+            .tables
+            .alloc(Table::from_collection(new_values).with_properties(table_properties)))
+    }
+
     #[allow(clippy::too_many_lines)]
     fn deduplicate(
         &mut self,
@@ -3093,6 +3650,7 @@ impl<S: MaybeTotalScope<MaybeTotalTimestamp = Timestamp>> DataflowGraphInner<S>
         parser: Box<dyn Parser>,
         commit_duration: Option<Duration>,
         parallel_readers: usize,
+        parse_threads: usize,
         table_properties: Arc<TableProperties>,
         external_persistent_id: Option<&ExternalPersistentId>,
     ) -> Result<TableHandle> {
@@ -3158,6 +3716,7 @@ impl<S: MaybeTotalScope<MaybeTotalTimestamp = Timestamp>> DataflowGraphInner<S>
                 },
                 self.output_probe.clone(),
                 self.worker_persistent_storage.clone(),
+                parse_threads,
                 self.connector_monitors.len(),
                 realtime_reader_needed,
                 effective_persistent_id.as_ref(),
@@ -4278,6 +4837,27 @@ where
         )
     }
 
+    fn batch_apply_table(
+        &self,
+        function: Arc<dyn Fn(&[Vec<Value>]) -> DynResult<Vec<Value>> + Send + Sync>,
+        table_handle: TableHandle,
+        column_paths: Vec<ColumnPath>,
+        max_batch_size: Option<usize>,
+        table_properties: Arc<TableProperties>,
+        trace: Trace,
+        deterministic: bool,
+    ) -> Result<TableHandle> {
+        self.0.borrow_mut().batch_apply_table(
+            function,
+            table_handle,
+            column_paths,
+            max_batch_size,
+            table_properties,
+            trace,
+            deterministic,
+        )
+    }
+
     fn subscribe_table(
         &self,
         _table_handle: TableHandle,
@@ -4488,6 +5068,80 @@ where
         )
     }
 
+    fn session_windows_table(
+        &self,
+        _table_handle: TableHandle,
+        _key_column_path: ColumnPath,
+        _instance_column_path: ColumnPath,
+        _predicate: SessionPredicate,
+        _table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        Err(Error::NotSupportedInIteration)
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn interval_join_table(
+        &self,
+        _left_table_handle: TableHandle,
+        _right_table_handle: TableHandle,
+        _left_time_column_path: ColumnPath,
+        _right_time_column_path: ColumnPath,
+        _left_instance_column_path: ColumnPath,
+        _right_instance_column_path: ColumnPath,
+        _bounds: IntervalJoinBounds,
+        _table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        Err(Error::NotSupportedInIteration)
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn asof_join_table(
+        &self,
+        _table_handle: TableHandle,
+        _time_column_path: ColumnPath,
+        _side_column_path: ColumnPath,
+        _instance_column_path: ColumnPath,
+        _direction: AsofJoinDirection,
+        _right_first: bool,
+        _match_left: bool,
+        _match_right: bool,
+        _table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        Err(Error::NotSupportedInIteration)
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn prefix_sum_upperbound_table(
+        &self,
+        _table_handle: TableHandle,
+        _key_column_path: ColumnPath,
+        _instance_column_path: ColumnPath,
+        _weight_column_path: ColumnPath,
+        _queries_table_handle: TableHandle,
+        _query_instance_column_path: ColumnPath,
+        _threshold_column_path: ColumnPath,
+        _table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        Err(Error::NotSupportedInIteration)
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn graph_algorithm_table(
+        &self,
+        _vertices_table_handle: TableHandle,
+        _vertex_instance_column_path: ColumnPath,
+        _is_source_column_path: ColumnPath,
+        _edges_table_handle: TableHandle,
+        _source_column_path: ColumnPath,
+        _target_column_path: ColumnPath,
+        _weight_column_path: ColumnPath,
+        _edge_instance_column_path: ColumnPath,
+        _algorithm: GraphAlgorithm,
+        _table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        Err(Error::NotSupportedInIteration)
+    }
+
     fn deduplicate(
         &self,
         _table_handle: TableHandle,
@@ -4602,6 +5256,7 @@ where
         _parser: Box<dyn Parser>,
         _commit_duration: Option<Duration>,
         _parallel_readers: usize,
+        _parse_threads: usize,
         _table_properties: Arc<TableProperties>,
         _external_persistent_id: Option<&ExternalPersistentId>,
     ) -> Result<TableHandle> {
@@ -4851,6 +5506,27 @@ impl<S: MaybeTotalScope<MaybeTotalTimestamp = Timestamp>> Graph for OuterDataflo
         )
     }
 
+    fn batch_apply_table(
+        &self,
+        function: Arc<dyn Fn(&[Vec<Value>]) -> DynResult<Vec<Value>> + Send + Sync>,
+        table_handle: TableHandle,
+        column_paths: Vec<ColumnPath>,
+        max_batch_size: Option<usize>,
+        table_properties: Arc<TableProperties>,
+        trace: Trace,
+        deterministic: bool,
+    ) -> Result<TableHandle> {
+        self.0.borrow_mut().batch_apply_table(
+            function,
+            table_handle,
+            column_paths,
+            max_batch_size,
+            table_properties,
+            trace,
+            deterministic,
+        )
+    }
+
     fn subscribe_table(
         &self,
         table_handle: TableHandle,
@@ -5087,6 +5763,125 @@ impl<S: MaybeTotalScope<MaybeTotalTimestamp = Timestamp>> Graph for OuterDataflo
         )
     }
 
+    fn session_windows_table(
+        &self,
+        table_handle: TableHandle,
+        key_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        predicate: SessionPredicate,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        self.0.borrow_mut().session_windows_table(
+            table_handle,
+            key_column_path,
+            instance_column_path,
+            predicate,
+            table_properties,
+        )
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn interval_join_table(
+        &self,
+        left_table_handle: TableHandle,
+        right_table_handle: TableHandle,
+        left_time_column_path: ColumnPath,
+        right_time_column_path: ColumnPath,
+        left_instance_column_path: ColumnPath,
+        right_instance_column_path: ColumnPath,
+        bounds: IntervalJoinBounds,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        self.0.borrow_mut().interval_join_table(
+            left_table_handle,
+            right_table_handle,
+            left_time_column_path,
+            right_time_column_path,
+            left_instance_column_path,
+            right_instance_column_path,
+            bounds,
+            table_properties,
+        )
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn asof_join_table(
+        &self,
+        table_handle: TableHandle,
+        time_column_path: ColumnPath,
+        side_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        direction: AsofJoinDirection,
+        right_first: bool,
+        match_left: bool,
+        match_right: bool,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        self.0.borrow_mut().asof_join_table(
+            table_handle,
+            time_column_path,
+            side_column_path,
+            instance_column_path,
+            direction,
+            right_first,
+            match_left,
+            match_right,
+            table_properties,
+        )
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn prefix_sum_upperbound_table(
+        &self,
+        table_handle: TableHandle,
+        key_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        weight_column_path: ColumnPath,
+        queries_table_handle: TableHandle,
+        query_instance_column_path: ColumnPath,
+        threshold_column_path: ColumnPath,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        self.0.borrow_mut().prefix_sum_upperbound_table(
+            table_handle,
+            key_column_path,
+            instance_column_path,
+            weight_column_path,
+            queries_table_handle,
+            query_instance_column_path,
+            threshold_column_path,
+            table_properties,
+        )
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn graph_algorithm_table(
+        &self,
+        vertices_table_handle: TableHandle,
+        vertex_instance_column_path: ColumnPath,
+        is_source_column_path: ColumnPath,
+        edges_table_handle: TableHandle,
+        source_column_path: ColumnPath,
+        target_column_path: ColumnPath,
+        weight_column_path: ColumnPath,
+        edge_instance_column_path: ColumnPath,
+        algorithm: GraphAlgorithm,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        self.0.borrow_mut().graph_algorithm_table(
+            vertices_table_handle,
+            vertex_instance_column_path,
+            is_source_column_path,
+            edges_table_handle,
+            source_column_path,
+            target_column_path,
+            weight_column_path,
+            edge_instance_column_path,
+            algorithm,
+            table_properties,
+        )
+    }
+
     fn deduplicate(
         &self,
         table_handle: TableHandle,
@@ -5210,6 +6005,7 @@ impl<S: MaybeTotalScope<MaybeTotalTimestamp = Timestamp>> Graph for OuterDataflo
         parser: Box<dyn Parser>,
         commit_duration: Option<Duration>,
         parallel_readers: usize,
+        parse_threads: usize,
         table_properties: Arc<TableProperties>,
         external_persistent_id: Option<&ExternalPersistentId>,
     ) -> Result<TableHandle> {
@@ -5218,6 +6014,7 @@ impl<S: MaybeTotalScope<MaybeTotalTimestamp = Timestamp>> Graph for OuterDataflo
             parser,
             commit_duration,
             parallel_readers,
+            parse_threads,
             table_properties,
             external_persistent_id,
         )
@@ -5339,6 +6136,12 @@ where
                 }
             }
 
+            let metrics_collector = if with_http_server && worker.index() == 0 {
+                MetricsCollector::register(worker)
+            } else {
+                None
+            };
+
             let (
                 res,
                 mut flushers,
@@ -5397,6 +6200,7 @@ where
                         &output_probe,
                         &intermediate_probes,
                         &connector_monitors,
+                        metrics_collector.as_deref(),
                     );
                 }
 
@@ -5453,6 +6257,7 @@ where
                     &output_probe,
                     &intermediate_probes,
                     &connector_monitors,
+                    metrics_collector.as_deref(),
                 );
             }
 
@@ -0,0 +1,235 @@
+// Copyright © 2024 Pathway
+
+//! Per-operator metrics gathered from the timely and differential logging streams.
+//!
+//! `DataflowGraphInner::set_operator_id` marks the start of every Pathway operator in the
+//! timely log with an `ApplicationEvent`, so the timely operators, channels and arrangements
+//! created afterwards can be attributed to the Pathway operator that built them.
+
+use std::cell::RefCell;
+use std::collections::HashMap;
+use std::rc::Rc;
+use std::time::Duration;
+
+use differential_dataflow::logging::DifferentialEvent;
+use timely::communication::Allocate;
+use timely::logging::{StartStop, TimelyEvent};
+use timely::worker::Worker;
+
+use crate::engine::OperatorMetrics;
+
+#[derive(Default)]
+pub struct MetricsCollector {
+    current_operator_id: Option<usize>,
+    operator_ids: HashMap<usize, usize>,
+    operator_ids_by_address: HashMap<Vec<usize>, usize>,
+    channels: HashMap<usize, (Option<usize>, Option<usize>)>,
+    schedule_stack: Vec<(usize, Duration, Duration)>,
+    metrics: HashMap<usize, OperatorMetrics>,
+}
+
+impl MetricsCollector {
+    /// Subscribes to the logging streams of the worker. Returns `None` if they are
+    /// already consumed by someone else, e.g. when logging to a socket is enabled.
+    pub fn register<A: Allocate>(worker: &mut Worker<A>) -> Option<Rc<RefCell<Self>>> {
+        let mut log_register = worker.log_register();
+        if log_register.get::<TimelyEvent>("timely").is_some() {
+            return None;
+        }
+        let collector = Rc::new(RefCell::new(Self::default()));
+
+        let timely_collector = collector.clone();
+        log_register.insert::<TimelyEvent, _>("timely", move |_time, data| {
+            let mut collector = timely_collector.borrow_mut();
+            for (time, _worker, event) in data.drain(..) {
+                collector.on_timely_event(time, event);
+            }
+        });
+
+        if log_register
+            .get::<DifferentialEvent>("differential/arrange")
+            .is_none()
+        {
+            let differential_collector = collector.clone();
+            log_register.insert::<DifferentialEvent, _>(
+                "differential/arrange",
+                move |_time, data| {
+                    let mut collector = differential_collector.borrow_mut();
+                    for (_time, _worker, event) in data.drain(..) {
+                        collector.on_differential_event(event);
+                    }
+                },
+            );
+        }
+
+        Some(collector)
+    }
+
+    pub fn metrics(&self) -> &HashMap<usize, OperatorMetrics> {
+        &self.metrics
+    }
+
+    fn operator_metrics(&mut self, timely_id: usize) -> Option<&mut OperatorMetrics> {
+        let operator_id = self.operator_ids.get(&timely_id)?;
+        Some(self.metrics.entry(*operator_id).or_default())
+    }
+
+    fn on_timely_event(&mut self, time: Duration, event: TimelyEvent) {
+        match event {
+            TimelyEvent::Application(event) if event.is_start => {
+                self.current_operator_id = Some(event.id);
+            }
+            // operators of length-one addresses are whole dataflows
+            TimelyEvent::Operates(event) if event.addr.len() > 1 => {
+                if let Some(operator_id) = self.current_operator_id {
+                    self.operator_ids.insert(event.id, operator_id);
+                    self.operator_ids_by_address.insert(event.addr, operator_id);
+                }
+            }
+            TimelyEvent::Channels(event) => {
+                // node 0 is the boundary of the enclosing scope, the channel target is
+                // the operator being built right now
+                let source = (event.source.0 != 0)
+                    .then(|| {
+                        let mut address = event.scope_addr;
+                        address.push(event.source.0);
+                        self.operator_ids_by_address.get(&address).copied()
+                    })
+                    .flatten();
+                self.channels
+                    .insert(event.id, (source, self.current_operator_id));
+            }
+            TimelyEvent::Messages(event) if !event.is_send => {
+                let Some((source, target)) = self.channels.get(&event.channel).copied() else {
+                    return;
+                };
+                if source == target {
+                    return;
+                }
+                let length = event.length as u64;
+                if let Some(source) = source {
+                    self.metrics.entry(source).or_default().rows_out += length;
+                }
+                if let Some(target) = target {
+                    self.metrics.entry(target).or_default().rows_in += length;
+                }
+            }
+            TimelyEvent::Schedule(event) => match event.start_stop {
+                StartStop::Start => self.schedule_stack.push((event.id, time, Duration::ZERO)),
+                StartStop::Stop => {
+                    let Some((id, start, children)) = self.schedule_stack.pop() else {
+                        return;
+                    };
+                    let elapsed = time.saturating_sub(start);
+                    if let Some(parent) = self.schedule_stack.last_mut() {
+                        parent.2 += elapsed;
+                    }
+                    if let Some(metrics) = self.operator_metrics(id) {
+                        metrics.busy_time += elapsed.saturating_sub(children);
+                    }
+                }
+            },
+            _ => {}
+        }
+    }
+
+    fn on_differential_event(&mut self, event: DifferentialEvent) {
+        match event {
+            DifferentialEvent::Batch(event) => {
+                if let Some(metrics) = self.operator_metrics(event.operator) {
+                    metrics.arrangement_records += event.length as u64;
+                }
+            }
+            DifferentialEvent::Merge(event) => {
+                if let (Some(length), Some(metrics)) =
+                    (event.complete, self.operator_metrics(event.operator))
+                {
+                    metrics.arrangement_records = (metrics.arrangement_records + length as u64)
+                        .saturating_sub((event.length1 + event.length2) as u64);
+                }
+            }
+            DifferentialEvent::Drop(event) => {
+                if let Some(metrics) = self.operator_metrics(event.operator) {
+                    metrics.arrangement_records = metrics
+                        .arrangement_records
+                        .saturating_sub(event.length as u64);
+                }
+            }
+            _ => {}
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use timely::logging::{
+        ApplicationEvent, ChannelsEvent, MessagesEvent, OperatesEvent, ScheduleEvent,
+    };
+
+    use super::*;
+
+    fn operates(id: usize, addr: Vec<usize>) -> TimelyEvent {
+        TimelyEvent::Operates(OperatesEvent {
+            id,
+            addr,
+            name: String::new(),
+        })
+    }
+
+    fn received(channel: usize, length: usize) -> TimelyEvent {
+        TimelyEvent::Messages(MessagesEvent {
+            is_send: false,
+            channel,
+            source: 0,
+            target: 0,
+            seq_no: 0,
+            length,
+        })
+    }
+
+    fn schedule(id: usize, start_stop: StartStop) -> TimelyEvent {
+        TimelyEvent::Schedule(ScheduleEvent { id, start_stop })
+    }
+
+    #[test]
+    fn test_attributes_events_to_operators() {
+        let mut collector = MetricsCollector::default();
+        let events = [
+            TimelyEvent::Application(ApplicationEvent {
+                id: 7,
+                is_start: true,
+            }),
+            operates(1, vec![0, 1]),
+            operates(3, vec![0, 2]),
+            TimelyEvent::Application(ApplicationEvent {
+                id: 8,
+                is_start: true,
+            }),
+            TimelyEvent::Channels(ChannelsEvent {
+                id: 4,
+                scope_addr: vec![0],
+                source: (2, 0),
+                target: (3, 0),
+            }),
+            operates(5, vec![0, 3]),
+            received(4, 10),
+            schedule(3, StartStop::Start),
+            schedule(3, StartStop::Stop),
+        ];
+        for (time, event) in events.into_iter().enumerate() {
+            collector.on_timely_event(Duration::from_millis(time as u64), event);
+        }
+        collector.on_differential_event(DifferentialEvent::Batch(
+            differential_dataflow::logging::BatchEvent {
+                operator: 5,
+                length: 4,
+            },
+        ));
+
+        let metrics = collector.metrics();
+        assert_eq!(metrics[&7].rows_out, 10);
+        assert_eq!(metrics[&7].busy_time, Duration::from_millis(1));
+        assert_eq!(metrics[&8].rows_in, 10);
+        assert_eq!(metrics[&8].arrangement_records, 4);
+    }
+}
@@ -1,9 +1,14 @@
 // Copyright © 2024 Pathway
 
+pub mod asof_join;
 pub mod external_index;
 pub mod gradual_broadcast;
+pub mod graph_algorithms;
+pub mod interval_join;
 pub mod output;
+pub mod prefix_sum;
 pub mod prev_next;
+pub mod session_windows;
 pub mod stateful_reduce;
 pub mod time_column;
 mod utils;
@@ -215,6 +220,14 @@ where
         logic: impl FnMut(D) -> D2 + 'static,
     ) -> Collection<S, D2, R>;
 
+    fn map_wrapped_batched_named<D2: Data>(
+        &self,
+        name: &str,
+        wrapper: BatchWrapper,
+        max_batch_size: Option<usize>,
+        logic: impl FnMut(Vec<D>) -> Vec<D2> + 'static,
+    ) -> Collection<S, D2, R>;
+
     fn map_named_async<F: Future>(
         &self,
         name: &str,
@@ -265,6 +278,48 @@ where
             .as_collection()
     }
 
+    #[track_caller]
+    fn map_wrapped_batched_named<D2: Data>(
+        &self,
+        name: &str,
+        wrapper: BatchWrapper,
+        max_batch_size: Option<usize>,
+        mut logic: impl FnMut(Vec<D>) -> Vec<D2> + 'static,
+    ) -> Collection<S, D2, R> {
+        let caller = Location::caller();
+        let name = format!("{name} at {caller}");
+        let mut vector = Vec::new();
+        self.inner
+            .unary(Pipeline, &name, move |_, _| {
+                move |input, output| {
+                    wrapper.run(|| {
+                        while let Some((time, data)) = input.next() {
+                            data.swap(&mut vector);
+                            let batch_size = max_batch_size.unwrap_or(vector.len()).max(1);
+                            let mut session = output.session(&time);
+                            let mut rows = vector.drain(..).peekable();
+                            while rows.peek().is_some() {
+                                let (batch, times_and_diffs): (Vec<_>, Vec<_>) = rows
+                                    .by_ref()
+                                    .take(batch_size)
+                                    .map(|(data, time, diff)| (data, (time, diff)))
+                                    .unzip();
+                                let results = logic(batch);
+                                assert_eq!(results.len(), times_and_diffs.len());
+                                session.give_iterator(
+                                    results
+                                        .into_iter()
+                                        .zip(times_and_diffs)
+                                        .map(|(result, (time, diff))| (result, time, diff)),
+                                );
+                            }
+                        }
+                    });
+                }
+            })
+            .as_collection()
+    }
+
     #[track_caller]
     fn map_named_async<F: Future>(
         &self,
@@ -317,6 +372,14 @@ where
         logic: impl FnMut((K, V)) -> (K, V2) + 'static,
     ) -> Collection<S, (K, V2), R>;
 
+    fn map_named_batched_with_consistent_deletions<V2: Data>(
+        &self,
+        name: &str,
+        wrapper: BatchWrapper,
+        max_batch_size: Option<usize>,
+        logic: impl FnMut(Vec<(K, V)>) -> Vec<V2> + 'static,
+    ) -> Collection<S, (K, V2), R>;
+
     fn map_named_async_with_consistent_deletions<F: Future>(
         &self,
         name: &str,
@@ -376,6 +439,62 @@ where
             .as_collection()
     }
 
+    #[track_caller]
+    fn map_named_batched_with_consistent_deletions<V2: Data>(
+        &self,
+        name: &str,
+        wrapper: BatchWrapper,
+        max_batch_size: Option<usize>,
+        mut logic: impl FnMut(Vec<(K, V)>) -> Vec<V2> + 'static,
+    ) -> Collection<S, (K, V2), R> {
+        let caller = Location::caller();
+        let name = format!("{name} at {caller}");
+        let mut cache: HashMap<K, V2> = HashMap::new();
+        self.consolidate_for_output_named(&format!("ConsolidateForOutput: {name}"), false)
+            .unary(Pipeline, &name, move |_, _| {
+                let mut vector = Vec::new();
+                move |input, output| {
+                    wrapper.run(|| {
+                        while let Some((cap, data)) = input.next() {
+                            data.swap(&mut vector);
+                            for batch in vector.drain(..) {
+                                let OutputBatch { time, mut data } = batch;
+                                let mut session = output.session(&cap.delayed(&time));
+                                let mut insertions = Vec::new();
+                                for ((key, value), diff) in data.drain(..) {
+                                    if diff < Monoid::zero() {
+                                        let result = cache
+                                            .remove(&key)
+                                            .expect("result for negative diff should be stored");
+                                        session.give(((key, result), time.clone(), diff));
+                                    } else {
+                                        insertions.push(((key, value), diff));
+                                    }
+                                }
+                                let batch_size = max_batch_size.unwrap_or(insertions.len()).max(1);
+                                let mut rows = insertions.into_iter().peekable();
+                                while rows.peek().is_some() {
+                                    let (batch, diffs): (Vec<_>, Vec<_>) =
+                                        rows.by_ref().take(batch_size).unzip();
+                                    let keys: Vec<K> =
+                                        batch.iter().map(|(key, _value)| key.clone()).collect();
+                                    let results = logic(batch);
+                                    assert_eq!(results.len(), keys.len());
+                                    for ((key, result), diff) in
+                                        keys.into_iter().zip(results).zip(diffs)
+                                    {
+                                        cache.insert(key.clone(), result.clone());
+                                        session.give(((key, result), time.clone(), diff));
+                                    }
+                                }
+                            }
+                        }
+                    });
+                }
+            })
+            .as_collection()
+    }
+
     #[track_caller]
     fn map_named_async_with_consistent_deletions<F: Future>(
         &self,
@@ -0,0 +1,364 @@
+// Copyright © 2024 Pathway
+
+use std::collections::{BTreeMap, BTreeSet, HashMap};
+use std::hash::Hash;
+use std::ops::Bound::{Excluded, Unbounded};
+use std::panic::Location;
+
+use differential_dataflow::operators::arrange::Arranged;
+use differential_dataflow::trace::{BatchReader, Cursor, TraceReader};
+use differential_dataflow::{AsCollection, Collection, Data, ExchangeData};
+use timely::dataflow::channels::pact::Pipeline;
+use timely::dataflow::operators::Operator;
+use timely::order::TotalOrder;
+
+use super::ArrangeWithTypes;
+use crate::engine::dataflow::maybe_total::MaybeTotalScope;
+use crate::engine::dataflow::shard::Shard;
+use crate::engine::dataflow::ArrangedByKey;
+
+/// Which rows take part in an as-of join and how they are matched.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct AsofJoinSettings {
+    /// Whether rows of the left (`false`) and the right (`true`) side get matched.
+    /// Rows of a side that is not matched always get no peer.
+    pub matched_sides: [bool; 2],
+    /// Whether right rows precede left rows with equal times.
+    pub right_first: bool,
+    /// Whether a row can be matched with a preceding row of the other side.
+    pub backward: bool,
+    /// Whether a row can be matched with a following row of the other side.
+    pub forward: bool,
+}
+
+/// Position of a row: its time, whether it comes after rows of the other side
+/// with equal time, and its id.
+type Position<T, I> = (T, bool, I);
+
+/// Rows of a single instance, ordered separately for both sides,
+/// together with the peers that were last emitted for them.
+struct InstanceRows<T, I> {
+    rows: [BTreeSet<Position<T, I>>; 2],
+    peers: HashMap<I, Option<I>>,
+}
+
+impl<T, I> InstanceRows<T, I>
+where
+    T: Data,
+    I: Data + Hash,
+{
+    fn new() -> Self {
+        Self {
+            rows: [BTreeSet::new(), BTreeSet::new()],
+            peers: HashMap::new(),
+        }
+    }
+
+    fn is_empty(&self) -> bool {
+        self.rows.iter().all(BTreeSet::is_empty)
+    }
+
+    fn peer(
+        &self,
+        side: usize,
+        position: &Position<T, I>,
+        settings: AsofJoinSettings,
+        prefers_previous: &mut impl FnMut(&T, &T, &T) -> bool,
+    ) -> Option<I> {
+        if !settings.matched_sides[side] {
+            return None;
+        }
+        let others = &self.rows[1 - side];
+        let previous = if settings.backward {
+            others.range(..position).next_back()
+        } else {
+            None
+        };
+        let next = if settings.forward {
+            others.range((Excluded(position), Unbounded)).next()
+        } else {
+            None
+        };
+        let peer = match (previous, next) {
+            (Some(previous), Some(next)) => {
+                if prefers_previous(&position.0, &previous.0, &next.0) {
+                    previous
+                } else {
+                    next
+                }
+            }
+            (previous, next) => previous.or(next)?,
+        };
+        Some(peer.2.clone())
+    }
+
+    /// Applies updates from a single time and returns the changes of peers of rows.
+    /// Apart from the changed rows, only the rows of the other side lying between
+    /// a changed row and its neighbours from the same side are rematched.
+    fn update(
+        &mut self,
+        updates: Vec<((T, bool, I), isize)>,
+        settings: AsofJoinSettings,
+        prefers_previous: &mut impl FnMut(&T, &T, &T) -> bool,
+    ) -> Vec<((I, Option<I>), isize)> {
+        let mut changes = Vec::new();
+        let mut dirty = Vec::new();
+        for ((time, side, id), diff) in updates {
+            let position = (time, side != settings.right_first, id);
+            let side = usize::from(side);
+            if diff < 0 {
+                self.rows[side].remove(&position);
+                if let Some(peer) = self.peers.remove(&position.2) {
+                    changes.push(((position.2.clone(), peer), -1));
+                }
+            } else if diff > 0 {
+                self.rows[side].insert(position.clone());
+                dirty.push((side, position.clone()));
+            }
+
+            if settings.matched_sides[1 - side] {
+                let same_side = &self.rows[side];
+                let lower = if settings.forward {
+                    same_side
+                        .range(..&position)
+                        .next_back()
+                        .map_or(Unbounded, Excluded)
+                } else {
+                    Excluded(&position)
+                };
+                let upper = if settings.backward {
+                    same_side
+                        .range((Excluded(&position), Unbounded))
+                        .next()
+                        .map_or(Unbounded, Excluded)
+                } else {
+                    Excluded(&position)
+                };
+                dirty.extend(
+                    self.rows[1 - side]
+                        .range((lower, upper))
+                        .map(|affected| (1 - side, affected.clone())),
+                );
+            }
+        }
+        dirty.sort();
+        dirty.dedup();
+
+        for (side, position) in dirty {
+            if !self.rows[side].contains(&position) {
+                continue;
+            }
+            let peer = self.peer(side, &position, settings, prefers_previous);
+            let id = position.2;
+            if self.peers.get(&id) == Some(&peer) {
+                continue;
+            }
+            if let Some(old_peer) = self.peers.insert(id.clone(), peer.clone()) {
+                changes.push(((id.clone(), old_peer), -1));
+            }
+            changes.push(((id, peer), 1));
+        }
+        changes
+    }
+}
+
+pub trait AsofJoin<S, K, T, I>
+where
+    S: MaybeTotalScope,
+    S::Timestamp: TotalOrder,
+{
+    /// Matches rows, given as `(instance, (time, side, id))`, with the closest rows of the
+    /// other side from the same instance, preceding or following them depending on `settings`.
+    /// If both are allowed, `prefers_previous(current, previous, next)` decides between them.
+    /// Returns the id of the peer of every row (or `None`) keyed by the row id.
+    #[track_caller]
+    fn asof_join(
+        &self,
+        settings: AsofJoinSettings,
+        prefers_previous: impl FnMut(&T, &T, &T) -> bool + 'static,
+    ) -> Collection<S, (I, Option<I>), isize> {
+        self.asof_join_named("AsofJoin", settings, prefers_previous)
+    }
+
+    fn asof_join_named(
+        &self,
+        name: &str,
+        settings: AsofJoinSettings,
+        prefers_previous: impl FnMut(&T, &T, &T) -> bool + 'static,
+    ) -> Collection<S, (I, Option<I>), isize>;
+}
+
+impl<S, K, T, I> AsofJoin<S, K, T, I> for Collection<S, (K, (T, bool, I)), isize>
+where
+    S: MaybeTotalScope,
+    S::Timestamp: TotalOrder,
+    K: ExchangeData + Shard + Hash,
+    T: ExchangeData,
+    I: ExchangeData + Hash,
+{
+    #[track_caller]
+    fn asof_join_named(
+        &self,
+        name: &str,
+        settings: AsofJoinSettings,
+        prefers_previous: impl FnMut(&T, &T, &T) -> bool + 'static,
+    ) -> Collection<S, (I, Option<I>), isize> {
+        let arranged: ArrangedByKey<S, K, (T, bool, I), isize> =
+            self.arrange_named(&format!("Arrange: {name}"));
+        arranged.asof_join_named(name, settings, prefers_previous)
+    }
+}
+
+impl<S, Tr, T, I> AsofJoin<S, Tr::Key, T, I> for Arranged<S, Tr>
+where
+    S: MaybeTotalScope,
+    S::Timestamp: TotalOrder,
+    Tr: TraceReader<Val = (T, bool, I), Time = S::Timestamp, R = isize> + Clone,
+    Tr::Key: Data + Hash,
+    T: Data,
+    I: Data + Hash,
+{
+    #[track_caller]
+    fn asof_join_named(
+        &self,
+        name: &str,
+        settings: AsofJoinSettings,
+        mut prefers_previous: impl FnMut(&T, &T, &T) -> bool + 'static,
+    ) -> Collection<S, (I, Option<I>), isize> {
+        let caller = Location::caller();
+        let name = format!("{name} at {caller}");
+
+        let mut rows_by_instance: HashMap<Tr::Key, InstanceRows<T, I>> = HashMap::new();
+        self.stream
+            .unary(Pipeline, &name, move |_, _| {
+                move |input, output| {
+                    input.for_each(|cap, data| {
+                        let mut session = output.session(&cap);
+                        for batch in data.iter() {
+                            let mut cursor = batch.cursor();
+                            while let Some(key) = cursor.get_key(batch) {
+                                let mut data_by_time = BTreeMap::new();
+                                while let Some(val) = cursor.get_val(batch) {
+                                    cursor.map_times(batch, |time, diff| {
+                                        data_by_time
+                                            .entry(time.clone())
+                                            .or_insert_with(Vec::new)
+                                            .push((val.clone(), *diff));
+                                    });
+                                    cursor.step_val(batch);
+                                }
+                                let rows = rows_by_instance
+                                    .entry(key.clone())
+                                    .or_insert_with(InstanceRows::new);
+                                for (time, data) in data_by_time {
+                                    for (change, diff) in
+                                        rows.update(data, settings, &mut prefers_previous)
+                                    {
+                                        session.give((change, time.clone(), diff));
+                                    }
+                                }
+                                if rows.is_empty() {
+                                    rows_by_instance.remove(key);
+                                }
+                                cursor.step_key(batch);
+                            }
+                        }
+                    });
+                }
+            })
+            .as_collection()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::{AsofJoinSettings, InstanceRows};
+
+    fn prefers_previous(current: &i64, previous: &i64, next: &i64) -> bool {
+        current - previous < next - current
+    }
+
+    #[test]
+    fn test_backward_rematches_only_affected_rows() {
+        let settings = AsofJoinSettings {
+            matched_sides: [true, false],
+            right_first: true,
+            backward: true,
+            forward: false,
+        };
+        let mut rows = InstanceRows::new();
+        let changes = rows.update(
+            vec![
+                ((1, false, 'a'), 1),
+                ((4, false, 'b'), 1),
+                ((6, false, 'c'), 1),
+                ((2, true, 'x'), 1),
+            ],
+            settings,
+            &mut prefers_previous,
+        );
+        assert_eq!(
+            changes,
+            vec![
+                (('a', None), 1),
+                (('b', Some('x')), 1),
+                (('c', Some('x')), 1),
+                (('x', None), 1),
+            ]
+        );
+
+        // a right row with time equal to a left one comes first, so it is matched
+        let changes = rows.update(vec![((4, true, 'y'), 1)], settings, &mut prefers_previous);
+        assert_eq!(
+            changes,
+            vec![
+                (('b', Some('x')), -1),
+                (('b', Some('y')), 1),
+                (('c', Some('x')), -1),
+                (('c', Some('y')), 1),
+                (('y', None), 1),
+            ]
+        );
+
+        let changes = rows.update(vec![((2, true, 'x'), -1)], settings, &mut prefers_previous);
+        assert_eq!(changes, vec![(('x', None), -1)]);
+    }
+
+    #[test]
+    fn test_nearest() {
+        let settings = AsofJoinSettings {
+            matched_sides: [true, true],
+            right_first: false,
+            backward: true,
+            forward: true,
+        };
+        let mut rows = InstanceRows::new();
+        let changes = rows.update(
+            vec![
+                ((3, false, 'a'), 1),
+                ((1, true, 'x'), 1),
+                ((5, true, 'y'), 1),
+            ],
+            settings,
+            &mut prefers_previous,
+        );
+        assert_eq!(
+            changes,
+            vec![
+                (('a', Some('y')), 1),
+                (('x', Some('a')), 1),
+                (('y', Some('a')), 1),
+            ]
+        );
+
+        let changes = rows.update(vec![((2, true, 'z'), 1)], settings, &mut prefers_previous);
+        assert_eq!(
+            changes,
+            vec![
+                (('a', Some('y')), -1),
+                (('a', Some('z')), 1),
+                (('z', Some('a')), 1)
+            ]
+        );
+    }
+}
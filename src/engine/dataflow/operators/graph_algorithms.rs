@@ -0,0 +1,870 @@
+// Copyright © 2024 Pathway
+
+use std::collections::{BTreeMap, BTreeSet, HashMap, HashSet, VecDeque};
+use std::hash::Hash;
+use std::panic::Location;
+
+use differential_dataflow::{AsCollection, Collection, ExchangeData};
+use ordered_float::OrderedFloat;
+use timely::dataflow::channels::pact::Exchange;
+use timely::dataflow::operators::{Capability, Operator};
+use timely::order::TotalOrder;
+
+use crate::engine::dataflow::maybe_total::MaybeTotalScope;
+use crate::engine::dataflow::shard::Shard;
+
+/// A directed multigraph with weighted edges. Apart from the endpoints of edges,
+/// it contains the vertices that were given explicitly, some of them marked as sources.
+struct Graph<I> {
+    vertices: HashMap<I, bool>,
+    out_edges: HashMap<I, HashMap<I, (I, f64)>>,
+    in_edges: HashMap<I, HashMap<I, (I, f64)>>,
+}
+
+impl<I> Graph<I>
+where
+    I: Eq + Hash + Clone,
+{
+    fn new() -> Self {
+        Self {
+            vertices: HashMap::new(),
+            out_edges: HashMap::new(),
+            in_edges: HashMap::new(),
+        }
+    }
+
+    fn is_empty(&self) -> bool {
+        self.vertices.is_empty() && self.out_edges.is_empty()
+    }
+
+    fn update_vertex(&mut self, vertex: I, is_source: bool, diff: isize) {
+        if diff > 0 {
+            self.vertices.insert(vertex, is_source);
+        } else if diff < 0 {
+            self.vertices.remove(&vertex);
+        }
+    }
+
+    fn update_edge(&mut self, edge: I, u: I, v: I, weight: f64, diff: isize) {
+        if diff > 0 {
+            self.out_edges
+                .entry(u.clone())
+                .or_default()
+                .insert(edge.clone(), (v.clone(), weight));
+            self.in_edges
+                .entry(v)
+                .or_default()
+                .insert(edge, (u, weight));
+        } else if diff < 0 {
+            Self::remove_edge(&mut self.out_edges, &u, &edge);
+            Self::remove_edge(&mut self.in_edges, &v, &edge);
+        }
+    }
+
+    fn remove_edge(edges: &mut HashMap<I, HashMap<I, (I, f64)>>, vertex: &I, edge: &I) {
+        if let Some(vertex_edges) = edges.get_mut(vertex) {
+            vertex_edges.remove(edge);
+            if vertex_edges.is_empty() {
+                edges.remove(vertex);
+            }
+        }
+    }
+
+    fn contains(&self, vertex: &I) -> bool {
+        self.vertices.contains_key(vertex)
+            || self.out_edges.contains_key(vertex)
+            || self.in_edges.contains_key(vertex)
+    }
+
+    fn is_source(&self, vertex: &I) -> bool {
+        self.vertices.get(vertex) == Some(&true)
+    }
+
+    fn out_edges(&self, vertex: &I) -> impl Iterator<Item = (&I, &I, f64)> {
+        self.out_edges
+            .get(vertex)
+            .into_iter()
+            .flatten()
+            .map(|(edge, (v, weight))| (edge, v, *weight))
+    }
+
+    fn in_edges(&self, vertex: &I) -> impl Iterator<Item = (&I, &I, f64)> {
+        self.in_edges
+            .get(vertex)
+            .into_iter()
+            .flatten()
+            .map(|(edge, (u, weight))| (edge, u, *weight))
+    }
+
+    fn out_degree(&self, vertex: &I) -> usize {
+        self.out_edges.get(vertex).map_or(0, HashMap::len)
+    }
+
+    fn neighbours(&self, vertex: &I) -> impl Iterator<Item = &I> {
+        self.out_edges(vertex)
+            .chain(self.in_edges(vertex))
+            .map(|(_edge, neighbour, _weight)| neighbour)
+    }
+}
+
+/// Results that were last emitted for the explicitly given vertices.
+struct EmittedResults<I, O> {
+    results: HashMap<I, O>,
+}
+
+impl<I, O> EmittedResults<I, O>
+where
+    I: Eq + Hash + Clone,
+    O: PartialEq + Clone,
+{
+    fn new() -> Self {
+        Self {
+            results: HashMap::new(),
+        }
+    }
+
+    fn set(&mut self, vertex: I, result: Option<O>, changes: &mut Vec<((I, O), isize)>) {
+        let old_result = match result {
+            Some(result) => {
+                if self.results.get(&vertex) == Some(&result) {
+                    return;
+                }
+                changes.push(((vertex.clone(), result.clone()), 1));
+                self.results.insert(vertex.clone(), result)
+            }
+            None => self.results.remove(&vertex),
+        };
+        if let Some(old_result) = old_result {
+            changes.push(((vertex, old_result), -1));
+        }
+    }
+}
+
+/// State of an algorithm computing a result for every vertex of a graph, kept up to date
+/// while vertices and edges are added and removed.
+pub trait IncrementalGraphAlgorithm<I>: 'static {
+    type Output: ExchangeData;
+
+    fn update_vertex(&mut self, vertex: I, is_source: bool, diff: isize);
+
+    fn update_edge(&mut self, edge: I, u: I, v: I, weight: f64, diff: isize);
+
+    /// Recomputes the results affected by the updates applied since the last call
+    /// and returns the changes of results of the explicitly given vertices.
+    fn update_results(&mut self, changes: &mut Vec<((I, Self::Output), isize)>);
+
+    fn is_empty(&self) -> bool;
+}
+
+/// `PageRank` with damping factor `damping`, in the scale where a vertex with no
+/// incoming edges has rank `1 - damping`. Changed ranks are propagated to the successors
+/// of a vertex only if they differ by more than `tolerance` from the previous ones.
+pub struct PageRank<I> {
+    graph: Graph<I>,
+    damping: f64,
+    tolerance: f64,
+    ranks: HashMap<I, f64>,
+    queue: VecDeque<I>,
+    queued: HashSet<I>,
+    touched: HashSet<I>,
+    emitted: EmittedResults<I, OrderedFloat<f64>>,
+}
+
+impl<I> PageRank<I>
+where
+    I: Eq + Hash + Clone,
+{
+    pub fn new(damping: f64, tolerance: f64) -> Self {
+        Self {
+            graph: Graph::new(),
+            damping,
+            tolerance,
+            ranks: HashMap::new(),
+            queue: VecDeque::new(),
+            queued: HashSet::new(),
+            touched: HashSet::new(),
+            emitted: EmittedResults::new(),
+        }
+    }
+
+    fn enqueue(&mut self, vertex: I) {
+        if self.queued.insert(vertex.clone()) {
+            self.queue.push_back(vertex);
+        }
+    }
+
+    fn enqueue_successors(&mut self, vertex: &I) {
+        let successors: Vec<I> = self
+            .graph
+            .out_edges(vertex)
+            .map(|(_edge, v, _weight)| v.clone())
+            .collect();
+        for successor in successors {
+            self.enqueue(successor);
+        }
+    }
+}
+
+impl<I> IncrementalGraphAlgorithm<I> for PageRank<I>
+where
+    I: ExchangeData + Hash,
+{
+    type Output = OrderedFloat<f64>;
+
+    fn update_vertex(&mut self, vertex: I, is_source: bool, diff: isize) {
+        self.graph.update_vertex(vertex.clone(), is_source, diff);
+        self.touched.insert(vertex.clone());
+        self.enqueue(vertex);
+    }
+
+    fn update_edge(&mut self, edge: I, u: I, v: I, weight: f64, diff: isize) {
+        self.graph
+            .update_edge(edge, u.clone(), v.clone(), weight, diff);
+        // the out-degree of u changed, so the inflow of all its successors did
+        self.enqueue_successors(&u);
+        self.enqueue(u);
+        self.enqueue(v);
+    }
+
+    fn update_results(&mut self, changes: &mut Vec<((I, OrderedFloat<f64>), isize)>) {
+        while let Some(vertex) = self.queue.pop_front() {
+            self.queued.remove(&vertex);
+            self.touched.insert(vertex.clone());
+            if !self.graph.contains(&vertex) {
+                self.ranks.remove(&vertex);
+                continue;
+            }
+            let inflow: f64 = self
+                .graph
+                .in_edges(&vertex)
+                .map(|(_edge, u, _weight)| {
+                    #[allow(clippy::cast_precision_loss)]
+                    let out_degree = self.graph.out_degree(u) as f64;
+                    self.ranks.get(u).copied().unwrap_or(1.0) / out_degree
+                })
+                .sum();
+            let rank = (1.0 - self.damping) + self.damping * inflow;
+            let previous_rank = self.ranks.insert(vertex.clone(), rank);
+            if previous_rank.map_or(true, |previous_rank| {
+                (rank - previous_rank).abs() > self.tolerance
+            }) {
+                self.enqueue_successors(&vertex);
+            }
+        }
+        for vertex in self.touched.drain() {
+            let result = if self.graph.vertices.contains_key(&vertex) {
+                self.ranks.get(&vertex).copied().map(OrderedFloat)
+            } else {
+                None
+            };
+            self.emitted.set(vertex, result, changes);
+        }
+    }
+
+    fn is_empty(&self) -> bool {
+        self.graph.is_empty()
+    }
+}
+
+/// Weakly connected components, each labelled with the smallest of its vertices.
+pub struct WeaklyConnectedComponents<I> {
+    graph: Graph<I>,
+    labels: HashMap<I, I>,
+    members: HashMap<I, BTreeSet<I>>,
+    touched: HashSet<I>,
+    emitted: EmittedResults<I, I>,
+}
+
+impl<I> WeaklyConnectedComponents<I>
+where
+    I: Ord + Hash + Clone,
+{
+    pub fn new() -> Self {
+        Self {
+            graph: Graph::new(),
+            labels: HashMap::new(),
+            members: HashMap::new(),
+            touched: HashSet::new(),
+            emitted: EmittedResults::new(),
+        }
+    }
+
+    fn add_singleton(&mut self, vertex: &I) {
+        if !self.labels.contains_key(vertex) {
+            self.labels.insert(vertex.clone(), vertex.clone());
+            self.members
+                .insert(vertex.clone(), BTreeSet::from([vertex.clone()]));
+            self.touched.insert(vertex.clone());
+        }
+    }
+
+    fn remove_if_absent(&mut self, vertex: &I) {
+        if self.graph.contains(vertex) {
+            return;
+        }
+        if let Some(label) = self.labels.remove(vertex) {
+            let members = self.members.get_mut(&label).unwrap();
+            members.remove(vertex);
+            if members.is_empty() {
+                self.members.remove(&label);
+            }
+            self.touched.insert(vertex.clone());
+        }
+    }
+
+    fn relabel(&mut self, vertices: BTreeSet<I>) {
+        let label = vertices.first().unwrap().clone();
+        for vertex in &vertices {
+            self.labels.insert(vertex.clone(), label.clone());
+            self.touched.insert(vertex.clone());
+        }
+        self.members.insert(label, vertices);
+    }
+
+    fn merge(&mut self, u: &I, v: &I) {
+        let u_label = self.labels[u].clone();
+        let v_label = self.labels[v].clone();
+        if u_label == v_label {
+            return;
+        }
+        let (label, merged_label) = if u_label < v_label {
+            (u_label, v_label)
+        } else {
+            (v_label, u_label)
+        };
+        let merged = self.members.remove(&merged_label).unwrap();
+        for vertex in &merged {
+            self.labels.insert(vertex.clone(), label.clone());
+            self.touched.insert(vertex.clone());
+        }
+        self.members.get_mut(&label).unwrap().extend(merged);
+    }
+
+    /// Searches from `u` and `v` alternately. If the searches meet, returns `None`.
+    /// Otherwise, returns the vertices reachable from the one that was exhausted first,
+    /// so that the work done is proportional to the smaller of the parts.
+    fn separated_part(&self, u: &I, v: &I) -> Option<BTreeSet<I>> {
+        if u == v {
+            return None;
+        }
+        let mut queues = [VecDeque::from([u.clone()]), VecDeque::from([v.clone()])];
+        let mut visited = [HashSet::from([u.clone()]), HashSet::from([v.clone()])];
+        loop {
+            for side in 0..2 {
+                let Some(vertex) = queues[side].pop_front() else {
+                    return Some(visited[side].drain().collect());
+                };
+                for neighbour in self.graph.neighbours(&vertex) {
+                    if visited[1 - side].contains(neighbour) {
+                        return None;
+                    }
+                    if visited[side].insert(neighbour.clone()) {
+                        queues[side].push_back(neighbour.clone());
+                    }
+                }
+            }
+        }
+    }
+
+    fn split(&mut self, u: &I, v: &I) {
+        let Some(part) = self.separated_part(u, v) else {
+            return;
+        };
+        let label = self.labels[u].clone();
+        let mut rest = self.members.remove(&label).unwrap();
+        for vertex in &part {
+            rest.remove(vertex);
+        }
+        if !part.contains(&label) {
+            self.members.insert(label, rest);
+        } else if !rest.is_empty() {
+            self.relabel(rest);
+        }
+        self.relabel(part);
+    }
+}
+
+impl<I> Default for WeaklyConnectedComponents<I>
+where
+    I: Ord + Hash + Clone,
+{
+    fn default() -> Self {
+        Self::new()
+    }
+}
+
+impl<I> IncrementalGraphAlgorithm<I> for WeaklyConnectedComponents<I>
+where
+    I: ExchangeData + Hash,
+{
+    type Output = I;
+
+    fn update_vertex(&mut self, vertex: I, is_source: bool, diff: isize) {
+        self.graph.update_vertex(vertex.clone(), is_source, diff);
+        if diff > 0 {
+            self.add_singleton(&vertex);
+        } else {
+            self.remove_if_absent(&vertex);
+        }
+        self.touched.insert(vertex);
+    }
+
+    fn update_edge(&mut self, edge: I, u: I, v: I, weight: f64, diff: isize) {
+        if diff > 0 {
+            self.add_singleton(&u);
+            self.add_singleton(&v);
+            self.graph
+                .update_edge(edge, u.clone(), v.clone(), weight, diff);
+            self.merge(&u, &v);
+        } else if diff < 0 {
+            self.graph
+                .update_edge(edge, u.clone(), v.clone(), weight, diff);
+            self.split(&u, &v);
+            self.remove_if_absent(&u);
+            self.remove_if_absent(&v);
+        }
+    }
+
+    fn update_results(&mut self, changes: &mut Vec<((I, I), isize)>) {
+        for vertex in self.touched.drain() {
+            let result = if self.graph.vertices.contains_key(&vertex) {
+                self.labels.get(&vertex).cloned()
+            } else {
+                None
+            };
+            self.emitted.set(vertex, result, changes);
+        }
+    }
+
+    fn is_empty(&self) -> bool {
+        self.graph.is_empty()
+    }
+}
+
+/// Distances from the closest source, with `f64::INFINITY` for unreachable vertices.
+/// Edge weights can be negative, but the graph must not contain negative cycles.
+///
+/// Every reached vertex remembers the edge (or being a source) its distance comes from.
+/// Removing it resets only the distances in the subtree of the shortest-paths tree
+/// hanging from that vertex, which are then recomputed from their remaining in-edges.
+pub struct ShortestPaths<I> {
+    graph: Graph<I>,
+    distances: HashMap<I, f64>,
+    parents: HashMap<I, Option<I>>,
+    queue: VecDeque<I>,
+    queued: HashSet<I>,
+    reset: Vec<I>,
+    touched: HashSet<I>,
+    emitted: EmittedResults<I, OrderedFloat<f64>>,
+}
+
+impl<I> ShortestPaths<I>
+where
+    I: Eq + Hash + Clone,
+{
+    pub fn new() -> Self {
+        Self {
+            graph: Graph::new(),
+            distances: HashMap::new(),
+            parents: HashMap::new(),
+            queue: VecDeque::new(),
+            queued: HashSet::new(),
+            reset: Vec::new(),
+            touched: HashSet::new(),
+            emitted: EmittedResults::new(),
+        }
+    }
+
+    fn distance(&self, vertex: &I) -> f64 {
+        self.distances.get(vertex).copied().unwrap_or(f64::INFINITY)
+    }
+
+    fn improve(&mut self, vertex: I, distance: f64, parent: Option<I>) {
+        if distance < self.distance(&vertex) {
+            self.distances.insert(vertex.clone(), distance);
+            self.parents.insert(vertex.clone(), parent);
+            self.touched.insert(vertex.clone());
+            if self.queued.insert(vertex.clone()) {
+                self.queue.push_back(vertex);
+            }
+        }
+    }
+
+    fn reset_subtree(&mut self, root: I) {
+        let mut stack = vec![root];
+        while let Some(vertex) = stack.pop() {
+            if self.distances.remove(&vertex).is_none() {
+                continue;
+            }
+            self.parents.remove(&vertex);
+            stack.extend(
+                self.graph
+                    .out_edges(&vertex)
+                    .filter(|(edge, v, _weight)| {
+                        self.parents
+                            .get(*v)
+                            .is_some_and(|parent| parent.as_ref() == Some(*edge))
+                    })
+                    .map(|(_edge, v, _weight)| v.clone()),
+            );
+            self.touched.insert(vertex.clone());
+            self.reset.push(vertex);
+        }
+    }
+}
+
+impl<I> Default for ShortestPaths<I>
+where
+    I: Eq + Hash + Clone,
+{
+    fn default() -> Self {
+        Self::new()
+    }
+}
+
+impl<I> IncrementalGraphAlgorithm<I> for ShortestPaths<I>
+where
+    I: ExchangeData + Hash,
+{
+    type Output = OrderedFloat<f64>;
+
+    fn update_vertex(&mut self, vertex: I, is_source: bool, diff: isize) {
+        self.graph.update_vertex(vertex.clone(), is_source, diff);
+        self.touched.insert(vertex.clone());
+        if diff < 0 && self.parents.get(&vertex) == Some(&None) {
+            self.reset_subtree(vertex);
+        } else if diff > 0 && is_source {
+            self.improve(vertex, 0.0, None);
+        }
+    }
+
+    fn update_edge(&mut self, edge: I, u: I, v: I, weight: f64, diff: isize) {
+        self.graph
+            .update_edge(edge.clone(), u.clone(), v.clone(), weight, diff);
+        if diff < 0 && self.parents.get(&v) == Some(&Some(edge.clone())) {
+            self.reset_subtree(v);
+        } else if diff > 0 {
+            let distance = self.distance(&u) + weight;
+            self.improve(v, distance, Some(edge));
+        }
+    }
+
+    fn update_results(&mut self, changes: &mut Vec<((I, OrderedFloat<f64>), isize)>) {
+        for vertex in std::mem::take(&mut self.reset) {
+            let mut best = if self.graph.is_source(&vertex) {
+                (0.0, None)
+            } else {
+                (f64::INFINITY, None)
+            };
+            for (edge, u, weight) in self.graph.in_edges(&vertex) {
+                let distance = self.distance(u) + weight;
+                if distance < best.0 {
+                    best = (distance, Some(edge.clone()));
+                }
+            }
+            self.improve(vertex, best.0, best.1);
+        }
+        while let Some(vertex) = self.queue.pop_front() {
+            self.queued.remove(&vertex);
+            let distance = self.distance(&vertex);
+            let relaxed: Vec<_> = self
+                .graph
+                .out_edges(&vertex)
+                .map(|(edge, v, weight)| (v.clone(), distance + weight, edge.clone()))
+                .collect();
+            for (v, distance, edge) in relaxed {
+                self.improve(v, distance, Some(edge));
+            }
+        }
+        for vertex in self.touched.drain() {
+            let result = self.graph.vertices.contains_key(&vertex).then(|| {
+                OrderedFloat(
+                    self.distances
+                        .get(&vertex)
+                        .copied()
+                        .unwrap_or(f64::INFINITY),
+                )
+            });
+            self.emitted.set(vertex, result, changes);
+        }
+    }
+
+    fn is_empty(&self) -> bool {
+        self.graph.is_empty()
+    }
+}
+
+pub trait IncrementalGraph<S, K, I>
+where
+    S: MaybeTotalScope,
+    S::Timestamp: TotalOrder,
+{
+    /// Runs an incremental graph algorithm separately for every instance, on vertices given
+    /// as `(instance, (id, is_source))` and edges given as `(instance, (id, u, v, weight))`.
+    /// Returns the result of the algorithm for every vertex keyed by the vertex id.
+    #[track_caller]
+    fn incremental_graph<G>(
+        &self,
+        edges: &Collection<S, (K, (I, I, I, OrderedFloat<f64>)), isize>,
+        new_state: impl Fn() -> G + 'static,
+    ) -> Collection<S, (I, G::Output), isize>
+    where
+        G: IncrementalGraphAlgorithm<I>,
+    {
+        self.incremental_graph_named("IncrementalGraph", edges, new_state)
+    }
+
+    fn incremental_graph_named<G>(
+        &self,
+        name: &str,
+        edges: &Collection<S, (K, (I, I, I, OrderedFloat<f64>)), isize>,
+        new_state: impl Fn() -> G + 'static,
+    ) -> Collection<S, (I, G::Output), isize>
+    where
+        G: IncrementalGraphAlgorithm<I>;
+}
+
+type Pending<S, K, I> = BTreeMap<
+    <S as timely::dataflow::ScopeParent>::Timestamp,
+    (
+        Capability<<S as timely::dataflow::ScopeParent>::Timestamp>,
+        Vec<((K, (I, bool)), isize)>,
+        Vec<((K, (I, I, I, OrderedFloat<f64>)), isize)>,
+    ),
+>;
+
+impl<S, K, I> IncrementalGraph<S, K, I> for Collection<S, (K, (I, bool)), isize>
+where
+    S: MaybeTotalScope,
+    S::Timestamp: TotalOrder,
+    K: ExchangeData + Shard + Hash,
+    I: ExchangeData + Hash,
+{
+    #[track_caller]
+    fn incremental_graph_named<G>(
+        &self,
+        name: &str,
+        edges: &Collection<S, (K, (I, I, I, OrderedFloat<f64>)), isize>,
+        new_state: impl Fn() -> G + 'static,
+    ) -> Collection<S, (I, G::Output), isize>
+    where
+        G: IncrementalGraphAlgorithm<I>,
+    {
+        let caller = Location::caller();
+        let name = format!("{name} at {caller}");
+
+        let vertices_exchange =
+            Exchange::new(|((key, _value), _time, _diff): &((K, (I, bool)), _, _)| key.shard());
+        let edges_exchange = Exchange::new(
+            |((key, _value), _time, _diff): &((K, (I, I, I, OrderedFloat<f64>)), _, _)| key.shard(),
+        );
+
+        self.inner
+            .binary_frontier(
+                &edges.inner,
+                vertices_exchange,
+                edges_exchange,
+                &name,
+                move |_capability, _info| {
+                    let mut states: HashMap<K, G> = HashMap::new();
+                    let mut pending: Pending<S, K, I> = BTreeMap::new();
+                    let mut vertices_buffer = Vec::new();
+                    let mut edges_buffer = Vec::new();
+
+                    move |vertices_input, edges_input, output| {
+                        vertices_input.for_each(|cap, data| {
+                            data.swap(&mut vertices_buffer);
+                            for (data, time, diff) in vertices_buffer.drain(..) {
+                                pending
+                                    .entry(time.clone())
+                                    .or_insert_with(|| (cap.delayed(&time), Vec::new(), Vec::new()))
+                                    .1
+                                    .push((data, diff));
+                            }
+                        });
+                        edges_input.for_each(|cap, data| {
+                            data.swap(&mut edges_buffer);
+                            for (data, time, diff) in edges_buffer.drain(..) {
+                                pending
+                                    .entry(time.clone())
+                                    .or_insert_with(|| (cap.delayed(&time), Vec::new(), Vec::new()))
+                                    .2
+                                    .push((data, diff));
+                            }
+                        });
+
+                        // updates are processed in time order, once both inputs are complete,
+                        // and only the results of instances with changes are recomputed
+                        while let Some(time) = pending.keys().next().cloned() {
+                            if vertices_input.frontier().less_equal(&time)
+                                || edges_input.frontier().less_equal(&time)
+                            {
+                                break;
+                            }
+                            let (cap, mut vertex_updates, mut edge_updates) =
+                                pending.remove(&time).unwrap();
+                            let mut changes = Vec::new();
+                            let mut touched = HashSet::new();
+                            // retractions first, so that an updated vertex or edge is replaced
+                            vertex_updates.sort_by_key(|(_data, diff)| *diff);
+                            for ((instance, (id, is_source)), diff) in vertex_updates {
+                                states
+                                    .entry(instance.clone())
+                                    .or_insert_with(&new_state)
+                                    .update_vertex(id, is_source, diff);
+                                touched.insert(instance);
+                            }
+                            edge_updates.sort_by_key(|(_data, diff)| *diff);
+                            for ((instance, (id, u, v, weight)), diff) in edge_updates {
+                                states
+                                    .entry(instance.clone())
+                                    .or_insert_with(&new_state)
+                                    .update_edge(id, u, v, weight.into_inner(), diff);
+                                touched.insert(instance);
+                            }
+                            for instance in touched {
+                                let state = states.get_mut(&instance).unwrap();
+                                state.update_results(&mut changes);
+                                if state.is_empty() {
+                                    states.remove(&instance);
+                                }
+                            }
+                            let mut session = output.session(&cap);
+                            for (change, diff) in changes {
+                                session.give((change, time.clone(), diff));
+                            }
+                        }
+                    }
+                },
+            )
+            .as_collection()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use ordered_float::OrderedFloat;
+
+    use super::{IncrementalGraphAlgorithm, PageRank, ShortestPaths, WeaklyConnectedComponents};
+
+    fn sorted<T: Ord>(mut changes: Vec<T>) -> Vec<T> {
+        changes.sort();
+        changes
+    }
+
+    #[test]
+    fn test_pagerank_converges() {
+        let mut pagerank = PageRank::new(0.5, 1e-9);
+        for vertex in [1, 2, 3] {
+            pagerank.update_vertex(vertex, false, 1);
+        }
+        pagerank.update_edge(10, 1, 2, 1.0, 1);
+        pagerank.update_edge(11, 2, 1, 1.0, 1);
+        let mut changes = Vec::new();
+        pagerank.update_results(&mut changes);
+        for ((vertex, rank), diff) in sorted(changes) {
+            assert_eq!(diff, 1);
+            let expected = if vertex == 3 { 0.5 } else { 1.0 };
+            assert!((rank.into_inner() - expected).abs() < 1e-6);
+        }
+
+        // r3 = 0.5 does not change, r1 = 0.5 + 0.5 * (r2 + r3) and r2 = 0.5 + 0.5 * r1
+        pagerank.update_edge(12, 3, 1, 1.0, 1);
+        let mut changes = Vec::new();
+        pagerank.update_results(&mut changes);
+        let inserted: Vec<_> = sorted(changes)
+            .into_iter()
+            .filter(|(_change, diff)| *diff > 0)
+            .map(|((vertex, rank), _diff)| (vertex, rank))
+            .collect();
+        assert_eq!(inserted.len(), 2);
+        assert!((inserted[0].1.into_inner() - 4.0 / 3.0).abs() < 1e-6);
+        assert!((inserted[1].1.into_inner() - 7.0 / 6.0).abs() < 1e-6);
+    }
+
+    #[test]
+    fn test_components_split_and_merge() {
+        let mut components = WeaklyConnectedComponents::new();
+        for vertex in [1, 2, 3, 4] {
+            components.update_vertex(vertex, false, 1);
+        }
+        components.update_edge(10, 1, 2, 0.0, 1);
+        components.update_edge(11, 3, 2, 0.0, 1);
+        components.update_edge(12, 3, 4, 0.0, 1);
+        let mut changes = Vec::new();
+        components.update_results(&mut changes);
+        assert_eq!(
+            sorted(changes),
+            vec![((1, 1), 1), ((2, 1), 1), ((3, 1), 1), ((4, 1), 1)]
+        );
+
+        components.update_edge(11, 3, 2, 0.0, -1);
+        let mut changes = Vec::new();
+        components.update_results(&mut changes);
+        assert_eq!(
+            sorted(changes),
+            vec![((3, 1), -1), ((3, 3), 1), ((4, 1), -1), ((4, 3), 1)]
+        );
+
+        components.update_edge(13, 4, 1, 0.0, 1);
+        let mut changes = Vec::new();
+        components.update_results(&mut changes);
+        assert_eq!(
+            sorted(changes),
+            vec![((3, 1), 1), ((3, 3), -1), ((4, 1), 1), ((4, 3), -1)]
+        );
+    }
+
+    #[test]
+    fn test_shortest_paths_after_removal() {
+        let mut paths = ShortestPaths::new();
+        paths.update_vertex(1, true, 1);
+        for vertex in [2, 3, 4] {
+            paths.update_vertex(vertex, false, 1);
+        }
+        paths.update_edge(10, 1, 2, 1.0, 1);
+        paths.update_edge(11, 2, 3, 1.0, 1);
+        paths.update_edge(12, 1, 3, 5.0, 1);
+        paths.update_edge(13, 3, 4, 1.0, 1);
+        let mut changes = Vec::new();
+        paths.update_results(&mut changes);
+        assert_eq!(
+            sorted(changes),
+            vec![
+                ((1, OrderedFloat(0.0)), 1),
+                ((2, OrderedFloat(1.0)), 1),
+                ((3, OrderedFloat(2.0)), 1),
+                ((4, OrderedFloat(3.0)), 1),
+            ]
+        );
+
+        paths.update_edge(11, 2, 3, 1.0, -1);
+        let mut changes = Vec::new();
+        paths.update_results(&mut changes);
+        assert_eq!(
+            sorted(changes),
+            vec![
+                ((3, OrderedFloat(2.0)), -1),
+                ((3, OrderedFloat(5.0)), 1),
+                ((4, OrderedFloat(3.0)), -1),
+                ((4, OrderedFloat(6.0)), 1),
+            ]
+        );
+
+        paths.update_vertex(1, true, -1);
+        let mut changes = Vec::new();
+        paths.update_results(&mut changes);
+        assert_eq!(
+            sorted(changes),
+            vec![
+                ((1, OrderedFloat(0.0)), -1),
+                ((2, OrderedFloat(1.0)), -1),
+                ((2, OrderedFloat(f64::INFINITY)), 1),
+                ((3, OrderedFloat(5.0)), -1),
+                ((3, OrderedFloat(f64::INFINITY)), 1),
+                ((4, OrderedFloat(6.0)), -1),
+                ((4, OrderedFloat(f64::INFINITY)), 1),
+            ]
+        );
+    }
+}
@@ -0,0 +1,229 @@
+// Copyright © 2024 Pathway
+
+use std::collections::{BTreeMap, HashMap};
+use std::hash::Hash;
+use std::panic::Location;
+
+use differential_dataflow::{AsCollection, Collection, ExchangeData};
+use timely::dataflow::channels::pact::Exchange;
+use timely::dataflow::operators::{Capability, Operator};
+use timely::order::TotalOrder;
+
+use crate::engine::dataflow::maybe_total::MaybeTotalScope;
+use crate::engine::dataflow::shard::Shard;
+
+/// Rows of one side of the join: for every join key, ids of rows ordered by their times.
+struct TimeIndex<K, T, I> {
+    rows: HashMap<K, BTreeMap<T, HashMap<I, isize>>>,
+}
+
+impl<K, T, I> TimeIndex<K, T, I>
+where
+    K: Eq + Hash + Clone,
+    T: Ord + Clone,
+    I: Eq + Hash + Clone,
+{
+    fn new() -> Self {
+        Self {
+            rows: HashMap::new(),
+        }
+    }
+
+    fn update(&mut self, key: K, time: T, id: I, diff: isize) {
+        let by_time = self.rows.entry(key.clone()).or_default();
+        let ids = by_time.entry(time.clone()).or_default();
+        let count = ids.entry(id.clone()).or_default();
+        *count += diff;
+        if *count == 0 {
+            ids.remove(&id);
+            if ids.is_empty() {
+                by_time.remove(&time);
+                if by_time.is_empty() {
+                    self.rows.remove(&key);
+                }
+            }
+        }
+    }
+
+    /// Calls `logic` for every row with the given key and time in `[lower, upper]`.
+    fn probe(&self, key: &K, lower: &T, upper: &T, mut logic: impl FnMut(&I, isize)) {
+        if lower > upper {
+            return;
+        }
+        let Some(by_time) = self.rows.get(key) else {
+            return;
+        };
+        for ids in by_time.range(lower..=upper).map(|(_time, ids)| ids) {
+            for (id, count) in ids {
+                logic(id, *count);
+            }
+        }
+    }
+}
+
+pub trait IntervalJoin<S, K, T, I>
+where
+    S: MaybeTotalScope,
+    S::Timestamp: TotalOrder,
+{
+    /// Joins rows, given as `(key, (time, id))`, with rows of `other` having the same key
+    /// and time in the range returned by `left_range` for the time of the left row.
+    /// `right_range` has to return the inverse range, i.e. the times of left rows matching
+    /// a right row. Returns pairs of ids of the matched rows.
+    ///
+    /// Both sides keep their rows in per-key ordered indices, so that every update only
+    /// visits rows within its range instead of all rows with the same key.
+    #[track_caller]
+    fn interval_join(
+        &self,
+        other: &Collection<S, (K, (T, I)), isize>,
+        left_range: impl FnMut(&T) -> (T, T) + 'static,
+        right_range: impl FnMut(&T) -> (T, T) + 'static,
+    ) -> Collection<S, (I, I), isize> {
+        self.interval_join_named("IntervalJoin", other, left_range, right_range)
+    }
+
+    fn interval_join_named(
+        &self,
+        name: &str,
+        other: &Collection<S, (K, (T, I)), isize>,
+        left_range: impl FnMut(&T) -> (T, T) + 'static,
+        right_range: impl FnMut(&T) -> (T, T) + 'static,
+    ) -> Collection<S, (I, I), isize>;
+}
+
+type Pending<S, K, T, I> = BTreeMap<
+    <S as timely::dataflow::ScopeParent>::Timestamp,
+    (
+        Capability<<S as timely::dataflow::ScopeParent>::Timestamp>,
+        Vec<((K, (T, I)), isize)>,
+        Vec<((K, (T, I)), isize)>,
+    ),
+>;
+
+impl<S, K, T, I> IntervalJoin<S, K, T, I> for Collection<S, (K, (T, I)), isize>
+where
+    S: MaybeTotalScope,
+    S::Timestamp: TotalOrder,
+    K: ExchangeData + Shard + Hash,
+    T: ExchangeData,
+    I: ExchangeData + Hash,
+{
+    #[track_caller]
+    fn interval_join_named(
+        &self,
+        name: &str,
+        other: &Collection<S, (K, (T, I)), isize>,
+        mut left_range: impl FnMut(&T) -> (T, T) + 'static,
+        mut right_range: impl FnMut(&T) -> (T, T) + 'static,
+    ) -> Collection<S, (I, I), isize> {
+        let caller = Location::caller();
+        let name = format!("{name} at {caller}");
+
+        let left_exchange =
+            Exchange::new(|((key, _value), _time, _diff): &((K, (T, I)), _, _)| key.shard());
+        let right_exchange =
+            Exchange::new(|((key, _value), _time, _diff): &((K, (T, I)), _, _)| key.shard());
+
+        self.inner
+            .binary_frontier(
+                &other.inner,
+                left_exchange,
+                right_exchange,
+                &name,
+                move |_capability, _info| {
+                    let mut left_index = TimeIndex::new();
+                    let mut right_index = TimeIndex::new();
+                    let mut pending: Pending<S, K, T, I> = BTreeMap::new();
+                    let mut left_buffer = Vec::new();
+                    let mut right_buffer = Vec::new();
+
+                    move |left_input, right_input, output| {
+                        left_input.for_each(|cap, data| {
+                            data.swap(&mut left_buffer);
+                            for (data, time, diff) in left_buffer.drain(..) {
+                                pending
+                                    .entry(time.clone())
+                                    .or_insert_with(|| (cap.delayed(&time), Vec::new(), Vec::new()))
+                                    .1
+                                    .push((data, diff));
+                            }
+                        });
+                        right_input.for_each(|cap, data| {
+                            data.swap(&mut right_buffer);
+                            for (data, time, diff) in right_buffer.drain(..) {
+                                pending
+                                    .entry(time.clone())
+                                    .or_insert_with(|| (cap.delayed(&time), Vec::new(), Vec::new()))
+                                    .2
+                                    .push((data, diff));
+                            }
+                        });
+
+                        // updates are processed in time order, once both inputs are complete:
+                        // new left rows are matched with the old right rows, then new right rows
+                        // with all left rows, which together give the change of the join result
+                        while let Some(time) = pending.keys().next().cloned() {
+                            if left_input.frontier().less_equal(&time)
+                                || right_input.frontier().less_equal(&time)
+                            {
+                                break;
+                            }
+                            let (cap, left_updates, right_updates) = pending.remove(&time).unwrap();
+                            let mut session = output.session(&cap);
+                            for ((key, (left_time, left_id)), left_diff) in left_updates {
+                                let (lower, upper) = left_range(&left_time);
+                                right_index.probe(&key, &lower, &upper, |right_id, right_diff| {
+                                    session.give((
+                                        (left_id.clone(), right_id.clone()),
+                                        time.clone(),
+                                        left_diff * right_diff,
+                                    ));
+                                });
+                                left_index.update(key, left_time, left_id, left_diff);
+                            }
+                            for ((key, (right_time, right_id)), right_diff) in right_updates {
+                                let (lower, upper) = right_range(&right_time);
+                                left_index.probe(&key, &lower, &upper, |left_id, left_diff| {
+                                    session.give((
+                                        (left_id.clone(), right_id.clone()),
+                                        time.clone(),
+                                        left_diff * right_diff,
+                                    ));
+                                });
+                                right_index.update(key, right_time, right_id, right_diff);
+                            }
+                        }
+                    }
+                },
+            )
+            .as_collection()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::TimeIndex;
+
+    #[test]
+    fn test_probe_visits_only_range() {
+        let mut index = TimeIndex::new();
+        for (time, id) in [(1, 'a'), (3, 'b'), (5, 'c'), (8, 'd')] {
+            index.update(0, time, id, 1);
+        }
+        index.update(1, 4, 'e', 1);
+
+        let mut matched = Vec::new();
+        index.probe(&0, &2, &5, |id, diff| matched.push((*id, diff)));
+        assert_eq!(matched, vec![('b', 1), ('c', 1)]);
+
+        index.update(0, 3, 'b', -1);
+        let mut matched = Vec::new();
+        index.probe(&0, &2, &5, |id, diff| matched.push((*id, diff)));
+        assert_eq!(matched, vec![('c', 1)]);
+
+        let mut matched = Vec::new();
+        index.probe(&0, &6, &5, |id, diff| matched.push((*id, diff)));
+        assert!(matched.is_empty());
+    }
+}
@@ -0,0 +1,275 @@
+// Copyright © 2024 Pathway
+
+use std::collections::{BTreeMap, HashMap, HashSet};
+use std::hash::Hash;
+use std::panic::Location;
+
+use differential_dataflow::{AsCollection, Collection, ExchangeData};
+use ordered_float::OrderedFloat;
+use timely::dataflow::channels::pact::Exchange;
+use timely::dataflow::operators::{Capability, Operator};
+use timely::order::TotalOrder;
+
+use crate::engine::dataflow::maybe_total::MaybeTotalScope;
+use crate::engine::dataflow::shard::Shard;
+
+/// Rows of a single instance ordered by their keys, together with the queries asked
+/// about this instance and the answers that were last emitted for them.
+struct InstanceState<T, I, Q> {
+    rows: BTreeMap<(T, I), OrderedFloat<f64>>,
+    queries: HashMap<Q, OrderedFloat<f64>>,
+    answers: HashMap<Q, Option<I>>,
+}
+
+impl<T, I, Q> InstanceState<T, I, Q>
+where
+    T: Ord + Clone,
+    I: Ord + Clone,
+    Q: Ord + Hash + Clone,
+{
+    fn new() -> Self {
+        Self {
+            rows: BTreeMap::new(),
+            queries: HashMap::new(),
+            answers: HashMap::new(),
+        }
+    }
+
+    fn is_empty(&self) -> bool {
+        self.rows.is_empty() && self.queries.is_empty()
+    }
+
+    fn update_row(&mut self, key: T, id: I, weight: OrderedFloat<f64>, diff: isize) {
+        if diff > 0 {
+            self.rows.insert((key, id), weight);
+        } else if diff < 0 {
+            self.rows.remove(&(key, id));
+        }
+    }
+
+    fn update_query(
+        &mut self,
+        query: Q,
+        threshold: OrderedFloat<f64>,
+        diff: isize,
+        changes: &mut Vec<((Q, Option<I>), isize)>,
+    ) {
+        if diff > 0 {
+            self.queries.insert(query, threshold);
+        } else if diff < 0 && self.queries.remove(&query).is_some() {
+            if let Some(answer) = self.answers.remove(&query) {
+                changes.push(((query, answer), -1));
+            }
+        }
+    }
+
+    /// Answers all queries in a single pass over the rows, visiting them only
+    /// up to the answer to the query with the largest threshold.
+    fn answer_queries(&mut self, changes: &mut Vec<((Q, Option<I>), isize)>) {
+        let mut queries: Vec<_> = self
+            .queries
+            .iter()
+            .map(|(query, threshold)| (*threshold, query.clone()))
+            .collect();
+        queries.sort();
+
+        let mut rows = self.rows.iter();
+        let mut sum = OrderedFloat(0.0);
+        let mut current: Option<&I> = None;
+        for (threshold, query) in queries {
+            while current.is_none() || sum <= threshold {
+                if let Some(((_key, id), weight)) = rows.next() {
+                    sum += *weight;
+                    current = Some(id);
+                } else {
+                    current = None;
+                    break;
+                }
+            }
+            let answer = current.cloned();
+            if self.answers.get(&query) == Some(&answer) {
+                continue;
+            }
+            if let Some(old_answer) = self.answers.insert(query.clone(), answer.clone()) {
+                changes.push(((query.clone(), old_answer), -1));
+            }
+            changes.push(((query, answer), 1));
+        }
+    }
+}
+
+pub trait PrefixSumUpperbound<S, K, T, I, Q>
+where
+    S: MaybeTotalScope,
+    S::Timestamp: TotalOrder,
+{
+    /// For every query, given as `(instance, (query id, threshold))`, finds the first row,
+    /// given as `(instance, (key, id, weight))`, in the order of keys within the instance,
+    /// such that the sum of weights of rows up to and including it exceeds the threshold.
+    /// Weights are expected to be non-negative. Returns the id of such row (or `None`
+    /// if the sum of all weights does not exceed the threshold) keyed by the query id.
+    #[track_caller]
+    fn prefix_sum_upperbound(
+        &self,
+        queries: &Collection<S, (K, (Q, OrderedFloat<f64>)), isize>,
+    ) -> Collection<S, (Q, Option<I>), isize> {
+        self.prefix_sum_upperbound_named("PrefixSumUpperbound", queries)
+    }
+
+    fn prefix_sum_upperbound_named(
+        &self,
+        name: &str,
+        queries: &Collection<S, (K, (Q, OrderedFloat<f64>)), isize>,
+    ) -> Collection<S, (Q, Option<I>), isize>;
+}
+
+type Pending<S, K, T, I, Q> = BTreeMap<
+    <S as timely::dataflow::ScopeParent>::Timestamp,
+    (
+        Capability<<S as timely::dataflow::ScopeParent>::Timestamp>,
+        Vec<((K, (T, I, OrderedFloat<f64>)), isize)>,
+        Vec<((K, (Q, OrderedFloat<f64>)), isize)>,
+    ),
+>;
+
+impl<S, K, T, I, Q> PrefixSumUpperbound<S, K, T, I, Q>
+    for Collection<S, (K, (T, I, OrderedFloat<f64>)), isize>
+where
+    S: MaybeTotalScope,
+    S::Timestamp: TotalOrder,
+    K: ExchangeData + Shard + Hash,
+    T: ExchangeData,
+    I: ExchangeData,
+    Q: ExchangeData + Hash,
+{
+    #[track_caller]
+    fn prefix_sum_upperbound_named(
+        &self,
+        name: &str,
+        queries: &Collection<S, (K, (Q, OrderedFloat<f64>)), isize>,
+    ) -> Collection<S, (Q, Option<I>), isize> {
+        let caller = Location::caller();
+        let name = format!("{name} at {caller}");
+
+        let rows_exchange = Exchange::new(
+            |((key, _value), _time, _diff): &((K, (T, I, OrderedFloat<f64>)), _, _)| key.shard(),
+        );
+        let queries_exchange = Exchange::new(
+            |((key, _value), _time, _diff): &((K, (Q, OrderedFloat<f64>)), _, _)| key.shard(),
+        );
+
+        self.inner
+            .binary_frontier(
+                &queries.inner,
+                rows_exchange,
+                queries_exchange,
+                &name,
+                move |_capability, _info| {
+                    let mut states: HashMap<K, InstanceState<T, I, Q>> = HashMap::new();
+                    let mut pending: Pending<S, K, T, I, Q> = BTreeMap::new();
+                    let mut rows_buffer = Vec::new();
+                    let mut queries_buffer = Vec::new();
+
+                    move |rows_input, queries_input, output| {
+                        rows_input.for_each(|cap, data| {
+                            data.swap(&mut rows_buffer);
+                            for (data, time, diff) in rows_buffer.drain(..) {
+                                pending
+                                    .entry(time.clone())
+                                    .or_insert_with(|| (cap.delayed(&time), Vec::new(), Vec::new()))
+                                    .1
+                                    .push((data, diff));
+                            }
+                        });
+                        queries_input.for_each(|cap, data| {
+                            data.swap(&mut queries_buffer);
+                            for (data, time, diff) in queries_buffer.drain(..) {
+                                pending
+                                    .entry(time.clone())
+                                    .or_insert_with(|| (cap.delayed(&time), Vec::new(), Vec::new()))
+                                    .2
+                                    .push((data, diff));
+                            }
+                        });
+
+                        // updates are processed in time order, once both inputs are complete,
+                        // and only the queries of instances with changes are answered again
+                        while let Some(time) = pending.keys().next().cloned() {
+                            if rows_input.frontier().less_equal(&time)
+                                || queries_input.frontier().less_equal(&time)
+                            {
+                                break;
+                            }
+                            let (cap, mut row_updates, mut query_updates) =
+                                pending.remove(&time).unwrap();
+                            let mut changes = Vec::new();
+                            let mut touched = HashSet::new();
+                            // retractions first, so that an updated row or query is replaced
+                            row_updates.sort_by_key(|(_data, diff)| *diff);
+                            for ((instance, (key, id, weight)), diff) in row_updates {
+                                states
+                                    .entry(instance.clone())
+                                    .or_insert_with(InstanceState::new)
+                                    .update_row(key, id, weight, diff);
+                                touched.insert(instance);
+                            }
+                            query_updates.sort_by_key(|(_data, diff)| *diff);
+                            for ((instance, (query, threshold)), diff) in query_updates {
+                                states
+                                    .entry(instance.clone())
+                                    .or_insert_with(InstanceState::new)
+                                    .update_query(query, threshold, diff, &mut changes);
+                                touched.insert(instance);
+                            }
+                            for instance in touched {
+                                let state = states.get_mut(&instance).unwrap();
+                                state.answer_queries(&mut changes);
+                                if state.is_empty() {
+                                    states.remove(&instance);
+                                }
+                            }
+                            let mut session = output.session(&cap);
+                            for (change, diff) in changes {
+                                session.give((change, time.clone(), diff));
+                            }
+                        }
+                    }
+                },
+            )
+            .as_collection()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use ordered_float::OrderedFloat;
+
+    use super::InstanceState;
+
+    #[test]
+    fn test_answers_change_only_when_needed() {
+        let mut state = InstanceState::new();
+        for (key, id) in [(1, 'a'), (3, 'b'), (5, 'c')] {
+            state.update_row(key, id, OrderedFloat(1.0), 1);
+        }
+        let mut changes = Vec::new();
+        state.update_query(0, OrderedFloat(0.0), 1, &mut changes);
+        state.update_query(1, OrderedFloat(1.5), 1, &mut changes);
+        state.update_query(2, OrderedFloat(3.0), 1, &mut changes);
+        state.answer_queries(&mut changes);
+        assert_eq!(
+            changes,
+            vec![((0, Some('a')), 1), ((1, Some('b')), 1), ((2, None), 1)]
+        );
+
+        let mut changes = Vec::new();
+        state.update_row(4, 'd', OrderedFloat(1.0), 1);
+        state.answer_queries(&mut changes);
+        assert_eq!(changes, vec![((2, None), -1), ((2, Some('c')), 1)]);
+
+        let mut changes = Vec::new();
+        state.update_query(1, OrderedFloat(1.5), -1, &mut changes);
+        state.answer_queries(&mut changes);
+        assert_eq!(changes, vec![((1, Some('b')), -1)]);
+    }
+}
@@ -0,0 +1,275 @@
+// Copyright © 2024 Pathway
+
+use std::collections::{BTreeMap, HashMap};
+use std::panic::Location;
+
+use differential_dataflow::operators::arrange::Arranged;
+use differential_dataflow::trace::{BatchReader, Cursor, TraceReader};
+use differential_dataflow::{AsCollection, Collection, Data, ExchangeData};
+use timely::dataflow::channels::pact::Pipeline;
+use timely::dataflow::operators::Operator;
+use timely::order::TotalOrder;
+
+use super::ArrangeWithTypes;
+use crate::engine::dataflow::maybe_total::MaybeTotalScope;
+use crate::engine::dataflow::shard::Shard;
+use crate::engine::dataflow::ArrangedByKey;
+
+/// Session a row belongs to: the id of its last row, and the first and the last time in it.
+pub type Session<I, T> = (I, T, T);
+
+/// Sessions of a single instance. Rows are kept ordered by their times (and ids),
+/// together with the sessions that were last emitted for them.
+struct InstanceSessions<I, T> {
+    rows: BTreeMap<(T, I), Option<Session<I, T>>>,
+}
+
+impl<I, T> InstanceSessions<I, T>
+where
+    I: Data,
+    T: Data,
+{
+    fn new() -> Self {
+        Self {
+            rows: BTreeMap::new(),
+        }
+    }
+
+    fn predecessor(&self, position: &(T, I)) -> Option<&(T, I)> {
+        self.rows
+            .range(..position)
+            .next_back()
+            .map(|(position, _session)| position)
+    }
+
+    fn successor(&self, position: &(T, I)) -> Option<&(T, I)> {
+        use std::ops::Bound::{Excluded, Unbounded};
+        self.rows
+            .range((Excluded(position), Unbounded))
+            .next()
+            .map(|(position, _session)| position)
+    }
+
+    /// Applies updates from a single time and returns the changes of sessions of rows.
+    /// Only the sessions adjacent to the changed rows are recomputed.
+    fn update(
+        &mut self,
+        updates: Vec<((T, I), isize)>,
+        merges: &mut impl FnMut(&T, &T) -> bool,
+    ) -> Vec<((I, Session<I, T>), isize)> {
+        let mut changes = Vec::new();
+        let mut changed_positions = Vec::with_capacity(updates.len());
+        for (position, diff) in updates {
+            if diff < 0 {
+                if let Some(Some(session)) = self.rows.remove(&position) {
+                    changes.push(((position.1.clone(), session), -1));
+                }
+            } else if diff > 0 {
+                self.rows.insert(position.clone(), None);
+            }
+            changed_positions.push(position);
+        }
+
+        let mut dirty = Vec::with_capacity(3 * changed_positions.len());
+        for position in &changed_positions {
+            dirty.extend(self.predecessor(position).cloned());
+            if self.rows.contains_key(position) {
+                dirty.push(position.clone());
+            }
+            dirty.extend(self.successor(position).cloned());
+        }
+        dirty.sort();
+        dirty.dedup();
+
+        // sessions are contiguous, so after processing dirty positions in order
+        // any position not after the end of the last recomputed session is already handled
+        let mut covered_until: Option<(T, I)> = None;
+        for position in dirty {
+            if covered_until.as_ref().is_some_and(|last| position <= *last) {
+                continue;
+            }
+            let mut first = position.clone();
+            while let Some(previous) = self.predecessor(&first) {
+                if !merges(&previous.0, &first.0) {
+                    break;
+                }
+                first = previous.clone();
+            }
+            let mut members = vec![first];
+            while let Some(next) = self.successor(members.last().unwrap()) {
+                if !merges(&members.last().unwrap().0, &next.0) {
+                    break;
+                }
+                members.push(next.clone());
+            }
+            let last = members.last().unwrap().clone();
+            let session = (last.1.clone(), members[0].0.clone(), last.0.clone());
+            for member in members {
+                let current = self
+                    .rows
+                    .get_mut(&member)
+                    .expect("session member should be present");
+                if current.as_ref() == Some(&session) {
+                    continue;
+                }
+                if let Some(old_session) = current.replace(session.clone()) {
+                    changes.push(((member.1.clone(), old_session), -1));
+                }
+                changes.push(((member.1, session.clone()), 1));
+            }
+            covered_until = Some(last);
+        }
+        changes
+    }
+}
+
+pub trait SessionWindows<S, K, T, I>
+where
+    S: MaybeTotalScope,
+    S::Timestamp: TotalOrder,
+{
+    /// Assigns rows, given as `(instance, (time, id))`, to sessions, i.e. maximal runs of rows
+    /// of the same instance, ordered by time, in which `merges` holds for every pair of
+    /// consecutive times. Returns the session of every row keyed by the row id.
+    #[track_caller]
+    fn session_windows(
+        &self,
+        merges: impl FnMut(&T, &T) -> bool + 'static,
+    ) -> Collection<S, (I, Session<I, T>), isize> {
+        self.session_windows_named("SessionWindows", merges)
+    }
+
+    fn session_windows_named(
+        &self,
+        name: &str,
+        merges: impl FnMut(&T, &T) -> bool + 'static,
+    ) -> Collection<S, (I, Session<I, T>), isize>;
+}
+
+impl<S, K, T, I> SessionWindows<S, K, T, I> for Collection<S, (K, (T, I)), isize>
+where
+    S: MaybeTotalScope,
+    S::Timestamp: TotalOrder,
+    K: ExchangeData + Shard + std::hash::Hash,
+    T: ExchangeData,
+    I: ExchangeData,
+{
+    #[track_caller]
+    fn session_windows_named(
+        &self,
+        name: &str,
+        merges: impl FnMut(&T, &T) -> bool + 'static,
+    ) -> Collection<S, (I, Session<I, T>), isize> {
+        let arranged: ArrangedByKey<S, K, (T, I), isize> =
+            self.arrange_named(&format!("Arrange: {name}"));
+        arranged.session_windows_named(name, merges)
+    }
+}
+
+impl<S, Tr, T, I> SessionWindows<S, Tr::Key, T, I> for Arranged<S, Tr>
+where
+    S: MaybeTotalScope,
+    S::Timestamp: TotalOrder,
+    Tr: TraceReader<Val = (T, I), Time = S::Timestamp, R = isize> + Clone,
+    Tr::Key: Data + std::hash::Hash,
+    T: Data,
+    I: Data,
+{
+    #[track_caller]
+    fn session_windows_named(
+        &self,
+        name: &str,
+        mut merges: impl FnMut(&T, &T) -> bool + 'static,
+    ) -> Collection<S, (I, Session<I, T>), isize> {
+        let caller = Location::caller();
+        let name = format!("{name} at {caller}");
+
+        let mut sessions_by_instance: HashMap<Tr::Key, InstanceSessions<I, T>> = HashMap::new();
+        self.stream
+            .unary(Pipeline, &name, move |_, _| {
+                move |input, output| {
+                    input.for_each(|cap, data| {
+                        let mut session = output.session(&cap);
+                        for batch in data.iter() {
+                            let mut cursor = batch.cursor();
+                            while let Some(key) = cursor.get_key(batch) {
+                                let mut data_by_time = BTreeMap::new();
+                                while let Some(val) = cursor.get_val(batch) {
+                                    cursor.map_times(batch, |time, diff| {
+                                        data_by_time
+                                            .entry(time.clone())
+                                            .or_insert_with(Vec::new)
+                                            .push((val.clone(), *diff));
+                                    });
+                                    cursor.step_val(batch);
+                                }
+                                let sessions = sessions_by_instance
+                                    .entry(key.clone())
+                                    .or_insert_with(InstanceSessions::new);
+                                for (time, data) in data_by_time {
+                                    for (change, diff) in sessions.update(data, &mut merges) {
+                                        session.give((change, time.clone(), diff));
+                                    }
+                                }
+                                if sessions.rows.is_empty() {
+                                    sessions_by_instance.remove(key);
+                                }
+                                cursor.step_key(batch);
+                            }
+                        }
+                    });
+                }
+            })
+            .as_collection()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::InstanceSessions;
+
+    fn merges(current: &i64, next: &i64) -> bool {
+        next - current < 3
+    }
+
+    #[test]
+    fn test_merge_and_split() {
+        let mut sessions = InstanceSessions::new();
+        let changes = sessions.update(
+            vec![((1, 'a'), 1), ((2, 'b'), 1), ((10, 'c'), 1)],
+            &mut merges,
+        );
+        assert_eq!(
+            changes,
+            vec![
+                (('a', ('b', 1, 2)), 1),
+                (('b', ('b', 1, 2)), 1),
+                (('c', ('c', 10, 10)), 1),
+            ]
+        );
+
+        let changes = sessions.update(vec![((4, 'd'), 1)], &mut merges);
+        assert_eq!(
+            changes,
+            vec![
+                (('a', ('b', 1, 2)), -1),
+                (('a', ('d', 1, 4)), 1),
+                (('b', ('b', 1, 2)), -1),
+                (('b', ('d', 1, 4)), 1),
+                (('d', ('d', 1, 4)), 1),
+            ]
+        );
+
+        let changes = sessions.update(vec![((4, 'd'), -1)], &mut merges);
+        assert_eq!(
+            changes,
+            vec![
+                (('d', ('d', 1, 4)), -1),
+                (('a', ('d', 1, 4)), -1),
+                (('a', ('b', 1, 2)), 1),
+                (('b', ('d', 1, 4)), -1),
+                (('b', ('b', 1, 2)), 1),
+            ]
+        );
+    }
+}
@@ -121,6 +121,7 @@ pub enum AnyExpression {
     CastToOptionalFloatFromOptionalInt(Arc<Expression>),
     MatMul(Arc<Expression>, Arc<Expression>),
     FillError(Arc<Expression>, Arc<Expression>),
+    AssignSlidingWindows(Arc<Expression>, Arc<Expression>, SlidingWindows),
 }
 
 #[derive(Debug)]
@@ -488,6 +489,159 @@ fn compare_tuples(lhs: &Arc<[Value]>, rhs: &Arc<[Value]>) -> DynResult<Ordering>
     }
 }
 
+#[derive(Debug, Clone)]
+pub enum WindowLength {
+    Duration(Value),
+    Ratio(i64),
+}
+
+/// Assignment of keys to windows `[k * hop + origin, k * hop + origin + duration)`
+/// used by sliding and tumbling windows.
+#[derive(Debug, Clone)]
+pub struct SlidingWindows {
+    pub hop: Value,
+    pub length: WindowLength,
+    pub origin: Value,
+    pub origin_is_explicit: bool,
+}
+
+impl SlidingWindows {
+    fn int_windows(&self, key: i64, hop: i64, duration: i64, origin: i64) -> Vec<(i64, i64)> {
+        // bounds for multipliers of hop for which windows can contain key,
+        // widened by one on the lower end to avoid off-by-one errors
+        let last_k = (key - origin).div_euclid(hop) + 1;
+        let first_k = last_k - duration.div_euclid(hop) - 2;
+        (first_k..=last_k)
+            .map(|k| (k * hop + origin, k * hop + origin + duration))
+            .filter(|(start, end)| {
+                *start <= key && key < *end && (!self.origin_is_explicit || *start >= origin)
+            })
+            .collect()
+    }
+
+    #[allow(clippy::cast_possible_truncation, clippy::cast_precision_loss)]
+    fn float_windows(&self, key: f64, hop: f64, origin: f64) -> DynResult<Vec<(f64, f64)>> {
+        let (steps, duration) = match &self.length {
+            WindowLength::Ratio(ratio) => (*ratio, None),
+            WindowLength::Duration(duration) => {
+                let duration = float_window_param(duration)?;
+                ((duration / hop).floor() as i64, Some(duration))
+            }
+        };
+        let last_k = ((key - origin) / hop).floor() as i64 + 1;
+        let first_k = last_k - steps - 2;
+        Ok((first_k..=last_k)
+            .map(|k| {
+                // computed the same way for all keys to get equal bounds for equal windows
+                let start = k as f64 * hop + origin;
+                let end = match duration {
+                    Some(duration) => start + duration,
+                    None => (k + steps) as f64 * hop + origin,
+                };
+                (start, end)
+            })
+            .filter(|(start, end)| {
+                *start <= key && key < *end && (!self.origin_is_explicit || *start >= origin)
+            })
+            .collect())
+    }
+
+    fn int_duration(&self, hop: i64) -> DynResult<i64> {
+        match &self.length {
+            WindowLength::Ratio(ratio) => Ok(ratio * hop),
+            WindowLength::Duration(duration) => match duration {
+                Value::Duration(duration) => Ok(duration.nanoseconds()),
+                duration => duration.as_int(),
+            },
+        }
+    }
+
+    fn time_windows(&self, key: i64, origin: i64) -> DynResult<Vec<(i64, i64)>> {
+        let hop = self.hop.as_duration()?.nanoseconds();
+        check_window_hop(hop)?;
+        Ok(self.int_windows(key, hop, self.int_duration(hop)?, origin))
+    }
+
+    pub fn assign(&self, instance: &Value, key: &Value) -> DynResult<Value> {
+        let windows: Vec<(Value, Value)> = match key {
+            Value::Int(key) => {
+                let hop = self.hop.as_int()?;
+                check_window_hop(hop)?;
+                self.int_windows(*key, hop, self.int_duration(hop)?, self.origin.as_int()?)
+                    .into_iter()
+                    .map(|(start, end)| (Value::from(start), Value::from(end)))
+                    .collect()
+            }
+            Value::Float(key) => {
+                let hop = float_window_param(&self.hop)?;
+                if hop.is_nan() || hop <= 0.0 {
+                    return Err(DynError::from(Error::ValueError(
+                        "window hop has to be positive".to_string(),
+                    )));
+                }
+                self.float_windows(key.into_inner(), hop, float_window_param(&self.origin)?)?
+                    .into_iter()
+                    .map(|(start, end)| (Value::from(start), Value::from(end)))
+                    .collect()
+            }
+            Value::DateTimeNaive(key) => {
+                let origin = self.origin.as_date_time_naive()?.timestamp();
+                self.time_windows(key.timestamp(), origin)?
+                    .into_iter()
+                    .map(|(start, end)| {
+                        (
+                            Value::from(DateTimeNaive::new(start)),
+                            Value::from(DateTimeNaive::new(end)),
+                        )
+                    })
+                    .collect()
+            }
+            Value::DateTimeUtc(key) => {
+                let origin = self.origin.as_date_time_utc()?.timestamp();
+                self.time_windows(key.timestamp(), origin)?
+                    .into_iter()
+                    .map(|(start, end)| {
+                        (
+                            Value::from(DateTimeUtc::new(start)),
+                            Value::from(DateTimeUtc::new(end)),
+                        )
+                    })
+                    .collect()
+            }
+            key => {
+                let key_type = key.simple_type();
+                return Err(DynError::from(Error::ValueError(format!(
+                    "cannot assign windows to a key of type {key_type:?}"
+                ))));
+            }
+        };
+        Ok(Value::Tuple(
+            windows
+                .into_iter()
+                .map(|(start, end)| Value::Tuple(vec![instance.clone(), start, end].into()))
+                .collect(),
+        ))
+    }
+}
+
+fn check_window_hop(hop: i64) -> DynResult<()> {
+    if hop > 0 {
+        Ok(())
+    } else {
+        Err(DynError::from(Error::ValueError(
+            "window hop has to be positive".to_string(),
+        )))
+    }
+}
+
+#[allow(clippy::cast_precision_loss)]
+fn float_window_param(value: &Value) -> DynResult<f64> {
+    match value {
+        Value::Int(value) => Ok(*value as f64),
+        value => value.as_float(),
+    }
+}
+
 impl AnyExpression {
     #[allow(clippy::too_many_lines)]
     pub fn eval(&self, values: &[Value]) -> DynResult<Value> {
@@ -672,6 +826,9 @@ impl AnyExpression {
             Self::FillError(e, replacement) => {
                 e.eval(values).or_else(|_| replacement.eval(values))?
             }
+            Self::AssignSlidingWindows(instance, key, windows) => {
+                windows.assign(&instance.eval(values)?, &key.eval(values)?)?
+            }
         };
         debug_assert!(!matches!(res, Value::Error));
         Ok(res)
@@ -510,6 +510,17 @@ impl OperatorStats {
     }
 }
 
+/// Counters of a single operator gathered from the dataflow logs.
+#[derive(Debug, Clone, Default)]
+pub struct OperatorMetrics {
+    pub rows_in: u64,
+    pub rows_out: u64,
+    pub arrangement_records: u64,
+    pub busy_time: Duration,
+    /// Busy time spent on each timestamp completed since the previous report.
+    pub processing_times: Vec<Duration>,
+}
+
 #[derive(Debug, Clone)]
 #[pyclass]
 pub struct ProberStats {
@@ -521,12 +532,188 @@ pub struct ProberStats {
     pub operators_stats: HashMap<usize, OperatorStats>,
     #[pyo3(get, set)]
     pub connector_stats: Vec<(String, ConnectorStats)>,
+    pub operators_metrics: HashMap<usize, OperatorMetrics>,
 }
 
 pub type OnDataFn = Box<dyn FnMut(Key, &[Value], Timestamp, isize) -> DynResult<()>>;
 pub type OnTimeEndFn = Box<dyn FnMut(Timestamp) -> DynResult<()>>;
 pub type OnEndFn = Box<dyn FnMut() -> DynResult<()>>;
 
+pub type SessionMergeFn = Arc<dyn Fn(&Value, &Value) -> DynResult<bool> + Send + Sync>;
+
+/// Decides whether two consecutive rows of a session window belong to the same session.
+#[derive(Clone)]
+pub enum SessionPredicate {
+    MaxGap(Value),
+    Custom(SessionMergeFn),
+}
+
+impl SessionPredicate {
+    pub fn merges(&self, current: &Value, next: &Value) -> DynResult<bool> {
+        match self {
+            Self::MaxGap(max_gap) => {
+                match (current, next, max_gap) {
+                    (Value::Int(current), Value::Int(next), Value::Int(max_gap)) => {
+                        Ok(next - current < *max_gap)
+                    }
+                    (
+                        Value::Int(_) | Value::Float(_),
+                        Value::Int(_) | Value::Float(_),
+                        Value::Int(_) | Value::Float(_),
+                    ) => Ok(as_session_float(next) - as_session_float(current)
+                        < as_session_float(max_gap)),
+                    (
+                        Value::DateTimeNaive(current),
+                        Value::DateTimeNaive(next),
+                        Value::Duration(max_gap),
+                    ) => Ok(*next - *current < *max_gap),
+                    (
+                        Value::DateTimeUtc(current),
+                        Value::DateTimeUtc(next),
+                        Value::Duration(max_gap),
+                    ) => Ok(*next - *current < *max_gap),
+                    _ => Err(Error::ValueError(format!(
+                    "max_gap {max_gap} can't be applied to session window keys {current} and {next}"
+                ))
+                    .into()),
+                }
+            }
+            Self::Custom(merges) => merges(current, next),
+        }
+    }
+}
+
+#[allow(clippy::cast_precision_loss)]
+fn as_session_float(value: &Value) -> f64 {
+    match value {
+        Value::Int(value) => *value as f64,
+        Value::Float(value) => value.into_inner(),
+        _ => unreachable!("only numeric values are compared as floats"),
+    }
+}
+
+/// Bounds of an interval join: a right row matches a left row if its time lies within
+/// `[left time + lower, left time + upper]`.
+#[derive(Debug, Clone)]
+pub struct IntervalJoinBounds {
+    pub lower: Value,
+    pub upper: Value,
+}
+
+impl IntervalJoinBounds {
+    pub fn new(lower: Value, upper: Value) -> Result<Self> {
+        let bounds = Self { lower, upper };
+        match (&bounds.lower, &bounds.upper) {
+            (Value::Int(lower), Value::Int(upper)) if lower <= upper => Ok(bounds),
+            (Value::Float(lower), Value::Float(upper)) if lower <= upper => Ok(bounds),
+            (Value::Duration(lower), Value::Duration(upper)) if lower <= upper => Ok(bounds),
+            _ => Err(Error::ValueError(format!(
+                "invalid interval join bounds: [{}, {}]",
+                bounds.lower, bounds.upper
+            ))),
+        }
+    }
+
+    /// Range of times of right rows matching a left row with the given time.
+    pub fn right_range(&self, left_time: &Value) -> DynResult<(Value, Value)> {
+        Ok((
+            shift_time(left_time, &self.lower, false)?,
+            shift_time(left_time, &self.upper, false)?,
+        ))
+    }
+
+    /// Range of times of left rows matching a right row with the given time.
+    pub fn left_range(&self, right_time: &Value) -> DynResult<(Value, Value)> {
+        Ok((
+            shift_time(right_time, &self.upper, true)?,
+            shift_time(right_time, &self.lower, true)?,
+        ))
+    }
+}
+
+fn shift_time(time: &Value, offset: &Value, backwards: bool) -> DynResult<Value> {
+    let shifted = match (time, offset) {
+        (Value::Int(time), Value::Int(offset)) if backwards => Value::Int(time - offset),
+        (Value::Int(time), Value::Int(offset)) => Value::Int(time + offset),
+        (Value::Float(time), Value::Float(offset)) if backwards => Value::Float(time - offset),
+        (Value::Float(time), Value::Float(offset)) => Value::Float(time + offset),
+        (Value::DateTimeNaive(time), Value::Duration(offset)) if backwards => {
+            Value::DateTimeNaive(*time - *offset)
+        }
+        (Value::DateTimeNaive(time), Value::Duration(offset)) => {
+            Value::DateTimeNaive(*time + *offset)
+        }
+        (Value::DateTimeUtc(time), Value::Duration(offset)) if backwards => {
+            Value::DateTimeUtc(*time - *offset)
+        }
+        (Value::DateTimeUtc(time), Value::Duration(offset)) => Value::DateTimeUtc(*time + *offset),
+        _ => {
+            return Err(Error::ValueError(format!(
+                "interval join bound {offset} can't be applied to time {time}"
+            ))
+            .into())
+        }
+    };
+    Ok(shifted)
+}
+
+/// Where an as-of join looks for the peer of a row among the rows of the other side.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum AsofJoinDirection {
+    Backward,
+    Forward,
+    Nearest,
+}
+
+impl AsofJoinDirection {
+    pub fn backward(self) -> bool {
+        matches!(self, Self::Backward | Self::Nearest)
+    }
+
+    pub fn forward(self) -> bool {
+        matches!(self, Self::Forward | Self::Nearest)
+    }
+
+    /// Decides whether a row with time `current` is closer to the preceding peer at `previous`
+    /// than to the following one at `next`. Ties are resolved in favor of the following peer.
+    pub fn prefers_previous(current: &Value, previous: &Value, next: &Value) -> DynResult<bool> {
+        match (current, previous, next) {
+            (Value::Int(current), Value::Int(previous), Value::Int(next)) => {
+                Ok(current - previous < next - current)
+            }
+            (Value::Float(current), Value::Float(previous), Value::Float(next)) => {
+                Ok(*current - *previous < *next - *current)
+            }
+            (
+                Value::DateTimeNaive(current),
+                Value::DateTimeNaive(previous),
+                Value::DateTimeNaive(next),
+            ) => Ok(*current - *previous < *next - *current),
+            (
+                Value::DateTimeUtc(current),
+                Value::DateTimeUtc(previous),
+                Value::DateTimeUtc(next),
+            ) => Ok(*current - *previous < *next - *current),
+            _ => Err(Error::ValueError(format!(
+                "can't compare distances between as-of join times {previous}, {current} and {next}"
+            ))
+            .into()),
+        }
+    }
+}
+
+/// An incremental algorithm computing a result for every vertex of a graph.
+#[derive(Debug, Clone, Copy, PartialEq)]
+pub enum GraphAlgorithm {
+    /// `PageRank` with the given damping factor, propagating only the changes of ranks
+    /// larger than `tolerance`. Results are floats.
+    PageRank { damping: f64, tolerance: f64 },
+    /// The smallest vertex of the weakly connected component. Results are pointers.
+    WeaklyConnectedComponents,
+    /// The length of the shortest path from any of the sources. Results are floats.
+    ShortestPaths,
+}
+
 pub struct SubscribeCallbacks {
     pub wrapper: BatchWrapper,
     pub on_data: Option<OnDataFn>,
@@ -708,6 +895,18 @@ pub trait Graph {
         deterministic: bool,
     ) -> Result<TableHandle>;
 
+    #[allow(clippy::too_many_arguments)]
+    fn batch_apply_table(
+        &self,
+        function: Arc<dyn Fn(&[Vec<Value>]) -> DynResult<Vec<Value>> + Send + Sync>,
+        table_handle: TableHandle,
+        column_paths: Vec<ColumnPath>,
+        max_batch_size: Option<usize>,
+        table_properties: Arc<TableProperties>,
+        trace: Trace,
+        deterministic: bool,
+    ) -> Result<TableHandle>;
+
     fn subscribe_table(
         &self,
         table_handle: TableHandle,
@@ -810,6 +1009,70 @@ pub trait Graph {
         table_properties: Arc<TableProperties>,
     ) -> Result<TableHandle>;
 
+    fn session_windows_table(
+        &self,
+        table_handle: TableHandle,
+        key_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        predicate: SessionPredicate,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle>;
+
+    #[allow(clippy::too_many_arguments)]
+    fn interval_join_table(
+        &self,
+        left_table_handle: TableHandle,
+        right_table_handle: TableHandle,
+        left_time_column_path: ColumnPath,
+        right_time_column_path: ColumnPath,
+        left_instance_column_path: ColumnPath,
+        right_instance_column_path: ColumnPath,
+        bounds: IntervalJoinBounds,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle>;
+
+    #[allow(clippy::too_many_arguments)]
+    fn asof_join_table(
+        &self,
+        table_handle: TableHandle,
+        time_column_path: ColumnPath,
+        side_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        direction: AsofJoinDirection,
+        right_first: bool,
+        match_left: bool,
+        match_right: bool,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle>;
+
+    #[allow(clippy::too_many_arguments)]
+    fn prefix_sum_upperbound_table(
+        &self,
+        table_handle: TableHandle,
+        key_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        weight_column_path: ColumnPath,
+        queries_table_handle: TableHandle,
+        query_instance_column_path: ColumnPath,
+        threshold_column_path: ColumnPath,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle>;
+
+    #[allow(clippy::too_many_arguments)]
+    fn graph_algorithm_table(
+        &self,
+        vertices_table_handle: TableHandle,
+        vertex_instance_column_path: ColumnPath,
+        is_source_column_path: ColumnPath,
+        edges_table_handle: TableHandle,
+        source_column_path: ColumnPath,
+        target_column_path: ColumnPath,
+        weight_column_path: ColumnPath,
+        edge_instance_column_path: ColumnPath,
+        algorithm: GraphAlgorithm,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle>;
+
     fn reindex_table(
         &self,
         table_handle: TableHandle,
@@ -915,6 +1178,7 @@ pub trait Graph {
         parser: Box<dyn Parser>,
         commit_duration: Option<Duration>,
         parallel_readers: usize,
+        parse_threads: usize,
         table_properties: Arc<TableProperties>,
         external_persistent_id: Option<&ExternalPersistentId>,
     ) -> Result<TableHandle>;
@@ -1151,6 +1415,29 @@ impl Graph for ScopedGraph {
         })
     }
 
+    fn batch_apply_table(
+        &self,
+        function: Arc<dyn Fn(&[Vec<Value>]) -> DynResult<Vec<Value>> + Send + Sync>,
+        table_handle: TableHandle,
+        column_paths: Vec<ColumnPath>,
+        max_batch_size: Option<usize>,
+        table_properties: Arc<TableProperties>,
+        trace: Trace,
+        deterministic: bool,
+    ) -> Result<TableHandle> {
+        self.try_with(|g| {
+            g.batch_apply_table(
+                function,
+                table_handle,
+                column_paths,
+                max_batch_size,
+                table_properties,
+                trace,
+                deterministic,
+            )
+        })
+    }
+
     fn subscribe_table(
         &self,
         table_handle: TableHandle,
@@ -1341,6 +1628,135 @@ impl Graph for ScopedGraph {
         })
     }
 
+    fn session_windows_table(
+        &self,
+        table_handle: TableHandle,
+        key_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        predicate: SessionPredicate,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        self.try_with(|g| {
+            g.session_windows_table(
+                table_handle,
+                key_column_path,
+                instance_column_path,
+                predicate,
+                table_properties,
+            )
+        })
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn interval_join_table(
+        &self,
+        left_table_handle: TableHandle,
+        right_table_handle: TableHandle,
+        left_time_column_path: ColumnPath,
+        right_time_column_path: ColumnPath,
+        left_instance_column_path: ColumnPath,
+        right_instance_column_path: ColumnPath,
+        bounds: IntervalJoinBounds,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        self.try_with(|g| {
+            g.interval_join_table(
+                left_table_handle,
+                right_table_handle,
+                left_time_column_path,
+                right_time_column_path,
+                left_instance_column_path,
+                right_instance_column_path,
+                bounds,
+                table_properties,
+            )
+        })
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn asof_join_table(
+        &self,
+        table_handle: TableHandle,
+        time_column_path: ColumnPath,
+        side_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        direction: AsofJoinDirection,
+        right_first: bool,
+        match_left: bool,
+        match_right: bool,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        self.try_with(|g| {
+            g.asof_join_table(
+                table_handle,
+                time_column_path,
+                side_column_path,
+                instance_column_path,
+                direction,
+                right_first,
+                match_left,
+                match_right,
+                table_properties,
+            )
+        })
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn prefix_sum_upperbound_table(
+        &self,
+        table_handle: TableHandle,
+        key_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        weight_column_path: ColumnPath,
+        queries_table_handle: TableHandle,
+        query_instance_column_path: ColumnPath,
+        threshold_column_path: ColumnPath,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        self.try_with(|g| {
+            g.prefix_sum_upperbound_table(
+                table_handle,
+                key_column_path,
+                instance_column_path,
+                weight_column_path,
+                queries_table_handle,
+                query_instance_column_path,
+                threshold_column_path,
+                table_properties,
+            )
+        })
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn graph_algorithm_table(
+        &self,
+        vertices_table_handle: TableHandle,
+        vertex_instance_column_path: ColumnPath,
+        is_source_column_path: ColumnPath,
+        edges_table_handle: TableHandle,
+        source_column_path: ColumnPath,
+        target_column_path: ColumnPath,
+        weight_column_path: ColumnPath,
+        edge_instance_column_path: ColumnPath,
+        algorithm: GraphAlgorithm,
+        table_properties: Arc<TableProperties>,
+    ) -> Result<TableHandle> {
+        self.try_with(|g| {
+            g.graph_algorithm_table(
+                vertices_table_handle,
+                vertex_instance_column_path,
+                is_source_column_path,
+                edges_table_handle,
+                source_column_path,
+                target_column_path,
+                weight_column_path,
+                edge_instance_column_path,
+                algorithm,
+                table_properties,
+            )
+        })
+    }
+
     fn reindex_table(
         &self,
         table_handle: TableHandle,
@@ -1513,6 +1929,7 @@ impl Graph for ScopedGraph {
         parser: Box<dyn Parser>,
         commit_duration: Option<Duration>,
         parallel_readers: usize,
+        parse_threads: usize,
         table_properties: Arc<TableProperties>,
         external_persistent_id: Option<&ExternalPersistentId>,
     ) -> Result<TableHandle> {
@@ -1522,6 +1939,7 @@ impl Graph for ScopedGraph {
                 parser,
                 commit_duration,
                 parallel_readers,
+                parse_threads,
                 table_properties,
                 external_persistent_id,
             )
@@ -1,6 +1,7 @@
 // Copyright © 2024 Pathway
 
 use std::env;
+use std::sync::atomic::AtomicU64;
 use std::sync::Arc;
 use std::thread::{Builder, JoinHandle};
 use std::time::SystemTime;
@@ -10,7 +11,10 @@ use hyper::service::{make_service_fn, service_fn};
 use hyper::{header, Body, Method, Response, Server, StatusCode};
 use log::{error, info};
 use prometheus_client::encoding::text::encode;
+use prometheus_client::metrics::counter::Counter;
+use prometheus_client::metrics::family::Family;
 use prometheus_client::metrics::gauge::Gauge;
+use prometheus_client::metrics::histogram::{exponential_buckets, Histogram};
 use prometheus_client::registry::Registry;
 use tokio::sync::oneshot::Sender;
 
@@ -20,9 +24,120 @@ use super::ProberStats;
 
 const DEFAULT_MONITORING_HTTP_PORT: u16 = 20000;
 
+type Labels = Vec<(&'static str, String)>;
+type ProcessingTimes = Family<Labels, Histogram, fn() -> Histogram>;
+
+fn processing_time_histogram() -> Histogram {
+    // from 0.1ms to about 26s
+    Histogram::new(exponential_buckets(0.0001, 4.0, 10))
+}
+
+fn operator_labels(operator_id: usize) -> Labels {
+    vec![("operator_id", operator_id.to_string())]
+}
+
+fn register_operators_metrics(registry: &mut Registry, stats: &ProberStats, now: SystemTime) {
+    let latency_ms = Family::<Labels, Gauge>::default();
+    for (operator_id, operator_stats) in &stats.operators_stats {
+        if let Some(latency) = operator_stats.latency(now) {
+            latency_ms
+                .get_or_create(&operator_labels(*operator_id))
+                .set(i64::try_from(latency).unwrap_or(i64::MAX));
+        }
+    }
+    registry.register(
+        "operator_latency_ms",
+        "A latency of an operator in milliseconds",
+        latency_ms,
+    );
+
+    let rows_in = Family::<Labels, Counter>::default();
+    let rows_out = Family::<Labels, Counter>::default();
+    let busy_seconds = Family::<Labels, Counter<f64, AtomicU64>>::default();
+    let arrangement_records = Family::<Labels, Gauge>::default();
+    for (operator_id, metrics) in &stats.operators_metrics {
+        let labels = operator_labels(*operator_id);
+        rows_in.get_or_create(&labels).inc_by(metrics.rows_in);
+        rows_out.get_or_create(&labels).inc_by(metrics.rows_out);
+        busy_seconds
+            .get_or_create(&labels)
+            .inc_by(metrics.busy_time.as_secs_f64());
+        arrangement_records
+            .get_or_create(&labels)
+            .set(i64::try_from(metrics.arrangement_records).unwrap_or(i64::MAX));
+    }
+    registry.register(
+        "operator_rows_in",
+        "Number of row updates received by an operator from other operators",
+        rows_in,
+    );
+    registry.register(
+        "operator_rows_out",
+        "Number of row updates sent by an operator to other operators",
+        rows_out,
+    );
+    registry.register(
+        "operator_busy_seconds",
+        "Time spent by the worker running an operator",
+        busy_seconds,
+    );
+    registry.register(
+        "operator_arrangement_records",
+        "Number of records kept in the arrangements of an operator",
+        arrangement_records,
+    );
+}
+
+fn register_connectors_metrics(registry: &mut Registry, stats: &ProberStats, now: SystemTime) {
+    let messages = Family::<Labels, Counter>::default();
+    let commits = Family::<Labels, Counter>::default();
+    let messages_in_last_minute = Family::<Labels, Gauge>::default();
+    let commit_lag_ms = Family::<Labels, Gauge>::default();
+    for (name, connector_stats) in &stats.connector_stats {
+        let labels = vec![("connector", name.clone())];
+        messages
+            .get_or_create(&labels)
+            .inc_by(connector_stats.num_messages_from_start as u64);
+        commits
+            .get_or_create(&labels)
+            .inc_by(connector_stats.num_commits_from_start as u64);
+        messages_in_last_minute
+            .get_or_create(&labels)
+            .set(i64::try_from(connector_stats.num_messages_in_last_minute).unwrap_or(i64::MAX));
+        if let Some(lag) = connector_stats.commit_lag(now) {
+            commit_lag_ms
+                .get_or_create(&labels)
+                .set(i64::try_from(lag).unwrap_or(i64::MAX));
+        }
+    }
+    registry.register(
+        "connector_messages",
+        "Number of messages read by an input connector",
+        messages,
+    );
+    registry.register(
+        "connector_commits",
+        "Number of minibatches committed by an input connector",
+        commits,
+    );
+    registry.register(
+        "connector_messages_in_last_minute",
+        "Number of messages read by an input connector in the last minute",
+        messages_in_last_minute,
+    );
+    registry.register(
+        "connector_commit_lag_ms",
+        "Time since an input connector committed its last minibatch in milliseconds (absent when finished)",
+        commit_lag_ms,
+    );
+}
+
 /// Retrieves metrics from prober stats in the `OpenMetrics` format
 /// See <https://github.com/OpenObservability/OpenMetrics>
-fn metrics_from_stats(stats: &Arc<ArcSwapOption<ProberStats>>) -> String {
+fn metrics_from_stats(
+    stats: &Arc<ArcSwapOption<ProberStats>>,
+    processing_times: &ProcessingTimes,
+) -> String {
     let stats_owned = stats.load().clone();
     let now = SystemTime::now();
     let mut metrics_text = String::new();
@@ -65,6 +180,14 @@ fn metrics_from_stats(stats: &Arc<ArcSwapOption<ProberStats>>) -> String {
             output_latency_ms,
         );
 
+        register_operators_metrics(&mut registry, &stats_owned, now);
+        registry.register(
+            "operator_processing_time_seconds",
+            "Time spent by the worker running an operator per completed timestamp",
+            processing_times.clone(),
+        );
+        register_connectors_metrics(&mut registry, &stats_owned, now);
+
         encode(&mut metrics_text, &registry).unwrap();
     }
     metrics_text
@@ -78,6 +201,7 @@ pub fn start_http_server_thread(
     process_id: u16,
     // monitoring_status: Arc<ArcSwap<String>>,
     stats: Arc<ArcSwapOption<ProberStats>>,
+    processing_times: ProcessingTimes,
     http_terminate_receiver: tokio::sync::oneshot::Receiver<()>,
 ) -> JoinHandle<()> {
     let monitoring_http_port: u16 = env::var("PATHWAY_MONITORING_HTTP_PORT")
@@ -98,15 +222,17 @@ pub fn start_http_server_thread(
                     let addr = ([127, 0, 0, 1], monitoring_http_port + process_id).into();
                     let make_service = make_service_fn(move |_| {
                         let stats = stats.clone();
+                        let processing_times = processing_times.clone();
                         async move {
                             Ok::<_, Error>(service_fn(move |req| {
                                 let stats = stats.clone();
+                                let processing_times = processing_times.clone();
 
                                 async move {
                                     let mut response = Response::new(Body::empty());
                                     let stats = stats.clone();
 
-                                    let metrics_text = metrics_from_stats(&stats);
+                                    let metrics_text = metrics_from_stats(&stats, &processing_times);
                                     match (req.method(), req.uri().path()) {
                                         (&Method::GET, "/status") => {
                                             *response.body_mut() = Body::from(metrics_text);
@@ -158,7 +284,11 @@ pub struct Runner {
 }
 
 impl Runner {
-    fn run(stats: &Arc<ArcSwapOption<ProberStats>>, process_id: usize) -> Runner {
+    fn run(
+        stats: &Arc<ArcSwapOption<ProberStats>>,
+        processing_times: &ProcessingTimes,
+        process_id: usize,
+    ) -> Runner {
         let (http_terminate_transmitter, http_terminate_receiver) =
             tokio::sync::oneshot::channel::<()>();
         let http_server_thread_handle = {
@@ -166,6 +296,7 @@ impl Runner {
             start_http_server_thread(
                 u16::try_from(process_id).unwrap(),
                 stats,
+                processing_times.clone(),
                 http_terminate_receiver,
             )
         };
@@ -198,12 +329,23 @@ pub fn maybe_run_http_server_thread(
 ) -> Option<Runner> {
     if with_http_server && graph.worker_index() == 0 {
         let stats_shared = Arc::new(ArcSwapOption::from(None));
-        let http_server_runner = Runner::run(&stats_shared, process_id);
+        let processing_times =
+            ProcessingTimes::new_with_constructor(processing_time_histogram as fn() -> Histogram);
+        let http_server_runner = Runner::run(&stats_shared, &processing_times, process_id);
 
         graph
             .attach_prober(
-                Box::new(move |prober_stats| stats_shared.store(Some(Arc::new(prober_stats)))),
-                false,
+                Box::new(move |prober_stats: ProberStats| {
+                    for (operator_id, metrics) in &prober_stats.operators_metrics {
+                        let histogram =
+                            processing_times.get_or_create(&operator_labels(*operator_id));
+                        for processing_time in &metrics.processing_times {
+                            histogram.observe(processing_time.as_secs_f64());
+                        }
+                    }
+                    stats_shared.store(Some(Arc::new(prober_stats)));
+                }),
+                true,
                 false,
             )
             .expect("Failed to start http monitoring server");
@@ -17,11 +17,12 @@ pub use reduce::Reducer;
 
 pub mod graph;
 pub use graph::{
-    BatchWrapper, ColumnHandle, ColumnPath, ColumnProperties, ComplexColumn, Computer,
-    ConcatHandle, Context, DataRow, ErrorLogHandle, ExportedTable, ExportedTableCallback,
-    ExpressionData, Graph, IterationLogic, IxKeyPolicy, IxerHandle, JoinData, JoinType,
-    LegacyTable, OperatorStats, ProberStats, ReducerData, ScopedGraph, TableHandle,
-    TableProperties, UniverseHandle,
+    AsofJoinDirection, BatchWrapper, ColumnHandle, ColumnPath, ColumnProperties, ComplexColumn,
+    Computer, ConcatHandle, Context, DataRow, ErrorLogHandle, ExportedTable, ExportedTableCallback,
+    ExpressionData, Graph, GraphAlgorithm, IntervalJoinBounds, IterationLogic, IxKeyPolicy,
+    IxerHandle, JoinData, JoinType, LegacyTable, OperatorMetrics, OperatorStats, ProberStats,
+    ReducerData, ScopedGraph, SessionMergeFn, SessionPredicate, TableHandle, TableProperties,
+    UniverseHandle,
 };
 
 pub mod http_server;
@@ -34,7 +35,7 @@ pub mod expression;
 pub use expression::{
     AnyExpression, BoolExpression, DateTimeNaiveExpression, DateTimeUtcExpression,
     DurationExpression, Expression, Expressions, FloatExpression, IntExpression, PointerExpression,
-    StringExpression,
+    SlidingWindows, StringExpression, WindowLength,
 };
 
 pub mod progress_reporter;
@@ -9,11 +9,14 @@ use differential_dataflow::{
 };
 use ordered_float::OrderedFloat;
 use serde::{Deserialize, Serialize};
+use std::collections::{BTreeMap, HashMap};
 use std::iter::repeat;
 use std::num::NonZeroUsize;
 use std::ops::Add;
 use std::{cmp::Reverse, sync::Arc};
+use xxhash_rust::xxh3::Xxh3 as Hasher;
 
+use super::value::HashInto;
 use super::{Key, Value};
 
 pub type StatefulCombineFn =
@@ -30,18 +33,44 @@ pub enum Reducer {
     ArgMin,
     Max,
     ArgMax,
-    SortedTuple { skip_nones: bool },
-    Tuple { skip_nones: bool },
+    SortedTuple {
+        skip_nones: bool,
+    },
+    Tuple {
+        skip_nones: bool,
+    },
     Any,
-    Stateful { combine_fn: StatefulCombineFn },
+    Stateful {
+        combine_fn: StatefulCombineFn,
+    },
     Earliest,
     Latest,
+    ApproxCountDistinct {
+        precision: u8,
+    },
+    ApproxQuantile {
+        quantile: f64,
+        relative_accuracy: f64,
+    },
+    TopK {
+        k: usize,
+    },
+    Variance {
+        ddof: usize,
+    },
+    Stddev {
+        ddof: usize,
+    },
+    Covariance {
+        ddof: usize,
+    },
+    Correlation,
 }
 
 pub trait SemigroupReducerImpl: 'static {
     type State: ExchangeData + Semigroup + Multiply<isize>;
 
-    fn init(&self, key: &Key, value: &Value) -> Option<Self::State>;
+    fn init(&self, key: &Key, values: &[Value]) -> Option<Self::State>;
 
     fn finish(&self, state: Self::State) -> Value;
 }
@@ -128,8 +157,8 @@ pub struct IntSumReducer;
 impl SemigroupReducerImpl for IntSumReducer {
     type State = IntSumState;
 
-    fn init(&self, _key: &Key, value: &Value) -> Option<Self::State> {
-        match value {
+    fn init(&self, _key: &Key, values: &[Value]) -> Option<Self::State> {
+        match &values[0] {
             Value::Int(i) => Some(IntSumState::single(*i)),
             _ => panic!("unsupported type for int_sum"),
         }
@@ -542,3 +571,540 @@ pub struct LatestReducer;
 
 #[derive(Debug, Clone, Copy)]
 pub struct EarliestReducer;
+
+fn add_counts<K: Ord + Clone>(lhs: &mut BTreeMap<K, isize>, rhs: &BTreeMap<K, isize>) {
+    for (key, count) in rhs {
+        let entry = lhs.entry(key.clone()).or_insert(0);
+        *entry += count;
+        if *entry == 0 {
+            lhs.remove(key);
+        }
+    }
+}
+
+fn multiply_counts<K: Ord>(counts: BTreeMap<K, isize>, rhs: isize) -> BTreeMap<K, isize> {
+    if rhs == 0 {
+        return BTreeMap::new();
+    }
+    counts
+        .into_iter()
+        .map(|(key, count)| (key, count * rhs))
+        .collect()
+}
+
+fn value_hash(value: &Value) -> u64 {
+    let mut hasher = Hasher::default();
+    value.hash_into(&mut hasher);
+    hasher.digest()
+}
+
+/// State of the `HyperLogLog` sketch. Instead of keeping only the maximal rank in every
+/// register, it counts the values for each (register, rank) pair, so that values can be
+/// retracted. The size of the state is bounded by the number of registers times the number
+/// of possible ranks, regardless of the number of aggregated values.
+#[derive(Debug, Clone, Default, Hash, PartialEq, Eq, PartialOrd, Ord, Serialize, Deserialize)]
+pub struct HyperLogLogState {
+    count: isize,
+    ranks: BTreeMap<(u16, u8), isize>,
+}
+
+impl Semigroup for HyperLogLogState {
+    fn is_zero(&self) -> bool {
+        self.count.is_zero() && self.ranks.is_empty()
+    }
+
+    fn plus_equals(&mut self, rhs: &Self) {
+        self.count.plus_equals(&rhs.count);
+        add_counts(&mut self.ranks, &rhs.ranks);
+    }
+}
+
+impl Multiply<isize> for HyperLogLogState {
+    type Output = Self;
+    fn multiply(self, rhs: &isize) -> Self::Output {
+        Self {
+            count: self.count * rhs,
+            ranks: multiply_counts(self.ranks, *rhs),
+        }
+    }
+}
+
+#[derive(Debug, Clone, Copy)]
+pub struct ApproxCountDistinctReducer {
+    precision: u8,
+}
+
+impl ApproxCountDistinctReducer {
+    pub fn new(precision: u8) -> Self {
+        assert!((4..=16).contains(&precision));
+        Self { precision }
+    }
+}
+
+impl SemigroupReducerImpl for ApproxCountDistinctReducer {
+    type State = HyperLogLogState;
+
+    fn init(&self, _key: &Key, values: &[Value]) -> Option<Self::State> {
+        let hash = value_hash(&values[0]);
+        let register = u16::try_from(hash >> (64 - self.precision)).unwrap();
+        let max_rank = 64 - self.precision + 1;
+        let rank = u8::try_from((hash << self.precision).leading_zeros() + 1)
+            .unwrap()
+            .min(max_rank);
+        Some(HyperLogLogState {
+            count: 1,
+            ranks: BTreeMap::from([((register, rank), 1)]),
+        })
+    }
+
+    #[allow(clippy::cast_precision_loss)]
+    #[allow(clippy::cast_possible_truncation)]
+    fn finish(&self, state: Self::State) -> Value {
+        let num_registers = 1_usize << self.precision;
+        let mut registers = vec![0_u8; num_registers];
+        for (&(register, rank), &count) in &state.ranks {
+            if count > 0 {
+                let register = &mut registers[usize::from(register)];
+                *register = (*register).max(rank);
+            }
+        }
+        let m = num_registers as f64;
+        let alpha = match num_registers {
+            16 => 0.673,
+            32 => 0.697,
+            64 => 0.709,
+            _ => 0.7213 / (1.0 + 1.079 / m),
+        };
+        let sum: f64 = registers
+            .iter()
+            .map(|rank| 2.0_f64.powi(-i32::from(*rank)))
+            .sum();
+        let empty_registers = registers.iter().filter(|rank| **rank == 0).count();
+        let raw_estimate = alpha * m * m / sum;
+        let estimate = if raw_estimate <= 2.5 * m && empty_registers > 0 {
+            // linear counting is more accurate for small cardinalities
+            m * (m / empty_registers as f64).ln()
+        } else {
+            raw_estimate
+        };
+        Value::Int(estimate.round() as i64)
+    }
+}
+
+/// State of the `DDSketch` quantile sketch. Values are counted in buckets of exponentially
+/// growing width, separately for negative and positive values, which makes the state mergeable
+/// and allows retracting values. The number of buckets only depends on the range of the
+/// aggregated values and the relative accuracy.
+#[derive(Debug, Clone, Default, Hash, PartialEq, Eq, PartialOrd, Ord, Serialize, Deserialize)]
+pub struct QuantileSketchState {
+    count: isize,
+    negative: BTreeMap<i32, isize>,
+    zero: isize,
+    positive: BTreeMap<i32, isize>,
+}
+
+impl Semigroup for QuantileSketchState {
+    fn is_zero(&self) -> bool {
+        self.count.is_zero()
+            && self.zero.is_zero()
+            && self.negative.is_empty()
+            && self.positive.is_empty()
+    }
+
+    fn plus_equals(&mut self, rhs: &Self) {
+        self.count.plus_equals(&rhs.count);
+        self.zero.plus_equals(&rhs.zero);
+        add_counts(&mut self.negative, &rhs.negative);
+        add_counts(&mut self.positive, &rhs.positive);
+    }
+}
+
+impl Multiply<isize> for QuantileSketchState {
+    type Output = Self;
+    fn multiply(self, rhs: &isize) -> Self::Output {
+        Self {
+            count: self.count * rhs,
+            negative: multiply_counts(self.negative, *rhs),
+            zero: self.zero * rhs,
+            positive: multiply_counts(self.positive, *rhs),
+        }
+    }
+}
+
+#[derive(Debug, Clone, Copy)]
+pub struct ApproxQuantileReducer {
+    quantile: f64,
+    gamma: f64,
+    gamma_ln: f64,
+}
+
+impl ApproxQuantileReducer {
+    pub fn new(quantile: f64, relative_accuracy: f64) -> Self {
+        assert!((0.0..=1.0).contains(&quantile));
+        assert!(relative_accuracy > 0.0 && relative_accuracy < 1.0);
+        let gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy);
+        Self {
+            quantile,
+            gamma,
+            gamma_ln: gamma.ln(),
+        }
+    }
+
+    #[allow(clippy::cast_possible_truncation)]
+    fn bucket(&self, value: f64) -> i32 {
+        (value.ln() / self.gamma_ln).ceil() as i32
+    }
+
+    fn bucket_value(&self, bucket: i32) -> f64 {
+        2.0 * (f64::from(bucket) * self.gamma_ln).exp() / (self.gamma + 1.0)
+    }
+}
+
+impl SemigroupReducerImpl for ApproxQuantileReducer {
+    type State = QuantileSketchState;
+
+    fn init(&self, _key: &Key, values: &[Value]) -> Option<Self::State> {
+        #[allow(clippy::cast_precision_loss)]
+        let value = match &values[0] {
+            Value::Int(i) => *i as f64,
+            Value::Float(f) => f.into_inner(),
+            Value::None => f64::NAN,
+            _ => panic!("unsupported type for approx_quantile"),
+        };
+        let mut state = QuantileSketchState {
+            count: 1,
+            ..Default::default()
+        };
+        if value.is_nan() {
+            // None and NaN values are skipped
+        } else if value > 0.0 {
+            state.positive.insert(self.bucket(value), 1);
+        } else if value < 0.0 {
+            state.negative.insert(self.bucket(-value), 1);
+        } else {
+            state.zero = 1;
+        }
+        Some(state)
+    }
+
+    #[allow(clippy::cast_precision_loss)]
+    fn finish(&self, state: Self::State) -> Value {
+        let total = state.negative.values().sum::<isize>()
+            + state.zero
+            + state.positive.values().sum::<isize>();
+        if total <= 0 {
+            return Value::None;
+        }
+        let rank = self.quantile * (total - 1) as f64;
+        let mut seen = 0;
+        let buckets = state
+            .negative
+            .iter()
+            .rev()
+            .map(|(bucket, count)| (-self.bucket_value(*bucket), *count))
+            .chain(std::iter::once((0.0, state.zero)))
+            .chain(
+                state
+                    .positive
+                    .iter()
+                    .map(|(bucket, count)| (self.bucket_value(*bucket), *count)),
+            );
+        let mut result = 0.0;
+        for (value, count) in buckets {
+            if count <= 0 {
+                continue;
+            }
+            seen += count;
+            result = value;
+            if seen as f64 > rank {
+                break;
+            }
+        }
+        Value::Float(result.into())
+    }
+}
+
+/// Exact top-k: the counts of all distinct values of a group are combined on every
+/// update, and the `k` most frequent ones are selected.
+#[derive(Debug, Clone, Copy)]
+pub struct TopKReducer {
+    k: usize,
+}
+
+impl TopKReducer {
+    pub fn new(k: usize) -> Self {
+        Self { k }
+    }
+}
+
+impl UnaryReducerImpl for TopKReducer {
+    type State = Vec<(Value, usize)>;
+
+    fn init_unary(&self, _key: &Key, value: &Value) -> Option<Self::State> {
+        Some(vec![(value.clone(), 1)])
+    }
+
+    fn combine<'a>(
+        &self,
+        values: impl IntoIterator<Item = (&'a Self::State, NonZeroUsize)>,
+    ) -> Self::State {
+        let mut counts: HashMap<&Value, usize> = HashMap::new();
+        for (state, cnt) in values {
+            for (value, count) in state {
+                *counts.entry(value).or_default() += count * cnt.get();
+            }
+        }
+        let mut counts: Vec<_> = counts.into_iter().collect();
+        let order =
+            |a: &(&Value, usize), b: &(&Value, usize)| b.1.cmp(&a.1).then_with(|| a.0.cmp(b.0));
+        // only the selected values are sorted
+        if counts.len() > self.k {
+            counts.select_nth_unstable_by(self.k, order);
+            counts.truncate(self.k);
+        }
+        counts.sort_unstable_by(order);
+        counts
+            .into_iter()
+            .map(|(value, count)| (value.clone(), count))
+            .collect()
+    }
+
+    fn finish(&self, state: Self::State) -> Value {
+        state
+            .into_iter()
+            .map(|(value, count)| {
+                let count = Value::Int(i64::try_from(count).unwrap());
+                Value::from([value, count].as_slice())
+            })
+            .collect::<Vec<Value>>()
+            .as_slice()
+            .into()
+    }
+}
+
+fn numeric_value(value: &Value, reducer: &str) -> f64 {
+    match value {
+        #[allow(clippy::cast_precision_loss)]
+        Value::Int(i) => *i as f64,
+        Value::Float(f) => f.into_inner(),
+        _ => panic!("unsupported type for {reducer}"),
+    }
+}
+
+/// Count, mean and sum of squared deviations from the mean of the aggregated values.
+/// States are merged with the formula of Chan et al., which is numerically stable and,
+/// as counts can be negative, also allows retracting values.
+#[derive(Debug, Clone, Default, Hash, PartialEq, Eq, PartialOrd, Ord, Serialize, Deserialize)]
+pub struct MomentsState {
+    count: isize,
+    mean: OrderedFloat<f64>,
+    m2: OrderedFloat<f64>,
+}
+
+impl MomentsState {
+    fn single(value: f64) -> Self {
+        Self {
+            count: 1,
+            mean: value.into(),
+            m2: 0.0.into(),
+        }
+    }
+
+    #[allow(clippy::cast_precision_loss)]
+    fn variance(&self, ddof: usize) -> Option<f64> {
+        let denominator = self.count - isize::try_from(ddof).unwrap();
+        if denominator <= 0 {
+            return None;
+        }
+        // retractions can leave a tiny negative rounding error
+        Some((self.m2.into_inner() / denominator as f64).max(0.0))
+    }
+}
+
+impl Semigroup for MomentsState {
+    fn is_zero(&self) -> bool {
+        self.count.is_zero()
+    }
+
+    #[allow(clippy::cast_precision_loss)]
+    fn plus_equals(&mut self, rhs: &Self) {
+        let count = self.count + rhs.count;
+        if count == 0 {
+            *self = Self::default();
+            return;
+        }
+        let (n_a, n_b, n) = (self.count as f64, rhs.count as f64, count as f64);
+        let delta = rhs.mean.into_inner() - self.mean.into_inner();
+        self.mean = (self.mean.into_inner() + delta * n_b / n).into();
+        self.m2 =
+            (self.m2.into_inner() + rhs.m2.into_inner() + delta * delta * n_a * n_b / n).into();
+        self.count = count;
+    }
+}
+
+impl Multiply<isize> for MomentsState {
+    type Output = Self;
+    #[allow(clippy::cast_precision_loss)]
+    fn multiply(self, rhs: &isize) -> Self::Output {
+        if *rhs == 0 {
+            return Self::default();
+        }
+        Self {
+            count: self.count * rhs,
+            mean: self.mean,
+            m2: (self.m2.into_inner() * *rhs as f64).into(),
+        }
+    }
+}
+
+#[derive(Debug, Clone, Copy)]
+pub struct VarianceReducer {
+    ddof: usize,
+    stddev: bool,
+}
+
+impl VarianceReducer {
+    pub fn new(ddof: usize, stddev: bool) -> Self {
+        Self { ddof, stddev }
+    }
+}
+
+impl SemigroupReducerImpl for VarianceReducer {
+    type State = MomentsState;
+
+    fn init(&self, _key: &Key, values: &[Value]) -> Option<Self::State> {
+        let reducer = if self.stddev { "stddev" } else { "var" };
+        Some(MomentsState::single(numeric_value(&values[0], reducer)))
+    }
+
+    fn finish(&self, state: Self::State) -> Value {
+        match state.variance(self.ddof) {
+            Some(variance) if self.stddev => Value::Float(variance.sqrt().into()),
+            Some(variance) => Value::Float(variance.into()),
+            None => Value::None,
+        }
+    }
+}
+
+/// Joint moments of two aggregated columns, merged like [`MomentsState`].
+#[derive(Debug, Clone, Default, Hash, PartialEq, Eq, PartialOrd, Ord, Serialize, Deserialize)]
+pub struct CoMomentsState {
+    count: isize,
+    mean_x: OrderedFloat<f64>,
+    mean_y: OrderedFloat<f64>,
+    m2_x: OrderedFloat<f64>,
+    m2_y: OrderedFloat<f64>,
+    c_xy: OrderedFloat<f64>,
+}
+
+impl CoMomentsState {
+    fn single(x: f64, y: f64) -> Self {
+        Self {
+            count: 1,
+            mean_x: x.into(),
+            mean_y: y.into(),
+            ..Default::default()
+        }
+    }
+}
+
+impl Semigroup for CoMomentsState {
+    fn is_zero(&self) -> bool {
+        self.count.is_zero()
+    }
+
+    #[allow(clippy::cast_precision_loss)]
+    fn plus_equals(&mut self, rhs: &Self) {
+        let count = self.count + rhs.count;
+        if count == 0 {
+            *self = Self::default();
+            return;
+        }
+        let (n_a, n_b, n) = (self.count as f64, rhs.count as f64, count as f64);
+        let delta_x = rhs.mean_x.into_inner() - self.mean_x.into_inner();
+        let delta_y = rhs.mean_y.into_inner() - self.mean_y.into_inner();
+        let weight = n_a * n_b / n;
+        self.mean_x = (self.mean_x.into_inner() + delta_x * n_b / n).into();
+        self.mean_y = (self.mean_y.into_inner() + delta_y * n_b / n).into();
+        self.m2_x =
+            (self.m2_x.into_inner() + rhs.m2_x.into_inner() + delta_x * delta_x * weight).into();
+        self.m2_y =
+            (self.m2_y.into_inner() + rhs.m2_y.into_inner() + delta_y * delta_y * weight).into();
+        self.c_xy =
+            (self.c_xy.into_inner() + rhs.c_xy.into_inner() + delta_x * delta_y * weight).into();
+        self.count = count;
+    }
+}
+
+impl Multiply<isize> for CoMomentsState {
+    type Output = Self;
+    #[allow(clippy::cast_precision_loss)]
+    fn multiply(self, rhs: &isize) -> Self::Output {
+        if *rhs == 0 {
+            return Self::default();
+        }
+        let factor = *rhs as f64;
+        Self {
+            count: self.count * rhs,
+            mean_x: self.mean_x,
+            mean_y: self.mean_y,
+            m2_x: (self.m2_x.into_inner() * factor).into(),
+            m2_y: (self.m2_y.into_inner() * factor).into(),
+            c_xy: (self.c_xy.into_inner() * factor).into(),
+        }
+    }
+}
+
+#[derive(Debug, Clone, Copy)]
+pub struct CovarianceReducer {
+    ddof: usize,
+}
+
+impl CovarianceReducer {
+    pub fn new(ddof: usize) -> Self {
+        Self { ddof }
+    }
+}
+
+impl SemigroupReducerImpl for CovarianceReducer {
+    type State = CoMomentsState;
+
+    fn init(&self, _key: &Key, values: &[Value]) -> Option<Self::State> {
+        Some(CoMomentsState::single(
+            numeric_value(&values[0], "cov"),
+            numeric_value(&values[1], "cov"),
+        ))
+    }
+
+    #[allow(clippy::cast_precision_loss)]
+    fn finish(&self, state: Self::State) -> Value {
+        let denominator = state.count - isize::try_from(self.ddof).unwrap();
+        if denominator <= 0 {
+            return Value::None;
+        }
+        Value::Float((state.c_xy.into_inner() / denominator as f64).into())
+    }
+}
+
+#[derive(Debug, Clone, Copy)]
+pub struct CorrelationReducer;
+
+impl SemigroupReducerImpl for CorrelationReducer {
+    type State = CoMomentsState;
+
+    fn init(&self, _key: &Key, values: &[Value]) -> Option<Self::State> {
+        Some(CoMomentsState::single(
+            numeric_value(&values[0], "corr"),
+            numeric_value(&values[1], "corr"),
+        ))
+    }
+
+    fn finish(&self, state: Self::State) -> Value {
+        let (m2_x, m2_y) = (state.m2_x.into_inner(), state.m2_y.into_inner());
+        if m2_x <= 0.0 || m2_y <= 0.0 {
+            return Value::None;
+        }
+        let correlation = state.c_xy.into_inner() / (m2_x * m2_y).sqrt();
+        Value::Float(correlation.clamp(-1.0, 1.0).into())
+    }
+}
@@ -1,19 +1,24 @@
 // Copyright © 2024 Pathway
 
-use std::ops::Deref;
-use std::{collections::HashMap, rc::Rc, sync::Arc};
+use std::cell::RefCell;
+use std::collections::{HashMap, HashSet};
+use std::rc::Rc;
+use std::sync::Arc;
 
 use glob::Pattern;
 use itertools::Itertools;
+use jmespath::ast::{Ast, Comparator};
 use jmespath::functions::{ArgumentType, CustomFunction, Signature};
-use jmespath::{self, Context, ErrorReason, JmespathError, Rcvar, Runtime, ToJmespath, Variable};
-use usearch::ffi::{IndexOptions, MetricKind, ScalarKind};
+use jmespath::{
+    self, interpret, Context, ErrorReason, JmespathError, Rcvar, Runtime, ToJmespath, Variable,
+};
+use usearch::ffi::{IndexOptions, Matches, MetricKind, ScalarKind};
 use usearch::{new_index, Index};
 
 use differential_dataflow::difference::Abelian;
 
 use crate::engine::dataflow::operators::external_index::Index as IndexTrait;
-use crate::engine::error::DynResult;
+use crate::engine::error::{DynError, DynResult};
 use crate::engine::report_error::{ReportError, UnwrapWithReporter};
 use crate::engine::{ColumnPath, Key, Value};
 
@@ -113,6 +118,27 @@ impl<R: Abelian + CanBeRetraction> IndexTrait<Key, Value, R, Value, Value> for I
 }
 
 /* utils */
+// Accepts vectors passed as tuples of numbers or as numpy arrays.
+#[allow(clippy::cast_precision_loss)]
+fn value_to_vector(value: &Value) -> DynResult<Vec<f64>> {
+    match value {
+        Value::FloatArray(array) => Ok(array.iter().copied().collect()),
+        Value::IntArray(array) => Ok(array.iter().map(|x| *x as f64).collect()),
+        Value::Tuple(tuple) => tuple
+            .iter()
+            .map(|x| match x {
+                Value::Int(i) => Ok(*i as f64),
+                _ => x.as_float(),
+            })
+            .try_collect(),
+        _ => Err(crate::engine::Error::TypeMismatch {
+            expected: "vector",
+            value: value.clone(),
+        }
+        .into()),
+    }
+}
+
 // Create a new Runtime and register the builtin JMESPath functions.
 struct JMESPathFilterWithGlobPattern {
     pub runtime: Runtime,
@@ -182,11 +208,116 @@ pub fn make_option_accessor(
 #[derive(Clone, Copy)]
 pub struct USearchMetricKind(pub MetricKind);
 
+// number of distinct filter expressions kept in compiled form
+const MAX_CACHED_FILTERS: usize = 1024;
+
+// JMESPath filter parsed once per distinct query string. String equalities on top-level
+// fields joined with `&&` are extracted, so they can be answered from the metadata index.
+struct CompiledFilter {
+    ast: Ast,
+    equalities: Vec<(String, String)>,
+    only_equalities: bool,
+}
+
+impl CompiledFilter {
+    fn new(ast: Ast) -> Self {
+        let mut equalities = Vec::new();
+        let only_equalities = Self::collect_equalities(&ast, &mut equalities);
+        Self {
+            ast,
+            equalities,
+            only_equalities,
+        }
+    }
+
+    // returns true if the whole expression is a conjunction of extracted equalities
+    fn collect_equalities(ast: &Ast, equalities: &mut Vec<(String, String)>) -> bool {
+        match ast {
+            Ast::And { lhs, rhs, .. } => {
+                let lhs_only = Self::collect_equalities(lhs, equalities);
+                let rhs_only = Self::collect_equalities(rhs, equalities);
+                lhs_only && rhs_only
+            }
+            Ast::Comparison {
+                comparator: Comparator::Equal,
+                lhs,
+                rhs,
+                ..
+            } => match (lhs.as_ref(), rhs.as_ref()) {
+                (Ast::Field { name, .. }, Ast::Literal { value, .. })
+                | (Ast::Literal { value, .. }, Ast::Field { name, .. }) => {
+                    if let Some(value) = value.as_string() {
+                        equalities.push((name.clone(), value.clone()));
+                        true
+                    } else {
+                        false
+                    }
+                }
+                _ => false,
+            },
+            _ => false,
+        }
+    }
+}
+
+// inverted index: field name -> string value -> ids of rows having this value
+// fields are indexed lazily, when they first appear in an equality filter
+#[derive(Default)]
+struct MetadataIndex {
+    fields: HashMap<String, HashMap<String, HashSet<u64>>>,
+}
+
+impl MetadataIndex {
+    fn ensure_field<'a>(
+        &mut self,
+        field: &str,
+        filter_data: impl IntoIterator<Item = (&'a u64, &'a Rcvar)>,
+    ) {
+        if self.fields.contains_key(field) {
+            return;
+        }
+        let mut values: HashMap<String, HashSet<u64>> = HashMap::new();
+        for (id, data) in filter_data {
+            if let Some(value) = data.get_field(field).as_string() {
+                values.entry(value.clone()).or_default().insert(*id);
+            }
+        }
+        self.fields.insert(field.to_string(), values);
+    }
+
+    fn add(&mut self, id: u64, data: &Variable) {
+        for (field, values) in &mut self.fields {
+            if let Some(value) = data.get_field(field).as_string() {
+                values.entry(value.clone()).or_default().insert(id);
+            }
+        }
+    }
+
+    fn remove(&mut self, id: u64, data: &Variable) {
+        for (field, values) in &mut self.fields {
+            if let Some(value) = data.get_field(field).as_string() {
+                if let Some(ids) = values.get_mut(value) {
+                    ids.remove(&id);
+                    if ids.is_empty() {
+                        values.remove(value);
+                    }
+                }
+            }
+        }
+    }
+
+    fn candidates(&self, field: &str, value: &str) -> Option<&HashSet<u64>> {
+        self.fields.get(field)?.get(value)
+    }
+}
+
 pub struct USearchKNNIndex {
     next_id: u64,
     id_to_key_map: HashMap<u64, Key>,
     key_to_id_map: HashMap<Key, u64>,
-    filter_data_map: HashMap<Key, Variable>,
+    filter_data_map: HashMap<u64, Rcvar>,
+    metadata_index: RefCell<MetadataIndex>,
+    filter_cache: RefCell<HashMap<String, Rc<CompiledFilter>>>,
     jmespath_runtime: JMESPathFilterWithGlobPattern,
     index: Arc<Index>,
     return_distance: bool,
@@ -210,9 +341,8 @@ impl USearchKNNIndex {
         id
     }
 
-    fn _search(&self, vector: &[f64], limit: usize) -> DynResult<Vec<SingleMatch>> {
-        let matches = self.index.search(vector, limit)?;
-        Ok(matches
+    fn matches_to_single_matches(&self, matches: Matches) -> Vec<SingleMatch> {
+        matches
             .keys
             .into_iter()
             .zip(matches.distances)
@@ -220,7 +350,84 @@ impl USearchKNNIndex {
                 key: self.id_to_key_map[&k],
                 distance: f64::from(d),
             })
-            .collect())
+            .collect()
+    }
+
+    fn _search(&self, vector: &[f64], limit: usize) -> DynResult<Vec<SingleMatch>> {
+        let matches = self.index.search(vector, limit)?;
+        Ok(self.matches_to_single_matches(matches))
+    }
+
+    fn compiled_filter(&self, filter: &str) -> DynResult<Rc<CompiledFilter>> {
+        if let Some(compiled) = self.filter_cache.borrow().get(filter) {
+            return Ok(compiled.clone());
+        }
+        let compiled = Rc::new(CompiledFilter::new(jmespath::parse(filter)?));
+        let mut filter_cache = self.filter_cache.borrow_mut();
+        if filter_cache.len() >= MAX_CACHED_FILTERS {
+            filter_cache.clear();
+        }
+        filter_cache.insert(filter.to_string(), compiled.clone());
+        Ok(compiled)
+    }
+
+    // the filter is evaluated as a predicate inside the HNSW traversal,
+    // equalities are first checked against the metadata index
+    fn _filtered_search(
+        &self,
+        vector: &[f64],
+        limit: usize,
+        filter: &str,
+    ) -> DynResult<Vec<SingleMatch>> {
+        let compiled = self.compiled_filter(filter)?;
+        {
+            let mut metadata_index = self.metadata_index.borrow_mut();
+            for (field, _value) in &compiled.equalities {
+                metadata_index.ensure_field(field, &self.filter_data_map);
+            }
+        }
+        let metadata_index = self.metadata_index.borrow();
+        let Some(candidate_sets): Option<Vec<&HashSet<u64>>> = compiled
+            .equalities
+            .iter()
+            .map(|(field, value)| metadata_index.candidates(field, value))
+            .collect()
+        else {
+            // some equality is not satisfied by any row
+            return Ok(Vec::new());
+        };
+
+        let null: Rcvar = Rc::new(Variable::Null);
+        let error: RefCell<Option<DynError>> = RefCell::new(None);
+        let predicate = |id: u64| -> bool {
+            if !candidate_sets.iter().all(|ids| ids.contains(&id)) {
+                return false;
+            }
+            if compiled.only_equalities {
+                return true;
+            }
+            let data = self.filter_data_map.get(&id).unwrap_or(&null);
+            let mut context = Context::new(filter, &self.jmespath_runtime.runtime);
+            let result = interpret(data, &compiled.ast, &mut context)
+                .map_err(DynError::from)
+                .and_then(|result| {
+                    result.as_boolean().ok_or_else(|| {
+                        crate::engine::Error::ValueError(
+                            "jmespath filter expression did not return a boolean value".to_string(),
+                        )
+                        .into()
+                    })
+                });
+            result.unwrap_or_else(|err| {
+                error.borrow_mut().get_or_insert(err);
+                false
+            })
+        };
+        let matches = self.index.filtered_search(vector, limit, predicate)?;
+        if let Some(err) = error.into_inner() {
+            return Err(err);
+        }
+        Ok(self.matches_to_single_matches(matches))
     }
 }
 
@@ -229,12 +436,16 @@ impl ExternalIndex for USearchKNNIndex {
     fn add(&mut self, key: Key, data: Value, filter_data: Option<Value>) -> DynResult<()> {
         let key_id = self.get_noncolliding_u64_id(key);
 
-        if let Some(f_data_un) = filter_data {
-            self.filter_data_map
-                .insert(key, f_data_un.as_json()?.to_jmespath()?.deref().clone());
+        if let Some(f_data_un) = filter_data.filter(|f_data| !matches!(f_data, Value::None)) {
+            let f_data = f_data_un.as_json()?.to_jmespath()?;
+            let mut metadata_index = self.metadata_index.borrow_mut();
+            if let Some(previous) = self.filter_data_map.insert(key_id, f_data.clone()) {
+                metadata_index.remove(key_id, &previous);
+            }
+            metadata_index.add(key_id, &f_data);
         };
 
-        let vector: Vec<f64> = (data.as_tuple()?.iter().map(Value::as_float).try_collect())?;
+        let vector = value_to_vector(&data)?;
 
         if self.index.size() + 1 > self.index.capacity() {
             assert!(self.index.reserve(2 * self.index.capacity()).is_ok());
@@ -249,7 +460,9 @@ impl ExternalIndex for USearchKNNIndex {
             .remove(&key)
             .ok_or(crate::engine::Error::KeyMissingInUniverse(key))?;
         self.id_to_key_map.remove(&key_id);
-        self.filter_data_map.remove(&key);
+        if let Some(f_data) = self.filter_data_map.remove(&key_id) {
+            self.metadata_index.borrow_mut().remove(key_id, &f_data);
+        }
         self.index.remove(key_id)?;
         Ok(())
     }
@@ -266,63 +479,20 @@ impl ExternalIndex for USearchKNNIndex {
             1
         };
 
-        let vector: Vec<f64> = (data.as_tuple()?.iter().map(Value::as_float).try_collect())?;
-
-        if filter.is_none() {
-            return Ok(Value::Tuple(
-                self._search(&vector, limit)?
-                    .into_iter()
-                    .map(|sm| {
-                        if self.return_distance {
-                            Value::Tuple(Arc::new([Value::from(sm.key), Value::from(sm.distance)]))
-                        } else {
-                            Value::from(sm.key)
-                        }
-                    })
-                    .collect(),
-            ));
+        if limit == 0 {
+            return Ok(Value::Tuple(Arc::from([])));
         }
 
-        let filter_str = filter.as_ref().unwrap().as_string()?.to_string();
-        let expr = self.jmespath_runtime.runtime.compile(&filter_str)?;
-        let mut upper_bound = limit;
-        let filtered = loop {
-            let results = self._search(&vector, upper_bound)?;
-            let res_len = results.len();
-
-            let res_with_expr: Vec<(SingleMatch, Rc<Variable>)> = results
-                .into_iter()
-                .map(|sm| expr.search(&self.filter_data_map[&sm.key]).map(|r| (sm, r)))
-                .try_collect()?;
+        let vector = value_to_vector(data)?;
 
-            let to_filter: Vec<(SingleMatch, bool)> = res_with_expr
-                .into_iter()
-                .map(|(k, e)| match e.as_boolean() {
-                    Some(ret) => Ok((k, ret)),
-                    None => Err(crate::engine::Error::ValueError(
-                        "jmespath filter expression did not return a boolean value".to_string(),
-                    )),
-                })
-                .try_collect()?;
-
-            let mut filtered: Vec<SingleMatch> = to_filter
-                .into_iter()
-                .filter_map(|(k, e)| if e { Some(k) } else { None })
-                .collect();
-
-            if filtered.len() >= limit {
-                filtered.truncate(limit);
-                break filtered;
-            }
-
-            if res_len < upper_bound {
-                break filtered;
-            }
-            upper_bound *= 2;
+        let results = if let Some(filter) = filter.filter(|f| !matches!(f, Value::None)) {
+            self._filtered_search(&vector, limit, filter.as_string()?)?
+        } else {
+            self._search(&vector, limit)?
         };
 
         Ok(Value::Tuple(
-            filtered
+            results
                 .into_iter()
                 .map(|sm| {
                     if self.return_distance {
@@ -390,6 +560,8 @@ impl ExternalIndexFactory for USearchKNNIndexFactory {
             id_to_key_map: HashMap::new(),
             key_to_id_map: HashMap::new(),
             filter_data_map: HashMap::new(),
+            metadata_index: RefCell::new(MetadataIndex::default()),
+            filter_cache: RefCell::new(HashMap::new()),
             jmespath_runtime: JMESPathFilterWithGlobPattern::new(),
             return_distance: self.return_distance,
             index: Arc::from(index),
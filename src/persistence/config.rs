@@ -15,8 +15,9 @@ use s3::bucket::Bucket as S3Bucket;
 use crate::connectors::data_storage::S3CommandName;
 use crate::connectors::data_storage::{ReadError, WriteError};
 use crate::connectors::snapshot::{
-    Event, LocalBinarySnapshotReader, LocalBinarySnapshotWriter, MockSnapshotReader,
-    S3SnapshotReader, S3SnapshotWriter, SnapshotReader, SnapshotReaderImpl,
+    compact_local_snapshot, compact_s3_snapshot, CompactionStats, Event, LocalBinarySnapshotReader,
+    LocalBinarySnapshotWriter, MockSnapshotReader, S3SnapshotReader, S3SnapshotWriter,
+    SnapshotFormat, SnapshotReader, SnapshotReaderImpl,
 };
 use crate::connectors::{PersistenceMode, SnapshotAccess};
 use crate::deepcopy::DeepCopy;
@@ -66,9 +67,12 @@ pub struct PersistenceManagerOuterConfig {
     snapshot_access: SnapshotAccess,
     persistence_mode: PersistenceMode,
     continue_after_replay: bool,
+    snapshot_format: SnapshotFormat,
+    snapshot_compaction_interval: Option<Duration>,
 }
 
 impl PersistenceManagerOuterConfig {
+    #[allow(clippy::too_many_arguments)]
     pub fn new(
         snapshot_interval: Duration,
         metadata_storage: MetadataStorageConfig,
@@ -76,6 +80,8 @@ impl PersistenceManagerOuterConfig {
         snapshot_access: SnapshotAccess,
         persistence_mode: PersistenceMode,
         continue_after_replay: bool,
+        snapshot_format: SnapshotFormat,
+        snapshot_compaction_interval: Option<Duration>,
     ) -> Self {
         Self {
             snapshot_interval,
@@ -84,6 +90,8 @@ impl PersistenceManagerOuterConfig {
             snapshot_access,
             persistence_mode,
             continue_after_replay,
+            snapshot_format,
+            snapshot_compaction_interval,
         }
     }
 
@@ -113,8 +121,10 @@ pub struct PersistenceManagerConfig {
     pub snapshot_access: SnapshotAccess,
     pub persistence_mode: PersistenceMode,
     pub continue_after_replay: bool,
+    pub snapshot_format: SnapshotFormat,
+    pub snapshot_compaction_interval: Option<Duration>,
     pub worker_id: usize,
-    total_workers: usize,
+    pub total_workers: usize,
 }
 
 impl PersistenceManagerConfig {
@@ -129,6 +139,8 @@ impl PersistenceManagerConfig {
             snapshot_access: outer_config.snapshot_access,
             persistence_mode: outer_config.persistence_mode,
             continue_after_replay: outer_config.continue_after_replay,
+            snapshot_format: outer_config.snapshot_format,
+            snapshot_compaction_interval: outer_config.snapshot_compaction_interval,
             worker_id,
             total_workers,
         }
@@ -209,16 +221,18 @@ impl PersistenceManagerConfig {
         persistent_id: PersistentId,
     ) -> Result<SharedSnapshotWriter, WriteError> {
         match &self.stream_storage {
-            StreamStorageConfig::Filesystem(root_path) => {
-                Ok(Arc::new(Mutex::new(LocalBinarySnapshotWriter::new(
+            StreamStorageConfig::Filesystem(root_path) => Ok(Arc::new(Mutex::new(
+                LocalBinarySnapshotWriter::with_format(
                     &self.snapshot_writer_path(root_path, persistent_id)?,
-                )?)))
-            }
+                    self.snapshot_format,
+                )?,
+            ))),
             StreamStorageConfig::S3 { bucket, root_path } => {
                 let snapshot_path = self.s3_snapshot_path(root_path, persistent_id);
                 Ok(Arc::new(Mutex::new(S3SnapshotWriter::new(
                     bucket.deep_copy(),
                     &snapshot_path,
+                    self.snapshot_format,
                 ))))
             }
             StreamStorageConfig::Mock(_) => {
@@ -227,6 +241,29 @@ impl PersistenceManagerConfig {
         }
     }
 
+    /// Compacts the snapshot written by this worker for the given source. Only the
+    /// events committed before `threshold_time` are compacted.
+    pub fn compact_snapshot(
+        &self,
+        persistent_id: PersistentId,
+        threshold_time: Timestamp,
+    ) -> Result<Option<CompactionStats>, ReadError> {
+        match &self.stream_storage {
+            StreamStorageConfig::Filesystem(root_path) => compact_local_snapshot(
+                &self.snapshot_writer_path(root_path, persistent_id)?,
+                threshold_time,
+                self.snapshot_format,
+            ),
+            StreamStorageConfig::S3 { bucket, root_path } => compact_s3_snapshot(
+                bucket,
+                &self.s3_snapshot_path(root_path, persistent_id),
+                threshold_time,
+                self.snapshot_format,
+            ),
+            StreamStorageConfig::Mock(_) => Ok(None),
+        }
+    }
+
     fn snapshot_writer_path(
         &self,
         root_path: &Path,
@@ -2,9 +2,12 @@
 
 use itertools::Itertools;
 use log::{error, info};
-use std::collections::HashMap;
+use std::cmp::min;
+use std::collections::{HashMap, HashSet};
 use std::mem::take;
 use std::sync::{Arc, Mutex};
+use std::thread::{Builder as ThreadBuilder, JoinHandle};
+use std::time::Instant;
 
 use crate::connectors::data_storage::{ReadError, StorageType, WriteError};
 use crate::connectors::snapshot::{SnapshotReader, SnapshotWriterFlushFuture};
@@ -31,6 +34,11 @@ pub struct SingleWorkerPersistentStorage {
     snapshot_writers: HashMap<PersistentId, SharedSnapshotWriter>,
     sink_threshold_times: Vec<Option<Timestamp>>,
     input_sources: FrontierByTimeForInputSources,
+
+    // The snapshots can't be compacted while they are being read
+    snapshots_being_rewound: HashSet<PersistentId>,
+    snapshot_compaction_started_at: Instant,
+    snapshot_compaction_thread: Option<JoinHandle<()>>,
 }
 
 /// The information from the first phase of time finalization commit.
@@ -80,6 +88,10 @@ impl SingleWorkerPersistentStorage {
             snapshot_writers: HashMap::new(),
             sink_threshold_times: Vec::new(),
             input_sources: Vec::new(),
+
+            snapshots_being_rewound: HashSet::new(),
+            snapshot_compaction_started_at: Instant::now(),
+            snapshot_compaction_thread: None,
         })
     }
 
@@ -223,19 +235,88 @@ impl SingleWorkerPersistentStorage {
 
         if let Err(e) = self.metadata_storage.save_current_state() {
             error!("Failed to save the current state, the data may duplicate in the re-run: {e}");
+        } else {
+            self.start_snapshot_compaction_if_due(commit_data.timestamp);
         }
     }
 
+    /// Starts folding the snapshots written by this worker in the background, if the
+    /// compaction is enabled and the previous one was started long enough ago.
+    fn start_snapshot_compaction_if_due(&mut self, committed_timestamp: Timestamp) {
+        let Some(compaction_interval) = self.config.snapshot_compaction_interval else {
+            return;
+        };
+        let is_running = self
+            .snapshot_compaction_thread
+            .as_ref()
+            .is_some_and(|thread| !thread.is_finished());
+        if is_running || self.snapshot_compaction_started_at.elapsed() < compaction_interval {
+            return;
+        }
+
+        let persistent_ids: Vec<PersistentId> = self
+            .snapshot_writers
+            .keys()
+            .filter(|persistent_id| !self.snapshots_being_rewound.contains(persistent_id))
+            .copied()
+            .collect();
+        let threshold_time = self.snapshot_compaction_threshold(committed_timestamp);
+        let config = self.config.clone();
+        let compaction_thread = ThreadBuilder::new()
+            .name("pathway:snapshot-compaction".to_string())
+            .spawn(move || {
+                for persistent_id in persistent_ids {
+                    match config.compact_snapshot(persistent_id, threshold_time) {
+                        Ok(Some(stats)) => {
+                            info!("Compacted the snapshot of {persistent_id}: {stats:?}")
+                        }
+                        Ok(None) => {}
+                        Err(e) => error!("Failed to compact the snapshot of {persistent_id}: {e}"),
+                    }
+                }
+            });
+        match compaction_thread {
+            Ok(compaction_thread) => {
+                self.snapshot_compaction_thread = Some(compaction_thread);
+                self.snapshot_compaction_started_at = Instant::now();
+            }
+            Err(e) => error!("Failed to start the snapshot compaction: {e}"),
+        }
+    }
+
+    /// The time, up to which the snapshots will be read in the re-run.
+    fn snapshot_compaction_threshold(&self, committed_timestamp: Timestamp) -> Timestamp {
+        if !matches!(
+            self.config.persistence_mode,
+            PersistenceMode::SelectivePersisting
+        ) {
+            return committed_timestamp;
+        }
+        // In this mode, the snapshots are read up to the minimal time committed by
+        // any worker, including the workers of the previous runs that are gone now.
+        self.metadata_storage
+            .past_runs_threshold_times()
+            .iter()
+            .filter(|(worker_id, _)| **worker_id >= self.config.total_workers)
+            .map(|(_, threshold_time)| *threshold_time)
+            .fold(committed_timestamp, min)
+    }
+
     pub fn create_snapshot_readers(
-        &self,
+        &mut self,
         persistent_id: PersistentId,
     ) -> Result<Vec<SnapshotReader>, ReadError> {
+        self.snapshots_being_rewound.insert(persistent_id);
         self.config.create_snapshot_readers(
             persistent_id,
             self.metadata_storage.past_runs_threshold_times(),
         )
     }
 
+    pub fn snapshot_rewind_finished(&mut self, persistent_id: PersistentId) {
+        self.snapshots_being_rewound.remove(&persistent_id);
+    }
+
     pub fn create_snapshot_writer(
         &mut self,
         persistent_id: PersistentId,
@@ -30,7 +30,7 @@ use pyo3::marker::Ungil;
 use pyo3::prelude::*;
 use pyo3::pyclass::CompareOp;
 use pyo3::sync::GILOnceCell;
-use pyo3::types::{PyBool, PyBytes, PyDict, PyFloat, PyInt, PyString, PyTuple, PyType};
+use pyo3::types::{PyBool, PyBytes, PyDict, PyFloat, PyInt, PyList, PyString, PyTuple, PyType};
 use pyo3::{AsPyPointer, PyTypeInfo};
 use pyo3_log::ResetHandle;
 use rdkafka::consumer::{BaseConsumer, Consumer};
@@ -65,10 +65,11 @@ use crate::connectors::data_format::{
 };
 use crate::connectors::data_storage::{
     ConnectorMode, CsvFilesystemReader, DataEventType, ElasticSearchWriter, FileWriter,
-    FilesystemReader, KafkaReader, KafkaWriter, NullWriter, PsqlWriter, PythonReaderBuilder,
-    ReadMethod, ReaderBuilder, S3CsvReader, S3GenericReader, SqliteReader, Writer,
+    FilesPartition, FilesystemReader, KafkaReader, KafkaWriter, ModificationMode, NullWriter,
+    PsqlWriter, PythonReaderBuilder, ReadMethod, ReaderBuilder, S3CsvReader, S3GenericReader,
+    SqliteReader, Writer,
 };
-use crate::connectors::snapshot::Event as SnapshotEvent;
+use crate::connectors::snapshot::{Event as SnapshotEvent, SnapshotFormat};
 use crate::connectors::{PersistenceMode, SessionType, SnapshotAccess};
 use crate::engine::dataflow::Config;
 use crate::engine::error::{DynError, DynResult, Trace as EngineTrace};
@@ -86,12 +87,16 @@ use crate::engine::{
     UniverseHandle, Value,
 };
 use crate::engine::{AnyExpression, Context as EngineContext};
+use crate::engine::{
+    AsofJoinDirection, GraphAlgorithm, IntervalJoinBounds, SessionMergeFn, SessionPredicate,
+};
 use crate::engine::{BoolExpression, Error as EngineError};
 use crate::engine::{ComplexColumn as EngineComplexColumn, WakeupReceiver};
 use crate::engine::{DateTimeNaiveExpression, DateTimeUtcExpression, DurationExpression};
 use crate::engine::{Expression, IntExpression};
 use crate::engine::{FloatExpression, Graph};
 use crate::engine::{LegacyTable as EngineLegacyTable, StringExpression};
+use crate::engine::{SlidingWindows, WindowLength};
 use crate::persistence::config::{
     ConnectorWorkerPair, MetadataStorageConfig, PersistenceManagerOuterConfig, StreamStorageConfig,
 };
@@ -419,6 +424,18 @@ impl IntoPy<PyObject> for ReadMethod {
     }
 }
 
+impl<'source> FromPyObject<'source> for ModificationMode {
+    fn extract(ob: &'source PyAny) -> PyResult<Self> {
+        Ok(ob.extract::<PyRef<PyModificationMode>>()?.0)
+    }
+}
+
+impl IntoPy<PyObject> for ModificationMode {
+    fn into_py(self, py: Python<'_>) -> PyObject {
+        PyModificationMode(self).into_py(py)
+    }
+}
+
 impl<'source> FromPyObject<'source> for ConnectorMode {
     fn extract(ob: &'source PyAny) -> PyResult<Self> {
         Ok(ob.extract::<PyRef<PyConnectorMode>>()?.0)
@@ -431,6 +448,30 @@ impl IntoPy<PyObject> for ConnectorMode {
     }
 }
 
+impl<'source> FromPyObject<'source> for AsofJoinDirection {
+    fn extract(ob: &'source PyAny) -> PyResult<Self> {
+        Ok(ob.extract::<PyRef<PyAsofJoinDirection>>()?.0)
+    }
+}
+
+impl IntoPy<PyObject> for AsofJoinDirection {
+    fn into_py(self, py: Python<'_>) -> PyObject {
+        PyAsofJoinDirection(self).into_py(py)
+    }
+}
+
+impl<'source> FromPyObject<'source> for GraphAlgorithm {
+    fn extract(ob: &'source PyAny) -> PyResult<Self> {
+        Ok(ob.extract::<PyRef<PyGraphAlgorithm>>()?.0)
+    }
+}
+
+impl IntoPy<PyObject> for GraphAlgorithm {
+    fn into_py(self, py: Python<'_>) -> PyObject {
+        PyGraphAlgorithm(self).into_py(py)
+    }
+}
+
 impl<'source> FromPyObject<'source> for SessionType {
     fn extract(ob: &'source PyAny) -> PyResult<Self> {
         Ok(ob.extract::<PyRef<PySessionType>>()?.0)
@@ -647,6 +688,42 @@ impl PyReducer {
 
     #[classattr]
     pub const EARLIEST: Reducer = Reducer::Earliest;
+
+    #[staticmethod]
+    fn approx_count_distinct(precision: u8) -> Reducer {
+        Reducer::ApproxCountDistinct { precision }
+    }
+
+    #[staticmethod]
+    fn approx_quantile(quantile: f64, relative_accuracy: f64) -> Reducer {
+        Reducer::ApproxQuantile {
+            quantile,
+            relative_accuracy,
+        }
+    }
+
+    #[staticmethod]
+    fn top_k(k: usize) -> Reducer {
+        Reducer::TopK { k }
+    }
+
+    #[staticmethod]
+    fn variance(ddof: usize) -> Reducer {
+        Reducer::Variance { ddof }
+    }
+
+    #[staticmethod]
+    fn stddev(ddof: usize) -> Reducer {
+        Reducer::Stddev { ddof }
+    }
+
+    #[staticmethod]
+    fn covariance(ddof: usize) -> Reducer {
+        Reducer::Covariance { ddof }
+    }
+
+    #[classattr]
+    pub const CORRELATION: Reducer = Reducer::Correlation;
 }
 
 fn wrap_stateful_combine(combine: Py<PyAny>) -> StatefulCombineFn {
@@ -670,6 +747,16 @@ fn wrap_stateful_combine(combine: Py<PyAny>) -> StatefulCombineFn {
     })
 }
 
+fn wrap_session_predicate(predicate: Py<PyAny>) -> SessionMergeFn {
+    Arc::new(move |current, next| {
+        with_gil_and_pool(|py| -> DynResult<bool> {
+            Ok(predicate
+                .call1(py, (current.clone(), next.clone()))?
+                .extract::<bool>(py)?)
+        })
+    })
+}
+
 #[derive(Clone, Copy, Debug)]
 pub enum UnaryOperator {
     Inv,
@@ -1220,6 +1307,41 @@ impl PyExpression {
             expr.gil || index.gil,
         )
     }
+
+    #[staticmethod]
+    #[pyo3(signature = (instance, key, hop, duration, origin, origin_is_explicit, ratio = None))]
+    fn sliding_windows(
+        instance: &PyExpression,
+        key: &PyExpression,
+        hop: Value,
+        duration: Option<Value>,
+        origin: Value,
+        origin_is_explicit: bool,
+        ratio: Option<i64>,
+    ) -> PyResult<Self> {
+        let length = match (duration, ratio) {
+            (_, Some(ratio)) => WindowLength::Ratio(ratio),
+            (Some(duration), None) => WindowLength::Duration(duration),
+            (None, None) => {
+                return Err(PyValueError::new_err(
+                    "either duration or ratio has to be provided",
+                ))
+            }
+        };
+        Ok(Self::new(
+            Arc::new(Expression::Any(AnyExpression::AssignSlidingWindows(
+                instance.inner.clone(),
+                key.inner.clone(),
+                SlidingWindows {
+                    hop,
+                    length,
+                    origin,
+                    origin_is_explicit,
+                },
+            ))),
+            instance.gil || key.gil,
+        ))
+    }
 }
 
 unary_expr!(is_none, BoolExpression::IsNone);
@@ -1374,6 +1496,19 @@ impl PyReadMethod {
     pub const FULL: ReadMethod = ReadMethod::Full;
 }
 
+#[pyclass(module = "pathway.engine", frozen, name = "ModificationMode")]
+pub struct PyModificationMode(ModificationMode);
+
+#[pymethods]
+impl PyModificationMode {
+    #[classattr]
+    pub const REREAD: ModificationMode = ModificationMode::Reread;
+    #[classattr]
+    pub const APPEND: ModificationMode = ModificationMode::Append;
+    #[classattr]
+    pub const DIFF: ModificationMode = ModificationMode::Diff;
+}
+
 #[pyclass(module = "pathway.engine", frozen, name = "ConnectorMode")]
 pub struct PyConnectorMode(ConnectorMode);
 
@@ -1400,6 +1535,37 @@ impl PySessionType {
     pub const UPSERT: SessionType = SessionType::Upsert;
 }
 
+#[pyclass(module = "pathway.engine", frozen, name = "AsofJoinDirection")]
+pub struct PyAsofJoinDirection(AsofJoinDirection);
+
+#[pymethods]
+impl PyAsofJoinDirection {
+    #[classattr]
+    pub const BACKWARD: AsofJoinDirection = AsofJoinDirection::Backward;
+    #[classattr]
+    pub const FORWARD: AsofJoinDirection = AsofJoinDirection::Forward;
+    #[classattr]
+    pub const NEAREST: AsofJoinDirection = AsofJoinDirection::Nearest;
+}
+
+#[pyclass(module = "pathway.engine", frozen, name = "GraphAlgorithm")]
+pub struct PyGraphAlgorithm(GraphAlgorithm);
+
+#[pymethods]
+impl PyGraphAlgorithm {
+    #[staticmethod]
+    fn pagerank(damping: f64, tolerance: f64) -> GraphAlgorithm {
+        GraphAlgorithm::PageRank { damping, tolerance }
+    }
+
+    #[classattr]
+    pub const WEAKLY_CONNECTED_COMPONENTS: GraphAlgorithm =
+        GraphAlgorithm::WeaklyConnectedComponents;
+
+    #[classattr]
+    pub const SHORTEST_PATHS: GraphAlgorithm = GraphAlgorithm::ShortestPaths;
+}
+
 #[pyclass(module = "pathway.engine", frozen, name = "DataEventType")]
 pub struct PyDataEventType(DataEventType);
 
@@ -2045,7 +2211,12 @@ impl Scope {
             }
         }
 
-        let (reader_impl, parallel_readers) = data_source.borrow().construct_reader(py)?;
+        let worker_index = self_.borrow().worker_index();
+        let worker_count = self_.borrow().worker_count();
+        let (reader_impl, parallel_readers) =
+            data_source
+                .borrow()
+                .construct_reader(py, worker_index, worker_count)?;
 
         let parser_impl = data_format.borrow().construct_parser(py)?;
 
@@ -2058,6 +2229,7 @@ impl Scope {
                 .commit_duration_ms
                 .map(time::Duration::from_millis),
             parallel_readers,
+            properties.parse_threads.unwrap_or(1).max(1),
             Arc::new(EngineTableProperties::flat(column_properties)),
             persistent_id.as_ref(),
         )?;
@@ -2202,6 +2374,57 @@ impl Scope {
         Table::new(self_, table_handle)
     }
 
+    #[allow(clippy::too_many_arguments)]
+    pub fn batch_apply_table(
+        self_: &PyCell<Self>,
+        table: PyRef<Table>,
+        #[pyo3(from_py_with = "from_py_iterable")] column_paths: Vec<ColumnPath>,
+        function: Py<PyAny>,
+        propagate_none: bool,
+        deterministic: bool,
+        properties: TableProperties,
+        max_batch_size: Option<usize>,
+    ) -> PyResult<Py<Table>> {
+        let table_handle = self_.borrow().graph.batch_apply_table(
+            Arc::new(move |rows: &[Vec<Value>]| {
+                let selected: Vec<usize> = (0..rows.len())
+                    .filter(|&index| {
+                        !propagate_none || !rows[index].iter().any(|a| matches!(a, Value::None))
+                    })
+                    .collect();
+                let mut results = vec![Value::None; rows.len()];
+                if selected.is_empty() {
+                    return Ok(results);
+                }
+                let values: Vec<Value> = with_gil_and_pool(|py| {
+                    let columns = (0..rows.first().map_or(0, Vec::len)).map(|column| {
+                        PyList::new(py, selected.iter().map(|&index| &rows[index][column]))
+                    });
+                    let args = PyTuple::new(py, columns);
+                    function.call1(py, args)?.extract(py)
+                })?;
+                if values.len() != selected.len() {
+                    return Err(DynError::from(PyValueError::new_err(format!(
+                        "batched UDF returned {} values for a batch of {} rows",
+                        values.len(),
+                        selected.len()
+                    ))));
+                }
+                for (index, value) in selected.into_iter().zip(values) {
+                    results[index] = value;
+                }
+                Ok(results)
+            }),
+            table.handle,
+            column_paths,
+            max_batch_size,
+            properties.0,
+            EngineTrace::Empty,
+            deterministic,
+        )?;
+        Table::new(self_, table_handle)
+    }
+
     pub fn expression_table(
         self_: &PyCell<Self>,
         table: &Table,
@@ -2485,6 +2708,148 @@ impl Scope {
         Table::new(self_, new_table_handle)
     }
 
+    #[pyo3(signature = (table, key_column_path, instance_column_path, max_gap, predicate, table_properties))]
+    #[allow(clippy::too_many_arguments)]
+    pub fn session_windows_table(
+        self_: &PyCell<Self>,
+        table: PyRef<Table>,
+        key_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        max_gap: Option<Value>,
+        predicate: Option<Py<PyAny>>,
+        table_properties: TableProperties,
+    ) -> PyResult<Py<Table>> {
+        let predicate = match (max_gap, predicate) {
+            (Some(max_gap), None) => SessionPredicate::MaxGap(max_gap),
+            (None, Some(predicate)) => SessionPredicate::Custom(wrap_session_predicate(predicate)),
+            _ => {
+                return Err(PyValueError::new_err(
+                    "exactly one of max_gap and predicate has to be set",
+                ))
+            }
+        };
+        let new_table_handle = self_.borrow().graph.session_windows_table(
+            table.handle,
+            key_column_path,
+            instance_column_path,
+            predicate,
+            table_properties.0,
+        )?;
+        Table::new(self_, new_table_handle)
+    }
+
+    #[pyo3(signature = (left_table, right_table, left_time_column_path, right_time_column_path, left_instance_column_path, right_instance_column_path, lower_bound, upper_bound, table_properties))]
+    #[allow(clippy::too_many_arguments)]
+    pub fn interval_join_table(
+        self_: &PyCell<Self>,
+        left_table: PyRef<Table>,
+        right_table: PyRef<Table>,
+        left_time_column_path: ColumnPath,
+        right_time_column_path: ColumnPath,
+        left_instance_column_path: ColumnPath,
+        right_instance_column_path: ColumnPath,
+        lower_bound: Value,
+        upper_bound: Value,
+        table_properties: TableProperties,
+    ) -> PyResult<Py<Table>> {
+        let bounds = IntervalJoinBounds::new(lower_bound, upper_bound)?;
+        let new_table_handle = self_.borrow().graph.interval_join_table(
+            left_table.handle,
+            right_table.handle,
+            left_time_column_path,
+            right_time_column_path,
+            left_instance_column_path,
+            right_instance_column_path,
+            bounds,
+            table_properties.0,
+        )?;
+        Table::new(self_, new_table_handle)
+    }
+
+    #[pyo3(signature = (table, time_column_path, side_column_path, instance_column_path, direction, right_first, match_left, match_right, table_properties))]
+    #[allow(clippy::too_many_arguments)]
+    pub fn asof_join_table(
+        self_: &PyCell<Self>,
+        table: PyRef<Table>,
+        time_column_path: ColumnPath,
+        side_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        direction: AsofJoinDirection,
+        right_first: bool,
+        match_left: bool,
+        match_right: bool,
+        table_properties: TableProperties,
+    ) -> PyResult<Py<Table>> {
+        let new_table_handle = self_.borrow().graph.asof_join_table(
+            table.handle,
+            time_column_path,
+            side_column_path,
+            instance_column_path,
+            direction,
+            right_first,
+            match_left,
+            match_right,
+            table_properties.0,
+        )?;
+        Table::new(self_, new_table_handle)
+    }
+
+    #[pyo3(signature = (table, key_column_path, instance_column_path, weight_column_path, queries_table, query_instance_column_path, threshold_column_path, table_properties))]
+    #[allow(clippy::too_many_arguments)]
+    pub fn prefix_sum_upperbound_table(
+        self_: &PyCell<Self>,
+        table: PyRef<Table>,
+        key_column_path: ColumnPath,
+        instance_column_path: ColumnPath,
+        weight_column_path: ColumnPath,
+        queries_table: PyRef<Table>,
+        query_instance_column_path: ColumnPath,
+        threshold_column_path: ColumnPath,
+        table_properties: TableProperties,
+    ) -> PyResult<Py<Table>> {
+        let new_table_handle = self_.borrow().graph.prefix_sum_upperbound_table(
+            table.handle,
+            key_column_path,
+            instance_column_path,
+            weight_column_path,
+            queries_table.handle,
+            query_instance_column_path,
+            threshold_column_path,
+            table_properties.0,
+        )?;
+        Table::new(self_, new_table_handle)
+    }
+
+    #[pyo3(signature = (vertices_table, vertex_instance_column_path, is_source_column_path, edges_table, source_column_path, target_column_path, weight_column_path, edge_instance_column_path, algorithm, table_properties))]
+    #[allow(clippy::too_many_arguments)]
+    pub fn graph_algorithm_table(
+        self_: &PyCell<Self>,
+        vertices_table: PyRef<Table>,
+        vertex_instance_column_path: ColumnPath,
+        is_source_column_path: ColumnPath,
+        edges_table: PyRef<Table>,
+        source_column_path: ColumnPath,
+        target_column_path: ColumnPath,
+        weight_column_path: ColumnPath,
+        edge_instance_column_path: ColumnPath,
+        algorithm: GraphAlgorithm,
+        table_properties: TableProperties,
+    ) -> PyResult<Py<Table>> {
+        let new_table_handle = self_.borrow().graph.graph_algorithm_table(
+            vertices_table.handle,
+            vertex_instance_column_path,
+            is_source_column_path,
+            edges_table.handle,
+            source_column_path,
+            target_column_path,
+            weight_column_path,
+            edge_instance_column_path,
+            algorithm,
+            table_properties.0,
+        )?;
+        Table::new(self_, new_table_handle)
+    }
+
     pub fn reindex_table(
         self_: &PyCell<Self>,
         table: PyRef<Table>,
@@ -3339,6 +3704,7 @@ pub struct DataStorage {
     csv_parser_settings: Option<Py<CsvParserSettings>>,
     mode: ConnectorMode,
     read_method: ReadMethod,
+    modification_mode: ModificationMode,
     snapshot_maintenance_on_output: bool,
     aws_s3_settings: Option<Py<AwsS3Settings>>,
     elasticsearch_params: Option<Py<ElasticSearchParams>>,
@@ -3419,6 +3785,8 @@ pub struct PersistenceConfig {
     snapshot_access: SnapshotAccess,
     persistence_mode: PersistenceMode,
     continue_after_replay: bool,
+    compress_snapshots: bool,
+    snapshot_compaction_interval: Option<::std::time::Duration>,
 }
 
 #[pymethods]
@@ -3432,7 +3800,10 @@ impl PersistenceConfig {
         snapshot_access = SnapshotAccess::Full,
         persistence_mode = PersistenceMode::Batch,
         continue_after_replay = true,
+        compress_snapshots = false,
+        snapshot_compaction_interval_ms = 0,
     ))]
+    #[allow(clippy::too_many_arguments)]
     fn new(
         snapshot_interval_ms: u64,
         metadata_storage: DataStorage,
@@ -3440,6 +3811,8 @@ impl PersistenceConfig {
         snapshot_access: SnapshotAccess,
         persistence_mode: PersistenceMode,
         continue_after_replay: bool,
+        compress_snapshots: bool,
+        snapshot_compaction_interval_ms: u64,
     ) -> Self {
         Self {
             snapshot_interval: ::std::time::Duration::from_millis(snapshot_interval_ms),
@@ -3448,6 +3821,10 @@ impl PersistenceConfig {
             snapshot_access,
             persistence_mode,
             continue_after_replay,
+            compress_snapshots,
+            snapshot_compaction_interval: (snapshot_compaction_interval_ms > 0).then_some(
+                ::std::time::Duration::from_millis(snapshot_compaction_interval_ms),
+            ),
         }
     }
 }
@@ -3462,6 +3839,12 @@ impl PersistenceConfig {
             self.snapshot_access,
             self.persistence_mode,
             self.continue_after_replay,
+            if self.compress_snapshots {
+                SnapshotFormat::CompressedBlocks
+            } else {
+                SnapshotFormat::Plain
+            },
+            self.snapshot_compaction_interval,
         ))
     }
 }
@@ -3641,6 +4024,7 @@ impl DataStorage {
         csv_parser_settings = None,
         mode = ConnectorMode::Streaming,
         read_method = ReadMethod::ByLine,
+        modification_mode = ModificationMode::Reread,
         snapshot_maintenance_on_output = false,
         aws_s3_settings = None,
         elasticsearch_params = None,
@@ -3665,6 +4049,7 @@ impl DataStorage {
         csv_parser_settings: Option<Py<CsvParserSettings>>,
         mode: ConnectorMode,
         read_method: ReadMethod,
+        modification_mode: ModificationMode,
         snapshot_maintenance_on_output: bool,
         aws_s3_settings: Option<Py<AwsS3Settings>>,
         elasticsearch_params: Option<Py<ElasticSearchParams>>,
@@ -3688,6 +4073,7 @@ impl DataStorage {
             csv_parser_settings,
             mode,
             read_method,
+            modification_mode,
             snapshot_maintenance_on_output,
             aws_s3_settings,
             elasticsearch_params,
@@ -3895,7 +4281,21 @@ impl DataStorage {
             .map(IntoPersistentId::into_persistent_id)
     }
 
-    fn construct_fs_reader(&self) -> PyResult<(Box<dyn ReaderBuilder>, usize)> {
+    /// Returns the part of the files read by the given worker and the number of workers
+    /// reading them
+    fn files_partition(&self, worker_index: usize, worker_count: usize) -> (FilesPartition, usize) {
+        let parallel_readers = self.parallel_readers.unwrap_or(1).clamp(1, worker_count);
+        // the workers past the parallel readers don't read anything
+        let partition = FilesPartition::new(worker_index % parallel_readers, parallel_readers);
+        (partition, parallel_readers)
+    }
+
+    fn construct_fs_reader(
+        &self,
+        worker_index: usize,
+        worker_count: usize,
+    ) -> PyResult<(Box<dyn ReaderBuilder>, usize)> {
+        let (partition, parallel_readers) = self.files_partition(worker_index, worker_count);
         let storage = FilesystemReader::new(
             self.path()?,
             self.mode,
@@ -3903,8 +4303,10 @@ impl DataStorage {
             self.read_method,
             &self.object_pattern,
         )
-        .map_err(|e| PyIOError::new_err(format!("Failed to initialize Filesystem reader: {e}")))?;
-        Ok((Box::new(storage), 1))
+        .map_err(|e| PyIOError::new_err(format!("Failed to initialize Filesystem reader: {e}")))?
+        .with_modification_mode(self.modification_mode)
+        .with_partition(partition);
+        Ok((Box::new(storage), parallel_readers))
     }
 
     fn construct_s3_reader(&self, py: pyo3::Python) -> PyResult<(Box<dyn ReaderBuilder>, usize)> {
@@ -3936,7 +4338,13 @@ impl DataStorage {
         Ok((Box::new(storage), 1))
     }
 
-    fn construct_csv_reader(&self, py: pyo3::Python) -> PyResult<(Box<dyn ReaderBuilder>, usize)> {
+    fn construct_csv_reader(
+        &self,
+        py: pyo3::Python,
+        worker_index: usize,
+        worker_count: usize,
+    ) -> PyResult<(Box<dyn ReaderBuilder>, usize)> {
+        let (partition, parallel_readers) = self.files_partition(worker_index, worker_count);
         let reader = CsvFilesystemReader::new(
             self.path()?,
             self.build_csv_parser_settings(py),
@@ -3944,10 +4352,10 @@ impl DataStorage {
             self.internal_persistent_id(),
             &self.object_pattern,
         )
-        .map_err(|e| {
-            PyIOError::new_err(format!("Failed to initialize CsvFilesystem reader: {e}"))
-        })?;
-        Ok((Box::new(reader), 1))
+        .map_err(|e| PyIOError::new_err(format!("Failed to initialize CsvFilesystem reader: {e}")))?
+        .with_modification_mode(self.modification_mode)
+        .with_partition(partition);
+        Ok((Box::new(reader), parallel_readers))
     }
 
     fn construct_kafka_reader(&self) -> PyResult<(Box<dyn ReaderBuilder>, usize)> {
@@ -4000,12 +4408,17 @@ impl DataStorage {
         Ok((Box::new(reader), 1))
     }
 
-    fn construct_reader(&self, py: pyo3::Python) -> PyResult<(Box<dyn ReaderBuilder>, usize)> {
+    fn construct_reader(
+        &self,
+        py: pyo3::Python,
+        worker_index: usize,
+        worker_count: usize,
+    ) -> PyResult<(Box<dyn ReaderBuilder>, usize)> {
         match self.storage_type.as_ref() {
-            "fs" => self.construct_fs_reader(),
+            "fs" => self.construct_fs_reader(worker_index, worker_count),
             "s3" => self.construct_s3_reader(py),
             "s3_csv" => self.construct_s3_csv_reader(py),
-            "csv" => self.construct_csv_reader(py),
+            "csv" => self.construct_csv_reader(py, worker_index, worker_count),
             "kafka" => self.construct_kafka_reader(),
             "python" => self.construct_python_reader(py),
             "sqlite" => self.construct_sqlite_reader(),
@@ -4361,6 +4774,8 @@ pub struct ConnectorProperties {
     unsafe_trusted_ids: bool,
     #[pyo3(get)]
     column_properties: Vec<ColumnProperties>,
+    #[pyo3(get)]
+    parse_threads: Option<usize>,
 }
 
 #[pymethods]
@@ -4369,17 +4784,20 @@ impl ConnectorProperties {
     #[pyo3(signature = (
         commit_duration_ms = None,
         unsafe_trusted_ids = false,
-        column_properties = vec![]
+        column_properties = vec![],
+        parse_threads = None
     ))]
     fn new(
         commit_duration_ms: Option<u64>,
         unsafe_trusted_ids: bool,
         #[pyo3(from_py_with = "from_py_iterable")] column_properties: Vec<ColumnProperties>,
+        parse_threads: Option<usize>,
     ) -> Self {
         Self {
             commit_duration_ms,
             unsafe_trusted_ids,
             column_properties,
+            parse_threads,
         }
     }
 }
@@ -4654,9 +5072,12 @@ fn module(_py: Python<'_>, m: &PyModule) -> PyResult<()> {
     m.add_class::<PathwayType>()?;
     m.add_class::<PyConnectorMode>()?;
     m.add_class::<PySessionType>()?;
+    m.add_class::<PyAsofJoinDirection>()?;
+    m.add_class::<PyGraphAlgorithm>()?;
     m.add_class::<PyDataEventType>()?;
     m.add_class::<PyDebeziumDBType>()?;
     m.add_class::<PyReadMethod>()?;
+    m.add_class::<PyModificationMode>()?;
     m.add_class::<PyMonitoringLevel>()?;
     m.add_class::<Universe>()?;
     m.add_class::<Column>()?;
@@ -18,7 +18,7 @@ use pathway_engine::connectors::data_format::{ParsedEvent, Parser};
 use pathway_engine::connectors::data_storage::{
     DataEventType, ReadResult, Reader, ReaderBuilder, ReaderContext,
 };
-use pathway_engine::connectors::snapshot::Event as SnapshotEvent;
+use pathway_engine::connectors::snapshot::{Event as SnapshotEvent, SnapshotFormat};
 use pathway_engine::connectors::{Connector, Entry, PersistenceMode, SnapshotAccess};
 use pathway_engine::engine::{Key, Timestamp};
 use pathway_engine::persistence::frontier::OffsetAntichain;
@@ -88,7 +88,7 @@ pub fn full_cycle_read(
     let mut rewind_finish_sentinel_seen = false;
     for entry in &result {
         match entry {
-            Entry::Realtime(_) => assert!(rewind_finish_sentinel_seen),
+            Entry::Realtime(_) | Entry::Parsed(..) => assert!(rewind_finish_sentinel_seen),
             Entry::RewindFinishSentinel => {
                 assert!(!rewind_finish_sentinel_seen);
                 rewind_finish_sentinel_seen = true;
@@ -219,6 +219,8 @@ pub fn create_persistence_manager(
                 SnapshotAccess::Full,
                 PersistenceMode::Batch,
                 true,
+                SnapshotFormat::Plain,
+                None,
             )
             .into_inner(0, 1),
         )
@@ -11,12 +11,15 @@ mod test_dsv;
 mod test_dsv_dir;
 mod test_dsv_output;
 mod test_file_kv;
+mod test_fs_partition;
+mod test_fs_watch;
 mod test_json_output;
 mod test_jsonlines;
 mod test_metadata;
 mod test_null_writer;
 mod test_offsets_storage;
 mod test_parser_errors;
+mod test_parser_pool;
 mod test_prev_next;
 mod test_psql_output;
 mod test_psql_snapshot;
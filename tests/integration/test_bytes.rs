@@ -92,3 +92,48 @@ fn test_bytes_read_from_folder() -> eyre::Result<()> {
 
     Ok(())
 }
+
+#[test]
+fn test_large_file_read_by_lines() -> eyre::Result<()> {
+    // large enough for its cached copy to be memory-mapped
+    let test_storage = tempfile::tempdir()?;
+    let input_path = test_storage.path().join("input.txt");
+    let lines: Vec<String> = (0..200_000).map(|i| format!("line {i}")).collect();
+    std::fs::write(&input_path, lines.join("\n"))?;
+
+    // in the streaming mode the file is read from its cached copy
+    let mut reader = FilesystemReader::new(
+        input_path.to_str().unwrap(),
+        ConnectorMode::Streaming,
+        None,
+        ReadMethod::ByLine,
+        "*",
+    )?;
+    let mut parser = IdentityParser::new(vec!["data".to_string()], true, SessionType::Native);
+    let mut values = Vec::new();
+    while values.len() < lines.len() {
+        match reader.read()? {
+            ReadResult::Data(context, _) => {
+                for event in parser
+                    .parse(&context)
+                    .expect("entries should parse correctly")
+                {
+                    let ParsedEvent::Insert((_, event_values)) = event else {
+                        panic!("unexpected event: {event:?}");
+                    };
+                    values.extend(event_values);
+                }
+            }
+            ReadResult::Finished => break,
+            ReadResult::FinishedSource { .. } | ReadResult::NewSource(_) => continue,
+        }
+    }
+
+    let expected: Vec<Value> = lines
+        .into_iter()
+        .map(|line| Value::String(line.into()))
+        .collect();
+    assert_eq!(values, expected);
+
+    Ok(())
+}
@@ -0,0 +1,81 @@
+// Copyright © 2024 Pathway
+
+use std::fs;
+use std::path::{Path, PathBuf};
+use std::sync::Arc;
+
+use pathway_engine::connectors::data_storage::{
+    ConnectorMode, DataEventType, FilesPartition, FilesystemReader, ReadMethod, ReadResult, Reader,
+    ReaderContext,
+};
+use pathway_engine::connectors::{OffsetKey, OffsetValue};
+
+// The lines read, with the path and the end offset, which identify the rows
+type ReadLine = (Vec<u8>, Arc<PathBuf>, u64);
+
+fn read_lines(path: &Path, partition: Option<FilesPartition>) -> eyre::Result<Vec<ReadLine>> {
+    let mut reader = FilesystemReader::new(
+        path.to_str().unwrap(),
+        ConnectorMode::Static,
+        None,
+        ReadMethod::ByLine,
+        "*",
+    )?;
+    if let Some(partition) = partition {
+        reader = reader.with_partition(partition).with_min_split_file_size(1);
+    }
+
+    let mut lines = Vec::new();
+    loop {
+        match reader.read()? {
+            ReadResult::Data(
+                ReaderContext::RawBytes(DataEventType::Insert, line),
+                (
+                    OffsetKey::Empty,
+                    OffsetValue::FilePosition {
+                        path, bytes_offset, ..
+                    },
+                ),
+            ) => lines.push((line, path, bytes_offset)),
+            ReadResult::Data(..) => panic!("unexpected entry"),
+            ReadResult::Finished => break,
+            ReadResult::FinishedSource { .. } | ReadResult::NewSource(_) => continue,
+        }
+    }
+    Ok(lines)
+}
+
+#[test]
+fn test_split_file_lines_read_once() -> eyre::Result<()> {
+    let test_storage = tempfile::tempdir()?;
+    let input_path = test_storage.path().join("input.txt");
+    // the lines have different lengths, so that the boundaries fall inside of them,
+    // and the last one has no trailing newline
+    let mut contents = String::new();
+    for i in 0..20 {
+        contents.push_str(&format!("line-{i}-{}\n", "x".repeat(i % 7)));
+    }
+    contents.push('\n');
+    contents.push_str("last line");
+    fs::write(&input_path, &contents)?;
+
+    let mut expected = read_lines(&input_path, None)?;
+    assert_eq!(expected.len(), 22);
+    assert_eq!(expected.last().unwrap().0, b"last line");
+    expected.sort();
+
+    for count in 2..=3 {
+        let mut lines = Vec::new();
+        for index in 0..count {
+            let partition_lines = read_lines(&input_path, Some(FilesPartition::new(index, count)))?;
+            // every reader reads its own range of the file
+            assert!(!partition_lines.is_empty());
+            assert!(partition_lines.len() < expected.len());
+            lines.extend(partition_lines);
+        }
+        lines.sort();
+        assert_eq!(lines, expected);
+    }
+
+    Ok(())
+}
@@ -0,0 +1,92 @@
+// Copyright © 2024 Pathway
+
+use std::fs::{self, OpenOptions};
+use std::io::Write;
+use std::path::Path;
+use std::sync::mpsc::{self, Receiver};
+use std::thread;
+use std::time::{Duration, Instant};
+
+use pathway_engine::connectors::data_storage::{
+    ConnectorMode, DataEventType, FilesystemReader, ReadMethod, ReadResult, Reader, ReaderContext,
+};
+
+fn spawn_streaming_reader(path: &Path) -> Receiver<ReadResult> {
+    let path = path.to_str().unwrap().to_string();
+    let (sender, receiver) = mpsc::channel();
+    thread::spawn(move || {
+        let mut reader = FilesystemReader::new(
+            &path,
+            ConnectorMode::Streaming,
+            None,
+            ReadMethod::ByLine,
+            "*",
+        )
+        .unwrap();
+        loop {
+            let read_result = reader.read().unwrap();
+            if sender.send(read_result).is_err() {
+                break;
+            }
+        }
+    });
+    receiver
+}
+
+fn wait_for_inserted_line(receiver: &Receiver<ReadResult>, expected_line: &str) -> bool {
+    let deadline = Instant::now() + Duration::from_secs(10);
+    while let Some(timeout) = deadline.checked_duration_since(Instant::now()) {
+        let Ok(read_result) = receiver.recv_timeout(timeout) else {
+            return false;
+        };
+        if let ReadResult::Data(ReaderContext::RawBytes(DataEventType::Insert, line), _) =
+            read_result
+        {
+            if line.strip_suffix(b"\n").unwrap_or(&line) == expected_line.as_bytes() {
+                return true;
+            }
+        }
+    }
+    false
+}
+
+#[test]
+fn test_append_to_open_file_is_read() -> eyre::Result<()> {
+    let test_storage = tempfile::tempdir()?;
+    let input_path = test_storage.path().join("input.txt");
+    fs::write(&input_path, "a\n")?;
+
+    let receiver = spawn_streaming_reader(test_storage.path());
+    assert!(wait_for_inserted_line(&receiver, "a"));
+
+    // the modification times are compared with the precision of a second
+    thread::sleep(Duration::from_millis(1100));
+    // the file stays open, like the file of a logger, so it is never closed after writing
+    let mut file = OpenOptions::new().append(true).open(&input_path)?;
+    file.write_all(b"b\n")?;
+    file.flush()?;
+    assert!(wait_for_inserted_line(&receiver, "b"));
+    drop(file);
+
+    Ok(())
+}
+
+#[test]
+fn test_moved_in_directory_is_scanned() -> eyre::Result<()> {
+    let test_storage = tempfile::tempdir()?;
+    let watched_path = test_storage.path().join("watched");
+    fs::create_dir(&watched_path)?;
+    fs::write(watched_path.join("a.txt"), "a\n")?;
+
+    let receiver = spawn_streaming_reader(&watched_path);
+    assert!(wait_for_inserted_line(&receiver, "a"));
+
+    // the files inside a moved directory produce no events, only a full scan finds them
+    let prepared_path = test_storage.path().join("nested");
+    fs::create_dir(&prepared_path)?;
+    fs::write(prepared_path.join("b.txt"), "b\n")?;
+    fs::rename(&prepared_path, watched_path.join("nested"))?;
+    assert!(wait_for_inserted_line(&receiver, "b"));
+
+    Ok(())
+}
@@ -0,0 +1,85 @@
+// Copyright © 2024 Pathway
+
+use std::collections::HashMap;
+use std::sync::mpsc::{self, TryRecvError};
+use std::sync::Arc;
+use std::thread;
+
+use pathway_engine::connectors::data_format::{JsonLinesParser, ParsedEvent, Parser};
+use pathway_engine::connectors::data_storage::{DataEventType, ReadResult, ReaderContext};
+use pathway_engine::connectors::parser_pool::ParserPool;
+use pathway_engine::connectors::{Entry, Offset, OffsetKey, OffsetValue, SessionType};
+use pathway_engine::engine::{Key, Value};
+
+fn kafka_offset(offset: i64) -> Offset {
+    (
+        OffsetKey::Kafka(Arc::new("test".to_string()), 0),
+        OffsetValue::KafkaOffset(offset),
+    )
+}
+
+#[test]
+fn test_parser_pool_keeps_order() -> eyre::Result<()> {
+    let parser = JsonLinesParser::new(
+        Some(vec!["a".to_string()]),
+        vec!["b".to_string()],
+        HashMap::new(),
+        true,
+        HashMap::new(),
+        SessionType::Native,
+    );
+    let parsers: Vec<Box<dyn Parser>> = (0..3).map(|_| parser.fork().unwrap()).collect();
+
+    let (sender, receiver) = mpsc::channel();
+    sender.send(Entry::RewindFinishSentinel)?;
+    for i in 0..100 {
+        let line = if i == 50 {
+            "malformed".to_string()
+        } else {
+            format!(r#"{{"a": {i}, "b": {}}}"#, i * 2)
+        };
+        sender.send(Entry::Realtime(ReadResult::Data(
+            ReaderContext::from_raw_bytes(DataEventType::Insert, line.into_bytes()),
+            kafka_offset(i),
+        )))?;
+    }
+    sender.send(Entry::Realtime(ReadResult::Finished))?;
+    drop(sender);
+
+    let mut parser_pool = ParserPool::new(
+        "test",
+        receiver,
+        parsers,
+        |values: Option<&Vec<Value>>, _offset: Option<&Offset>| {
+            Key::for_values(values.expect("key is required"))
+        },
+        &thread::current(),
+    );
+    let mut entries = Vec::new();
+    loop {
+        match parser_pool.try_recv() {
+            Ok(entry) => entries.push(entry),
+            Err(TryRecvError::Empty) => thread::park(),
+            Err(TryRecvError::Disconnected) => break,
+        }
+    }
+
+    assert_eq!(entries.len(), 101);
+    assert_eq!(entries[0], Entry::RewindFinishSentinel);
+    assert_eq!(entries[100], Entry::Realtime(ReadResult::Finished));
+    let offsets: Vec<i64> = (0..100).filter(|i| *i != 50).collect();
+    for (entry, offset) in entries[1..100].iter().zip(offsets) {
+        let key_values = vec![Value::Int(offset)];
+        let expected_event =
+            ParsedEvent::Insert((Some(key_values.clone()), vec![Value::Int(offset * 2)]));
+        assert_eq!(
+            entry,
+            &Entry::Parsed(
+                vec![(expected_event, Some(Key::for_values(&key_values)))],
+                kafka_offset(offset)
+            )
+        );
+    }
+
+    Ok(())
+}
@@ -9,12 +9,15 @@ use std::fs::File;
 use std::io::Write;
 use std::path::Path;
 use std::sync::{mpsc, Arc};
+use std::thread::sleep;
+use std::time::Duration;
 
 use tempfile::tempdir;
 
 use pathway_engine::connectors::snapshot::Event as SnapshotEvent;
 use pathway_engine::connectors::snapshot::{
-    LocalBinarySnapshotReader, LocalBinarySnapshotWriter, SnapshotReaderImpl, SnapshotWriter,
+    compact_local_snapshot, CompactionStats, LocalBinarySnapshotReader, LocalBinarySnapshotWriter,
+    SnapshotFormat, SnapshotReaderImpl, SnapshotWriter,
 };
 use pathway_engine::connectors::{Connector, Entry, PersistenceMode};
 use pathway_engine::engine::{Key, Value};
@@ -104,6 +107,87 @@ fn test_stream_snapshot_io() -> eyre::Result<()> {
     Ok(())
 }
 
+#[test]
+fn test_stream_snapshot_io_compressed() -> eyre::Result<()> {
+    let mut events = vec![
+        SnapshotEvent::Upsert(Key::random(), None),
+        SnapshotEvent::AdvanceTime(Timestamp(1)),
+        SnapshotEvent::Delete(Key::random(), vec![Value::Int(1)]),
+    ];
+    // enough events to span several blocks
+    for i in 0..40_000 {
+        events.push(SnapshotEvent::Insert(
+            Key::random(),
+            vec![
+                Value::Int(i % 7),
+                Value::String("repeated string".into()),
+                Value::Tuple(Arc::new([Value::Int(i), Value::Float(1.1.into())])),
+            ],
+        ));
+        if i % 1000 == 0 {
+            events.push(SnapshotEvent::Upsert(
+                Key::random(),
+                Some(vec![Value::Bool(true), Value::None]),
+            ));
+        }
+    }
+
+    let test_storage = tempdir()?;
+    let test_storage_path = test_storage.path();
+
+    {
+        let mut snapshot_writer = LocalBinarySnapshotWriter::with_format(
+            test_storage_path,
+            SnapshotFormat::CompressedBlocks,
+        )
+        .expect("Failed to create test snapshot storage");
+        for event in &events {
+            snapshot_writer
+                .write(event)
+                .expect("Failed to write event into snapshot file");
+        }
+    }
+
+    assert_eq!(read_persistent_buffer(test_storage_path), events);
+
+    Ok(())
+}
+
+#[test]
+fn test_stream_snapshot_truncate_compressed() -> eyre::Result<()> {
+    let events: Vec<_> = (0..5)
+        .map(|i| SnapshotEvent::Insert(Key::random(), vec![Value::Int(i)]))
+        .collect();
+
+    let test_storage = tempdir()?;
+    let test_storage_path = test_storage.path();
+
+    {
+        let mut snapshot_writer = LocalBinarySnapshotWriter::with_format(
+            test_storage_path,
+            SnapshotFormat::CompressedBlocks,
+        )
+        .expect("Failed to create test snapshot storage");
+        for event in &events {
+            snapshot_writer
+                .write(event)
+                .expect("Failed to write event into snapshot file");
+        }
+    }
+
+    {
+        let mut snapshot_reader = LocalBinarySnapshotReader::new(test_storage_path.to_path_buf())
+            .expect("Failed to create reader for test snapshot storage");
+        assert_eq!(snapshot_reader.read().expect("Failed to read"), events[0]);
+        assert_eq!(snapshot_reader.read().expect("Failed to read"), events[1]);
+        snapshot_reader.truncate().expect("Failed to truncate");
+    }
+
+    assert_eq!(read_persistent_buffer(test_storage_path), events[..2]);
+
+    Ok(())
+}
+
 #[test]
 fn test_stream_snapshot_io_broken_format() -> eyre::Result<()> {
     let test_storage = tempdir()?;
@@ -350,3 +434,179 @@ fn test_stream_snapshot_speedrun() -> eyre::Result<()> {
 
     Ok(())
 }
+
+fn write_snapshot_parts(chunks_root: &Path, parts: &[Vec<SnapshotEvent>]) {
+    write_snapshot_parts_with_formats(chunks_root, parts, |_| SnapshotFormat::Plain);
+}
+
+fn write_snapshot_parts_with_formats(
+    chunks_root: &Path,
+    parts: &[Vec<SnapshotEvent>],
+    format: impl Fn(usize) -> SnapshotFormat,
+) {
+    for (part_idx, events) in parts.iter().enumerate() {
+        let mut snapshot_writer =
+            LocalBinarySnapshotWriter::with_format(chunks_root, format(part_idx))
+                .expect("Failed to create test snapshot storage");
+        for event in events {
+            snapshot_writer
+                .write(event)
+                .expect("Failed to write event into snapshot file");
+        }
+        // parts are named after the millisecond of their creation
+        sleep(Duration::from_millis(2));
+    }
+}
+
+fn compaction_test_parts() -> Vec<Vec<SnapshotEvent>> {
+    let (key1, key2, key3, key4, key5) = (
+        Key::random(),
+        Key::random(),
+        Key::random(),
+        Key::random(),
+        Key::random(),
+    );
+    vec![
+        vec![
+            SnapshotEvent::Insert(key1, vec![Value::Int(1)]),
+            SnapshotEvent::Insert(key2, vec![Value::Int(2)]),
+            SnapshotEvent::Upsert(key3, Some(vec![Value::Int(3)])),
+            SnapshotEvent::AdvanceTime(Timestamp(2)),
+            SnapshotEvent::Delete(key1, vec![Value::Int(1)]),
+            SnapshotEvent::Insert(key1, vec![Value::Int(10)]),
+        ],
+        vec![
+            SnapshotEvent::AdvanceTime(Timestamp(4)),
+            SnapshotEvent::Upsert(key3, Some(vec![Value::Int(30)])),
+            SnapshotEvent::Delete(key2, vec![Value::Int(2)]),
+            SnapshotEvent::AdvanceTime(Timestamp(6)),
+            SnapshotEvent::Insert(key4, vec![Value::Int(4)]),
+        ],
+        vec![
+            SnapshotEvent::AdvanceTime(Timestamp(8)),
+            SnapshotEvent::Insert(key5, vec![Value::Int(5)]),
+        ],
+    ]
+}
+
+fn sort_events(mut events: Vec<SnapshotEvent>) -> Vec<SnapshotEvent> {
+    events.sort_by_key(|event| format!("{event:?}"));
+    events
+}
+
+#[test]
+fn test_stream_snapshot_compaction() -> eyre::Result<()> {
+    let test_storage = tempdir()?;
+    let test_storage_path = test_storage.path();
+
+    let parts = compaction_test_parts();
+    write_snapshot_parts(test_storage_path, &parts);
+
+    let stats = compact_local_snapshot(test_storage_path, Timestamp(7), SnapshotFormat::Plain)?;
+    assert_eq!(
+        stats,
+        Some(CompactionStats {
+            parts_compacted: 2,
+            events_read: 11,
+            events_written: 4,
+        })
+    );
+    assert_eq!(std::fs::read_dir(test_storage_path)?.count(), 2);
+
+    let events = read_persistent_buffer(test_storage_path);
+    assert_eq!(
+        sort_events(events[..2].to_vec()),
+        sort_events(vec![parts[0][5].clone(), parts[1][1].clone()])
+    );
+    assert_eq!(
+        events[2..],
+        [
+            SnapshotEvent::AdvanceTime(Timestamp(6)),
+            parts[1][4].clone(),
+            parts[2][0].clone(),
+            parts[2][1].clone(),
+        ]
+    );
+
+    // the only part left to compact is already compacted
+    let stats = compact_local_snapshot(test_storage_path, Timestamp(7), SnapshotFormat::Plain)?;
+    assert_eq!(stats, None);
+
+    Ok(())
+}
+
+#[test]
+fn test_stream_snapshot_compaction_stops_at_threshold() -> eyre::Result<()> {
+    let test_storage = tempdir()?;
+    let test_storage_path = test_storage.path();
+
+    let parts = compaction_test_parts();
+    write_snapshot_parts(test_storage_path, &parts);
+
+    // the second part contains the time 6, which isn't committed yet
+    let stats = compact_local_snapshot(
+        test_storage_path,
+        Timestamp(5),
+        SnapshotFormat::CompressedBlocks,
+    )?;
+    assert_eq!(
+        stats,
+        Some(CompactionStats {
+            parts_compacted: 1,
+            events_read: 6,
+            events_written: 6,
+        })
+    );
+
+    let events = read_persistent_buffer(test_storage_path);
+    assert_eq!(
+        sort_events(events[..3].to_vec()),
+        sort_events(parts[0][..3].to_vec())
+    );
+    let mut expected_tail = parts[0][3..].to_vec();
+    expected_tail.extend(parts[1].iter().cloned());
+    expected_tail.extend(parts[2].iter().cloned());
+    assert_eq!(events[3..], expected_tail);
+
+    Ok(())
+}
+
+#[test]
+fn test_stream_snapshot_many_parts() -> eyre::Result<()> {
+    let test_storage = tempdir()?;
+    let test_storage_path = test_storage.path();
+
+    // more parts than are loaded at once, in both formats
+    let parts: Vec<Vec<SnapshotEvent>> = (0..10)
+        .map(|part_idx| {
+            (0..10)
+                .map(|i| SnapshotEvent::Insert(Key::random(), vec![Value::Int(part_idx * 10 + i)]))
+                .collect()
+        })
+        .collect();
+    write_snapshot_parts_with_formats(test_storage_path, &parts, |part_idx| {
+        if part_idx % 2 == 0 {
+            SnapshotFormat::Plain
+        } else {
+            SnapshotFormat::CompressedBlocks
+        }
+    });
+    let all_events = parts.concat();
+    assert_eq!(read_persistent_buffer(test_storage_path), all_events);
+
+    for events_to_keep in [35, 22] {
+        let mut snapshot_reader = LocalBinarySnapshotReader::new(test_storage_path.to_path_buf())
+            .expect("Failed to create reader for test snapshot storage");
+        for event in &all_events[..events_to_keep] {
+            assert_eq!(&snapshot_reader.read().expect("Failed to read"), event);
+        }
+        snapshot_reader.truncate().expect("Failed to truncate");
+
+        assert_eq!(
+            read_persistent_buffer(test_storage_path),
+            all_events[..events_to_keep]
+        );
+    }
+
+    Ok(())
+}